@@ -12,6 +12,8 @@ SCRIPT_ROOT = os.path.dirname(os.path.abspath(__file__))
 POLLY_PATH = os.path.join(SCRIPT_ROOT,  "hunter", "polly")
 sys.path.append(os.path.join(POLLY_PATH, 'bin'))
 from detail.toolchain_table import get_by_name # noqa
+from detail import toolchain_index # noqa
+from detail.check_cache import CheckCache # noqa
 
 NODEJS_TEMPLATE_PATH = os.path.join(SCRIPT_ROOT, "cmake", "nodejs", "CMakeLists.txt.in")
 
@@ -95,6 +97,13 @@ class Configs(Enum):
     def __str__(self):
         return self.name
 
+def find_toolchain(name):
+    """Toolchain checked against the toolchain index of polly (exits with
+    the close names if there is no such toolchain file)"""
+    if toolchain_index.get().get(name) is None:
+        toolchain_index.verify(name)
+    return get_by_name(name)
+
 def getCmakeVersion():
     sp = subprocess.Popen("cmake --version", stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True)
     out, err = sp.communicate()
@@ -155,6 +164,11 @@ def cmakeWrapper(addParserArguments=None, checkParserArguments=None):
     parser.add_argument("--clear", help="Delete the toolchain's directory in _builds before configuring.", action='store_true')
     parser.add_argument("--clear-all", help="Delete the _builds directory before configuring.", action='store_true')
     parser.add_argument("--dev", help="Enable development features like debug logging, regardless of build type", action='store_true')
+    parser.add_argument(
+        "--check-cache",
+        help="Reuse configure check results of the previous build directories (saved in the polly user cache). Default is on.",
+        choices=["on", "off", "refresh"],
+        default="on")
 
     # On/off flags.
     add_flags_to_parser(parser)
@@ -169,7 +183,7 @@ def cmakeWrapper(addParserArguments=None, checkParserArguments=None):
 
     # Add project prefix to each variable.
     additional_cmake_args = ['-D'+ projectName +'_{}'.format(cmake_arg) for cmake_arg in project_cmake_arg_list]
-    polly_toolchain = get_by_name(args.toolchain)
+    polly_toolchain = find_toolchain(args.toolchain)
 
     # Situational logic
     if not polly_toolchain.multiconfig:
@@ -179,7 +193,7 @@ def cmakeWrapper(addParserArguments=None, checkParserArguments=None):
         print("The Emscripten toolchain will not build Java bindings, "
               "shared libraries, projects, or tests, even if selected.")
     if args.host_toolchain:
-        polly_host_toolchain = get_by_name(args.host_toolchain)
+        polly_host_toolchain = find_toolchain(args.host_toolchain)
         additional_cmake_args.append("-DHUNTER_EXPERIMENTAL_HOST_TOOLCHAIN_FILE="+os.path.abspath(os.path.join(POLLY_PATH, polly_host_toolchain.name + '.cmake')))
         additional_cmake_args.append("-DHUNTER_EXPERIMENTAL_HOST_GENERATOR="+polly_host_toolchain.generator)
 
@@ -224,8 +238,24 @@ def cmakeWrapper(addParserArguments=None, checkParserArguments=None):
     if args.with_node:
         print(cmake_args)
     else:
-        cmake_call_string = "cmake -H. -B{} {}".format(build_dir, cmake_args)
+        check_cache = None
+        seed = None
+        if args.check_cache != "off":
+            check_cache = CheckCache(
+                "configure.py " + build_dir,
+                os.getcwd(),
+                "cmake",
+                os.path.join(POLLY_PATH, polly_toolchain.name + '.cmake'),
+                [cmake_args],
+                os.environ,
+                refresh=(args.check_cache == "refresh"))
+            seed, message = check_cache.seed(build_dir)
+            print("Check cache: " + (message if seed else "not used ({})".format(message)))
+        cmake_call_string = "cmake {}-H. -B{} {}".format(
+            '-C "{}" '.format(seed) if seed else '', build_dir, cmake_args)
         sp = subprocess.check_call(cmake_call_string, shell=True)
+        if check_cache:
+            check_cache.capture(build_dir)
         return sp
 
 if __name__ == "__main__":
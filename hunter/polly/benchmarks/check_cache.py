@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+# Configure time of a new build directory with and without the check cache
+# (polly.py --check-cache):
+#
+#   > benchmarks/check_cache.py --toolchain gcc --runs 3
+#   > benchmarks/check_cache.py --project ~/work/foo --toolchain ninja
+#
+# Every run is `polly.py --clear --nobuild` (fresh build directory), the
+# 'Generate' time is taken from _3rdParty/polly/timing.json. The project is
+# copied to a temporary directory and a temporary user cache is used, so
+# nothing is left in the project or in ~/.cache/polly. Without --project a
+# generated project with --checks configure checks is measured.
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+polly_py = os.path.realpath(
+    os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'bin', 'polly.py')
+)
+
+def generate_project(project_dir, checks):
+  lines = [
+      'cmake_minimum_required(VERSION 3.5)',
+      'project(check_cache_benchmark C CXX)',
+      'include(CheckIncludeFile)',
+      'include(CheckCXXSourceCompiles)',
+      'include(CheckTypeSize)',
+      'include(CheckFunctionExists)'
+  ]
+  headers = ['stdio.h', 'stdlib.h', 'string.h', 'math.h', 'no_such_header.h']
+  for i in range(checks):
+    kind = i % 4
+    if kind == 0:
+      lines.append(
+          'check_include_file({} HAVE_HEADER_{})'.format(headers[i % len(headers)], i)
+      )
+    elif kind == 1:
+      lines.append(
+          'check_cxx_source_compiles("int main() {{ return {}; }}" HAVE_SOURCE_{})'.format(i, i)
+      )
+    elif kind == 2:
+      lines.append('check_type_size("long long" SIZEOF_LONG_LONG_{})'.format(i))
+    else:
+      lines.append('check_function_exists(printf HAVE_FUNCTION_{})'.format(i))
+  lines.append('find_package(Threads)')
+  os.makedirs(project_dir)
+  with open(os.path.join(project_dir, 'CMakeLists.txt'), 'w') as f:
+    f.write('\n'.join(lines) + '\n')
+
+def configure(project_dir, toolchain, config, mode, environ):
+  """Generate time of a fresh build directory"""
+  cmd = [
+      sys.executable,
+      polly_py,
+      '--toolchain',
+      toolchain,
+      '--clear',
+      '--nobuild',
+      '--check-cache',
+      mode
+  ]
+  if config:
+    cmd += ['--config', config]
+  subprocess.check_call(
+      cmd,
+      cwd=project_dir,
+      env=environ,
+      stdout=subprocess.DEVNULL,
+      stderr=subprocess.DEVNULL
+  )
+  tag = toolchain + ('-{}'.format(config) if config else '')
+  timing = os.path.join(
+      project_dir, '_builds', tag, '_3rdParty', 'polly', 'timing.json'
+  )
+  with open(timing, 'r') as f:
+    jobs = json.load(f)['jobs']
+  return [x['seconds'] for x in jobs if x['name'] == 'Generate'][0]
+
+def main():
+  parser = argparse.ArgumentParser(description='check cache benchmark')
+  parser.add_argument('--project', help='Project to measure (copied)')
+  parser.add_argument(
+      '--checks',
+      type=int,
+      default=60,
+      help='Checks in the generated project (default: %(default)s)'
+  )
+  parser.add_argument(
+      '--toolchain', default='gcc', help='Toolchain (default: %(default)s)'
+  )
+  parser.add_argument('--config', help='polly.py --config')
+  parser.add_argument(
+      '--runs', type=int, default=3, help='Runs per mode (default: %(default)s)'
+  )
+  args = parser.parse_args()
+
+  work_dir = tempfile.mkdtemp(prefix='polly-check-cache-benchmark-')
+  try:
+    project_dir = os.path.join(work_dir, 'project')
+    if args.project:
+      shutil.copytree(
+          args.project,
+          project_dir,
+          symlinks=True,
+          ignore=shutil.ignore_patterns('_builds', '_install', '_logs', '.git')
+      )
+    else:
+      generate_project(project_dir, args.checks)
+
+    environ = dict(os.environ)
+    environ['POLLY_CACHE_DIR'] = os.path.join(work_dir, 'cache')
+
+    results = {}
+    for mode in ['off', 'on']:
+      print('Measure: --check-cache {}'.format(mode))
+      if mode == 'on':
+        # snapshot of the checks
+        configure(project_dir, args.toolchain, args.config, 'refresh', environ)
+      results[mode] = [
+          configure(project_dir, args.toolchain, args.config, mode, environ)
+          for i in range(args.runs)
+      ]
+  finally:
+    shutil.rmtree(work_dir)
+
+  print('-')
+  print('{:<16} {:>12} {:>10} {:>9}'.format('check cache', 'median (s)', 'min (s)', 'change'))
+  base = statistics.median(results['off'])
+  for mode in ['off', 'on']:
+    median = statistics.median(results[mode])
+    change = '' if mode == 'off' else '{:+.1f}%'.format((median - base) / base * 100)
+    print(
+        '{:<16} {:>12.2f} {:>10.2f} {:>9}'.format(
+            mode, median, min(results[mode]), change
+        )
+    )
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+# Modules imported by polly.py on the fast paths (`python -X importtime`):
+#
+#   > benchmarks/import_time.py
+#   > benchmarks/import_time.py --baseline HEAD~1 --top 5
+#
+# For every scenario the number of modules, the sum of the import times and
+# the slowest top-level imports are reported. Exit status is 1 if one of the
+# `forbidden` modules is imported by a fast path (e.g. someone adds an import
+# back to the top of polly.py), so the script can run in CI.
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+benchmarks_dir = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, benchmarks_dir)
+
+from startup import bin_dir, export_revision # noqa
+
+# Fast paths must not load the build machinery or the toolchain table
+forbidden = [
+    'subprocess',
+    'detail.call',
+    'detail.logging',
+    'detail.toolchain_table',
+    'detail.toolchain_index'
+]
+
+def scenarios(polly_bin):
+  polly_py = os.path.join(polly_bin, 'polly.py')
+  return [
+      ('polly.py --help', [polly_py, '--help'], True),
+      ('polly.py bad option', [polly_py, '--no-such-option'], True),
+      (
+          'polly.py conflicting options',
+          [polly_py, '--config', 'Debug', '--config-all', 'Release'],
+          True
+      ),
+      (
+          'polly.py --dry-run',
+          [polly_py, '--toolchain', 'gcc', '--dry-run'],
+          False
+      )
+  ]
+
+def import_times(cmd, cwd):
+  """{module: (self us, cumulative us, nesting level)}"""
+  output = subprocess.run(
+      [sys.executable, '-X', 'importtime'] + cmd,
+      cwd=cwd,
+      stdout=subprocess.DEVNULL,
+      stderr=subprocess.PIPE
+  ).stderr.decode('utf-8', errors='replace')
+  result = {}
+  for line in output.splitlines():
+    if not line.startswith('import time:'):
+      continue
+    fields = line[len('import time:'):].split('|')
+    try:
+      own = int(fields[0])
+      cumulative = int(fields[1])
+    except ValueError:
+      continue # header
+    name = fields[2].rstrip()
+    level = (len(name) - len(name.lstrip())) // 2
+    result[name.strip()] = (own, cumulative, level)
+  return result
+
+def main():
+  parser = argparse.ArgumentParser(description='polly import time benchmark')
+  parser.add_argument(
+      '--baseline', help='Compare with polly from this git revision'
+  )
+  parser.add_argument(
+      '--top',
+      type=int,
+      default=3,
+      help='Show N slowest top-level imports (default: %(default)s)'
+  )
+  args = parser.parse_args()
+
+  work_dir = tempfile.mkdtemp(prefix='polly-import-time-')
+  try:
+    project_dir = os.path.join(work_dir, 'project')
+    os.makedirs(project_dir)
+    with open(os.path.join(project_dir, 'CMakeLists.txt'), 'w') as f:
+      f.write('cmake_minimum_required(VERSION 3.5)\nproject(foo NONE)\n')
+
+    versions = [('current', bin_dir)]
+    if args.baseline:
+      versions.insert(
+          0, (args.baseline, export_revision(args.baseline, work_dir))
+      )
+
+    violations = []
+    print(
+        '{:<30} {:<12} {:>8} {:>10}'.format(
+            'scenario', 'version', 'modules', 'time (ms)'
+        )
+    )
+    for name, cmd, fast in scenarios(bin_dir):
+      for version, polly_bin in versions:
+        times = import_times(
+            [os.path.join(polly_bin, os.path.basename(cmd[0]))] + cmd[1:],
+            project_dir
+        )
+        total = sum(x[0] for x in times.values())
+        print(
+            '{:<30} {:<12} {:>8} {:>10.1f}'.format(
+                name, version[:12], len(times), total / 1000.0
+            )
+        )
+        top = sorted(
+            [x for x in times.items() if x[1][2] == 1],
+            key=lambda x: x[1][1],
+            reverse=True
+        )
+        for module, (own, cumulative, level) in top[:args.top]:
+          print('{:>34}{:<40} {:>8.1f}'.format('', module, cumulative / 1000.0))
+        if fast and version == 'current':
+          for module in forbidden:
+            if module in times:
+              violations.append((name, module))
+  finally:
+    shutil.rmtree(work_dir)
+
+  if violations:
+    print('-')
+    for name, module in violations:
+      print('FAILED: {} imports {}'.format(name, module))
+    sys.exit(1)
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+
+# Run N concurrent polly.py builds of a synthetic project with and without
+# the shared jobserver and report wall time and load:
+#
+#   > benchmarks/jobserver.py --builds 3 --jobs 4
+#
+# "independent": every build uses `--jobs J` (up to N*J compilers)
+# "jobserver": all builds share one pool with J tokens (`--jobserver`)
+#
+# Load is sampled from /proc/loadavg: the number of currently runnable tasks
+# (peak/mean) and the 1-minute load average (peak).
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+bin_dir = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), '..', 'bin'
+)
+sys.path.insert(0, bin_dir)
+
+import detail.jobserver
+
+polly_py = os.path.join(bin_dir, 'polly.py')
+
+def generate_project(project_dir, units, functions):
+  sources = []
+  for i in range(units):
+    name = 'unit{}.cpp'.format(i)
+    sources.append(name)
+    with open(os.path.join(project_dir, name), 'w') as f:
+      for j in range(functions):
+        f.write(
+            'double f{i}_{j}(double x) {{\n'
+            '  double r = x;\n'
+            '  for (int k = 0; k < {j} + 10; ++k) {{\n'
+            '    r = r * 1.0001 + k / (r + {j}.5);\n'
+            '  }}\n'
+            '  return r;\n'
+            '}}\n'.format(i=i, j=j)
+        )
+  with open(os.path.join(project_dir, 'CMakeLists.txt'), 'w') as f:
+    f.write('cmake_minimum_required(VERSION 3.2)\n')
+    f.write('project(jobserver_benchmark CXX)\n')
+    f.write('add_library(synthetic {})\n'.format(' '.join(sources)))
+
+class LoadSampler:
+  def __init__(self, interval=0.1):
+    self.interval = interval
+    self.running = []
+    self.loadavg = []
+    self.stop_event = threading.Event()
+    self.thread = threading.Thread(target=self.sample)
+    self.thread.daemon = True
+
+  def sample(self):
+    while not self.stop_event.is_set():
+      with open('/proc/loadavg', 'r') as f:
+        fields = f.read().split()
+      self.loadavg.append(float(fields[0]))
+      # exclude the sampler itself
+      self.running.append(int(fields[3].split('/')[0]) - 1)
+      time.sleep(self.interval)
+
+  def __enter__(self):
+    self.thread.start()
+    return self
+
+  def __exit__(self, *args):
+    self.stop_event.set()
+    self.thread.join()
+
+def polly_command(output_dir, jobs, use_jobserver):
+  cmd = [
+      sys.executable, polly_py,
+      '--toolchain', 'gcc',
+      '--config', 'Release',
+      '--output', output_dir,
+      '--verbosity-level', 'silent'
+  ]
+  if use_jobserver:
+    cmd.append('--jobserver')
+  else:
+    cmd += ['--jobs', str(jobs)]
+  return cmd
+
+def run_mode(project_dir, builds, jobs, use_jobserver):
+  outputs = []
+  for i in range(builds):
+    output_dir = os.path.join(project_dir, '_out{}'.format(i))
+    if os.path.exists(output_dir):
+      shutil.rmtree(output_dir)
+    os.makedirs(output_dir)
+    outputs.append(output_dir)
+    # configure outside of the measurement
+    subprocess.check_call(
+        polly_command(output_dir, jobs, False) + ['--nobuild'],
+        cwd=project_dir,
+        stdout=subprocess.DEVNULL
+    )
+
+  env = dict(os.environ)
+  jobserver = None
+  pass_fds = ()
+  if use_jobserver:
+    jobserver = detail.jobserver.create(jobs)
+    jobserver.export(env)
+    pass_fds = jobserver.pass_fds()
+
+  with LoadSampler() as sampler:
+    start = time.time()
+    processes = [
+        subprocess.Popen(
+            polly_command(x, jobs, use_jobserver),
+            cwd=project_dir,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            pass_fds=pass_fds
+        ) for x in outputs
+    ]
+    for p in processes:
+      if p.wait() != 0:
+        sys.exit('Build failed')
+    wall = time.time() - start
+
+  if jobserver:
+    jobserver.close()
+
+  return {
+      'wall': wall,
+      'running_peak': max(sampler.running),
+      'running_mean': sum(sampler.running) / len(sampler.running),
+      'loadavg_peak': max(sampler.loadavg)
+  }
+
+def main():
+  parser = argparse.ArgumentParser(description='polly jobserver benchmark')
+  parser.add_argument('--builds', type=int, default=3, help='Concurrent builds')
+  parser.add_argument(
+      '--jobs', type=int, default=os.cpu_count(), help='Jobs budget'
+  )
+  parser.add_argument('--units', type=int, default=24, help='Sources number')
+  parser.add_argument(
+      '--functions', type=int, default=400, help='Functions per source'
+  )
+  args = parser.parse_args()
+
+  if not os.path.exists('/proc/loadavg'):
+    sys.exit('/proc/loadavg is not available')
+
+  project_dir = tempfile.mkdtemp(prefix='polly-jobserver-benchmark-')
+  try:
+    generate_project(project_dir, args.units, args.functions)
+    results = []
+    for mode, use_jobserver in [('independent', False), ('jobserver', True)]:
+      print('Run mode: {}'.format(mode))
+      results.append(
+          (mode, run_mode(project_dir, args.builds, args.jobs, use_jobserver))
+      )
+  finally:
+    shutil.rmtree(project_dir)
+
+  print('-')
+  print(
+      '{} builds, --jobs {}, {} cores'.format(
+          args.builds, args.jobs, os.cpu_count()
+      )
+  )
+  print(
+      '{:<12} {:>10} {:>14} {:>14} {:>14}'.format(
+          'mode', 'wall (s)', 'running peak', 'running mean', 'loadavg peak'
+      )
+  )
+  for mode, r in results:
+    print(
+        '{:<12} {:>10.2f} {:>14} {:>14.2f} {:>14.2f}'.format(
+            mode,
+            r['wall'],
+            r['running_peak'],
+            r['running_mean'],
+            r['loadavg_peak']
+        )
+    )
+
+if __name__ == '__main__':
+  main()
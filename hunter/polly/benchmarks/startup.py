@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+# Startup time of polly.py and of the toolchain table lookup used by the
+# scripts importing it (e.g. configure.py of the projects), compared with
+# polly from another git revision:
+#
+#   > benchmarks/startup.py --baseline HEAD~1 --runs 30
+#
+# Every sample is a new Python process, the median and the minimum are
+# reported. `--dry-run` runs in a temporary project, so it includes the
+# `which cmake` and `cmake --version` calls made before it exits.
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+bin_dir = os.path.realpath(
+    os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'bin')
+)
+
+lookup = r"""
+import sys
+sys.path.insert(0, sys.argv[1])
+from detail.toolchain_table import get_by_name
+get_by_name(sys.argv[2])
+"""
+
+def export_revision(revision, work_dir):
+  """bin directory of polly at git `revision`"""
+  prefix = subprocess.check_output(
+      ['git', 'rev-parse', '--show-prefix'], cwd=bin_dir
+  ).decode().strip()
+  top = subprocess.check_output(
+      ['git', 'rev-parse', '--show-toplevel'], cwd=bin_dir
+  ).decode().strip()
+  archive = os.path.join(work_dir, 'baseline.tar')
+  subprocess.check_call(
+      ['git', 'archive', '-o', archive, revision, prefix], cwd=top
+  )
+  with tarfile.open(archive) as tar:
+    tar.extractall(os.path.join(work_dir, 'baseline'))
+  result = os.path.join(work_dir, 'baseline', prefix)
+  # bytecode as in the working tree (PYTHONDONTWRITEBYTECODE may be set)
+  subprocess.check_call([sys.executable, '-m', 'compileall', '-q', result])
+  return result
+
+def measure(cmd, cwd, runs):
+  samples = []
+  for i in range(runs):
+    start = time.perf_counter()
+    subprocess.call(
+        cmd, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    samples.append(time.perf_counter() - start)
+  return statistics.median(samples), min(samples)
+
+def scenarios(polly_bin, project_dir, toolchain):
+  polly_py = os.path.join(polly_bin, 'polly.py')
+  return [
+      (
+          'toolchain lookup',
+          [sys.executable, '-c', lookup, polly_bin, toolchain]
+      ),
+      ('polly.py --help', [sys.executable, polly_py, '--help']),
+      (
+          'polly.py --dry-run',
+          [sys.executable, polly_py, '--toolchain', toolchain, '--dry-run']
+      ),
+      (
+          'polly.py bad option',
+          [sys.executable, polly_py, '--toolchain', toolchain, '--no-such']
+      )
+  ]
+
+def main():
+  parser = argparse.ArgumentParser(description='polly startup benchmark')
+  parser.add_argument(
+      '--baseline', help='Compare with polly from this git revision'
+  )
+  parser.add_argument(
+      '--runs', type=int, default=20, help='Samples per scenario'
+  )
+  parser.add_argument(
+      '--toolchain', default='gcc', help='Toolchain (default: %(default)s)'
+  )
+  args = parser.parse_args()
+
+  work_dir = tempfile.mkdtemp(prefix='polly-startup-benchmark-')
+  try:
+    project_dir = os.path.join(work_dir, 'project')
+    os.makedirs(project_dir)
+    with open(os.path.join(project_dir, 'CMakeLists.txt'), 'w') as f:
+      f.write('cmake_minimum_required(VERSION 3.5)\nproject(foo NONE)\n')
+
+    versions = [('current', bin_dir)]
+    if args.baseline:
+      versions.insert(
+          0, (args.baseline, export_revision(args.baseline, work_dir))
+      )
+
+    results = {}
+    for version, polly_bin in versions:
+      print('Measure: {}'.format(version))
+      for name, cmd in scenarios(polly_bin, project_dir, args.toolchain):
+        results[(version, name)] = measure(cmd, project_dir, args.runs)
+  finally:
+    shutil.rmtree(work_dir)
+
+  print('-')
+  print(
+      '{:<22} {:<12} {:>12} {:>10} {:>9}'.format(
+          'scenario', 'version', 'median (ms)', 'min (ms)', 'change'
+      )
+  )
+  for name, cmd in scenarios(bin_dir, '', args.toolchain):
+    base = None
+    for version, polly_bin in versions:
+      median, minimum = results[(version, name)]
+      change = ''
+      if base:
+        change = '{:+.1f}%'.format((median - base) / base * 100)
+      print(
+          '{:<22} {:<12} {:>12.1f} {:>10.1f} {:>9}'.format(
+              name, version[:12], median * 1000, minimum * 1000, change
+          )
+      )
+      base = base or median
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+# Compare the output handling of `detail.call`: one tee thread per pipe
+# (`tee`, readline per line) against the single-thread selector multiplexer
+# (`multiplex`, chunked reads and batched writes) on synthetic output that
+# looks like a verbose Makefile build:
+#
+#   > benchmarks/tee_throughput.py --size 1024
+#
+# Both modes must write the same log lines (stdout and stderr lines may
+# interleave differently, so lines are compared as a multiset); the console
+# is /dev/null.
+
+import argparse
+import hashlib
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+bin_dir = os.path.join(
+    os.path.dirname(os.path.realpath(__file__)), '..', 'bin'
+)
+sys.path.insert(0, bin_dir)
+
+import detail.call
+import detail.logging
+
+# Child: write `size` MiB of compiler-like lines, every 10th line to stderr
+generator = r"""
+import os
+import sys
+
+size = int(sys.argv[1]) * 1024 * 1024
+out_lines = []
+err_lines = []
+for i in range(4000):
+  line = (
+      '/usr/bin/c++ -DFOO_EXPORTS -I/src/include -I/build/include\t-O2 -g'
+      ' -std=c++14 -fPIC -o CMakeFiles/foo.dir/src/file{0}.cpp.o'
+      ' -c /src/src/file{0}.cpp  \r\n'.format(i)
+  ).encode('utf-8')
+  if i % 10 == 0:
+    err_lines.append(b'/src/src/file' + str(i).encode() + b'.cpp:1: warning: unused\n')
+  else:
+    out_lines.append(line)
+out_block = b''.join(out_lines)
+err_block = b''.join(err_lines)
+written = 0
+while written < size:
+  os.write(1, out_block)
+  os.write(2, err_block)
+  written += len(out_block) + len(err_block)
+"""
+
+def run_mode(mode, size, work_dir, discard):
+  cdir = os.path.join(work_dir, mode)
+  os.makedirs(cdir)
+  logging = detail.logging.Logging(cdir, 'normal', discard, None, 'benchmark')
+  console = open(os.devnull, 'w')
+
+  usage_start = resource.getrusage(resource.RUSAGE_SELF)
+  start = time.time()
+  p = subprocess.Popen(
+      [sys.executable, '-c', generator, str(size)],
+      stdout=subprocess.PIPE,
+      stderr=subprocess.PIPE,
+      bufsize=0
+  )
+  if mode == 'threads':
+    threads = [
+        detail.call.tee(p.stdout, discard, logging, console),
+        detail.call.tee(p.stderr, discard, logging, console)
+    ]
+    for t in threads:
+      t.join()
+  else:
+    detail.call.multiplex(
+        [
+            detail.call.Stream(p.stdout, discard, logging, console),
+            detail.call.Stream(p.stderr, discard, logging, console)
+        ]
+    )
+  if p.wait() != 0:
+    sys.exit('Generator failed')
+  wall = time.time() - start
+  usage_end = resource.getrusage(resource.RUSAGE_SELF)
+  logging.log_file.close()
+  console.close()
+
+  # order-independent digest of the lines
+  digest = 0
+  with open(logging.log_path, 'rb') as f:
+    for line in f:
+      value = hashlib.md5(line).digest()[:8]
+      digest = (digest + int.from_bytes(value, 'little')) % (1 << 64)
+  cpu = (usage_end.ru_utime - usage_start.ru_utime) + (
+      usage_end.ru_stime - usage_start.ru_stime
+  )
+  return {
+      'wall': wall,
+      'cpu': cpu,
+      'log_size': os.path.getsize(logging.log_path),
+      'log_digest': digest
+  }
+
+def main():
+  parser = argparse.ArgumentParser(description='polly output tee benchmark')
+  parser.add_argument(
+      '--size', type=int, default=1024, help='Output size in MiB'
+  )
+  parser.add_argument(
+      '--discard', type=int, help='Print every N-th line (polly --discard)'
+  )
+  args = parser.parse_args()
+
+  work_dir = tempfile.mkdtemp(prefix='polly-tee-benchmark-')
+  try:
+    results = []
+    for mode in ['threads', 'multiplex']:
+      print('Run mode: {}'.format(mode))
+      results.append((mode, run_mode(mode, args.size, work_dir, args.discard)))
+  finally:
+    shutil.rmtree(work_dir)
+
+  print('-')
+  print('{} MiB of output'.format(args.size))
+  print(
+      '{:<10} {:>10} {:>14} {:>12} {:>10}'.format(
+          'mode', 'wall (s)', 'polly cpu (s)', 'MiB/s', 'log MiB'
+      )
+  )
+  for mode, r in results:
+    print(
+        '{:<10} {:>10.2f} {:>14.2f} {:>12.1f} {:>10.1f}'.format(
+            mode,
+            r['wall'],
+            r['cpu'],
+            args.size / r['wall'],
+            r['log_size'] / (1024 * 1024)
+        )
+    )
+  if len(set(r['log_digest'] for mode, r in results)) != 1:
+    sys.exit('Logs differ!')
+  print('Log lines are identical')
+
+if __name__ == '__main__':
+  main()
@@ -5,5 +5,6 @@
 
 # Note: build.py has been renamed to polly.py.
 
-from os.path import abspath, dirname, join
-exec(open(join(dirname(abspath(__file__)), 'polly.py'), 'r').read())
+import polly
+
+polly.main()
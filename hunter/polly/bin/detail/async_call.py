@@ -0,0 +1,278 @@
+# asyncio counterpart of `detail.call`: run several commands at once on one
+# event loop and return structured results instead of exiting on failure.
+#
+#   results = detail.async_call.run_all(
+#       [
+#           detail.async_call.Command(test_command, prefix='test'),
+#           detail.async_call.Command(pack_command, prefix='pack')
+#       ],
+#       logging,
+#       cancel_on_failure=True
+#   )
+#
+# Output of every command goes through `detail.call.Stream` (same cleanup and
+# filters as the blocking version) to the shared log and console, every line
+# prefixed with '[prefix] '. Children are waited with wait4() in executor
+# threads (asyncio child watchers would reap them before the resources are
+# read) and take jobserver slots like `detail.call.teed_call`. Every child
+# runs in its own process group, cancelling terminates the whole group (e.g.
+# the tests started by ctest).
+#
+# Requires Python 3.5+, imported by polly.py only for --concurrent-pack.
+
+import asyncio
+import concurrent.futures
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import detail.call
+import detail.jobserver
+import detail.rusage
+
+class Command:
+  def __init__(self, cmd_args, prefix=None, cwd=None, on_line=None):
+    self.cmd_args = cmd_args
+    self.prefix = prefix
+    self.cwd = cwd
+    self.on_line = on_line
+
+class Result:
+  def __init__(self, command):
+    self.command = command
+    self.exit_code = None
+    self.cancelled = False
+    self.start = None
+    self.duration = None
+    self.rusage = None # cpu_user, cpu_system, peak_rss of the child
+    # Bytes of the log written while the command was running (lines of
+    # other commands running at the same time can be in between)
+    self.log_start = None
+    self.log_end = None
+
+  @property
+  def ok(self):
+    return self.exit_code == 0 and not self.cancelled
+
+  def __repr__(self):
+    return 'Result({}, exit_code={}, cancelled={}, duration={})'.format(
+        self.command.cmd_args, self.exit_code, self.cancelled, self.duration
+    )
+
+def terminate(p):
+  """Terminate the process group of `p`"""
+  if os.name == 'nt':
+    subprocess.call(
+        ['taskkill', '/F', '/T', '/PID', str(p.pid)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    return
+  try:
+    os.killpg(p.pid, signal.SIGTERM)
+  except ProcessLookupError:
+    pass
+
+def header(command, logging):
+  prefix = '[{}] '.format(command.prefix) if command.prefix else ''
+  oneline = ''
+  for i in command.cmd_args:
+    oneline += ' "{}"'.format(i)
+  oneline = '{}[{}]>{}\n'.format(prefix, command.cwd or os.getcwd(), oneline)
+  if logging.verbosity != 'silent':
+    print(oneline)
+  logging.write(oneline)
+
+async def read_pipe(loop, pipe, stream, executor):
+  """Feed `stream` from `pipe` until EOF"""
+  fd = pipe.fileno()
+  if os.name == 'nt':
+    # Proactor event loop can't watch pipes opened by subprocess.Popen
+    while True:
+      data = await loop.run_in_executor(executor, os.read, fd, 1 << 16)
+      if not data:
+        break
+      stream.feed(data)
+    stream.close()
+    return
+
+  eof = loop.create_future()
+  def on_readable():
+    try:
+      data = os.read(fd, 1 << 18)
+    except InterruptedError:
+      return
+    if data:
+      stream.feed(data)
+      return
+    loop.remove_reader(fd)
+    if not eof.done():
+      eof.set_result(None)
+  loop.add_reader(fd, on_readable)
+  try:
+    await eof
+  finally:
+    loop.remove_reader(fd)
+    stream.close()
+
+async def run(command, logging, executor=None):
+  """Run `command`, return `Result` (never exits on failure)"""
+  loop = asyncio.get_event_loop()
+  result = Result(command)
+  prefix = '[{}] '.format(command.prefix) if command.prefix else None
+
+  # Child runs in the job slot taken from the shared jobserver pool (if any)
+  acquiring = loop.run_in_executor(executor, detail.jobserver.acquire)
+  try:
+    await asyncio.shield(acquiring)
+  except asyncio.CancelledError:
+    # blocking read can't be interrupted, give the token back once it's read
+    await asyncio.shield(acquiring)
+    detail.jobserver.release()
+    raise
+  try:
+    header(command, logging)
+    result.log_start = logging.offset
+    result.start = time.time()
+    if os.name == 'nt':
+      group = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+      group = {'start_new_session': True}
+    try:
+      p = subprocess.Popen(
+          command.cmd_args,
+          stdout=subprocess.PIPE,
+          stderr=subprocess.PIPE,
+          env=os.environ,
+          cwd=command.cwd,
+          bufsize=0,
+          pass_fds=detail.jobserver.pass_fds(),
+          **group
+      )
+    except OSError as exc:
+      logging.write('{}{}\n'.format(prefix or '', exc))
+      result.exit_code = 127
+      result.duration = time.time() - result.start
+      return result
+
+    silent = (logging.verbosity == 'silent')
+    streams = [
+        (p.stdout, None if silent else sys.stdout),
+        (p.stderr, None if silent else sys.stderr)
+    ]
+    readers = [
+        read_pipe(
+            loop,
+            pipe,
+            detail.call.Stream(
+                None, logging.discard, logging, console, command.on_line, prefix
+            ),
+            executor
+        )
+        for pipe, console in streams
+    ]
+    waiter = loop.run_in_executor(executor, detail.rusage.wait_rusage, p)
+    try:
+      await asyncio.gather(*readers)
+      result.exit_code, result.rusage = await asyncio.shield(waiter)
+    except asyncio.CancelledError:
+      result.cancelled = True
+      if p.poll() is None:
+        terminate(p)
+      result.exit_code, result.rusage = await waiter
+    finally:
+      # `detail.call.Stream` was created without `infile`, close the pipes here
+      p.stdout.close()
+      p.stderr.close()
+    result.duration = time.time() - result.start
+    result.log_end = logging.offset
+    logging.add_segment(
+        command.cmd_args,
+        command.cwd or os.getcwd(),
+        result.log_start,
+        result.exit_code,
+        result.start,
+        result.duration,
+        interleaved=True
+    )
+  finally:
+    detail.jobserver.release()
+
+  if result.cancelled:
+    logging.write('{}Cancelled\n'.format(prefix or ''))
+  return result
+
+async def gather(commands, logging, cancel_on_failure=False, executor=None):
+  """Run all `commands` at once, return results in the same order.
+  If `cancel_on_failure` the others are terminated after the first failure."""
+  loop = asyncio.get_event_loop()
+  own_executor = None
+  if executor is None:
+    # one thread per blocking wait4/jobserver read (and per pipe read on
+    # Windows: 3 threads per command)
+    own_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=3 * len(commands) + 2
+    )
+    executor = own_executor
+  try:
+    tasks = [
+        loop.create_task(run(x, logging, executor)) for x in commands
+    ]
+    pending = set(tasks)
+    try:
+      while pending:
+        done, pending = await asyncio.wait(
+            pending, return_when=asyncio.FIRST_COMPLETED
+        )
+        failed = [x for x in done if not x.result().ok]
+        if failed and cancel_on_failure:
+          for x in pending:
+            x.cancel()
+          await asyncio.wait(pending)
+          pending = set()
+    except asyncio.CancelledError:
+      for x in pending:
+        x.cancel()
+      if pending:
+        await asyncio.wait(pending)
+      raise
+    results = []
+    for command, task in zip(commands, tasks):
+      if task.cancelled():
+        # cancelled before the child was started
+        result = Result(command)
+        result.cancelled = True
+        results.append(result)
+      else:
+        results.append(task.result())
+    return results
+  finally:
+    if own_executor:
+      own_executor.shutdown(wait=True)
+
+def run_all(commands, logging, cancel_on_failure=False):
+  """Blocking wrapper of `gather` for the synchronous code"""
+  loop = asyncio.new_event_loop()
+  main = loop.create_task(gather(commands, logging, cancel_on_failure))
+  try:
+    return loop.run_until_complete(main)
+  except KeyboardInterrupt:
+    # children don't get SIGINT of the terminal (own process groups)
+    main.cancel()
+    try:
+      loop.run_until_complete(main)
+    except asyncio.CancelledError:
+      pass
+    raise
+  finally:
+    loop.close()
+
+def exit_on_failure(results, logging):
+  """Exit like `detail.call.call` if one of the commands failed"""
+  for x in results:
+    if not x.cancelled and x.exit_code != 0:
+      detail.call.failed(
+          x.exit_code, x.command.cmd_args, logging, x.command.cwd
+      )
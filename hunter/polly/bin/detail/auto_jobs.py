@@ -0,0 +1,299 @@
+# `--jobs auto`: number of build jobs from the CPUs and the memory available
+# to polly (CPU affinity, cgroup v1/v2 CPU quota and memory limit,
+# MemAvailable) and a per-job memory estimate.
+#
+# During the build `Throttle` watches memory pressure (PSI, MemAvailable) and
+# withholds jobserver tokens so make starts fewer compilers instead of
+# letting the OOM killer stop them.
+
+import math
+import os
+import select
+import threading
+
+mebibyte = 1024 * 1024
+gibibyte = 1024 * mebibyte
+
+# Memory PSI 'some avg10' (percent of time some tasks stalled on memory)
+pressure_high = 10.0
+pressure_low = 1.0
+
+def read_file(path):
+  try:
+    with open(path, 'r') as f:
+      return f.read().strip()
+  except OSError:
+    return None
+
+def format_size(size):
+  return '{:.1f} GiB'.format(size / gibibyte)
+
+def cgroup_mounts():
+  """List of (version, options, root, mount point) of cgroup mounts"""
+  content = read_file('/proc/self/mountinfo')
+  result = []
+  if not content:
+    return result
+  for line in content.splitlines():
+    left, sep, right = line.partition(' - ')
+    fields = left.split()
+    right_fields = right.split()
+    if len(fields) < 5 or len(right_fields) < 3:
+      continue
+    if right_fields[0] == 'cgroup2':
+      result.append((2, [], fields[3], fields[4]))
+    elif right_fields[0] == 'cgroup':
+      result.append((1, right_fields[2].split(','), fields[3], fields[4]))
+  return result
+
+def cgroup_dirs(controller):
+  """Cgroup version and directories of this process for `controller`
+  (from the leaf up to the mount point)"""
+  content = read_file('/proc/self/cgroup')
+  if not content:
+    return None, []
+  mounts = cgroup_mounts()
+  candidates = []
+  for line in content.splitlines():
+    hierarchy, controllers, path = line.split(':', 2)
+    for version, options, root, mount_point in mounts:
+      if hierarchy == '0' and controllers == '':
+        if version != 2:
+          continue
+      elif version != 1 or controller not in controllers.split(','):
+        continue
+      elif controller not in options:
+        continue
+      relative = path
+      if root != '/' and relative.startswith(root):
+        relative = relative[len(root):]
+      directory = os.path.normpath(mount_point + '/' + relative)
+      if not os.path.isdir(directory):
+        directory = mount_point
+      dirs = [directory]
+      while directory != mount_point and directory.startswith(mount_point):
+        directory = os.path.dirname(directory)
+        dirs.append(directory)
+      candidates.append((version, dirs))
+  # Hybrid hierarchy: controllers are attached to v1
+  candidates.sort(key=lambda x: x[0])
+  if not candidates:
+    return None, []
+  return candidates[0]
+
+def cpu_quota():
+  """CPU limit of the cgroup (e.g. 2.5) or None"""
+  version, dirs = cgroup_dirs('cpu')
+  limits = []
+  for directory in dirs:
+    if version == 2:
+      content = read_file(os.path.join(directory, 'cpu.max'))
+      if not content:
+        continue
+      quota, period = content.split()
+    else:
+      quota = read_file(os.path.join(directory, 'cpu.cfs_quota_us'))
+      period = read_file(os.path.join(directory, 'cpu.cfs_period_us'))
+      if not quota or not period:
+        continue
+    if quota == 'max' or int(quota) <= 0:
+      continue
+    limits.append(int(quota) / int(period))
+  if not limits:
+    return None
+  return min(limits)
+
+def inactive_file(directory, version):
+  """Reclaimable page cache charged to the cgroup"""
+  content = read_file(os.path.join(directory, 'memory.stat'))
+  if not content:
+    return 0
+  name = 'inactive_file' if version == 2 else 'total_inactive_file'
+  for line in content.splitlines():
+    fields = line.split()
+    if len(fields) == 2 and fields[0] == name:
+      return int(fields[1])
+  return 0
+
+def cgroup_memory_available(version, dirs):
+  """Memory left before hitting the cgroup limit or None"""
+  available = []
+  for directory in dirs:
+    if version == 2:
+      limit = read_file(os.path.join(directory, 'memory.max'))
+      usage = read_file(os.path.join(directory, 'memory.current'))
+    else:
+      limit = read_file(os.path.join(directory, 'memory.limit_in_bytes'))
+      usage = read_file(os.path.join(directory, 'memory.usage_in_bytes'))
+    if not limit or not usage or limit == 'max':
+      continue
+    if int(limit) >= 2 ** 60:
+      continue # v1 "unlimited"
+    usage = int(usage) - inactive_file(directory, version)
+    available.append(max(0, int(limit) - usage))
+  if not available:
+    return None
+  return min(available)
+
+def mem_available():
+  """MemAvailable from /proc/meminfo or None"""
+  content = read_file('/proc/meminfo')
+  if not content:
+    return None
+  for line in content.splitlines():
+    if line.startswith('MemAvailable:'):
+      return int(line.split()[1]) * 1024
+  return None
+
+def memory_available(version, dirs):
+  """Available memory, description"""
+  system = mem_available()
+  cgroup = cgroup_memory_available(version, dirs)
+  values = [x for x in [system, cgroup] if x is not None]
+  if not values:
+    return None, 'unknown'
+  description = []
+  if system is not None:
+    description.append('MemAvailable {}'.format(format_size(system)))
+  if cgroup is not None:
+    description.append('cgroup v{} {}'.format(version, format_size(cgroup)))
+  return min(values), ', '.join(description)
+
+def memory_pressure(version, dirs):
+  """Memory PSI 'some avg10' of the cgroup (v2) or system, None if missing"""
+  paths = []
+  if version == 2 and dirs:
+    paths.append(os.path.join(dirs[0], 'memory.pressure'))
+  paths.append('/proc/pressure/memory')
+  for path in paths:
+    content = read_file(path)
+    if not content:
+      continue
+    for line in content.splitlines():
+      fields = line.split()
+      if fields and fields[0] == 'some':
+        for x in fields[1:]:
+          if x.startswith('avg10='):
+            return float(x[len('avg10='):])
+  return None
+
+def get(job_memory):
+  """Number of jobs and the reason"""
+  online = os.cpu_count() or 1
+  if hasattr(os, 'sched_getaffinity'):
+    affinity = len(os.sched_getaffinity(0))
+  else:
+    affinity = online
+  quota = cpu_quota()
+  cpu_jobs = affinity
+  cpu_reason = 'CPU affinity'
+  if quota is not None and math.ceil(quota) < cpu_jobs:
+    cpu_jobs = max(1, math.ceil(quota))
+    cpu_reason = 'cgroup CPU quota'
+
+  description = ['CPUs: {} online, {} in affinity mask, cgroup quota {}'.format(
+      online, affinity, 'none' if quota is None else '{:.2f}'.format(quota)
+  )]
+
+  version, dirs = cgroup_dirs('memory')
+  available, memory_description = memory_available(version, dirs)
+  description.append('memory: {} ({})'.format(
+      'unknown' if available is None else format_size(available),
+      memory_description
+  ))
+
+  jobs = cpu_jobs
+  reason = cpu_reason
+  if available is not None:
+    memory_jobs = max(1, available // job_memory)
+    description.append(
+        '{} per job -> {} jobs'.format(format_size(job_memory), memory_jobs)
+    )
+    if memory_jobs < jobs:
+      jobs = memory_jobs
+      reason = 'available memory'
+
+  return jobs, '{} (limited by {}); {}'.format(
+      jobs, reason, '; '.join(description)
+  )
+
+class Throttle:
+  """Withhold tokens of the owned jobserver pool under memory pressure"""
+  def __init__(self, jobserver, job_memory, logging, interval=1.0):
+    self.jobserver = jobserver
+    self.job_memory = job_memory
+    self.logging = logging
+    self.interval = interval
+    self.version, self.dirs = cgroup_dirs('memory')
+    # polly's own child keeps one token, so make can always run one job
+    self.limit = jobserver.jobs
+    self.withheld = []
+    self.relaxed_samples = 0
+    self.stopped = threading.Event()
+    self.thread = threading.Thread(target=self.watch)
+    self.thread.daemon = True
+
+  def message(self, text):
+    self.logging.write('Jobs throttle: {}\n'.format(text))
+
+  def take_token(self):
+    # Tokens in use are returned when a job is done: limit applies to the
+    # next started jobs, running jobs are not affected
+    while not self.stopped.is_set():
+      ready, _, _ = select.select([self.jobserver.read_fd], [], [], self.interval)
+      if not ready:
+        continue
+      try:
+        token = os.read(self.jobserver.read_fd, 1)
+      except InterruptedError:
+        continue
+      if token:
+        self.withheld.append(token)
+        return True
+    return False
+
+  def give_token(self):
+    os.write(self.jobserver.write_fd, self.withheld.pop())
+
+  def sample(self):
+    available, description = memory_available(self.version, self.dirs)
+    pressure = memory_pressure(self.version, self.dirs)
+    state = 'PSI some avg10 {}, {}'.format(
+        '-' if pressure is None else '{:.2f}'.format(pressure), description
+    )
+    low_memory = available is not None and available < self.job_memory
+    if low_memory or (pressure is not None and pressure > pressure_high):
+      self.relaxed_samples = 0
+      if self.limit > 1 and self.take_token():
+        self.limit -= 1
+        self.message('memory pressure ({}), limit {} jobs'.format(state, self.limit))
+      return
+
+    enough_memory = available is None or available > 2 * self.job_memory
+    if enough_memory and (pressure is None or pressure < pressure_low):
+      self.relaxed_samples += 1
+    else:
+      self.relaxed_samples = 0
+    if self.withheld and self.relaxed_samples >= 5:
+      self.relaxed_samples = 0
+      self.give_token()
+      self.limit += 1
+      self.message('pressure gone ({}), limit {} jobs'.format(state, self.limit))
+
+  def watch(self):
+    while not self.stopped.wait(self.interval):
+      self.sample()
+
+  def start(self):
+    self.message(
+        'watching memory pressure, {} jobs, {} per job'.format(
+            self.limit, format_size(self.job_memory)
+        )
+    )
+    self.thread.start()
+
+  def stop(self):
+    self.stopped.set()
+    self.thread.join()
+    while self.withheld:
+      self.give_token()
@@ -0,0 +1,444 @@
+# Snapshot of a configured build directory for the workers starting with an
+# empty tree (CI): polly.py --snapshot-build-dir / --restore-build-dir.
+#
+# Store (--snapshot-store, default 'build-snapshots' in the user cache
+# directory, see `detail.user_cache`) is content-addressed:
+# * objects/<sha256[:2]>/<sha256>: gzip-compressed file content, shared by
+#   all the snapshots
+# * manifests/<key>.json.gz: files of one snapshot, key is the hash of the
+#   toolchain files, arguments, environment (inputs of `detail.fingerprint`)
+#   and of the CMake files of the project, with the absolute paths of the
+#   project and polly replaced, so the snapshot can be restored in another
+#   directory
+#
+# Snapshot has CMakeCache.txt, the generated build files, _3rdParty (Hunter,
+# polly) and the Hunter install root of the build (if outside of the build
+# directory). Object files, libraries and target artifacts only with
+# --snapshot-objects.
+#
+# Restore unpacks the files in parallel with their original mtimes, replaces
+# the old paths in the text files and sets the mtimes of the unchanged
+# source files back to the snapshot time, so make/ninja rebuild only what is
+# changed since the snapshot. Configure is skipped if it was up to date when
+# the snapshot was taken (fingerprint is rewritten for the new paths).
+
+import concurrent.futures
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+
+import detail.check_cache
+import detail.fingerprint
+import detail.query_index
+import detail.user_cache
+
+version = 1
+
+# Not part of the source tree
+skip_dirs = [
+    '.git',
+    '.hg',
+    '.svn',
+    '_archives',
+    '_builds',
+    '_framework',
+    '_install',
+    '_logs',
+    '_trash',
+]
+
+object_extensions = [
+    '.a',
+    '.dll',
+    '.dylib',
+    '.exe',
+    '.gch',
+    '.ilk',
+    '.lib',
+    '.o',
+    '.obj',
+    '.pch',
+    '.pdb',
+    '.so',
+]
+
+# Bigger files are not checked for the paths to replace
+rewrite_limit = 16 * 1024 * 1024
+
+chunk_size = 1 << 20
+
+def default_store():
+  return detail.user_cache.path('build-snapshots')
+
+def is_cmake_file(name):
+  return name == 'CMakeLists.txt' or name.endswith('.cmake') or name.endswith('.cmake.in')
+
+def walk(root, skip=()):
+  """Relative paths of the files under `root` (no symlinks followed)"""
+  result = []
+  for directory, dirs, files in os.walk(root):
+    dirs[:] = sorted(
+        x for x in dirs
+        if x not in skip_dirs and os.path.join(directory, x) not in skip
+    )
+    for name in files:
+      path = os.path.join(directory, name)
+      if not os.path.islink(path):
+        result.append(os.path.relpath(path, root))
+  return sorted(result)
+
+def file_hash(path):
+  h = hashlib.sha256()
+  with open(path, 'rb') as f:
+    for data in iter(lambda: f.read(chunk_size), b''):
+      h.update(data)
+  return h.hexdigest()
+
+def parallel(function, items):
+  with concurrent.futures.ThreadPoolExecutor() as pool:
+    return list(pool.map(function, items))
+
+class Paths:
+  """Absolute paths of a run, replaced when the snapshot is relocated"""
+  def __init__(self, build_dir, project_dir, output_dir, polly_root):
+    self.roots = [
+        ('build', os.path.abspath(build_dir)),
+        ('project', os.path.abspath(project_dir)),
+        ('output', os.path.abspath(output_dir)),
+        ('polly', os.path.abspath(polly_root)),
+    ]
+
+  def get(self, name):
+    return dict(self.roots)[name]
+
+  def placeholders(self, value):
+    """`value` with the paths replaced by '<name>' (longest path first)"""
+    for name, path in sorted(self.roots, key=lambda x: -len(x[1])):
+      value = value.replace(path, '<{}>'.format(name))
+    return value
+
+  def replacements(self, old_roots):
+    """Regex and map old path -> new path (None if nothing to replace)"""
+    mapping = {}
+    for name, path in self.roots:
+      old = old_roots.get(name)
+      if old and old != path:
+        mapping[old.encode('utf-8')] = path.encode('utf-8')
+    if not mapping:
+      return None
+    regex = re.compile(
+        b'|'.join(re.escape(x) for x in sorted(mapping, key=len, reverse=True))
+    )
+    return regex, mapping
+
+def key(tag, arguments, toolchain_path, cache_path, environ, paths):
+  """Key of the snapshot, the same for a relocated project"""
+  h = hashlib.sha256()
+  def add(kind, value):
+    value = paths.placeholders('{}'.format(value))
+    h.update('{}={}\n'.format(kind, value).encode('utf-8'))
+
+  add('version', version)
+  add('tag', tag)
+  for x in arguments:
+    add('arg', x)
+  files, used_variables = detail.fingerprint.toolchain_files(
+      toolchain_path, environ
+  )
+  for path in sorted(files):
+    add('file', '{} {}'.format(path, files[path]))
+  if cache_path:
+    add('cache', file_hash(cache_path))
+  variables = set(detail.fingerprint.common_environment) | used_variables
+  for name in sorted(variables):
+    add('env', '{} {}'.format(name, environ.get(name)))
+  project_dir = paths.get('project')
+  skip = [paths.get('output'), paths.get('build')]
+  for x in walk(project_dir, skip):
+    if is_cmake_file(os.path.basename(x)):
+      add('project', '{} {}'.format(x, file_hash(os.path.join(project_dir, x))))
+  return h.hexdigest()
+
+def binary_id(path):
+  """Path and size of the compiler/cmake (mtime differs between workers)"""
+  file_id = detail.check_cache.file_id(path)
+  return file_id[:2] if file_id else None
+
+def tool_ids(build_dir):
+  result = []
+  try:
+    entries = detail.check_cache.read_cmake_cache(
+        os.path.join(build_dir, 'CMakeCache.txt')
+    )
+  except (OSError, IOError):
+    return result
+  for name, kind, value, doc in entries:
+    if name == 'CMAKE_COMMAND' or detail.check_cache.compiler_regex.match(name):
+      if value and binary_id(value):
+        result.append(binary_id(value))
+  return result
+
+def hunter_root(build_dir):
+  """Hunter directory with the packages of this build (or None)"""
+  try:
+    with open(os.path.join(build_dir, '_3rdParty', 'Hunter', 'install-root-dir'), 'r') as f:
+      install_dir = f.read().strip()
+  except (OSError, IOError):
+    return None
+  if not os.path.isdir(install_dir):
+    return None
+  if os.path.basename(install_dir) == 'Install':
+    # with the stamps of the installed packages
+    return os.path.dirname(install_dir)
+  return install_dir
+
+class Store:
+  def __init__(self, directory):
+    self.directory = directory
+
+  def object_path(self, sha):
+    return os.path.join(self.directory, 'objects', sha[:2], sha)
+
+  def manifest_path(self, snapshot_key):
+    return os.path.join(self.directory, 'manifests', '{}.json.gz'.format(snapshot_key))
+
+  def temp_file(self, path):
+    directory = os.path.dirname(path)
+    if not os.path.exists(directory):
+      os.makedirs(directory, exist_ok=True)
+    return tempfile.mkstemp(dir=directory, prefix='.tmp.')
+
+  def add(self, path, needles):
+    """Add content of the file: (sha256, size, has one of `needles`)"""
+    size = os.path.getsize(path)
+    if size <= rewrite_limit:
+      with open(path, 'rb') as f:
+        data = f.read()
+      sha = hashlib.sha256(data).hexdigest()
+    else:
+      data = None
+      sha = file_hash(path)
+    destination = self.object_path(sha)
+    if not os.path.exists(destination):
+      fd, temp = self.temp_file(destination)
+      with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=3, mtime=0) as f:
+        if data is None:
+          with open(path, 'rb') as source:
+            shutil.copyfileobj(source, f, chunk_size)
+        else:
+          f.write(data)
+      os.replace(temp, destination)
+    text = data is not None and b'\0' not in data
+    return sha, size, text and any(x in data for x in needles)
+
+  def extract(self, sha, path, replacements):
+    with gzip.open(self.object_path(sha), 'rb') as f:
+      if replacements:
+        regex, mapping = replacements
+        data = regex.sub(lambda m: mapping[m.group(0)], f.read())
+        with open(path, 'wb') as out:
+          out.write(data)
+      else:
+        with open(path, 'wb') as out:
+          shutil.copyfileobj(f, out, chunk_size)
+
+  def save_manifest(self, manifest):
+    path = self.manifest_path(manifest['key'])
+    fd, temp = self.temp_file(path)
+    with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+      f.write(json.dumps(manifest, separators=(',', ':')).encode('utf-8'))
+    os.replace(temp, path)
+
+  def load_manifest(self, snapshot_key):
+    try:
+      with gzip.open(self.manifest_path(snapshot_key), 'rb') as f:
+        manifest = json.loads(f.read().decode('utf-8'))
+    except (OSError, IOError, ValueError, EOFError):
+      return None
+    if manifest.get('version') != version:
+      return None
+    return manifest
+
+class BuildSnapshot:
+  def __init__(self, store_dir, tag, build_dir, project_dir, output_dir, polly_root, arguments, toolchain_path, cache_path, environ):
+    self.store = Store(store_dir)
+    self.paths = Paths(build_dir, project_dir, output_dir, polly_root)
+    self.key = key(tag, arguments, toolchain_path, cache_path, environ, self.paths)
+    self.toolchain_files = sorted(
+        detail.fingerprint.toolchain_files(toolchain_path, environ)[0]
+    )
+
+  def sources(self):
+    """(root name, root, relative path) of the files the build depends on"""
+    project_dir = self.paths.get('project')
+    skip = [self.paths.get('output'), self.paths.get('build')]
+    result = [('project', project_dir, x) for x in walk(project_dir, skip)]
+    polly_root = self.paths.get('polly')
+    if not polly_root.startswith(project_dir + os.sep):
+      # only the toolchain files are dependencies of the build files
+      for path in self.toolchain_files:
+        if path.startswith(polly_root + os.sep):
+          result.append(('polly', polly_root, os.path.relpath(path, polly_root)))
+    return result
+
+  def save(self, fingerprint_path, fingerprint, objects):
+    """Add the build directory to the store, return a summary message"""
+    build_dir = self.paths.get('build')
+    try:
+      with open(fingerprint_path, 'r') as f:
+        configured = (f.read() == fingerprint)
+    except (OSError, IOError):
+      configured = False
+    skip = set()
+    if not objects:
+      index = detail.query_index.load(build_dir)
+      if index:
+        skip = set(index.artifacts())
+
+    roots = [('build', build_dir)]
+    hunter = hunter_root(build_dir)
+    if hunter and not hunter.startswith(build_dir + os.sep):
+      roots.append(('hunter', hunter))
+
+    files = []
+    links = []
+    dirs = []
+    for root_name, root in roots:
+      for directory, subdirs, names in os.walk(root):
+        relative = os.path.relpath(directory, root)
+        dirs.append([root_name, relative])
+        for name in subdirs + names:
+          path = os.path.join(directory, name)
+          if os.path.islink(path):
+            links.append([root_name, os.path.join(relative, name), os.readlink(path)])
+        for name in names:
+          path = os.path.join(directory, name)
+          if os.path.islink(path):
+            continue
+          if root_name == 'build' and not objects:
+            if os.path.splitext(name)[1].lower() in object_extensions:
+              continue
+            if path in skip:
+              continue
+          files.append((root_name, root, os.path.join(relative, name)))
+
+    needles = [x[1].encode('utf-8') for x in self.paths.roots]
+
+    def add(entry):
+      root_name, root, relative = entry
+      path = os.path.join(root, relative)
+      stat = os.stat(path)
+      sha, size, text = self.store.add(path, needles)
+      return [root_name, relative, sha, stat.st_mode & 0o777, stat.st_mtime_ns, text], size
+
+    added = parallel(add, files)
+    file_entries = [x[0] for x in added]
+    total = sum(x[1] for x in added)
+
+    def source(entry):
+      root_name, root, relative = entry
+      path = os.path.join(root, relative)
+      return [root_name, relative, file_hash(path), os.stat(path).st_mtime_ns]
+
+    manifest = {
+        'version': version,
+        'key': self.key,
+        'created': time.time(),
+        'objects': objects,
+        'roots': dict(self.paths.roots + roots),
+        'configured': configured,
+        'tools': tool_ids(build_dir),
+        'dirs': dirs,
+        'links': links,
+        'files': file_entries,
+        'sources': parallel(source, self.sources())
+    }
+    self.store.save_manifest(manifest)
+    return '{} files, {:.1f} MiB, key {}'.format(
+        len(file_entries), total / 1024.0 / 1024.0, self.key[:12]
+    )
+
+  def restore(self, fingerprint_path, fingerprint):
+    """Unpack the snapshot: (True if restored, message)"""
+    build_dir = self.paths.get('build')
+    if os.path.exists(os.path.join(build_dir, 'CMakeCache.txt')):
+      return False, 'existing CMakeCache.txt'
+    manifest = self.store.load_manifest(self.key)
+    if manifest is None:
+      return False, 'no snapshot {}'.format(self.key[:12])
+    for tool_id in manifest['tools']:
+      if binary_id(tool_id[0]) != tool_id:
+        return False, 'changed since snapshot: {}'.format(tool_id[0])
+    for x in manifest['files']:
+      if not os.path.exists(self.store.object_path(x[2])):
+        return False, 'incomplete snapshot {}, object {} missing'.format(
+            self.key[:12], x[2][:12]
+        )
+
+    old_roots = manifest['roots']
+    destinations = dict(self.paths.roots)
+    if 'hunter' in old_roots:
+      hunter = old_roots['hunter']
+      # same path: Hunter install root is not relocated
+      try:
+        os.makedirs(hunter)
+        destinations['hunter'] = hunter
+      except OSError as exc:
+        print('Restore: Hunter root not restored ({}): {}'.format(exc.strerror, hunter))
+    replacements = self.paths.replacements(old_roots)
+
+    for root_name, relative in manifest['dirs']:
+      if root_name in destinations:
+        path = os.path.normpath(os.path.join(destinations[root_name], relative))
+        if not os.path.isdir(path):
+          os.makedirs(path)
+    for root_name, relative, link in manifest['links']:
+      if root_name in destinations:
+        path = os.path.join(destinations[root_name], relative)
+        if not os.path.lexists(path):
+          os.symlink(link, path)
+
+    def extract(entry):
+      root_name, relative, sha, mode, mtime_ns, text = entry
+      if root_name not in destinations:
+        return 0
+      path = os.path.join(destinations[root_name], relative)
+      self.store.extract(sha, path, replacements if text else None)
+      os.chmod(path, mode)
+      os.utime(path, ns=(mtime_ns, mtime_ns))
+      return 1
+
+    restored = sum(parallel(extract, manifest['files']))
+
+    def source(entry):
+      root_name, relative, sha, mtime_ns = entry
+      path = os.path.join(destinations[root_name], relative)
+      try:
+        if file_hash(path) != sha:
+          return 0
+      except (OSError, IOError):
+        return 0
+      os.utime(path, ns=(os.stat(path).st_atime_ns, mtime_ns))
+      return 1
+
+    unchanged = sum(
+        parallel(source, [x for x in manifest['sources'] if x[0] in destinations])
+    )
+    if manifest['configured']:
+      # up to date when the snapshot was taken, fingerprint of the new paths
+      with open(fingerprint_path, 'w') as f:
+        f.write(fingerprint)
+    # last use, for the cleanup of the store
+    os.utime(self.store.manifest_path(self.key))
+    return True, '{} files, {} of {} sources unchanged, key {}{}'.format(
+        restored,
+        unchanged,
+        len(manifest['sources']),
+        self.key[:12],
+        ', relocated' if replacements else ''
+    )
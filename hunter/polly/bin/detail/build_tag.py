@@ -0,0 +1,7 @@
+"""Build directory tag"""
+
+def get(polly_toolchain, toolchain_entry, config):
+  if config and not toolchain_entry.multiconfig:
+    return "{}-{}".format(polly_toolchain, config)
+  else:
+    return polly_toolchain
@@ -4,22 +4,29 @@
 # Adapted to python3 version of: http://stackoverflow.com/questions/4984428
 
 import os
-import platform
+import re
+import selectors
 import subprocess
 import sys
 import threading
 import time
 
+import detail.jobserver
+import detail.mtime
+import detail.output_filter
+import detail.rusage
+
 # Tests:
 #
 # Windows:
 # * Control Panel -> Region -> Administrative -> Current languange for non-Unicode programs: "Russian (Russia)"
 # * cd to directory with name like 'привет' and run 'polly.py --verbose'
 
-def tee(infile, discard, logging, console=None):
+def tee(infile, discard, logging, console=None, on_line=None):
   """Print `infile` to `files` in a separate thread."""
   def fanout():
     discard_counter = 0
+    chain = detail.output_filter.create_chain()
     for line in iter(infile.readline, b''):
       # use the same encoding as stdout/stderr
       s = line.decode(
@@ -30,6 +37,12 @@ def tee(infile, discard, logging, console=None):
       s = s.replace('\t', '  ')
       s = s.rstrip() # strip spaces and EOL
       s += '\n' # append stripped EOL back
+      if on_line is not None:
+        on_line(s)
+      if chain is not None:
+        s = ''.join(chain.filter([s]))
+        if not s:
+          continue
       logging.write(s)
       if console is None:
         continue
@@ -43,21 +56,134 @@ def tee(infile, discard, logging, console=None):
       discard_counter += 1
       if discard_counter == discard:
         discard_counter = 0
+    if chain is not None:
+      s = ''.join(chain.finish())
+      logging.write(s)
+      if console is not None:
+        console.write(s)
+        console.flush()
     infile.close()
   t = threading.Thread(target=fanout)
   t.daemon = True
   t.start()
   return t
 
-def teed_call(cmd_args, logging, output_filter=None):
+# Whitespace at the end of every line (except EOL)
+trailing_space_regex = re.compile(r'[^\S\n]+$', re.MULTILINE)
+
+def split_lines(s):
+  """Lines of `s` ending with EOL (split on '\\n' only, like `readline`)"""
+  return [x + '\n' for x in s[:-1].split('\n')]
+
+class Stream:
+  """Output of one pipe for `multiplex`: lines are split on raw bytes and
+  written to the log and the console in batches (same line cleanup as `tee`).
+  Lines are prefixed with `prefix` if several commands share the output."""
+  def __init__(self, infile, discard, logging, console=None, on_line=None, prefix=None):
+    self.infile = infile
+    self.fd = infile.fileno() if infile else None
+    self.discard = discard
+    self.logging = logging
+    self.console = console
+    self.on_line = on_line
+    self.prefix = prefix
+    self.discard_counter = 0
+    self.partial = b''
+    self.chain = detail.output_filter.create_chain()
+
+  def feed(self, data):
+    end = data.rfind(b'\n')
+    if end == -1:
+      self.partial += data
+      return
+    block = self.partial + data[:end + 1]
+    self.partial = data[end + 1:]
+    self.write(block)
+
+  def close(self):
+    if self.partial:
+      self.write(self.partial + b'\n')
+      self.partial = b''
+    if self.chain is not None:
+      self.emit(''.join(self.chain.finish()))
+    if self.infile:
+      self.infile.close()
+
+  def write(self, block):
+    # use the same encoding as stdout/stderr
+    s = block.decode(encoding=sys.stdout.encoding, errors='replace')
+    s = s.replace('\r', '')
+    s = s.replace('\t', '  ')
+    s = trailing_space_regex.sub('', s)
+    if self.on_line is not None:
+      for line in split_lines(s):
+        self.on_line(line)
+    if self.chain is not None:
+      s = ''.join(self.chain.filter(split_lines(s)))
+    self.emit(s)
+
+  def emit(self, s):
+    """Write complete lines to the log and the console"""
+    if not s:
+      return
+    if self.prefix:
+      s = self.prefix + s[:-1].replace('\n', '\n' + self.prefix) + '\n'
+    self.logging.write(s)
+    if self.console is None:
+      return
+    if self.discard is not None:
+      lines = []
+      for line in split_lines(s):
+        if self.discard_counter == 0:
+          lines.append(line)
+        self.discard_counter += 1
+        if self.discard_counter == self.discard:
+          self.discard_counter = 0
+      s = ''.join(lines)
+    if s:
+      self.console.write(s)
+      self.console.flush()
+
+def multiplex(streams, chunk_size=1 << 18):
+  """Read all the `streams` in the calling thread until EOF"""
+  selector = selectors.DefaultSelector()
+  for x in streams:
+    selector.register(x.fd, selectors.EVENT_READ, x)
+  try:
+    while selector.get_map():
+      for key, events in selector.select():
+        stream = key.data
+        try:
+          data = os.read(stream.fd, chunk_size)
+        except InterruptedError:
+          continue
+        if data:
+          stream.feed(data)
+        else:
+          selector.unregister(stream.fd)
+          stream.close()
+  finally:
+    selector.close()
+
+def teed_call(cmd_args, logging, output_filter=None, cwd=None, on_line=None):
+  # Child runs in the job slot taken from the shared jobserver pool (if any)
+  detail.jobserver.acquire()
+  try:
+    return teed_call_in_slot(cmd_args, logging, output_filter, cwd, on_line)
+  finally:
+    detail.jobserver.release()
+
+def teed_call_in_slot(cmd_args, logging, output_filter, cwd, on_line):
   p = subprocess.Popen(
       cmd_args,
       stdout=subprocess.PIPE,
       stderr=subprocess.PIPE,
       env=os.environ,
-      bufsize=0
+      cwd=cwd,
+      bufsize=0,
+      pass_fds=detail.jobserver.pass_fds()
   )
-  threads = []
+  pipes = [] # (pipe, console, on_line)
 
   output_pipe = p.stdout
 
@@ -71,34 +197,60 @@ def teed_call(cmd_args, logging, output_filter=None):
       bufsize=0
     )
     # also pipe filter error to stderr and log
-    threads.append(tee(filter_p.stderr, logging.discard, logging, sys.stderr))
+    pipes.append((filter_p.stderr, sys.stderr, None))
     output_pipe = filter_p.stdout
 
   if logging.verbosity != 'silent':
-    threads.append(tee(output_pipe, logging.discard, logging, sys.stdout))
-    threads.append(tee(p.stderr, logging.discard, logging, sys.stderr))
+    pipes.append((output_pipe, sys.stdout, on_line))
+    pipes.append((p.stderr, sys.stderr, on_line))
   else:
-    threads.append(tee(output_pipe, logging.discard, logging))
-    threads.append(tee(p.stderr, logging.discard, logging))
+    pipes.append((output_pipe, None, on_line))
+    pipes.append((p.stderr, None, on_line))
 
-  for t in threads:
-    t.join() # wait for IO completion
+  if os.name == 'nt':
+    # selectors can't wait for pipes on Windows
+    threads = [
+        tee(pipe, logging.discard, logging, console, on_line)
+        for pipe, console, on_line in pipes
+    ]
+    for t in threads:
+      t.join() # wait for IO completion
+  else:
+    multiplex(
+        [
+            Stream(pipe, logging.discard, logging, console, on_line)
+            for pipe, console, on_line in pipes
+        ]
+    )
 
-  return p.wait()
+  return detail.rusage.wait(p)
 
-def call(call_args, logging, cache_file='', ignore=False, sleep=0, output_filter=None, dry_run=False):
+def describe(call_args, cwd=None):
+  """Multiline and one line description of the command"""
   pretty = 'Execute command: [\n'
   for i in call_args:
     pretty += '  `{}`\n'.format(i)
   pretty += ']\n'
-  print(pretty)
-  logging.write(pretty)
 
-  # print one line version
   oneline = ''
   for i in call_args:
     oneline += ' "{}"'.format(i)
-  oneline = "[{}]>{}\n".format(os.getcwd(), oneline)
+  oneline = "[{}]>{}\n".format(cwd or os.getcwd(), oneline)
+  return pretty, oneline
+
+def print_command(call_args, cwd=None):
+  """Print the command without running it (polly.py --dry-run)"""
+  pretty, oneline = describe(call_args, cwd)
+  print(pretty)
+  print(oneline)
+
+def call(call_args, logging, cache_file='', ignore=False, sleep=0, output_filter=None, dry_run=False, cwd=None, on_line=None, mtime_barrier=None, interleaved=False):
+  segment_start = logging.offset
+  pretty, oneline = describe(call_args, cwd)
+  print(pretty)
+  logging.write(pretty)
+
+  # print one line version
   if logging.verbosity != 'silent':
     print(oneline)
   logging.write(oneline)
@@ -106,15 +258,44 @@ def call(call_args, logging, cache_file='', ignore=False, sleep=0, output_filter
   if dry_run:
       sys.exit(0)
 
-  x = teed_call(call_args, logging, output_filter)
+  start_time = time.time()
+  x = teed_call(call_args, logging, output_filter, cwd, on_line)
+  logging.add_segment(
+      call_args,
+      cwd or os.getcwd(),
+      segment_start,
+      x,
+      start_time,
+      time.time() - start_time,
+      interleaved
+  )
   if x == 0 or ignore:
-    time.sleep(sleep)
+    if sleep:
+      time.sleep(sleep)
+    if mtime_barrier:
+      # next writes to these directories must get newer timestamps
+      detail.mtime.barrier(mtime_barrier)
     return
   if os.path.exists(cache_file):
     os.unlink(cache_file)
-  logging.log_file.close()
-  print('Command exit with status "{}": {}'.format(x, oneline))
+  failed(x, call_args, logging, cwd)
+
+# Called before exiting on a failed command (polly.py: timing history)
+failure_hooks = []
+
+def failed(exit_code, call_args, logging, cwd=None):
+  """Print the failed command with the errors from the log and exit"""
+  pretty, oneline = describe(call_args, cwd)
+  logging.close()
+  print('Command exit with status "{}": {}'.format(exit_code, oneline))
+  exit_failed(logging)
+
+def exit_failed(logging):
+  """Print the errors from the (closed) log and exit"""
   print('Log: {}'.format(logging.log_path))
+  logging.print_errors()
   logging.print_last_lines()
   print('*** FAILED ***')
+  for hook in failure_hooks:
+    hook()
   sys.exit(1)
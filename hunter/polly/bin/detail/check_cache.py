@@ -0,0 +1,164 @@
+# Results of the configure checks shared by the fresh build directories of
+# the same project/toolchain (polly.py --check-cache, configure.py).
+#
+# After a successful configure the stable part of CMakeCache.txt is saved to
+# the user cache directory (see `detail.user_cache`):
+# * INTERNAL results of the check modules (check_include_file,
+#   check_cxx_source_compiles, check_type_size, ...: recognized by the
+#   docstrings the modules write, e.g. "Have include stdio.h")
+# * paths found by find_path/find_library/find_program (Find modules), only
+#   the ones which still exist (when saved and when used)
+#
+# A new build directory (no CMakeCache.txt) gets them as the initial cache
+# (-C), so CMake skips the try_compile runs. The snapshot is keyed by the
+# project directory, build tag, cmake binary, toolchain files, arguments and
+# environment (same inputs as `detail.fingerprint`) and is dropped if one of
+# the compilers from CMakeCache.txt is changed (size or mtime, like ccache).
+#
+# NOTE: as for an existing build directory, a result is not re-checked if
+# the code of the check changes, use '--check-cache refresh' or 'off'.
+# Compiler identification and ABI detection run anyway.
+
+import hashlib
+import os
+import re
+import shutil
+
+import detail.fingerprint
+import detail.user_cache
+
+version = 1
+
+# docstrings of the INTERNAL entries written by the check modules
+check_docs = re.compile(
+    r'^(Have (include|includes|function|symbol|library|variable|prototype) '
+    r'|Test |Result of TRY_(COMPILE|RUN)|Result of TEST_BIG_ENDIAN'
+    r'|CHECK_TYPE_SIZE: )'
+)
+
+# docstrings of the find_path/find_library/find_program results
+find_docs = ['Path to a file.', 'Path to a library.', 'Path to a program.']
+
+entry_regex = re.compile(r'^([^#/:][^:]*):([A-Z]+)=(.*)$')
+compiler_regex = re.compile(r'^CMAKE_\w+_COMPILER$')
+
+def read_cmake_cache(path):
+  """CMakeCache.txt entries: list of (name, type, value, doc)"""
+  result = []
+  doc = []
+  with open(path, 'r', errors='replace') as f:
+    for line in f:
+      line = line.rstrip('\n')
+      if line.startswith('//'):
+        doc.append(line[2:])
+        continue
+      found = entry_regex.match(line)
+      if found:
+        result.append(found.groups() + (' '.join(doc),))
+      doc = []
+  return result
+
+def stable(name, kind, value, doc):
+  if kind == 'INTERNAL':
+    return bool(check_docs.match(doc))
+  if kind in ['PATH', 'FILEPATH'] and doc in find_docs:
+    return os.path.exists(value) # NOTFOUND: new installs will be found
+  return False
+
+def file_id(path):
+  """(real path, size, mtime) of the file or None if missing"""
+  if not os.path.isabs(path):
+    path = shutil.which(path)
+    if path is None:
+      return None
+  path = os.path.realpath(path)
+  try:
+    stat = os.stat(path)
+  except OSError:
+    return None
+  return [path, stat.st_size, stat.st_mtime_ns]
+
+def quote(value):
+  for a, b in [('\\', '\\\\'), ('"', '\\"'), ('$', '\\$')]:
+    value = value.replace(a, b)
+  return '"{}"'.format(value)
+
+class CheckCache:
+  def __init__(self, tag, project_dir, cmake_bin, toolchain_path, arguments, environ, refresh=False):
+    self.refresh = refresh # capture only
+    project_dir = os.path.realpath(project_dir)
+    slot = hashlib.sha256(
+        '{}\n{}'.format(tag, project_dir).encode('utf-8')
+    ).hexdigest()[:16]
+    self.name = 'check-cache-{}.json'.format(slot)
+    key = hashlib.sha256()
+    for x in [
+        str(version),
+        tag,
+        project_dir,
+        str(file_id(cmake_bin)),
+        detail.fingerprint.get(arguments, toolchain_path, None, environ)
+    ]:
+      key.update(x.encode('utf-8') + b'\n')
+    self.key = key.hexdigest()
+    self.loaded = None
+
+  def load(self):
+    """Snapshot or None, and the reason if it can't be used"""
+    content = detail.user_cache.load_json(self.name)
+    if content is None:
+      return None, 'no snapshot'
+    if content.get('key') != self.key:
+      return None, 'toolchain, cmake or arguments changed'
+    for compiler_id in content['compilers']:
+      if file_id(compiler_id[0]) != compiler_id:
+        return None, 'compiler changed: {}'.format(compiler_id[0])
+    return content, None
+
+  def seed(self, build_dir):
+    """Path of the initial cache for `build_dir` or None with the reason"""
+    if os.path.exists(os.path.join(build_dir, 'CMakeCache.txt')):
+      return None, 'existing CMakeCache.txt'
+    if self.refresh:
+      return None, 'refresh'
+    content, reason = self.load()
+    if content is None:
+      return None, reason
+    self.loaded = content
+    polly_temp_dir = os.path.join(build_dir, '_3rdParty', 'polly')
+    if not os.path.exists(polly_temp_dir):
+      os.makedirs(polly_temp_dir)
+    # found paths removed since the snapshot: let CMake search again
+    entries = [x for x in content['entries'] if stable(*x)]
+    path = os.path.join(polly_temp_dir, 'check-cache.cmake')
+    with open(path, 'w') as f:
+      f.write('# Generated by polly from {}\n'.format(self.name))
+      for name, kind, value, doc in entries:
+        f.write(
+            'set({} {} CACHE {} {})\n'.format(name, quote(value), kind, quote(doc))
+        )
+    return path, '{} results'.format(len(entries))
+
+  def capture(self, build_dir):
+    """Save the stable entries of `build_dir`/CMakeCache.txt"""
+    cache_path = os.path.join(build_dir, 'CMakeCache.txt')
+    try:
+      entries = read_cmake_cache(cache_path)
+    except (OSError, IOError):
+      return
+    compilers = []
+    for name, kind, value, doc in entries:
+      if compiler_regex.match(name) and value:
+        compiler_id = file_id(value)
+        if compiler_id:
+          compilers.append(compiler_id)
+    content = {
+        'key': self.key,
+        'compilers': compilers,
+        'entries': [list(x) for x in entries if stable(*x)]
+    }
+    if self.loaded is None:
+      self.loaded = detail.user_cache.load_json(self.name) or {}
+    if content != self.loaded:
+      detail.user_cache.save_json(self.name, content)
+      self.loaded = content
@@ -2,7 +2,7 @@
 # All rights reserved.
 
 import os
-import platform
+import sys
 
 available_generators = [
     '7Z',
@@ -17,7 +17,7 @@ available_generators = [
     'ZIP',
 ]
 
-if platform.system() == 'Darwin':
+if sys.platform == 'darwin':
   available_generators += [
       'Bundle',
       'DragNDrop',
@@ -25,7 +25,7 @@ if platform.system() == 'Darwin':
       'PackageMaker',
   ]
 
-if platform.system().startswith('CYGWIN'):
+if sys.platform == 'cygwin':
   available_generators += [
       'CygwinBinary',
       'CygwinSource',
@@ -33,7 +33,7 @@ if platform.system().startswith('CYGWIN'):
       'RPM',
   ]
 
-if platform.system() == 'Linux':
+if sys.platform.startswith('linux'):
   available_generators += [
       'DEB',
       'RPM',
@@ -47,8 +47,8 @@ if os.name == 'nt':
 def default():
   if os.name == 'nt':
     return 'NSIS'
-  if platform.system() == 'Darwin':
+  if sys.platform == 'darwin':
     return 'PackageMaker'
-  if platform.system() == 'Linux':
+  if sys.platform.startswith('linux'):
     return 'DEB'
   return 'TGZ'
@@ -0,0 +1,300 @@
+# Persistent polly server: `polly.py --daemon` keeps modules, toolchain table,
+# argument parser and cmake checks warm and runs build requests received
+# from `polly-client.py` over a Unix domain socket.
+#
+# Every request is served by a forked copy of the daemon (so `sys.exit`,
+# `os.chdir` and environment tuning of one build can't leak into another):
+#
+#   daemon --fork--> relay --fork--> build (polly.py `main`)
+#
+# The build's stdout/stderr are pipes read by the relay, which sends them
+# back to the client with the exit status.
+#
+# Wire format (all integers are big-endian):
+#   request:  <u32 size><JSON {"argv": [...], "cwd": "...", "env": {...}}>
+#   response: frames <u8 kind><u32 size><payload>, kind is one of:
+#     'o' - stdout bytes, 'e' - stderr bytes, 'x' - exit status (ASCII)
+#
+# NOTE: this module is imported by the thin client, keep imports cheap.
+
+import json
+import os
+import socket
+import struct
+import sys
+
+socket_env = 'POLLY_DAEMON_SOCKET'
+
+frame_header = struct.Struct('>BI')
+size_header = struct.Struct('>I')
+
+def default_socket_path():
+  path = os.getenv(socket_env)
+  if path:
+    return path
+  runtime_dir = os.getenv('XDG_RUNTIME_DIR')
+  if runtime_dir and os.path.isdir(runtime_dir):
+    return os.path.join(runtime_dir, 'polly-daemon.sock')
+  return os.path.join('/tmp', 'polly-daemon-{}.sock'.format(os.getuid()))
+
+def recv_exactly(conn, size):
+  result = b''
+  while len(result) < size:
+    chunk = conn.recv(size - len(result))
+    if not chunk:
+      return None
+    result += chunk
+  return result
+
+def send_frame(conn, kind, payload):
+  conn.sendall(frame_header.pack(ord(kind), len(payload)) + payload)
+
+### Client
+
+def client(argv, socket_path=None):
+  """Run polly with `argv` in the daemon, return exit status or None"""
+  if socket_path is None:
+    socket_path = default_socket_path()
+  conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+  try:
+    conn.connect(socket_path)
+  except OSError:
+    conn.close()
+    return None
+
+  request = json.dumps(
+      {'argv': argv, 'cwd': os.getcwd(), 'env': dict(os.environ)}
+  ).encode('utf-8')
+  conn.sendall(size_header.pack(len(request)) + request)
+
+  outputs = {
+      ord('o'): sys.stdout.buffer,
+      ord('e'): sys.stderr.buffer
+  }
+  while True:
+    header = recv_exactly(conn, frame_header.size)
+    if header is None:
+      sys.stderr.write('polly daemon closed connection\n')
+      return 1
+    kind, size = frame_header.unpack(header)
+    payload = recv_exactly(conn, size)
+    if payload is None:
+      sys.stderr.write('polly daemon closed connection\n')
+      return 1
+    if kind == ord('x'):
+      conn.close()
+      return int(payload.decode('ascii'))
+    outputs[kind].write(payload)
+    outputs[kind].flush()
+
+### Server
+
+# Output of successful `which <cmake>` + `cmake --version` checks,
+# key: see `cmake_key`
+cmake_checks = {}
+
+def cmake_key(cmake_bin, path):
+  """(cmake option, PATH, real path, size, mtime) or None if not found,
+  an upgraded cmake gets a new key"""
+  import shutil
+  found = shutil.which(cmake_bin, path=path)
+  if found is None:
+    return None
+  found = os.path.realpath(found)
+  try:
+    stat = os.stat(found)
+  except OSError:
+    return None
+  return (cmake_bin, path, found, stat.st_size, stat.st_mtime_ns)
+
+def warm_cmake_check(cmake_bin):
+  """Cached check output for `cmake_bin` (None if not running in daemon)"""
+  if not cmake_checks:
+    return None
+  key = cmake_key(cmake_bin, os.getenv('PATH'))
+  if key is None:
+    return None
+  return cmake_checks.get(key)
+
+def check_cmake(argv, env):
+  import argparse
+  import subprocess
+
+  parser = argparse.ArgumentParser(add_help=False)
+  parser.add_argument('--cmake', default='cmake')
+  args, unknown = parser.parse_known_args(argv)
+
+  key = cmake_key(args.cmake, env.get('PATH'))
+  if key is None or key in cmake_checks:
+    return # not found: let the build report the error
+  commands = [[args.cmake, '--version']]
+  if not os.path.isabs(args.cmake):
+    commands.insert(0, ['which', args.cmake])
+  output = ''
+  for cmd in commands:
+    try:
+      output += subprocess.check_output(
+          cmd, env=env, stderr=subprocess.STDOUT, universal_newlines=True
+      )
+    except (OSError, subprocess.CalledProcessError):
+      return # let the build report the error
+  for x in list(cmake_checks):
+    if x[:2] == key[:2]:
+      del cmake_checks[x] # previous cmake binary
+  cmake_checks[key] = '[daemon cache] {}\n{}'.format(
+      ' '.join(x[0] for x in commands), output
+  )
+
+def build(request, out_w, err_w, run_main):
+  os.dup2(out_w, 1)
+  os.dup2(err_w, 2)
+  devnull = os.open(os.devnull, os.O_RDONLY)
+  os.dup2(devnull, 0)
+  sys.stdout = open(1, 'w', encoding='utf-8', errors='replace', closefd=False)
+  sys.stderr = open(2, 'w', encoding='utf-8', errors='replace', closefd=False)
+
+  os.chdir(request['cwd'])
+  os.environ.clear()
+  os.environ.update(request['env'])
+
+  try:
+    run_main(request['argv'])
+    code = 0
+  except SystemExit as exc:
+    if exc.code is None:
+      code = 0
+    elif isinstance(exc.code, int):
+      code = exc.code
+    else:
+      sys.stderr.write('{}\n'.format(exc.code))
+      code = 1
+  except BaseException:
+    import traceback
+    traceback.print_exc()
+    code = 1
+  try:
+    shutdown()
+  except BaseException:
+    import traceback
+    traceback.print_exc()
+  sys.stdout.flush()
+  sys.stderr.flush()
+  return code
+
+def shutdown():
+  """Interpreter exit steps skipped by `os._exit`: wait for the non-daemon
+  threads (log rotation) and run the atexit handlers (fifo jobserver)"""
+  import atexit
+  import threading
+  for x in threading.enumerate():
+    if x is not threading.current_thread() and not x.daemon:
+      x.join()
+  atexit._run_exitfuncs()
+
+def receive_request(conn):
+  header = recv_exactly(conn, size_header.size)
+  if header is None:
+    return None
+  (size,) = size_header.unpack(header)
+  payload = recv_exactly(conn, size)
+  if payload is None:
+    return None
+  return json.loads(payload.decode('utf-8'))
+
+def relay(conn, request, run_main):
+  import selectors
+  import signal
+
+  signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+  signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+  out_r, out_w = os.pipe()
+  err_r, err_w = os.pipe()
+  pid = os.fork()
+  if pid == 0:
+    conn.close()
+    os.close(out_r)
+    os.close(err_r)
+    os._exit(build(request, out_w, err_w, run_main))
+
+  os.close(out_w)
+  os.close(err_w)
+  selector = selectors.DefaultSelector()
+  selector.register(out_r, selectors.EVENT_READ, 'o')
+  selector.register(err_r, selectors.EVENT_READ, 'e')
+  try:
+    while selector.get_map():
+      for key, events in selector.select():
+        data = os.read(key.fd, 65536)
+        if not data:
+          selector.unregister(key.fd)
+          os.close(key.fd)
+          continue
+        send_frame(conn, key.data, data)
+    pid, status = os.waitpid(pid, 0)
+    if os.WIFEXITED(status):
+      code = os.WEXITSTATUS(status)
+    else:
+      code = 128 + os.WTERMSIG(status)
+    send_frame(conn, 'x', str(code).encode('ascii'))
+  except OSError:
+    # client went away: stop the build
+    os.kill(pid, signal.SIGTERM)
+    os.waitpid(pid, 0)
+
+def serve(socket_path, run_main):
+  import signal
+
+  if os.name != 'posix':
+    sys.exit('polly daemon is only supported on POSIX systems')
+
+  if socket_path is None:
+    socket_path = default_socket_path()
+  if os.path.exists(socket_path):
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+      probe.connect(socket_path)
+      sys.exit('polly daemon already running: {}'.format(socket_path))
+    except OSError:
+      os.unlink(socket_path) # stale socket
+    finally:
+      probe.close()
+
+  server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+  umask = os.umask(0o077) # socket is created 0600
+  try:
+    server.bind(socket_path)
+  finally:
+    os.umask(umask)
+  server.listen(16)
+
+  # relays are reaped automatically
+  signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+  signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+  print('polly daemon listening on {}'.format(socket_path))
+  sys.stdout.flush()
+  try:
+    while True:
+      conn, address = server.accept()
+      try:
+        request = receive_request(conn)
+        if request is None:
+          continue
+        # run the check in the daemon itself so the result stays warm
+        check_cmake(request['argv'], request['env'])
+
+        if os.fork() == 0:
+          server.close()
+          try:
+            relay(conn, request, run_main)
+          finally:
+            os._exit(0)
+      finally:
+        conn.close()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.close()
+    if os.path.exists(socket_path):
+      os.unlink(socket_path)
@@ -0,0 +1,97 @@
+# CMake file-based API: https://cmake.org/cmake/help/latest/manual/cmake-file-api.7.html
+#
+# polly writes a client query before generating, CMake writes the replies
+# into <build-dir>/.cmake/api/v1/reply on every configure (see
+# `detail.query_index` for the index built from them).
+
+import json
+import os
+
+client_name = 'client-polly'
+
+requests = [
+    {'kind': 'codemodel', 'version': 2},
+    {'kind': 'cache', 'version': 2},
+    {'kind': 'cmakeFiles', 'version': 1},
+]
+
+def api_dir(build_dir):
+  return os.path.join(build_dir, '.cmake', 'api', 'v1')
+
+def write_query(build_dir):
+  """True if the query is new or changed"""
+  query_dir = os.path.join(api_dir(build_dir), 'query', client_name)
+  if not os.path.exists(query_dir):
+    os.makedirs(query_dir)
+  query_path = os.path.join(query_dir, 'query.json')
+  content = json.dumps({'requests': requests}, indent=2, sort_keys=True)
+  if os.path.exists(query_path):
+    with open(query_path, 'r') as f:
+      if f.read() == content:
+        return False
+  with open(query_path, 'w') as f:
+    f.write(content)
+  return True
+
+def load_reply(reply_dir, json_file):
+  with open(os.path.join(reply_dir, json_file), 'r') as f:
+    return json.load(f)
+
+def reply_index(build_dir):
+  """Name of the latest reply index file (or None)"""
+  reply_dir = os.path.join(api_dir(build_dir), 'reply')
+  if not os.path.isdir(reply_dir):
+    return None
+  indexes = sorted(
+      x for x in os.listdir(reply_dir)
+      if x.startswith('index-') and x.endswith('.json')
+  )
+  if not indexes:
+    return None
+  return indexes[-1]
+
+def responses(build_dir):
+  """Map 'kind' -> reply object for the polly client query (or None)"""
+  index_file = reply_index(build_dir)
+  if index_file is None:
+    return None
+  reply_dir = os.path.join(api_dir(build_dir), 'reply')
+  index = load_reply(reply_dir, index_file)
+  client = index.get('reply', {}).get(client_name, {})
+  query = client.get('query.json', {})
+  result = {}
+  for response in query.get('responses', []):
+    if 'jsonFile' in response:
+      result[response['kind']] = load_reply(reply_dir, response['jsonFile'])
+  return result
+
+def has_reply(build_dir):
+  replies = responses(build_dir)
+  return bool(replies) and all(x['kind'] in replies for x in requests)
+
+def targets(build_dir, config):
+  """List of target objects of the codemodel for `config` (or None)"""
+  replies = responses(build_dir)
+  if not replies or 'codemodel' not in replies:
+    return None
+  reply_dir = os.path.join(api_dir(build_dir), 'reply')
+  configurations = replies['codemodel']['configurations']
+  selected = configurations[0]
+  for x in configurations:
+    if config and x['name'] == config:
+      selected = x
+  return [load_reply(reply_dir, x['jsonFile']) for x in selected['targets']]
+
+def artifacts(build_dir, config):
+  """Map absolute artifact path -> target name (or None)"""
+  result = {}
+  target_list = targets(build_dir, config)
+  if target_list is None:
+    return None
+  for target in target_list:
+    for artifact in target.get('artifacts', []):
+      path = os.path.normpath(
+          os.path.join(os.path.abspath(build_dir), artifact['path'])
+      )
+      result[path] = target['name']
+  return result
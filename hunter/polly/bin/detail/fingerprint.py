@@ -0,0 +1,89 @@
+# Fingerprint of everything that affects the CMake configure step:
+# * generate command arguments
+# * toolchain file and all the files it includes (recursively)
+# * initial cache script (-C)
+# * environment variables used by the toolchain files and the compilers
+
+import hashlib
+import os
+import re
+
+include_regex = re.compile(r'^\s*include\(\s*"?([^")\s]+)"?', re.MULTILINE)
+env_regex = re.compile(r'ENV\{([A-Za-z0-9_]+)\}')
+
+# Affect compiler detection and Hunter even if not used by toolchain files
+common_environment = [
+    'CC',
+    'CFLAGS',
+    'CMAKE_PREFIX_PATH',
+    'CPPFLAGS',
+    'CXX',
+    'CXXFLAGS',
+    'HUNTER_ROOT',
+    'LDFLAGS',
+    'PATH',
+]
+
+def resolve_include(name, current_dir, polly_root, environ):
+  """Path of the included file or None if can't be resolved"""
+  name = name.replace('${CMAKE_CURRENT_LIST_DIR}', current_dir)
+  name = re.sub(r'\$ENV\{([A-Za-z0-9_]+)\}', lambda m: environ.get(m.group(1), ''), name)
+  if '${' in name:
+    return None
+  if not name.endswith('.cmake'):
+    # module name, polly adds 'utilities' to CMAKE_MODULE_PATH
+    for directory in [current_dir, os.path.join(polly_root, 'utilities')]:
+      candidate = os.path.join(directory, '{}.cmake'.format(name))
+      if os.path.isfile(candidate):
+        return candidate
+    return None
+  if not os.path.isabs(name):
+    name = os.path.join(current_dir, name)
+  if os.path.isfile(name):
+    return os.path.normpath(name)
+  return None
+
+def toolchain_files(toolchain_path, environ):
+  """Toolchain file and all files included by it, and used ENV{} variables"""
+  polly_root = os.path.dirname(toolchain_path)
+  files = {}
+  variables = set()
+  stack = [os.path.normpath(toolchain_path)]
+  while stack:
+    path = stack.pop()
+    if path in files:
+      continue
+    with open(path, 'rb') as f:
+      content = f.read()
+    files[path] = hashlib.sha256(content).hexdigest()
+    text = content.decode('utf-8', errors='replace')
+    variables.update(env_regex.findall(text))
+    for name in include_regex.findall(text):
+      included = resolve_include(name, os.path.dirname(path), polly_root, environ)
+      if included:
+        stack.append(included)
+  return files, variables
+
+def get(generate_command, toolchain_path, cache_path, environ):
+  h = hashlib.sha256()
+  def add(kind, value):
+    h.update('{}={}\n'.format(kind, value).encode('utf-8'))
+
+  for x in generate_command:
+    add('arg', x)
+
+  variables = set(common_environment)
+  if toolchain_path:
+    files, used_variables = toolchain_files(toolchain_path, environ)
+    variables.update(used_variables)
+    for path in sorted(files):
+      add('file', '{} {}'.format(path, files[path]))
+
+  if cache_path:
+    with open(cache_path, 'rb') as f:
+      add('cache', hashlib.sha256(f.read()).hexdigest())
+
+  for name in sorted(variables):
+    add('env', '{} {}'.format(name, environ.get(name)))
+
+  return h.hexdigest()
@@ -0,0 +1,378 @@
+# Garbage collector of the output directory (polly.py gc):
+#
+#   > polly.py gc --dry-run
+#   > polly.py gc --max-size 50G --max-age 14
+#   > polly.py gc --output /builds --max-size 200G --snapshot-max-size 20G
+#
+# Every polly.py run records the last use of its build tag in
+# _builds/<tag>/_3rdParty/polly/last-use.json. Least recently used tags are
+# evicted while the output directory is bigger than --max-size, tags not
+# used for --max-age days are evicted anyway. _install, _framework and
+# _logs/polly of a toolchain go with the last build tag of the toolchain,
+# files in _archives are evicted by their own mtime. Tags used in the last
+# --keep-recent minutes (likely building right now, the use is recorded at
+# the start and at the end of the run) are never evicted.
+#
+# Evicted trees are moved to <output>/_trash and removed by the detached
+# reaper (`detail.rmtree`), so the command returns immediately.
+#
+# --snapshot-max-size: least recently restored snapshots of the build
+# directory snapshot store (`detail.build_snapshot`) are removed, then the
+# objects not used by the remaining snapshots.
+
+import argparse
+import concurrent.futures
+import datetime
+import gzip
+import json
+import os
+import re
+import sys
+import time
+
+import detail.build_snapshot
+import detail.rmtree
+
+last_use_name = 'last-use.json'
+
+def touch(polly_temp_dir, polly_toolchain, config):
+  """Record the use of the build tag"""
+  content = {'toolchain': polly_toolchain, 'config': config, 'time': time.time()}
+  with open(os.path.join(polly_temp_dir, last_use_name), 'w') as f:
+    json.dump(content, f)
+
+def parse_size(value):
+  found = re.match(r'^(\d+(?:\.\d+)?)([KMGT]?)i?B?$', value.strip(), re.IGNORECASE)
+  if not found:
+    raise argparse.ArgumentTypeError('Expected size like 500M or 20G: {}'.format(value))
+  power = ' KMGT'.index(found.group(2).upper() or ' ')
+  return int(float(found.group(1)) * 1024 ** power)
+
+def format_size(size):
+  for unit in ['B', 'K', 'M', 'G']:
+    if size < 1024:
+      return '{:.1f}{}'.format(size, unit) if unit != 'B' else '{}B'.format(size)
+    size /= 1024.0
+  return '{:.1f}T'.format(size)
+
+def file_usage(stat):
+  return getattr(stat, 'st_blocks', 0) * 512 or stat.st_size
+
+def disk_usage(path):
+  """Bytes used by the tree (hard links counted once, symlinks not followed)"""
+  if not os.path.isdir(path) or os.path.islink(path):
+    try:
+      return file_usage(os.lstat(path))
+    except OSError:
+      return 0
+  total = 0
+  seen = set()
+  stack = [path]
+  while stack:
+    try:
+      entries = list(os.scandir(stack.pop()))
+    except OSError:
+      continue
+    for entry in entries:
+      try:
+        if entry.is_dir(follow_symlinks=False):
+          stack.append(entry.path)
+          continue
+        stat = entry.stat(follow_symlinks=False)
+      except OSError:
+        continue
+      if stat.st_nlink > 1:
+        if (stat.st_dev, stat.st_ino) in seen:
+          continue
+        seen.add((stat.st_dev, stat.st_ino))
+      total += file_usage(stat)
+  return total
+
+def subdirs(path):
+  if not os.path.isdir(path):
+    return []
+  return sorted(
+      x for x in os.listdir(path)
+      if not x.startswith('.') and os.path.isdir(os.path.join(path, x))
+  )
+
+def mtime(path):
+  try:
+    return os.path.getmtime(path)
+  except OSError:
+    return 0
+
+class Item:
+  """Evicted as a whole: build tag, toolchain trees or archive"""
+  def __init__(self, name, kind, last_use, paths, toolchain=None):
+    self.name = name
+    self.kind = kind
+    self.last_use = last_use
+    self.paths = paths
+    self.toolchain = toolchain
+    self.size = 0
+    self.reason = None
+
+def last_use(build_dir, tag, toolchains):
+  """(time, toolchain) of the build tag"""
+  polly_temp_dir = os.path.join(build_dir, '_3rdParty', 'polly')
+  try:
+    with open(os.path.join(polly_temp_dir, last_use_name), 'r') as f:
+      content = json.load(f)
+    return content['time'], content['toolchain']
+  except (OSError, IOError, ValueError, KeyError):
+    pass
+  # run by an older polly.py: tag is <toolchain> or <toolchain>-<config>
+  toolchain = tag
+  while toolchain not in toolchains and '-' in toolchain:
+    toolchain = toolchain.rsplit('-', 1)[0]
+  if toolchain not in toolchains:
+    toolchain = tag
+  used = max(
+      mtime(os.path.join(build_dir, x))
+      for x in ['.', 'CMakeCache.txt', os.path.join('_3rdParty', 'polly')]
+  )
+  return used, toolchain
+
+def collect(cdir):
+  """Build tags, toolchain trees and archives of the output directory"""
+  toolchain_roots = [
+      os.path.join(cdir, '_install'),
+      os.path.join(cdir, '_framework'),
+      os.path.join(cdir, '_logs', 'polly')
+  ]
+  toolchains = {}
+  for root in toolchain_roots:
+    for name in subdirs(root):
+      toolchains.setdefault(name, []).append(os.path.join(root, name))
+
+  items = []
+  builds_dir = os.path.join(cdir, '_builds')
+  for tag in subdirs(builds_dir):
+    build_dir = os.path.join(builds_dir, tag)
+    used, toolchain = last_use(build_dir, tag, toolchains)
+    items.append(Item(tag, 'build', used, [build_dir], toolchain))
+
+  tags_used = {}
+  for item in items:
+    tags_used[item.toolchain] = max(tags_used.get(item.toolchain, 0), item.last_use)
+  for toolchain, paths in sorted(toolchains.items()):
+    used = max([mtime(x) for x in paths] + [tags_used.get(toolchain, 0)])
+    items.append(Item(toolchain, 'toolchain', used, paths, toolchain))
+
+  archives_dir = os.path.join(cdir, '_archives')
+  if os.path.isdir(archives_dir):
+    for name in sorted(os.listdir(archives_dir)):
+      path = os.path.join(archives_dir, name)
+      items.append(Item(name, 'archive', mtime(path), [path]))
+
+  with concurrent.futures.ThreadPoolExecutor() as pool:
+    sizes = pool.map(lambda x: sum(disk_usage(p) for p in x.paths), items)
+    for item, size in zip(items, sizes):
+      item.size = size
+  return items
+
+def select(items, max_size, max_age, keep_recent, now):
+  """Mark the evicted items (`reason`), return the size after collection"""
+  total = sum(x.size for x in items)
+  # toolchain trees go with the last build tag of the toolchain
+  tags = {}
+  for item in items:
+    if item.kind == 'build':
+      tags.setdefault(item.toolchain, []).append(item)
+
+  def evict(item, reason):
+    item.reason = reason
+    if item.kind == 'build' and all(x.reason for x in tags[item.toolchain]):
+      for x in items:
+        if x.kind == 'toolchain' and x.toolchain == item.toolchain and not x.reason:
+          x.reason = 'last tag of toolchain'
+    return sum(x.size for x in items if not x.reason)
+
+  # oldest first, toolchain trees only if there is no build tag left
+  candidates = sorted(
+      [x for x in items if not (x.kind == 'toolchain' and x.toolchain in tags)],
+      key=lambda x: x.last_use
+  )
+  for item in candidates:
+    if item.reason or now - item.last_use < keep_recent:
+      continue
+    if max_age is not None and now - item.last_use > max_age:
+      total = evict(item, 'age')
+    elif max_size is not None and total > max_size:
+      total = evict(item, 'size')
+  return total
+
+def report(items, total_before, total_after):
+  print(
+      '{:<32} {:<10} {:<16} {:>9} {:>9}  {}'.format(
+          'name', 'kind', 'last use', 'size', 'reclaim', 'action'
+      )
+  )
+  for item in sorted(items, key=lambda x: x.last_use):
+    print(
+        '{:<32} {:<10} {:<16} {:>9} {:>9}  {}'.format(
+            item.name[:32],
+            item.kind,
+            datetime.datetime.fromtimestamp(item.last_use).strftime('%Y-%m-%d %H:%M'),
+            format_size(item.size),
+            format_size(item.size) if item.reason else '-',
+            'evict ({})'.format(item.reason) if item.reason else 'keep'
+        )
+    )
+  print('-')
+  print(
+      'Total: {}, reclaimable: {}, after gc: {}'.format(
+          format_size(total_before),
+          format_size(total_before - total_after),
+          format_size(total_after)
+      )
+  )
+
+def snapshots_gc(store_dir, max_size, dry_run):
+  """Remove least recently used snapshots of the store"""
+  store = detail.build_snapshot.Store(store_dir)
+  manifests_dir = os.path.join(store_dir, 'manifests')
+  manifests = []
+  for name in os.listdir(manifests_dir) if os.path.isdir(manifests_dir) else []:
+    if name.endswith('.json.gz'):
+      path = os.path.join(manifests_dir, name)
+      try:
+        with gzip.open(path, 'rb') as f:
+          objects = set(x[2] for x in json.loads(f.read().decode('utf-8'))['files'])
+      except (OSError, IOError, ValueError, EOFError, KeyError):
+        objects = set()
+      manifests.append((mtime(path), path, objects))
+  manifests.sort()
+
+  sizes = {}
+  objects_dir = os.path.join(store_dir, 'objects')
+  for prefix in subdirs(objects_dir):
+    for name in os.listdir(os.path.join(objects_dir, prefix)):
+      if not name.startswith('.'):
+        sizes[name] = disk_usage(os.path.join(objects_dir, prefix, name))
+
+  def used_size(kept):
+    used = set()
+    for x in kept:
+      used |= x[2]
+    return sum(sizes.get(x, 0) for x in used), used
+
+  total = sum(sizes.values())
+  kept = list(manifests)
+  size, used = used_size(kept)
+  while kept and size > max_size:
+    kept.pop(0)
+    size, used = used_size(kept)
+  removed_manifests = [x[1] for x in manifests if x not in kept]
+  # also the objects left by interrupted snapshots
+  removed_objects = [x for x in sizes if x not in used]
+  print(
+      'Snapshots: {} of {} removed, {} of {} reclaimed ({})'.format(
+          len(removed_manifests),
+          len(manifests),
+          format_size(total - size),
+          format_size(total),
+          store_dir
+      )
+  )
+  if dry_run:
+    return
+  # manifests first: restore never sees a snapshot with missing objects
+  for path in removed_manifests:
+    os.unlink(path)
+  for sha in removed_objects:
+    try:
+      os.unlink(store.object_path(sha))
+    except OSError:
+      pass
+
+def main(argv, cdir):
+  parser = argparse.ArgumentParser(
+      prog='polly.py gc',
+      description='Remove least recently used build trees of the output directory'
+  )
+  parser.add_argument(
+      '--output', help="Directory polly.py was run in (polly.py --output)"
+  )
+  parser.add_argument(
+      '--max-size',
+      type=parse_size,
+      help='Evict least recently used build tags while the output directory'
+      ' is bigger (e.g. 500M, 50G)'
+  )
+  parser.add_argument(
+      '--max-age',
+      type=float,
+      help='Evict build tags not used for this number of days'
+  )
+  parser.add_argument(
+      '--keep-recent',
+      type=float,
+      default=60,
+      help='Never evict build tags used in the last N minutes'
+      ' (default: %(default)s)'
+  )
+  parser.add_argument(
+      '--dry-run',
+      action='store_true',
+      help='Report the reclaimable space, remove nothing'
+  )
+  parser.add_argument(
+      '--snapshot-max-size',
+      type=parse_size,
+      help='Remove least recently restored build directory snapshots while'
+      ' the snapshot store is bigger'
+  )
+  parser.add_argument(
+      '--snapshot-store',
+      help="Directory of the build directory snapshots (default:"
+      " 'build-snapshots' in the user cache directory)"
+  )
+  args = parser.parse_args(argv)
+
+  if args.output:
+    cdir = os.path.abspath(args.output)
+  if not os.path.isdir(cdir):
+    sys.exit('Directory not found: {}'.format(cdir))
+
+  dry_run = args.dry_run
+  if args.max_size is None and args.max_age is None:
+    dry_run = True
+    if args.snapshot_max_size is None:
+      print('NOTE: no --max-size/--max-age, report only')
+
+  now = time.time()
+  items = collect(cdir)
+  total_before = sum(x.size for x in items)
+  total_after = select(
+      items,
+      args.max_size,
+      None if args.max_age is None else args.max_age * 24 * 3600,
+      args.keep_recent * 60,
+      now
+  )
+  report(items, total_before, total_after)
+  if args.max_size is not None and total_after > args.max_size:
+    print(
+        'NOTE: over quota {}, recently used trees are kept (--keep-recent)'.format(
+            format_size(args.max_size)
+        )
+    )
+
+  if args.snapshot_max_size is not None:
+    snapshots_gc(
+        args.snapshot_store or detail.build_snapshot.default_store(),
+        args.snapshot_max_size,
+        args.dry_run
+    )
+
+  evicted = [x for x in items if x.reason]
+  if dry_run or not evicted:
+    return
+  trash_dir = detail.rmtree.trash_dir(cdir)
+  for item in evicted:
+    for path in item.paths:
+      detail.rmtree.move_to_trash(path, trash_dir)
+  detail.rmtree.start_reaper(trash_dir)
+  print('Removing {} in background'.format(format_size(total_before - total_after)))
@@ -3,35 +3,76 @@
 
 import difflib
 import os
-import sys
 
 import detail.call
+import detail.fingerprint
 
-def run(generate_command, build_dir, polly_temp_dir, reconfig, logging, output_filter=None, dry_run=False):
+def run(generate_command, build_dir, polly_temp_dir, reconfig, logging, output_filter=None, dry_run=False, toolchain_path=None, cache_path=None, mtime_barrier=None, check_cache=None):
   if not os.path.exists(polly_temp_dir):
     os.makedirs(polly_temp_dir)
   saved_arguments_path = os.path.join(polly_temp_dir, 'saved-arguments')
+  saved_fingerprint_path = os.path.join(polly_temp_dir, 'fingerprint')
   cache_file = os.path.join(build_dir, 'CMakeCache.txt')
 
   generate_command_oneline = ' '.join(
       [ '"{}"'.format(x) for x in generate_command]
   )
+  fingerprint = detail.fingerprint.get(
+      generate_command, toolchain_path, cache_path, os.environ
+  )
+
+  if reconfig:
+    reason = '--reconfig'
+  elif not os.path.exists(cache_file):
+    reason = 'no CMakeCache.txt'
+  elif not os.path.exists(saved_fingerprint_path):
+    reason = 'no saved fingerprint'
+  elif open(saved_fingerprint_path, 'r').read() != fingerprint:
+    reason = 'fingerprint changed'
+  else:
+    reason = None
 
-  if reconfig or not os.path.exists(saved_arguments_path):
-    detail.call.call(generate_command, logging, cache_file=cache_file, sleep=1, output_filter=output_filter, dry_run=dry_run)
-    open(saved_arguments_path, 'w').write(generate_command_oneline)
+  if reason is None:
+    message = 'Configure skipped (fingerprint {} matches)\n'.format(fingerprint)
+    print(message)
+    logging.write(message)
     return
 
-  # No need to generate project, just check that arguments not changed
-  expected = open(saved_arguments_path, 'r').read()
-  if expected != generate_command_oneline:
-    sys.exit(
-        "\n== WARNING ==\n"
-        "\nLooks like cmake arguments changed."
-        " You have two options to fix it:\n"
-        "  * Remove build directory completely"
-        " by adding '--clear' (works 100%)\n"
-        "  * Run configure again by adding '--reconfig'"
-        " (you must understand how CMake cache variables works/updated)\n\n"
-        "{}".format("\n".join(difflib.ndiff([expected], [generate_command_oneline])))
+  message = 'Configure: {}\n'.format(reason)
+  print(message)
+  logging.write(message)
+
+  if os.path.exists(saved_arguments_path):
+    expected = open(saved_arguments_path, 'r').read()
+    if expected != generate_command_oneline:
+      message = (
+          "\n== NOTE ==\n"
+          "\nLooks like cmake arguments changed. Project will be reconfigured,"
+          " note that removed/changed CMake cache variables may keep old values"
+          " (add '--clear' to remove build directory completely)\n\n"
+          "{}\n".format("\n".join(difflib.ndiff([expected], [generate_command_oneline])))
+      )
+      print(message)
+      logging.write(message)
+
+  if os.path.exists(saved_fingerprint_path):
+    os.unlink(saved_fingerprint_path)
+
+  # Not part of the saved arguments and fingerprint: used only for the new
+  # build directory. First, so --cache (-C) and -D options override it.
+  call_command = generate_command
+  if check_cache:
+    seed, message = check_cache.seed(build_dir)
+    message = 'Check cache: {}\n'.format(
+        message if seed else 'not used ({})'.format(message)
     )
+    print(message)
+    logging.write(message)
+    if seed:
+      call_command = generate_command[:1] + ['-C{}'.format(seed)] + generate_command[1:]
+
+  detail.call.call(call_command, logging, cache_file=cache_file, output_filter=output_filter, dry_run=dry_run, mtime_barrier=mtime_barrier)
+  if check_cache:
+    check_cache.capture(build_dir)
+  open(saved_arguments_path, 'w').write(generate_command_oneline)
+  open(saved_fingerprint_path, 'w').write(fingerprint)
@@ -0,0 +1,251 @@
+# Timing history of polly runs: SQLite database <cdir>/_logs/polly/history.sqlite
+# (see polly-stats.py)
+#
+# Failed runs are recorded too (status 'failed', phases finished before the
+# failure). The revision is read from the .git directory, the 'uncommitted
+# changes' check (git diff-index) runs in background while polly works.
+
+import hashlib
+import json
+import os
+import platform
+import subprocess
+
+try:
+  import sqlite3
+except ImportError:
+  sqlite3 = None # Python built without SQLite
+
+schema = """
+CREATE TABLE IF NOT EXISTS runs (
+  id INTEGER PRIMARY KEY,
+  started_at TEXT NOT NULL,
+  toolchain TEXT NOT NULL,
+  config TEXT,
+  jobs INTEGER,
+  host TEXT NOT NULL,
+  host_info TEXT,
+  revision TEXT,
+  dirty INTEGER,
+  seconds REAL,
+  status TEXT NOT NULL DEFAULT 'success'
+);
+CREATE TABLE IF NOT EXISTS phases (
+  run_id INTEGER NOT NULL REFERENCES runs(id),
+  name TEXT NOT NULL,
+  depth INTEGER NOT NULL,
+  seconds REAL NOT NULL,
+  cpu REAL,
+  utilization REAL,
+  peak_rss INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_toolchain ON runs(toolchain, config);
+CREATE INDEX IF NOT EXISTS phases_run ON phases(run_id);
+"""
+
+def database_path(cdir):
+  return os.path.join(cdir, '_logs', 'polly', 'history.sqlite')
+
+def connect(path):
+  connection = sqlite3.connect(path, timeout=60) # concurrent matrix runs
+  connection.executescript(schema)
+  columns = [x[1] for x in connection.execute('PRAGMA table_info(runs)')]
+  if 'status' not in columns:
+    # database of the old version: successful runs only
+    with connection:
+      connection.execute(
+          "ALTER TABLE runs ADD COLUMN status TEXT NOT NULL DEFAULT 'success'"
+      )
+  return connection
+
+def cpu_model():
+  try:
+    with open('/proc/cpuinfo', 'r') as f:
+      for line in f:
+        if line.startswith('model name'):
+          return line.split(':', 1)[1].strip()
+  except OSError:
+    pass
+  return platform.processor()
+
+def memory_total():
+  try:
+    with open('/proc/meminfo', 'r') as f:
+      for line in f:
+        if line.startswith('MemTotal:'):
+          return int(line.split()[1]) * 1024
+  except OSError:
+    pass
+  return None
+
+def host_info():
+  return {
+      'node': platform.node(),
+      'system': platform.system(),
+      'release': platform.release(),
+      'machine': platform.machine(),
+      'cpu': cpu_model(),
+      'cores': os.cpu_count(),
+      'memory': memory_total()
+  }
+
+def host_fingerprint(info):
+  content = json.dumps(info, sort_keys=True).encode('utf-8')
+  return hashlib.sha256(content).hexdigest()[:12]
+
+def git_dir(home):
+  """.git directory of the repository with `home` or None"""
+  path = os.path.abspath(home)
+  while True:
+    candidate = os.path.join(path, '.git')
+    if os.path.isdir(candidate):
+      return candidate
+    if os.path.isfile(candidate):
+      # worktree/submodule: 'gitdir: <path>'
+      with open(candidate, 'r') as f:
+        content = f.read().strip()
+      if content.startswith('gitdir:'):
+        return os.path.join(path, content[len('gitdir:'):].strip())
+      return None
+    parent = os.path.dirname(path)
+    if parent == path:
+      return None
+    path = parent
+
+def read_ref(directory, ref):
+  try:
+    with open(os.path.join(directory, ref), 'r') as f:
+      return f.read().strip()
+  except (OSError, IOError):
+    pass
+  try:
+    with open(os.path.join(directory, 'packed-refs'), 'r') as f:
+      for line in f:
+        parts = line.split()
+        if len(parts) == 2 and parts[1] == ref:
+          return parts[0]
+  except (OSError, IOError):
+    pass
+  return None
+
+def git_revision(home):
+  """Commit of HEAD read from the .git directory (None if no git)"""
+  directory = git_dir(home)
+  if directory is None:
+    return None
+  try:
+    with open(os.path.join(directory, 'HEAD'), 'r') as f:
+      head = f.read().strip()
+  except (OSError, IOError):
+    return None
+  if not head.startswith('ref:'):
+    return head or None # detached
+  ref = head[len('ref:'):].strip()
+  found = read_ref(directory, ref)
+  if found is None:
+    # worktree: branches are in the common directory
+    try:
+      with open(os.path.join(directory, 'commondir'), 'r') as f:
+        common = os.path.join(directory, f.read().strip())
+    except (OSError, IOError):
+      return None
+    found = read_ref(common, ref)
+  return found
+
+class Recorder:
+  """Record of the current run, the git checks start in background when it
+  is created (polly.py: before the build)"""
+  def __init__(self, cdir, timer, toolchain, config, jobs, home):
+    self.cdir = cdir
+    self.timer = timer
+    self.toolchain = toolchain
+    self.config = config
+    self.jobs = jobs
+    self.revision = git_revision(home)
+    self.dirty_check = None
+    if self.revision is not None:
+      try:
+        self.dirty_check = subprocess.Popen(
+            ['git', 'diff-index', '--quiet', 'HEAD', '--'],
+            cwd=home,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+      except OSError:
+        pass
+
+  def dirty(self):
+    """'Uncommitted changes' flag (None if unknown)"""
+    if self.dirty_check is None:
+      return None
+    exit_code = self.dirty_check.wait()
+    if exit_code not in [0, 1]:
+      return None # not a git repository, no HEAD
+    return exit_code == 1
+
+  def record(self, status='success'):
+    """Append the run to the database, return the path"""
+    if not self.timer.total.stopped:
+      self.timer.total.stop() # failed run
+    return record(
+        self.cdir,
+        self.timer,
+        self.toolchain,
+        self.config,
+        self.jobs,
+        self.revision,
+        self.dirty(),
+        status
+    )
+
+def record(cdir, timer, toolchain, config, jobs, revision, dirty, status):
+  """Append the stopped jobs of `timer` to the database, return the path"""
+  if sqlite3 is None:
+    return None
+  info = host_info()
+  path = database_path(cdir)
+  connection = connect(path)
+  try:
+    with connection:
+      cursor = connection.execute(
+          'INSERT INTO runs (started_at, toolchain, config, jobs, host,'
+          ' host_info, revision, dirty, seconds, status)'
+          ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+          (
+              timer.started_at(),
+              toolchain,
+              config,
+              jobs,
+              host_fingerprint(info),
+              json.dumps(info, sort_keys=True),
+              revision,
+              None if dirty is None else int(dirty),
+              timer.total.total,
+              status
+          )
+      )
+      run_id = cursor.lastrowid
+      for job in timer.jobs:
+        if not job.stopped or job.recorded:
+          continue
+        resources = job.resources
+        cpu = None
+        if 'cpu_user' in resources:
+          cpu = resources['cpu_user'] + resources['cpu_system']
+        connection.execute(
+            'INSERT INTO phases (run_id, name, depth, seconds, cpu,'
+            ' utilization, peak_rss) VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (
+                run_id,
+                job.job_name,
+                job.depth,
+                job.total,
+                cpu,
+                resources.get('utilization'),
+                resources.get('peak_rss')
+            )
+        )
+  finally:
+    connection.close()
+  return path
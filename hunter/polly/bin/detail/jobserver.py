@@ -0,0 +1,193 @@
+# POSIX jobserver shared by all the commands started by polly.
+#
+# Protocol: https://www.gnu.org/software/make/manual/html_node/POSIX-Jobserver.html
+#
+# Every free job slot is a one byte token in a pipe (or a named fifo). A client
+# reads a token before starting a job and writes it back when the job is done.
+# Each client owns one implicit slot that is not backed by a token.
+#
+# polly creates a pool with `jobs` tokens and takes one token for every child
+# started by `detail.call` (the child uses it as its implicit slot), so the
+# total number of jobs never exceeds `jobs`. Several polly processes (matrix
+# mode, concurrent runs with exported MAKEFLAGS) join the same pool. If polly
+# itself was started by a jobserver-aware make, it joins that pool and runs the
+# children in its own implicit slot.
+
+import atexit
+import errno
+import os
+import re
+import shlex
+import stat
+import sys
+import tempfile
+
+# Marks the pools created by polly: the clients of such pools have no
+# implicit slot and must take a token for every child
+polly_pool_env = 'POLLY_JOBSERVER'
+
+auth_regex = re.compile(r'^--jobserver-(auth|fds)=(.*)$')
+
+class Jobserver:
+  def __init__(self, read_fd, write_fd, auth, jobs, fifo_path=None):
+    self.read_fd = read_fd
+    self.write_fd = write_fd
+    self.auth = auth
+    self.jobs = jobs
+    self.fifo_path = fifo_path
+    self.owner = False
+    self.explicit = True
+    self.tokens = []
+
+  def makeflags(self, original):
+    """Replace -j/jobserver options of the `original` MAKEFLAGS"""
+    flags = ['-j{}'.format(self.jobs)]
+    if self.fifo_path:
+      flags.append('--jobserver-auth={}'.format(self.auth))
+    else:
+      # --jobserver-fds for GNU Make < 4.2
+      flags.append('--jobserver-fds={}'.format(self.auth))
+      flags.append('--jobserver-auth={}'.format(self.auth))
+    for x in shlex.split(original or ''):
+      if x.startswith('-j') or auth_regex.match(x):
+        continue
+      flags.append(x)
+    return ' '.join(flags)
+
+  def export(self, environ):
+    """Export the pool created by this process (clients keep MAKEFLAGS)"""
+    if not self.owner:
+      return
+    environ['MAKEFLAGS'] = self.makeflags(environ.get('MAKEFLAGS'))
+    environ[polly_pool_env] = self.auth
+
+  def pass_fds(self):
+    if self.fifo_path:
+      return ()
+    return (self.read_fd, self.write_fd)
+
+  def acquire(self):
+    if not self.explicit:
+      return
+    while True:
+      try:
+        token = os.read(self.read_fd, 1)
+      except InterruptedError:
+        continue
+      if token:
+        self.tokens.append(token)
+        return
+      sys.exit('Jobserver pipe closed')
+
+  def release(self):
+    if not self.tokens:
+      return
+    os.write(self.write_fd, self.tokens.pop())
+
+  def close(self):
+    while self.tokens:
+      self.release()
+    if self.owner and self.fifo_path and os.path.exists(self.fifo_path):
+      os.unlink(self.fifo_path)
+      os.rmdir(os.path.dirname(self.fifo_path))
+
+def create(jobs, use_fifo=False):
+  if os.name != 'posix':
+    sys.exit('Jobserver is only supported on POSIX systems')
+  if jobs < 1:
+    sys.exit('Jobserver needs at least one job slot')
+  if use_fifo:
+    fifo_path = os.path.join(tempfile.mkdtemp(prefix='polly-jobserver-'), 'fifo')
+    os.mkfifo(fifo_path, 0o600)
+    # O_RDWR: opening never blocks and the fifo never reports EOF
+    read_fd = os.open(fifo_path, os.O_RDWR)
+    write_fd = read_fd
+    auth = 'fifo:{}'.format(fifo_path)
+  else:
+    fifo_path = None
+    read_fd, write_fd = os.pipe()
+    os.set_inheritable(read_fd, True)
+    os.set_inheritable(write_fd, True)
+    auth = '{},{}'.format(read_fd, write_fd)
+  result = Jobserver(read_fd, write_fd, auth, jobs, fifo_path)
+  result.owner = True
+  if fifo_path:
+    atexit.register(result.close)
+  os.write(write_fd, b'+' * jobs)
+  return result
+
+def fd_is_pipe(fd):
+  try:
+    return stat.S_ISFIFO(os.fstat(fd).st_mode)
+  except OSError as exc:
+    if exc.errno == errno.EBADF:
+      return False
+    raise
+
+def join(environ):
+  """Join the pool described by MAKEFLAGS or return None"""
+  if os.name != 'posix':
+    return None
+  auth = None
+  for x in shlex.split(environ.get('MAKEFLAGS', '')):
+    m = auth_regex.match(x)
+    if m:
+      auth = m.group(2)
+  if not auth:
+    return None
+
+  if auth.startswith('fifo:'):
+    fifo_path = auth[len('fifo:'):]
+    if not os.path.exists(fifo_path):
+      return None
+    read_fd = os.open(fifo_path, os.O_RDWR)
+    write_fd = read_fd
+  else:
+    fifo_path = None
+    try:
+      read_fd, write_fd = [int(x) for x in auth.split(',')]
+    except ValueError:
+      return None
+    # make closes the descriptors for the commands not marked with '+'
+    if not fd_is_pipe(read_fd) or not fd_is_pipe(write_fd):
+      return None
+
+  result = Jobserver(read_fd, write_fd, auth, None, fifo_path)
+  result.explicit = (environ.get(polly_pool_env) == auth)
+  return result
+
+# Jobserver used by `detail.call`
+active = None
+
+def activate(jobserver, environ):
+  global active
+  active = jobserver
+  jobserver.export(environ)
+
+def setup(mode, jobs, environ, logging):
+  """Join the pool from the environment or create a new one"""
+  jobserver = join(environ)
+  if jobserver:
+    message = 'Join jobserver: {}\n'.format(jobserver.auth)
+  else:
+    if not jobs:
+      jobs = os.cpu_count() or 1
+    jobserver = create(jobs, use_fifo=(mode == 'fifo'))
+    message = 'Create jobserver: {} ({} jobs)\n'.format(jobserver.auth, jobs)
+  print(message)
+  logging.write(message)
+  activate(jobserver, environ)
+  return jobserver
+
+def pass_fds():
+  if active is None:
+    return ()
+  return active.pass_fds()
+
+def acquire():
+  if active is not None:
+    active.acquire()
+
+def release():
+  if active is not None:
+    active.release()
@@ -0,0 +1,167 @@
+# Rotation of the polly logs (_logs/polly/<toolchain>/log.txt):
+# * previous log (log.txt or log.txt.gz) is renamed to
+#   'log-<time of last write>.txt[.gz]' (no probing of free names)
+# * rotated logs are compressed and removed by the retention policy in a
+#   background thread while the build is running
+# * temporary files of an interrupted compression are removed an hour later
+
+import datetime
+import gzip
+import os
+import re
+import shutil
+import threading
+import time
+
+try:
+  import zstandard
+except ImportError:
+  zstandard = None # optional, 'pip install zstandard'
+
+# log-20240131-235959-123456.txt[.gz|.zst] (old versions: log-0.txt)
+rotated_regex = re.compile(r'^log-(.+)\.txt(\.gz|\.zst)?$')
+
+extensions = {'gzip': '.gz', 'zstd': '.zst'}
+
+# Temporary files of `compress`, left by an interrupted run
+temp_regex = re.compile(r'^log-.+\.txt(\.gz|\.zst)\.tmp$')
+
+# Not modified for this long: not written by a running compression
+stale_temp_seconds = 3600
+
+class Retention:
+  def __init__(self, keep=100, max_age=None, max_size=None, compression='gzip'):
+    self.keep = keep # number of rotated logs
+    self.max_age = max_age # days
+    self.max_size = max_size # bytes, all rotated logs (compressed size)
+    self.compression = compression # 'gzip', 'zstd' or 'none'
+
+def base_path(log_path):
+  """log.txt, log.txt.gz -> log"""
+  for x in extensions.values():
+    if log_path.endswith(x):
+      log_path = log_path[:-len(x)]
+  return os.path.splitext(log_path)[0]
+
+def index_path(log_path):
+  return base_path(log_path) + '.index.json'
+
+def phases_path(log_path):
+  """Directory of the per-phase logs (polly.py --log-split-phases)"""
+  return base_path(log_path) + '.phases'
+
+def rotate(log_path):
+  """Rename existing `log_path` (with index) out of the way"""
+  try:
+    mtime = os.path.getmtime(log_path)
+  except OSError:
+    return # no log
+  log_dir = os.path.dirname(log_path)
+  stamp = datetime.datetime.fromtimestamp(mtime).strftime('%Y%m%d-%H%M%S-%f')
+  extension = '.gz' if log_path.endswith('.gz') else ''
+  rotated = os.path.join(log_dir, 'log-{}.txt{}'.format(stamp, extension))
+  if os.path.exists(rotated):
+    # two logs written in the same microsecond (clock changes)
+    rotated = os.path.join(
+        log_dir, 'log-{}-{}.txt{}'.format(stamp, os.getpid(), extension)
+    )
+  os.rename(log_path, rotated)
+  for x in [index_path, phases_path]:
+    if os.path.exists(x(log_path)):
+      os.rename(x(log_path), x(rotated))
+
+def compress(path, compression):
+  """Replace `path` with compressed version (written under temporary name
+  so an interrupted run leaves only the uncompressed log)"""
+  result = path + extensions[compression]
+  temp = result + '.tmp'
+  with open(path, 'rb') as src:
+    if compression == 'zstd':
+      with open(temp, 'wb') as dst:
+        zstandard.ZstdCompressor(level=6).copy_stream(src, dst)
+    else:
+      with gzip.open(temp, 'wb', compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+  shutil.copystat(path, temp)
+  os.rename(temp, result)
+  os.unlink(path)
+  return result
+
+def rotated_logs(log_dir):
+  """Rotated logs, newest first: list of [path, mtime, size]"""
+  result = []
+  for name in os.listdir(log_dir):
+    if not rotated_regex.match(name):
+      continue
+    path = os.path.join(log_dir, name)
+    try:
+      stat = os.stat(path)
+    except OSError:
+      continue
+    result.append([path, stat.st_mtime, stat.st_size])
+  result.sort(key=lambda x: x[1], reverse=True)
+  return result
+
+def remove_stale_temps(log_dir, now):
+  for name in os.listdir(log_dir):
+    if not temp_regex.match(name):
+      continue
+    path = os.path.join(log_dir, name)
+    try:
+      if now - os.path.getmtime(path) > stale_temp_seconds:
+        os.unlink(path)
+    except OSError:
+      pass
+
+def remove(path):
+  for x in [path, index_path(path)]:
+    try:
+      os.unlink(x)
+    except OSError:
+      pass
+  shutil.rmtree(phases_path(path), ignore_errors=True)
+
+def cleanup(log_dir, retention):
+  """Apply `retention` to the rotated logs of `log_dir`, compress the rest"""
+  now = time.time()
+  remove_stale_temps(log_dir, now)
+  logs = rotated_logs(log_dir)
+  kept = []
+  total = 0
+  for entry in logs:
+    path, mtime, size = entry
+    if retention.keep is not None and len(kept) >= retention.keep:
+      remove(path)
+    elif retention.max_age is not None and now - mtime > retention.max_age * 86400:
+      remove(path)
+    else:
+      kept.append(entry)
+
+  compression = retention.compression
+  if compression == 'zstd' and zstandard is None:
+    compression = 'gzip'
+  for entry in kept:
+    if compression == 'none' or not entry[0].endswith('.txt'):
+      continue
+    try:
+      entry[0] = compress(entry[0], compression)
+      entry[2] = os.path.getsize(entry[0])
+    except (OSError, IOError):
+      pass # keep uncompressed, next run will try again
+
+  if retention.max_size is not None:
+    for path, mtime, size in kept:
+      total += size
+      if total > retention.max_size:
+        remove(path)
+
+def start(log_dir, retention):
+  """Run `cleanup` in a background thread"""
+  def run():
+    try:
+      cleanup(log_dir, retention)
+    except OSError:
+      pass # concurrent run of polly in the same directory
+  thread = threading.Thread(target=run, name='polly-log-rotation')
+  thread.start()
+  return thread
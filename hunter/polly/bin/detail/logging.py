@@ -1,14 +1,101 @@
 # Copyright (c) 2015-2017, Ruslan Baratov
 # All rights reserved.
 
+import collections
+import json
 import os
-import sys
+import re
+import threading
+
+import detail.log_rotation
+import detail.seekable_log
+
+# Lines indexed while the log is written (byte patterns, one line each):
+# * error: compiler, linker and CMake diagnostics
+# * failure: build tool/ctest lines reporting the failure (printed only if
+#   there are no errors)
+# (kind, regex, substrings), lines with one of the substrings are matched
+# with the regex (searching literals is much faster than the alternation)
+patterns = [
+    (
+        'error',
+        re.compile(
+            br'(: (fatal )?error( [A-Z]+\d+)?:|^CMake Error'
+            br'|undefined reference to|^ld: .*error)',
+            re.MULTILINE
+        ),
+        [b'rror', b'undefined reference']
+    ),
+    (
+        'warning',
+        re.compile(br'(\bwarning( [A-Z]+\d+)?:|^CMake Warning)', re.MULTILINE),
+        [b'arning']
+    ),
+    (
+        'failure',
+        re.compile(
+            br'(^FAILED: |^g?make(\[\d+\])?: \*\*\*|^ninja: build stopped'
+            br'|^\s*The following tests FAILED:)',
+            re.MULTILINE
+        ),
+        [b'FAILED', b'***', b'stopped']
+    )
+]
+
+# Offsets stored per kind (counts are exact)
+index_limit = 1000
+
+# Bytes of the log tail kept in memory for `print_last_lines`
+tail_bytes = 256 * 1024
+
+class Index:
+  """Byte offsets of error and warning lines of the log"""
+  def __init__(self):
+    self.offsets = {}
+    self.counts = {}
+    for kind, regex, keywords in patterns:
+      self.offsets[kind] = []
+      self.counts[kind] = 0
+
+  def scan(self, data, offset, kind, regex, keywords):
+    lines = set()
+    for x in keywords:
+      position = data.find(x)
+      while position != -1:
+        start = data.rfind(b'\n', 0, position) + 1
+        end = data.find(b'\n', position)
+        if end == -1:
+          end = len(data)
+        lines.add((start, end))
+        position = data.find(x, end)
+    offsets = self.offsets[kind]
+    for start, end in sorted(lines):
+      if not regex.search(data, start, end):
+        continue
+      self.counts[kind] += 1
+      if len(offsets) < index_limit:
+        offsets.append(offset + start)
+
+  def add(self, data, offset):
+    """Index `data` (complete lines) written at `offset` of the log"""
+    for kind, regex, keywords in patterns:
+      self.scan(data, offset, kind, regex, keywords)
+
+  def content(self):
+    result = {'counts': self.counts}
+    for kind in self.offsets:
+      result['{}_offsets'.format(kind)] = self.offsets[kind]
+    return result
+
+def slug(name):
+  return re.sub(r'[^A-Za-z0-9]+', '-', name).strip('-').lower() or 'phase'
 
 class Logging:
-  def __init__(self, cdir, verbosity, discard, tail_N, polly_toolchain):
+  def __init__(self, cdir, verbosity, discard, tail_N, polly_toolchain, errors_N=5, retention=None, compress=False, split_phases=False):
     self.verbosity = verbosity
     self.discard = discard
     self.tail_N = tail_N
+    self.errors_N = errors_N
 
     # Add extra 'polly_toolchain' directory so we can run two builds on
     # one directory with different toolchains in parallel
@@ -16,34 +103,211 @@ class Logging:
     if not os.path.exists(log_dir):
       os.makedirs(log_dir)
 
-    self.log_path = os.path.join(log_dir, 'log.txt')
-    if os.path.exists(self.log_path):
-      for i in range(1000):
-        try_name = 'log-{}.txt'.format(i)
-        try_path = os.path.join(log_dir, try_name)
-        if not os.path.exists(try_path):
-          os.renames(self.log_path, try_path)
-          break
-      else:
-        sys.exit(
-            'Please clean-up your logs in directory: {}'.format(log_dir)
-        )
+    for x in ['log.txt', 'log.txt.gz']:
+      detail.log_rotation.rotate(os.path.join(log_dir, x))
+
+    if compress:
+      # seekable gzip, see polly-log.py
+      self.log_path = os.path.join(log_dir, 'log.txt.gz')
+      self.log_file = detail.seekable_log.Writer(self.log_path)
+    else:
+      self.log_path = os.path.join(log_dir, 'log.txt')
+      # https://docs.python.org/3.2/library/functions.html#open
+      # 'b' - we will be writing byte objects to this file (see 'write' method)
+      self.log_file = open(self.log_path, 'wb')
+    self.index_path = detail.log_rotation.index_path(self.log_path)
 
-    # https://docs.python.org/3.2/library/functions.html#open
-    # 'b' - we will be writing byte objects to this file (see 'write' method)
-    self.log_file = open(self.log_path, 'wb')
+    if retention is None:
+      retention = detail.log_rotation.Retention()
+    self.rotation = detail.log_rotation.start(log_dir, retention)
+
+    # `write` is called from the threads of the pipelined test, the auto jobs
+    # throttle and the tee of Windows
+    self.lock = threading.Lock()
+    self.offset = 0
+    self.index = Index()
+    self.tail = collections.deque()
+    self.tail_size = 0
+
+    # Commands run by `detail.call` and phases (jobs of `detail.timer`):
+    # byte ranges of the log saved to the index
+    self.segments = []
+    self.phases = []
+    self.phases_dir = None
+    self.phase_file = None
+    if split_phases:
+      # every phase also written to its own file
+      self.phases_dir = detail.log_rotation.phases_path(self.log_path)
+      os.makedirs(self.phases_dir)
+    self.set_phase(None)
 
   # receive string 's' in various encoding and convert it to UTF-8
   def write(self, s):
-    self.log_file.write(s.encode('utf-8'))
+    data = s.encode('utf-8')
+    with self.lock:
+      self.log_file.write(data)
+      if self.phases_dir is not None:
+        if self.phase_file is None:
+          self.open_phase_file()
+        self.phase_file.write(data)
+      self.index.add(data, self.offset)
+      self.offset += len(data)
+
+      self.tail.append(data)
+      self.tail_size += len(data)
+      while self.tail_size - len(self.tail[0]) >= tail_bytes:
+        self.tail_size -= len(self.tail.popleft())
+
+  def set_phase(self, name):
+    """Start new phase of the log (`None`: outside of the timed jobs)"""
+    if name is None:
+      name = 'polly'
+    with self.lock:
+      if self.phases:
+        current = self.phases[-1]
+        if current['name'] == name:
+          return
+        current['end'] = self.offset
+        if current['end'] == current['start']:
+          self.phases.pop() # nothing written
+      if self.phase_file is not None:
+        self.phase_file.close()
+        self.phase_file = None
+      self.phases.append({'name': name, 'start': self.offset, 'end': None})
+
+  def open_phase_file(self):
+    phase = self.phases[-1]
+    number = len([x for x in self.phases if 'file' in x])
+    path = os.path.join(
+        self.phases_dir, '{:02d}-{}.txt'.format(number, slug(phase['name']))
+    )
+    self.phase_file = open(path, 'wb')
+    phase['file'] = os.path.relpath(path, os.path.dirname(self.log_path))
+
+  def phase(self):
+    return self.phases[-1]['name']
+
+  def add_segment(self, cmd_args, cwd, start, exit_code, start_time, duration, interleaved=False):
+    """Command which output was written from offset `start` to the current
+    one. If `interleaved` other commands were writing at the same time."""
+    with self.lock:
+      segment = {
+          'phase': self.phase(),
+          'cmd': cmd_args,
+          'cwd': cwd,
+          'start': start,
+          'end': self.offset,
+          'exit_code': exit_code,
+          'start_time': start_time,
+          'duration': duration
+      }
+      if interleaved:
+        segment['interleaved'] = True
+      self.segments.append(segment)
+
+  def save_index(self):
+    content = self.index.content()
+    content['log_size'] = self.offset
+    content['phases'] = self.phases
+    content['segments'] = self.segments
+    with open(self.index_path, 'w') as f:
+      json.dump(content, f, indent=2)
+
+  def close(self):
+    """Close the log and save the index next to it"""
+    if self.log_file.closed:
+      return
+    self.log_file.close()
+    if self.phase_file is not None:
+      self.phase_file.close()
+    self.phases[-1]['end'] = self.offset
+    if self.phases[-1]['start'] == self.offset and len(self.phases) > 1:
+      self.phases.pop()
+    try:
+      self.save_index()
+    except (OSError, IOError):
+      pass
+    self.rotation.join()
+
+  def context(self, f, offset, before=2, after=3):
+    """Lines around the line at `offset` (read from `f`): list of
+    (offset, line)"""
+    start = max(0, offset - 4096)
+    f.seek(start)
+    head = f.read(offset - start).split(b'\n')[:-1]
+    if start > 0:
+      head = head[1:] # partial line
+    head = head[-before:] if before else []
+    tail = f.read(4096).split(b'\n')[:after + 1]
+    if tail and not tail[-1]:
+      tail.pop()
+    result = []
+    line_offset = offset - sum(len(x) + 1 for x in head)
+    for x in head + tail:
+      result.append((line_offset, x.decode('utf-8', errors='replace')))
+      line_offset += len(x) + 1
+    return result
+
+  def print_errors(self):
+    """First errors from the log with context (seek by index)"""
+    if not self.errors_N:
+      return
+    kind = 'error'
+    if not self.index.offsets[kind]:
+      kind = 'failure'
+    offsets = self.index.offsets[kind][:self.errors_N]
+    if not offsets:
+      return
+    if not self.log_file.closed:
+      self.log_file.flush()
+    print(
+        'First {} of {} {} lines ({} warnings), index: {}\n'.format(
+            len(offsets),
+            self.index.counts[kind],
+            kind,
+            self.index.counts['warning'],
+            self.index_path
+        )
+    )
+    print('-' * 80)
+    printed = -1 # end of the last printed line
+    with detail.seekable_log.open_log(self.log_path) as f:
+      for offset in offsets:
+        if offset < printed:
+          continue # shown in the context of the previous one
+        for line_offset, line in self.context(f, offset):
+          if line_offset < printed:
+            continue
+          marker = '>' if line_offset in offsets else ' '
+          print('{}   {}'.format(marker, line))
+          printed = line_offset + 1
+        print('-' * 80)
+
+  def last_lines(self):
+    """Last `tail_N` lines: from the memory tail or, if it has fewer lines
+    (long lines, large N), read backwards from the log"""
+    data = b''.join(self.tail)
+    start = self.offset - len(data)
+    if start > 0 and data.count(b'\n') <= self.tail_N:
+      if not self.log_file.closed:
+        self.log_file.flush()
+      with detail.seekable_log.open_log(self.log_path) as f:
+        while start > 0 and data.count(b'\n') <= self.tail_N:
+          size = min(start, max(len(data), tail_bytes))
+          start -= size
+          f.seek(start)
+          data = f.read(size) + data
+    lines = data.split(b'\n')
+    if lines and not lines[-1]:
+      lines.pop()
+    return lines[-self.tail_N:]
 
   def print_last_lines(self):
     if self.tail_N is None:
       return
-    lines = open(self.log_path, 'r').readlines()
-    tail = lines[-self.tail_N:]
+    tail = self.last_lines()
     print('Last {} lines\n'.format(self.tail_N))
     print('-' * 80)
     for i in tail:
-      print('    {}'.format(i), end='')
+      print('    {}'.format(i.decode('utf-8', errors='replace')))
     print('-' * 80)
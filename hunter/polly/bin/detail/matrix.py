@@ -0,0 +1,227 @@
+# Run polly.py for several toolchains concurrently.
+#
+# Every toolchain is built by a separate polly.py process (so the environment
+# tuning, logging and `sys.exit` error handling stay per-toolchain). The
+# processes share one global jobs budget: the budget is split between
+# `min(toolchains, budget)` slots and each slot builds its toolchains one by
+# one with the `--jobs` value of the slot. With `--jobserver` the processes
+# join one jobserver pool with `budget` tokens instead.
+#
+# With `--jobs auto` the processes get `--jobs auto --jobs-max <slot jobs>`
+# (each one lowers its Makefile parallelism under memory pressure), the
+# jobserver pool of the matrix is throttled by the matrix process itself.
+
+import datetime
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+
+import detail.auto_jobs
+import detail.build_tag
+import detail.jobserver
+import detail.toolchain_table
+
+def is_glob(pattern):
+  return any(c in pattern for c in '*?[')
+
+def is_matrix(args_toolchain):
+  if not args_toolchain:
+    return False
+  return (',' in args_toolchain) or is_glob(args_toolchain)
+
+def expand(args_toolchain, registry):
+  """Expand comma-separated list of names/globs to the toolchain names"""
+  result = []
+  for pattern in args_toolchain.split(','):
+    pattern = pattern.strip()
+    if not pattern:
+      continue
+    if is_glob(pattern):
+      matched = registry.match(pattern)
+      if not matched:
+        sys.exit('No toolchains match pattern: {}'.format(pattern))
+    else:
+      if pattern not in registry:
+        sys.exit('Unknown toolchain: {}'.format(pattern))
+      matched = [pattern]
+    for name in matched:
+      if name not in result:
+        result.append(name)
+  if not result:
+    sys.exit('No toolchains specified: {}'.format(args_toolchain))
+  return result
+
+def split_jobs(budget, toolchains_number):
+  """Split `budget` between the concurrent slots"""
+  slots = max(1, min(toolchains_number, budget))
+  return [
+      budget // slots + (1 if i < budget % slots else 0) for i in range(slots)
+  ]
+
+class Run:
+  def __init__(self, toolchain, timing_path):
+    self.toolchain = toolchain
+    self.timing_path = timing_path
+    self.jobs = None
+    self.exit_code = None
+    self.wall = None
+    self.timing = None
+
+class Matrix:
+  def __init__(self, polly_py, argv, cdir, config, jobs, job_memory=None):
+    self.polly_py = polly_py
+    self.argv = argv
+    self.cdir = cdir
+    self.config = config
+    if jobs:
+      self.budget = jobs
+    else:
+      self.budget = os.cpu_count() or 1
+    self.job_memory = job_memory # --jobs auto
+    self.console_lock = threading.Lock()
+
+  def timing_path(self, toolchain):
+    entry = detail.toolchain_table.get_by_name(toolchain)
+    build_tag = detail.build_tag.get(toolchain, entry, self.config)
+    return os.path.join(
+        self.cdir, '_builds', build_tag, '_3rdParty', 'polly', 'timing.json'
+    )
+
+  def forward(self, run, pipe):
+    prefix = '[{}] '.format(run.toolchain)
+    for line in iter(pipe.readline, b''):
+      s = line.decode(encoding=sys.stdout.encoding, errors='replace')
+      s = s.rstrip()
+      with self.console_lock:
+        sys.stdout.write(prefix + s + '\n')
+        sys.stdout.flush()
+    pipe.close()
+
+  def write(self, s):
+    """Messages of the jobs throttle (`detail.logging.Logging` interface)"""
+    with self.console_lock:
+      sys.stdout.write('[matrix] ' + s)
+      sys.stdout.flush()
+
+  def execute(self, run, jobs):
+    run.jobs = jobs
+    if os.path.exists(run.timing_path):
+      os.unlink(run.timing_path)
+
+    # argparse keeps the last value of the option, so the per-toolchain
+    # values override the original ones
+    cmd = [sys.executable, self.polly_py] + self.argv + [
+        '--toolchain', run.toolchain
+    ]
+    if self.job_memory:
+      cmd += ['--jobs', 'auto', '--jobs-max', str(jobs)]
+    else:
+      cmd += ['--jobs', str(jobs)]
+
+    start = time.time()
+    p = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env=os.environ,
+        pass_fds=detail.jobserver.pass_fds()
+    )
+    self.forward(run, p.stdout)
+    run.exit_code = p.wait()
+    run.wall = time.time() - start
+
+    if os.path.exists(run.timing_path):
+      with open(run.timing_path, 'r') as f:
+        run.timing = json.load(f)
+
+  def worker(self, jobs, runs_queue):
+    while True:
+      try:
+        run = runs_queue.get_nowait()
+      except queue.Empty:
+        return
+      self.execute(run, jobs)
+
+  def run(self, toolchains):
+    runs = [Run(x, self.timing_path(x)) for x in toolchains]
+    if detail.jobserver.active:
+      slots = [self.budget] * len(runs)
+    else:
+      slots = split_jobs(self.budget, len(runs))
+
+    print(
+        'Matrix: {} toolchains, {} concurrent, jobs budget {}'.format(
+            len(runs), len(slots), self.budget
+        )
+    )
+
+    runs_queue = queue.Queue()
+    for x in runs:
+      runs_queue.put(x)
+
+    # children join the pool, only the owner can withhold the tokens
+    throttle = None
+    pool = detail.jobserver.active
+    if self.job_memory and pool and pool.owner:
+      throttle = detail.auto_jobs.Throttle(pool, self.job_memory, self)
+      throttle.start()
+
+    start = time.time()
+    threads = []
+    try:
+      for jobs in slots:
+        t = threading.Thread(target=self.worker, args=(jobs, runs_queue))
+        t.start()
+        threads.append(t)
+      for t in threads:
+        t.join()
+    finally:
+      if throttle:
+        throttle.stop()
+    total = time.time() - start
+
+    self.summary(runs, total)
+    return 0 if all(x.exit_code == 0 for x in runs) else 1
+
+  def summary(self, runs, total):
+    def pretty(seconds):
+      return '{}s'.format(datetime.timedelta(seconds=seconds))
+
+    print('-')
+    print('Matrix summary (jobs budget: {})'.format(self.budget))
+    for run in runs:
+      if run.exit_code == 0:
+        status = 'SUCCESS'
+      else:
+        status = 'FAILED (exit code {})'.format(run.exit_code)
+      print(
+          '  {}: {}, jobs: {}, wall: {}'.format(
+              run.toolchain, status, run.jobs, pretty(run.wall)
+          )
+      )
+      if run.timing:
+        for job in run.timing['jobs']:
+          print(
+              '    {}{}: {}'.format(
+                  '  ' * job.get('depth', 0), job['name'], pretty(job['seconds'])
+              )
+          )
+      if run.exit_code != 0:
+        log_path = os.path.join(
+            self.cdir, '_logs', 'polly', run.toolchain, 'log.txt'
+        )
+        print('    Log: {}'.format(log_path))
+    print('-')
+    print('Total: {}'.format(pretty(total)))
+    print('-')
+    if all(x.exit_code == 0 for x in runs):
+      print('SUCCESS')
+    else:
+      print('*** FAILED ***')
+
+def run(toolchains, polly_py, argv, cdir, config, jobs, job_memory=None):
+  return Matrix(polly_py, argv, cdir, config, jobs, job_memory).run(toolchains)
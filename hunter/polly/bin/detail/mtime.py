@@ -0,0 +1,135 @@
+# Filesystem timestamp barrier: after a command has written its outputs wait
+# until a file written later is guaranteed to get a newer mtime (make and
+# ninja compare timestamps, an edit of a source in the same timestamp tick as
+# the output would be missed by the next build).
+#
+# Timestamp resolution of the filesystem is probed once per mount point and
+# cached (memory and `mtime-resolution.json` in the user cache): nanosecond
+# filesystems (ext4, xfs, btrfs, APFS) tick with the kernel clock (few
+# milliseconds at most), FAT has 2 seconds, HFS+ and old ext3 1 second.
+# The probe file is created in a directory owned by polly on the same device
+# (never in the source tree), if there is none the fallback is used.
+
+import os
+import sys
+import tempfile
+import time
+
+import detail.user_cache
+
+cache_name = 'mtime-resolution.json'
+
+# mount key -> resolution in seconds
+resolutions = {}
+
+# Resolution used if probing failed (sleep of the old versions)
+fallback = 1.0
+
+# Directories owned by polly for the probe file (polly.py: build directory),
+# the user cache and the temporary directory are tried after them
+probe_dirs = []
+
+def mount_point(path):
+  path = os.path.realpath(path)
+  while not os.path.ismount(path):
+    parent = os.path.dirname(path)
+    if parent == path:
+      break
+    path = parent
+  return path
+
+def mount_key(path):
+  mount = mount_point(path)
+  return '{} (dev {})'.format(mount, os.stat(mount).st_dev)
+
+def probe(directory, duration=0.05):
+  """Timestamp resolution (seconds) of the filesystem of `directory`"""
+  fd, probe_path = tempfile.mkstemp(dir=directory, prefix='.polly-mtime-')
+  os.close(fd)
+  try:
+    # distinct mtimes given by the filesystem to the file touched in a loop
+    values = []
+    end = time.time() + duration
+    while time.time() < end or len(values) < 2:
+      os.utime(probe_path, None)
+      value = os.stat(probe_path).st_mtime_ns
+      if not values or values[-1] != value:
+        values.append(value)
+      if len(values) >= 6:
+        break
+      if time.time() > end and values[0] % 10**9 == 0:
+        break # coarse filesystem, don't wait for the next second
+  finally:
+    os.unlink(probe_path)
+
+  if len(values) > 1:
+    ticks = [b - a for a, b in zip(values, values[1:])]
+    return max(min(ticks), 1) / 1e9
+
+  # one value only, the largest unit it's a multiple of
+  for unit in [2 * 10**9, 10**9, 10**7, 10**6, 10**3]:
+    if values[0] % unit == 0:
+      return unit / 1e9
+  return fallback
+
+def probe_directory(directory):
+  """Directory of `probe_dirs` (or the user cache, temporary directory) on
+  the same device as `directory` or None"""
+  device = os.stat(directory).st_dev
+  for x in probe_dirs + [detail.user_cache.directory(), tempfile.gettempdir()]:
+    try:
+      if os.path.isdir(x) and os.stat(x).st_dev == device:
+        return x
+    except OSError:
+      continue
+  return None
+
+def kernel_tick():
+  """Linux stamps files with the coarse clock, probing can show finer values
+  (multigrain timestamps: only for files someone looked at)"""
+  if not sys.platform.startswith('linux') or not hasattr(time, 'clock_getres'):
+    return 0
+  try:
+    return time.clock_getres(5) # CLOCK_REALTIME_COARSE
+  except OSError:
+    return 0
+
+def resolution(directory):
+  try:
+    key = mount_key(directory)
+  except OSError:
+    return fallback
+  if key not in resolutions:
+    resolutions[key] = max(probed_resolution(directory, key), kernel_tick())
+  return resolutions[key]
+
+def probed_resolution(directory, key):
+  cache = detail.user_cache.load_json(cache_name)
+  if not isinstance(cache, dict):
+    cache = {}
+  value = cache.get(key)
+  if not isinstance(value, (int, float)) or value <= 0:
+    try:
+      probe_dir = probe_directory(directory)
+      if probe_dir is None:
+        return fallback
+      value = probe(probe_dir)
+    except OSError:
+      return fallback
+    cache[key] = value
+    detail.user_cache.save_json(cache_name, cache)
+  return value
+
+def barrier(directories):
+  """Wait until files in `directories` get mtime newer than files written
+  before the call, return waited seconds"""
+  value = max([resolution(x) for x in directories if os.path.isdir(x)] or [0])
+  if value <= 0:
+    return 0
+  # Filesystem clock can lag behind `time.time()` for up to one tick: wait one
+  # tick and then up to the tick boundary
+  start = time.time()
+  ticks = (start + value) / value
+  wait_until = (int(ticks) + 1) * value
+  time.sleep(wait_until - start)
+  return time.time() - start
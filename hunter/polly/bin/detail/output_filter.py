@@ -0,0 +1,165 @@
+# In-process output filters (polly.py --filter), applied by `detail.call` to
+# stdout and stderr of every command before the output is logged and printed.
+#
+# Specifications:
+# * 'progress': drop make/ninja progress lines
+# * 'collapse-warnings': print every distinct compiler warning only once
+# * 'drop:<regex>': drop lines matching regex
+# * 'keep:<regex>': keep only lines matching regex
+# * 'python:<module or file.py>:<name>': Python callable called for every
+#   line (with EOL), returns the line to print (possibly modified) or None
+#   to drop it. If <name> is a class a new instance is created for every
+#   stream; method `finish()` (if any) returns lines to add at the end.
+#
+# Filters see complete lines; the lines are passed in batches.
+
+import importlib
+import importlib.util
+import os
+import re
+import sys
+
+progress_regex = re.compile(
+    r'^(\[\s*\d+%\] |\[\d+/\d+\] |Scanning dependencies of target '
+    r'|Consolidate compiler generated dependencies of target '
+    r'|g?make(\[\d+\])?: (Entering|Leaving) directory )'
+)
+
+# gcc/clang 'file:1:2: warning: ...', MSVC 'file(1): warning C4996: ...'
+warning_regex = re.compile(r'(\bwarning( C\d+)?:|^CMake Warning)')
+
+class RegexFilter:
+  def __init__(self, regex, keep):
+    self.regex = regex
+    self.keep = keep
+
+  def filter(self, lines):
+    return [x for x in lines if bool(self.regex.search(x)) == self.keep]
+
+  def finish(self):
+    return []
+
+class CollapseWarnings:
+  """Drop repeated warnings (and the indented context lines after them)"""
+  def __init__(self):
+    self.seen = set()
+    self.collapsed = 0
+    self.in_collapsed = False
+
+  def filter(self, lines):
+    result = []
+    for line in lines:
+      if warning_regex.search(line):
+        if line in self.seen:
+          self.collapsed += 1
+          self.in_collapsed = True
+          continue
+        self.seen.add(line)
+        self.in_collapsed = False
+      elif self.in_collapsed and line.startswith(' '):
+        continue # source excerpt, caret, notes
+      else:
+        self.in_collapsed = False
+      result.append(line)
+    return result
+
+  def finish(self):
+    if not self.collapsed:
+      return []
+    return ['polly: {} repeated warnings collapsed\n'.format(self.collapsed)]
+
+class CallableFilter:
+  def __init__(self, function):
+    self.function = function
+
+  def filter(self, lines):
+    result = []
+    for line in lines:
+      x = self.function(line)
+      if x:
+        result.append(x if x.endswith('\n') else x + '\n')
+    return result
+
+  def finish(self):
+    finish = getattr(self.function, 'finish', None)
+    if finish is None:
+      return []
+    return [x if x.endswith('\n') else x + '\n' for x in finish()]
+
+def load_callable(spec):
+  location, sep, name = spec.rpartition(':')
+  if not location or not name:
+    sys.exit('Expected python:<module or file.py>:<name>: {}'.format(spec))
+  try:
+    if location.endswith('.py'):
+      if not os.path.isfile(location):
+        sys.exit('Filter file not found: {}'.format(location))
+      module_spec = importlib.util.spec_from_file_location(
+          'polly_filter_{}'.format(abs(hash(location))), location
+      )
+      module = importlib.util.module_from_spec(module_spec)
+      module_spec.loader.exec_module(module)
+    else:
+      module = importlib.import_module(location)
+  except ImportError as exc:
+    sys.exit('Can\'t load filter module {}: {}'.format(location, exc))
+  function = getattr(module, name, None)
+  if not callable(function):
+    sys.exit('Filter {} not found in {}'.format(name, location))
+  if isinstance(function, type):
+    return lambda: CallableFilter(function())
+  return lambda: CallableFilter(function)
+
+def compile_regex(pattern):
+  try:
+    return re.compile(pattern)
+  except re.error as exc:
+    sys.exit('Invalid filter regex {}: {}'.format(pattern, exc))
+
+def factory(spec):
+  """Function creating a new filter for `spec`"""
+  if spec == 'progress':
+    return lambda: RegexFilter(progress_regex, False)
+  if spec == 'collapse-warnings':
+    return CollapseWarnings
+  kind, sep, value = spec.partition(':')
+  if kind in ['drop', 'keep'] and sep:
+    regex = compile_regex(value)
+    return lambda: RegexFilter(regex, kind == 'keep')
+  if kind == 'python' and sep:
+    return load_callable(value)
+  sys.exit(
+      'Unknown filter: {} (expected progress, collapse-warnings,'
+      ' drop:<regex>, keep:<regex> or python:<module>:<name>)'.format(spec)
+  )
+
+class Chain:
+  def __init__(self, filters):
+    self.filters = filters
+
+  def filter(self, lines):
+    for x in self.filters:
+      lines = x.filter(lines)
+      if not lines:
+        break
+    return lines
+
+  def finish(self):
+    # lines added by a filter go through the rest of the chain
+    result = []
+    for x in self.filters:
+      result = x.filter(result) + x.finish()
+    return result
+
+# Factories of the filters used by `detail.call`
+active = []
+
+def setup(specs):
+  global active
+  active = [factory(x) for x in specs or []]
+
+def create_chain():
+  """New filter chain for one output stream or None if no filters"""
+  if not active:
+    return None
+  return Chain([x() for x in active])
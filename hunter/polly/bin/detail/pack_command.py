@@ -6,7 +6,7 @@ import subprocess
 
 import detail.call
 
-def run(config, logging, cpack_generator, cpack_bin, cmake_bin):
+def command(config, cpack_generator, cpack_bin, cmake_bin):
   pack_command = [cpack_bin]
   if os.name == 'nt':
     # use full path to cpack since Chocolatey pack command has the same name
@@ -22,4 +22,8 @@ def run(config, logging, cpack_generator, cpack_bin, cmake_bin):
   pack_command.append('--verbose')
   if cpack_generator:
     pack_command.append('-G{}'.format(cpack_generator))
+  return pack_command
+
+def run(config, logging, cpack_generator, cpack_bin, cmake_bin):
+  pack_command = command(config, cpack_generator, cpack_bin, cmake_bin)
   detail.call.call(pack_command, logging)
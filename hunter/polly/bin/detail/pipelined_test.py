@@ -0,0 +1,240 @@
+# Start tests while the rest of the project is still building.
+#
+# Tests and their targets are read from the query index (`detail.query_index`):
+# tests are listed with `ctest --show-only=json-v1` and mapped to the targets
+# through the artifacts of the CMake file API codemodel (test command is a
+# target executable).
+# A test starts as soon as its target is built:
+# * Makefiles: "Built target <name>" message in the build output
+# * Ninja: artifact path appears in .ninja_log (written when edge finished)
+#
+# Tests with DEPENDS/fixtures/RUN_SERIAL, tests not running a target
+# executable and the tests of other generators run by one ctest call after
+# the build, as in the serial path.
+
+import os
+import queue
+import re
+import threading
+import time
+
+import detail.call
+import detail.query_index
+import detail.timer
+
+built_target_regex = re.compile(r'Built target (\S+)\s*$')
+
+deferred_properties = [
+    'DEPENDS',
+    'FIXTURES_CLEANUP',
+    'FIXTURES_REQUIRED',
+    'FIXTURES_SETUP',
+    'RESOURCE_LOCK',
+    'RUN_SERIAL',
+]
+
+def message(logging, text):
+  print(text)
+  logging.write('{}\n'.format(text))
+
+def test_regex(names):
+  return '^({})$'.format('|'.join(re.escape(x) for x in names))
+
+class NinjaLogWatcher:
+  """Report outputs of finished ninja edges"""
+  def __init__(self, build_dir, on_output):
+    self.log_path = os.path.join(build_dir, '.ninja_log')
+    self.build_dir = os.path.abspath(build_dir)
+    self.on_output = on_output
+    self.offset = 0
+    if os.path.exists(self.log_path):
+      self.offset = os.path.getsize(self.log_path)
+    self.stopped = threading.Event()
+    self.thread = threading.Thread(target=self.watch)
+    self.thread.daemon = True
+
+  def poll(self):
+    if not os.path.exists(self.log_path):
+      return
+    if os.path.getsize(self.log_path) < self.offset:
+      self.offset = 0 # log recompacted
+    with open(self.log_path, 'rb') as f:
+      f.seek(self.offset)
+      data = f.read()
+    # process complete lines only
+    end = data.rfind(b'\n') + 1
+    self.offset += end
+    for line in data[:end].decode('utf-8', errors='replace').splitlines():
+      fields = line.split('\t')
+      if line.startswith('#') or len(fields) < 4:
+        continue
+      self.on_output(os.path.normpath(os.path.join(self.build_dir, fields[3])))
+
+  def watch(self):
+    while not self.stopped.wait(0.2):
+      self.poll()
+
+  def start(self):
+    self.thread.start()
+
+  def stop(self):
+    self.stopped.set()
+    self.thread.join()
+
+class Pipeline:
+  def __init__(self, build_dir, logging, test_command, all_tests, tests_by_target, artifacts, is_ninja):
+    self.build_dir = build_dir
+    self.all_tests = all_tests
+    self.logging = logging
+    self.test_command = test_command
+    self.tests_by_target = tests_by_target
+    self.artifacts = artifacts
+    self.is_ninja = is_ninja
+    self.queue = queue.Queue()
+    self.started = set()
+    self.calls = [] # (test names, exit code, start, duration)
+    self.lock = threading.Lock()
+    self.build_start = 0
+    self.build_time = 0
+    self.test_time = 0
+    self.wall = 0
+
+  def target_built(self, target):
+    with self.lock:
+      names = self.tests_by_target.pop(target, [])
+    for name in names:
+      self.queue.put(name)
+
+  def on_line(self, line):
+    m = built_target_regex.search(line)
+    if m:
+      self.target_built(m.group(1))
+
+  def on_output(self, path):
+    target = self.artifacts.get(path)
+    if target:
+      self.target_built(target)
+
+  def run_tests(self, names, cmd):
+    start = detail.timer.now()
+    start_time = time.time()
+    segment_start = self.logging.offset
+    exit_code = detail.call.teed_call(cmd, self.logging, cwd=self.build_dir)
+    duration = detail.timer.now() - start
+    self.logging.add_segment(
+        cmd,
+        self.build_dir,
+        segment_start,
+        exit_code,
+        start_time,
+        duration,
+        interleaved=True
+    )
+    with self.lock:
+      self.test_time += duration
+      self.calls.append((names, exit_code, start, duration))
+
+  def worker(self):
+    while True:
+      name = self.queue.get()
+      if name is None:
+        return
+      message(self.logging, 'Run test (pipelined): {}'.format(name))
+      self.started.add(name)
+      self.run_tests([name], self.test_command + ['-R', test_regex([name])])
+
+  def run(self, build_command, output_filter, mtime_barrier=None):
+    start = detail.timer.now()
+    worker = threading.Thread(target=self.worker)
+    worker.daemon = True
+    worker.start()
+
+    watcher = None
+    on_line = None
+    if self.is_ninja:
+      watcher = NinjaLogWatcher(self.build_dir, self.on_output)
+      watcher.start()
+    else:
+      on_line = self.on_line
+
+    self.build_start = detail.timer.now()
+    detail.call.call(
+        build_command,
+        self.logging,
+        mtime_barrier=mtime_barrier,
+        interleaved=True,
+        output_filter=output_filter,
+        on_line=on_line
+    )
+    self.build_time = detail.timer.now() - self.build_start
+    if watcher:
+      watcher.stop()
+      watcher.poll()
+
+    self.queue.put(None)
+    worker.join()
+
+    remaining = [x for x in self.all_tests if x not in self.started]
+    if remaining:
+      cmd = list(self.test_command)
+      if self.started:
+        cmd += ['-E', test_regex(sorted(self.started))]
+      message(
+          self.logging,
+          'Run remaining tests after build: {}'.format(len(remaining))
+      )
+      self.run_tests(remaining, cmd)
+
+    self.wall = detail.timer.now() - start
+
+    failed = [x for x in self.calls if x[1] != 0]
+    if failed:
+      for names, exit_code, start, duration in failed:
+        print('Test failed (exit code {}): {}'.format(exit_code, ' '.join(names)))
+      self.logging.close()
+      detail.call.exit_failed(self.logging)
+
+  def saved(self):
+    """Wall time saved compared to build followed by tests"""
+    return max(0, self.build_time + self.test_time - self.wall)
+
+def create(build_dir, config, ctest_bin, toolchain_entry, test_command, logging):
+  """Pipeline for the build or None if pipelining is not possible"""
+  if not (toolchain_entry.is_make or toolchain_entry.is_ninja) or toolchain_entry.is_nmake:
+    message(logging, 'Pipelined test: not supported for generator, run serially')
+    return None
+
+  index, rebuilt = detail.query_index.update(build_dir, config, ctest_bin)
+  if index is None:
+    message(logging, 'Pipelined test: no CMake file API reply, run serially')
+    return None
+
+  if index.tests is None:
+    message(logging, 'Pipelined test: ctest --show-only=json-v1 failed, run serially')
+    return None
+
+  tests_by_target = {}
+  all_tests = sorted(index.tests)
+  for name in all_tests:
+    test = index.tests[name]
+    if any(x in deferred_properties for x in test['properties']):
+      continue
+    if test['target']:
+      tests_by_target.setdefault(test['target'], []).append(name)
+
+  pipelined = sum(len(x) for x in tests_by_target.values())
+  message(
+      logging,
+      'Pipelined test: {} of {} tests start right after their target'.format(
+          pipelined, len(all_tests)
+      )
+  )
+  return Pipeline(
+      build_dir,
+      logging,
+      test_command,
+      all_tests,
+      tests_by_target,
+      index.artifacts(),
+      toolchain_entry.is_ninja
+  )
@@ -0,0 +1,212 @@
+# Targets, sources, tests and cache of a build directory in one file
+# (<build-dir>/_3rdParty/polly/query-index.json), read by polly-query.py and
+# the pipelined test without running CMake.
+#
+# Built from the CMake file API replies (codemodel, cache, cmakeFiles, see
+# `detail.file_api`) and `ctest --show-only=json-v1` after the configure step.
+# The index remembers the reply it was built from and is rebuilt only if
+# CMake wrote a new one (or for another configuration).
+
+import json
+import os
+import re
+
+import detail.file_api
+
+version = 1
+
+# add_test(name "command" ...), name is bare or [=[bracketed]=]
+add_test_regex = re.compile(
+    r'^add_test\(\s*(?:\[(=*)\[(.*?)\]\1\]|(\S+))\s+"([^"]*)"', re.MULTILINE
+)
+subdirs_regex = re.compile(r'^subdirs\(\s*"([^"]*)"\s*\)', re.MULTILINE)
+
+def path(build_dir):
+  return os.path.join(build_dir, '_3rdParty', 'polly', 'query-index.json')
+
+def list_tests(ctest_bin, build_dir, config):
+  import subprocess # not needed by the queries of polly-query.py
+  cmd = [ctest_bin, '--show-only=json-v1']
+  if config:
+    cmd += ['-C', config]
+  try:
+    output = subprocess.check_output(
+        cmd, cwd=build_dir, stderr=subprocess.DEVNULL, universal_newlines=True
+    )
+    return json.loads(output)['tests']
+  except (OSError, subprocess.CalledProcessError, ValueError, KeyError):
+    return None
+
+def testfile_commands(build_dir):
+  """Map test name -> executable from CTestTestfile.cmake files"""
+  result = {}
+  stack = [os.path.abspath(build_dir)]
+  while stack:
+    directory = stack.pop()
+    testfile = os.path.join(directory, 'CTestTestfile.cmake')
+    if not os.path.isfile(testfile):
+      continue
+    with open(testfile, 'r', errors='replace') as f:
+      content = f.read()
+    for m in add_test_regex.finditer(content):
+      name = m.group(2) if m.group(2) is not None else m.group(3)
+      result.setdefault(name, m.group(4))
+    for subdir in subdirs_regex.findall(content):
+      stack.append(os.path.join(directory, subdir))
+  return result
+
+def build(build_dir, config, ctest_bin):
+  """Create the index from the current replies (None if there are none)"""
+  replies = detail.file_api.responses(build_dir)
+  target_list = detail.file_api.targets(build_dir, config)
+  if not replies or target_list is None:
+    return None
+  build_dir = os.path.abspath(build_dir)
+  codemodel = replies['codemodel']
+  source_dir = codemodel['paths']['source']
+
+  def absolute(root, x):
+    return os.path.normpath(os.path.join(root, x))
+
+  names = {x['id']: x['name'] for x in target_list}
+  targets = {}
+  for target in target_list:
+    targets[target['name']] = {
+        'type': target['type'],
+        'directory': absolute(source_dir, target['paths']['source']),
+        'artifacts': [
+            absolute(build_dir, x['path']) for x in target.get('artifacts', [])
+        ],
+        'sources': [
+            absolute(source_dir, x['path']) for x in target.get('sources', [])
+        ],
+        'dependencies': sorted(
+            names[x['id']] for x in target.get('dependencies', [])
+            if x['id'] in names
+        )
+    }
+
+  cache = {}
+  for entry in replies.get('cache', {}).get('entries', []):
+    cache[entry['name']] = [entry['type'], entry['value']]
+
+  inputs = []
+  cmake_files = replies.get('cmakeFiles', {})
+  for x in cmake_files.get('inputs', []):
+    if not x.get('isCMake') and not x.get('isGenerated'):
+      inputs.append(absolute(cmake_files['paths']['source'], x['path']))
+
+  tests = None
+  test_list = list_tests(ctest_bin, build_dir, config)
+  if test_list is not None:
+    artifacts = {}
+    for name, target in targets.items():
+      for x in target['artifacts']:
+        artifacts[x] = name
+    testfile = None
+    tests = {}
+    for test in test_list:
+      command = test.get('command')
+      if not command:
+        # executable doesn't exist yet
+        if testfile is None:
+          testfile = testfile_commands(build_dir)
+        command = [testfile[test['name']]] if test['name'] in testfile else []
+      properties = {x['name']: x['value'] for x in test.get('properties', [])}
+      tests[test['name']] = {
+          'command': command,
+          'target': artifacts.get(os.path.normpath(command[0])) if command else None,
+          'labels': properties.pop('LABELS', []),
+          'properties': sorted(properties)
+      }
+
+  index = {
+      'version': version,
+      'reply': detail.file_api.reply_index(build_dir),
+      'config': config,
+      'build_dir': build_dir,
+      'source_dir': source_dir,
+      'targets': targets,
+      'tests': tests,
+      'cache': cache,
+      'inputs': inputs
+  }
+  index_path = path(build_dir)
+  if not os.path.exists(os.path.dirname(index_path)):
+    os.makedirs(os.path.dirname(index_path))
+  temp_path = index_path + '.tmp'
+  with open(temp_path, 'w') as f:
+    json.dump(index, f, separators=(',', ':'), sort_keys=True)
+  os.replace(temp_path, index_path)
+  return Index(index)
+
+def load(build_dir):
+  """Saved index or None"""
+  try:
+    with open(path(build_dir), 'r') as f:
+      content = json.load(f)
+  except (OSError, IOError, ValueError):
+    return None
+  if content.get('version') != version:
+    return None
+  return Index(content)
+
+def update(build_dir, config, ctest_bin):
+  """Index of the latest reply: (index or None, True if rebuilt)"""
+  index = load(build_dir)
+  if index and index.matches(build_dir, config):
+    return index, False
+  return build(build_dir, config, ctest_bin), True
+
+class Index:
+  def __init__(self, content):
+    self.content = content
+    self.targets = content['targets']
+    self.tests = content['tests']
+    self.cache = content['cache']
+    self.inputs = content['inputs']
+    self._owners = None
+
+  def matches(self, build_dir, config):
+    return (
+        self.content['reply'] == detail.file_api.reply_index(build_dir) and
+        self.content['config'] == config
+    )
+
+  def artifacts(self):
+    """Map absolute artifact path -> target name"""
+    result = {}
+    for name, target in self.targets.items():
+      for x in target['artifacts']:
+        result[x] = name
+    return result
+
+  def owners(self, source):
+    """Targets with `source` (absolute path)"""
+    if self._owners is None:
+      self._owners = {}
+      for name, target in self.targets.items():
+        for x in target['sources']:
+          self._owners.setdefault(x, []).append(name)
+    return sorted(self._owners.get(os.path.normpath(source), []))
+
+  def dependents(self, names):
+    """`names` and all targets depending on them (directly or not)"""
+    users = {}
+    for name, target in self.targets.items():
+      for x in target['dependencies']:
+        users.setdefault(x, []).append(name)
+    result = set()
+    stack = list(names)
+    while stack:
+      name = stack.pop()
+      if name not in result:
+        result.add(name)
+        stack.extend(users.get(name, []))
+    return result
+
+  def tests_of(self, names):
+    """Tests running one of the targets `names`"""
+    return sorted(
+        test for test, x in (self.tests or {}).items() if x['target'] in names
+    )
@@ -4,10 +4,16 @@
 # Call native tools to remove directory recursively. Use this command instead
 # of shutils.rmtree because of different glitches like impossibility to remove
 # directory with files with long path on Windows.
+#
+# Asynchronous removal: directory is renamed into the trash directory on the
+# same filesystem and removed by a detached low priority reaper process
+# (this file run as a script). Trash left by crashed runs is collected by the
+# reaper started on the next run.
 
 import os
 import subprocess
 import sys
+import time
 
 def rmtree(dir_path):
   if not os.path.exists(dir_path):
@@ -21,3 +27,141 @@ def rmtree(dir_path):
   # sanity check
   if os.path.exists(dir_path):
     sys.exit("Directory removing failed ({})".format(dir_path))
+
+def trash_dir(cdir):
+  return os.path.join(cdir, '_trash')
+
+def move_to_trash(dir_path, trash):
+  """Rename `dir_path` into `trash`, remove synchronously if not possible"""
+  if not os.path.exists(dir_path):
+    return
+  if not os.path.exists(trash):
+    os.makedirs(trash)
+  name = '{}-{}-{}'.format(
+      os.path.basename(os.path.normpath(dir_path)), os.getpid(), time.time()
+  )
+  destination = os.path.join(trash, name)
+  try:
+    os.rename(dir_path, destination)
+  except OSError as exc:
+    # e.g. EXDEV: directory is a mount point or on another filesystem
+    print('Can\'t move {} to trash ({}), remove now'.format(dir_path, exc))
+    rmtree(dir_path)
+    return
+  print("Move directory to trash: {} -> {}".format(dir_path, destination))
+
+def trash_entries(trash):
+  if not os.path.isdir(trash):
+    return []
+  return [x for x in os.listdir(trash) if x != lock_name]
+
+def start_reaper(trash):
+  """Start detached process removing the content of `trash` (if any)"""
+  if not trash_entries(trash):
+    return
+  # -I: directory of the script is not in sys.path ('detail/logging.py')
+  cmd = [sys.executable, '-I', os.path.realpath(__file__), trash]
+  kwargs = {
+      'stdin': subprocess.DEVNULL,
+      'stdout': subprocess.DEVNULL,
+      'stderr': subprocess.DEVNULL,
+      'close_fds': True
+  }
+  if os.name == 'nt':
+    kwargs['creationflags'] = (
+        subprocess.DETACHED_PROCESS |
+        subprocess.CREATE_NEW_PROCESS_GROUP |
+        subprocess.IDLE_PRIORITY_CLASS
+    )
+  else:
+    kwargs['start_new_session'] = True
+  subprocess.Popen(cmd, **kwargs)
+
+### Reaper
+
+lock_name = '.reaper.lock'
+
+def remove_files(directory):
+  """Remove files of `directory`, return subdirectories"""
+  subdirs = []
+  try:
+    entries = list(os.scandir(directory))
+  except FileNotFoundError:
+    return subdirs
+  for entry in entries:
+    try:
+      if entry.is_dir(follow_symlinks=False):
+        subdirs.append(entry.path)
+      else:
+        os.unlink(entry.path)
+    except FileNotFoundError:
+      pass
+  return subdirs
+
+def parallel_remove(path, workers):
+  import concurrent.futures
+
+  if not os.path.isdir(path) or os.path.islink(path):
+    os.unlink(path)
+    return
+  directories = [path]
+  with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+    pending = {pool.submit(remove_files, path)}
+    while pending:
+      done, pending = concurrent.futures.wait(
+          pending, return_when=concurrent.futures.FIRST_COMPLETED
+      )
+      for future in done:
+        for subdir in future.result():
+          directories.append(subdir)
+          pending.add(pool.submit(remove_files, subdir))
+  # parents are added before children
+  for directory in reversed(directories):
+    try:
+      os.rmdir(directory)
+    except FileNotFoundError:
+      pass
+
+def lower_priority():
+  if os.name == 'nt':
+    return # IDLE_PRIORITY_CLASS
+  os.nice(19)
+  if sys.platform.startswith('linux'):
+    # idle I/O scheduling class
+    try:
+      subprocess.call(
+          ['ionice', '-c', '3', '-p', str(os.getpid())],
+          stdout=subprocess.DEVNULL,
+          stderr=subprocess.DEVNULL
+      )
+    except OSError:
+      pass
+
+def reap(trash):
+  lock_file = open(os.path.join(trash, lock_name), 'w')
+  if os.name != 'nt':
+    import fcntl
+    try:
+      fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+      return # another reaper is running
+  lower_priority()
+  workers = min(8, (os.cpu_count() or 1) * 2)
+  failed = set()
+  while True:
+    # entries moved by other polly runs while removing are picked up too
+    entries = [x for x in trash_entries(trash) if x not in failed]
+    if not entries:
+      break
+    for name in entries:
+      path = os.path.join(trash, name)
+      try:
+        if os.name == 'nt':
+          subprocess.check_call(['cmd', '/c', 'rmdir', path, '/S', '/Q'])
+        else:
+          parallel_remove(path, workers)
+      except (OSError, subprocess.CalledProcessError):
+        failed.add(name) # e.g. permissions, retried on the next run
+
+if __name__ == '__main__':
+  reap(sys.argv[1])
@@ -0,0 +1,142 @@
+# Resources used by the child processes of polly:
+# * CPU time: getrusage(RUSAGE_CHILDREN) (children that were waited for)
+# * peak RSS: wait4() of every child started by `detail.call`
+#   (ru_maxrss of RUSAGE_CHILDREN is the maximum over the whole run)
+# * disk I/O: /proc/self/io, includes reaped children (Linux only)
+
+import os
+import sys
+import threading
+
+try:
+  import resource
+except ImportError:
+  resource = None # Windows
+
+# Snapshots of the running jobs: get the peak RSS in bytes of every waited
+# child (with its descendants) until `delta` is called
+open_snapshots = []
+open_snapshots_lock = threading.Lock() # children are waited in threads
+
+def maxrss_bytes(rusage):
+  if sys.platform == 'darwin':
+    return rusage.ru_maxrss
+  return rusage.ru_maxrss * 1024 # KiB
+
+def exit_code(status):
+  """Exit code in `subprocess.Popen.returncode` convention"""
+  if os.WIFSIGNALED(status):
+    return -os.WTERMSIG(status)
+  return os.WEXITSTATUS(status)
+
+def wait(popen):
+  """Wait for `popen` and record its resources, return exit code"""
+  return wait_rusage(popen)[0]
+
+def wait_rusage(popen):
+  """Wait for `popen` and record its resources, return exit code and
+  resources of the child (None if not available)"""
+  if not hasattr(os, 'wait4'):
+    return popen.wait(), None
+  while True:
+    try:
+      pid, status, rusage = os.wait4(popen.pid, 0)
+      break
+    except InterruptedError:
+      continue
+    except ChildProcessError:
+      return popen.wait(), None # already waited
+  popen.returncode = exit_code(status)
+  peak_rss = maxrss_bytes(rusage)
+  with open_snapshots_lock:
+    for x in open_snapshots:
+      x.peak_rss = max(x.peak_rss or 0, peak_rss)
+  return popen.returncode, {
+      'cpu_user': rusage.ru_utime,
+      'cpu_system': rusage.ru_stime,
+      'peak_rss': peak_rss
+  }
+
+def cores():
+  if hasattr(os, 'sched_getaffinity'):
+    return len(os.sched_getaffinity(0))
+  return os.cpu_count() or 1
+
+def io_counters():
+  """Bytes read/written from storage by polly and its reaped children"""
+  try:
+    with open('/proc/self/io', 'r') as f:
+      content = f.read()
+  except OSError:
+    return None
+  result = {}
+  for line in content.splitlines():
+    name, sep, value = line.partition(':')
+    if name in ['read_bytes', 'write_bytes']:
+      result[name] = int(value)
+  return result
+
+class Snapshot:
+  def __init__(self, track=True):
+    if resource:
+      usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+      self.cpu = (usage.ru_utime, usage.ru_stime)
+    else:
+      self.cpu = None
+    self.io = io_counters()
+    self.peak_rss = None
+    if track:
+      with open_snapshots_lock:
+        open_snapshots.append(self)
+
+  def delta(self, wall):
+    """Resources used since the snapshot by the job running `wall` seconds"""
+    end = Snapshot(track=False)
+    with open_snapshots_lock:
+      if self in open_snapshots:
+        open_snapshots.remove(self)
+    result = {}
+    if self.cpu and end.cpu:
+      result['cpu_user'] = end.cpu[0] - self.cpu[0]
+      result['cpu_system'] = end.cpu[1] - self.cpu[1]
+      result['cores'] = cores()
+      if wall > 0:
+        cpu = result['cpu_user'] + result['cpu_system']
+        result['utilization'] = cpu / (wall * result['cores'])
+    if self.peak_rss is not None:
+      result['peak_rss'] = self.peak_rss
+    if self.io and end.io:
+      for name in self.io:
+        result[name] = end.io[name] - self.io[name]
+    return result
+
+def mebibytes(value):
+  return '{:.1f} MiB'.format(value / (1024 * 1024))
+
+def describe(resources):
+  """One line summary of `Snapshot.delta` result"""
+  result = []
+  if 'cpu_user' in resources:
+    result.append(
+        'cpu {:.2f}s (user {:.2f}s, system {:.2f}s)'.format(
+            resources['cpu_user'] + resources['cpu_system'],
+            resources['cpu_user'],
+            resources['cpu_system']
+        )
+    )
+  if 'utilization' in resources:
+    result.append(
+        'utilization {:.0f}% of {} cores'.format(
+            resources['utilization'] * 100, resources['cores']
+        )
+    )
+  if 'peak_rss' in resources:
+    result.append('peak RSS {}'.format(mebibytes(resources['peak_rss'])))
+  if 'read_bytes' in resources:
+    result.append(
+        'disk read {}, write {}'.format(
+            mebibytes(resources['read_bytes']),
+            mebibytes(resources['write_bytes'])
+        )
+    )
+  return ', '.join(result)
@@ -0,0 +1,228 @@
+# Compressed log which can be read from the middle (polly.py --compress-log).
+#
+# File is a sequence of gzip members (valid gzip file, zcat works), every
+# member holds one block of the log (256 KiB by default). Header of every
+# member has extra subfield 'PL' with the compressed size of the member (the
+# same trick as BGZF) and the trailer has the uncompressed size, so the block
+# index is built by jumping from header to header without decompression.
+#
+# Blocks are compressed by a background thread, the writer only copies data.
+
+import gzip
+import io
+import os
+import queue
+import struct
+import threading
+import zlib
+
+block_size = 1 << 18
+
+# magic, CM=deflate, FLG=FEXTRA, MTIME=0, XFL=0, OS=unknown, XLEN=8
+header_prefix = b'\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x08\x00'
+subfield_id = b'PL'
+header_size = len(header_prefix) + 8 # subfield: id, length, member size
+
+def compress_block(data, level):
+  compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+  body = compressor.compress(data) + compressor.flush()
+  trailer = struct.pack('<II', zlib.crc32(data) & 0xffffffff, len(data))
+  member_size = header_size + len(body) + len(trailer)
+  header = header_prefix + subfield_id + struct.pack('<HI', 4, member_size)
+  return header + body + trailer
+
+class Writer:
+  """File-like (write, flush, close) object writing the blocks"""
+  def __init__(self, path, level=6, size=block_size):
+    self.file = open(path, 'wb')
+    self.level = level
+    self.size = size
+    self.pending = []
+    self.pending_size = 0
+    self.lock = threading.Lock()
+    self.closed = False
+    self.queue = queue.Queue(maxsize=16)
+    self.error = None
+    self.worker = threading.Thread(target=self.run, name='polly-log-compress')
+    self.worker.daemon = True
+    self.worker.start()
+
+  def run(self):
+    while True:
+      item = self.queue.get()
+      if item is None:
+        return
+      data, done = item
+      try:
+        if data:
+          self.file.write(compress_block(data, self.level))
+        if done is not None:
+          self.file.flush()
+          done.set()
+      except (OSError, IOError) as exc:
+        self.error = exc
+        if done is not None:
+          done.set()
+
+  def write(self, data):
+    with self.lock:
+      self.pending.append(data)
+      self.pending_size += len(data)
+      if self.pending_size >= self.size:
+        self.submit(None)
+
+  def submit(self, done):
+    data = b''.join(self.pending)
+    self.pending = []
+    self.pending_size = 0
+    self.queue.put((data, done))
+
+  def flush(self):
+    """Write everything (as a short block) and wait for the worker"""
+    done = threading.Event()
+    with self.lock:
+      self.submit(done)
+    done.wait()
+
+  def close(self):
+    if self.closed:
+      return
+    self.flush()
+    self.queue.put(None)
+    self.worker.join()
+    self.file.close()
+    self.closed = True
+    if self.error:
+      raise self.error
+
+class Block:
+  def __init__(self, offset, file_offset, file_size, size):
+    self.offset = offset # in the uncompressed log
+    self.file_offset = file_offset
+    self.file_size = file_size
+    self.size = size
+
+def read_blocks(f):
+  """Block index of the seekable log `f` (None if it's a different gzip);
+  blocks truncated by a crash are ignored"""
+  blocks = []
+  file_offset = 0
+  offset = 0
+  f.seek(0, os.SEEK_END)
+  file_size = f.tell()
+  while file_offset + header_size <= file_size:
+    f.seek(file_offset)
+    header = f.read(header_size)
+    if header[:4] != header_prefix[:4] or header[12:14] != subfield_id:
+      return None if not blocks else blocks
+    member_size = struct.unpack('<I', header[16:20])[0]
+    if file_offset + member_size > file_size:
+      break
+    f.seek(file_offset + member_size - 4)
+    size = struct.unpack('<I', f.read(4))[0]
+    blocks.append(Block(offset, file_offset, member_size, size))
+    offset += size
+    file_offset += member_size
+  return blocks
+
+def is_seekable_log(path):
+  with open(path, 'rb') as f:
+    header = f.read(header_size)
+  return header[:4] == header_prefix[:4] and header[12:14] == subfield_id
+
+class Reader(io.RawIOBase):
+  """Random access to the seekable log (read, seek, tell)"""
+  def __init__(self, path):
+    self.file = open(path, 'rb')
+    self.blocks = read_blocks(self.file) or []
+    self.size = sum(x.size for x in self.blocks)
+    self.position = 0
+    self.cache = (None, None) # last decompressed block
+
+  def readable(self):
+    return True
+
+  def seekable(self):
+    return True
+
+  def block_index(self, offset):
+    low = 0
+    high = len(self.blocks)
+    while low < high:
+      middle = (low + high) // 2
+      block = self.blocks[middle]
+      if offset < block.offset:
+        high = middle
+      elif offset >= block.offset + block.size:
+        low = middle + 1
+      else:
+        return middle
+    return None
+
+  def block_data(self, index):
+    if self.cache[0] == index:
+      return self.cache[1]
+    block = self.blocks[index]
+    self.file.seek(block.file_offset + header_size)
+    body = self.file.read(block.file_size - header_size - 8)
+    data = zlib.decompress(body, -zlib.MAX_WBITS)
+    self.cache = (index, data)
+    return data
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    if whence == os.SEEK_CUR:
+      offset += self.position
+    elif whence == os.SEEK_END:
+      offset += self.size
+    self.position = max(0, offset)
+    return self.position
+
+  def tell(self):
+    return self.position
+
+  def read(self, size=-1):
+    if size is None or size < 0:
+      size = self.size - self.position
+    result = []
+    while size > 0:
+      index = self.block_index(self.position)
+      if index is None:
+        break
+      block = self.blocks[index]
+      data = self.block_data(index)
+      start = self.position - block.offset
+      chunk = data[start:start + size]
+      result.append(chunk)
+      self.position += len(chunk)
+      size -= len(chunk)
+    return b''.join(result)
+
+  def readinto(self, buffer):
+    data = self.read(len(buffer))
+    buffer[:len(data)] = data
+    return len(data)
+
+  def iter_blocks(self, start=0, end=None):
+    """Uncompressed data from `start` to `end` block by block"""
+    if end is None:
+      end = self.size
+    index = self.block_index(start)
+    while index is not None and index < len(self.blocks):
+      block = self.blocks[index]
+      if block.offset >= end:
+        break
+      data = self.block_data(index)
+      yield data[max(0, start - block.offset):end - block.offset]
+      index += 1
+
+  def close(self):
+    self.file.close()
+    super().close()
+
+def open_log(path):
+  """Binary file object with seek/read for plain, seekable or gzip log"""
+  if not path.endswith('.gz'):
+    return open(path, 'rb')
+  if is_seekable_log(path):
+    return Reader(path)
+  return gzip.open(path, 'rb') # rotated log: seek works, but decompresses
@@ -0,0 +1,53 @@
+# Small statistics helpers for polly-stats.py (no third-party dependencies)
+
+import math
+
+def percentile(values, p):
+  """Linear interpolation between the closest ranks, `p` in [0, 100]"""
+  values = sorted(values)
+  if not values:
+    return None
+  position = (len(values) - 1) * p / 100
+  lower = int(math.floor(position))
+  upper = int(math.ceil(position))
+  fraction = position - lower
+  return values[lower] + (values[upper] - values[lower]) * fraction
+
+def median(values):
+  return percentile(values, 50)
+
+def ranks(values):
+  """Ranks (1-based, ties get the average rank) and tie group sizes"""
+  order = sorted(range(len(values)), key=lambda i: values[i])
+  result = [0] * len(values)
+  ties = []
+  i = 0
+  while i < len(order):
+    j = i
+    while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+      j += 1
+    rank = (i + j) / 2 + 1
+    for k in range(i, j + 1):
+      result[order[k]] = rank
+    ties.append(j - i + 1)
+    i = j + 1
+  return result, ties
+
+def mann_whitney(a, b):
+  """Two-sided Mann-Whitney U test: U statistic of `a` and p-value
+  (normal approximation with tie and continuity correction)"""
+  n1 = len(a)
+  n2 = len(b)
+  if n1 == 0 or n2 == 0:
+    return None, None
+  combined_ranks, ties = ranks(list(a) + list(b))
+  u = sum(combined_ranks[:n1]) - n1 * (n1 + 1) / 2
+  n = n1 + n2
+  mean = n1 * n2 / 2
+  tie_correction = sum(t ** 3 - t for t in ties) / (n * (n - 1)) if n > 1 else 0
+  variance = n1 * n2 / 12 * ((n + 1) - tie_correction)
+  if variance <= 0:
+    return u, 1.0 # all values are equal
+  z = (abs(u - mean) - 0.5) / math.sqrt(variance)
+  p = math.erfc(max(z, 0) / math.sqrt(2))
+  return u, min(p, 1.0)
@@ -3,7 +3,7 @@
 
 import detail.call
 
-def run(build_dir, config, logging, test_xml, verbose, timeout, ctest_bin):
+def command(config, test_xml, verbose, timeout, ctest_bin):
   test_command = [ctest_bin]
   if test_xml:
     test_command.append('-T')
@@ -16,5 +16,9 @@ def run(build_dir, config, logging, test_xml, verbose, timeout, ctest_bin):
   if timeout:
     test_command.append('--timeout')
     test_command.append(str(timeout))
+  return test_command
+
+def run(build_dir, config, logging, test_xml, verbose, timeout, ctest_bin):
+  test_command = command(config, test_xml, verbose, timeout, ctest_bin)
   print('Run tests')
   detail.call.call(test_command, logging)
@@ -2,39 +2,61 @@
 # All rights reserved.
 
 import datetime
+import json
+import os
 import sys
 import time
 
+import detail.rusage
+
 perf_counter_available = (sys.version_info.minor >= 3)
 
+def now():
+  if perf_counter_available:
+    return time.perf_counter()
+  return 0
+
 class Job:
-  def __init__(self, job_name):
-    if perf_counter_available:
-      self.start = time.perf_counter()
-    else:
-      self.start = 0
+  def __init__(self, job_name, parent=None):
+    self.start = now()
     self.job_name = job_name
+    self.parent = parent
+    self.depth = 0 if parent is None else parent.depth + 1
     self.stopped = False
+    self.recorded = False
+    self.resources_start = detail.rusage.Snapshot()
+    self.resources = {}
 
   def stop(self):
     if self.stopped:
       sys.exit('Already stopped')
     self.stopped = True
-    if perf_counter_available:
-      self.total = time.perf_counter() - self.start
-    else:
-      self.total = 0
+    self.end = now()
+    self.total = self.end - self.start
+    self.resources = self.resources_start.delta(self.total)
 
   def result(self):
     if not self.stopped:
       sys.exit("Stop the job before result")
     print(
-        '{}: {}s'.format(self.job_name, datetime.timedelta(seconds=self.total))
+        '{}{}: {}s'.format(
+            '  ' * self.depth,
+            self.job_name,
+            datetime.timedelta(seconds=self.total)
+        )
     )
 
 class Timer:
-  def __init__(self):
+  """Jobs started while another job is running are nested into it.
+
+  Events of the child processes (ninja edges, cmake profile, tests) are
+  added by `add_event` and saved with the jobs by `save_trace`."""
+  def __init__(self, logging=None):
+    self.logging = logging # log segments follow the running job
     self.jobs = []
+    self.running = []
+    self.events = []
+    self.wall_start = time.time()
     self.total = Job('Total')
 
   def start(self, job_name):
@@ -43,12 +65,44 @@ class Timer:
     for i in self.jobs:
       if i.job_name == job_name:
         sys.exit('Job already exists: {}'.format(job_name))
-    self.jobs.append(Job(job_name))
+    parent = self.running[-1] if self.running else None
+    job = Job(job_name, parent)
+    self.jobs.append(job)
+    self.running.append(job)
+    self.phase_changed()
 
   def stop(self):
-    if len(self.jobs) == 0:
+    if len(self.running) == 0:
       sys.exit("No jobs to stop")
-    self.jobs[-1].stop()
+    self.running.pop().stop()
+    self.phase_changed()
+
+  def phase_changed(self):
+    if self.logging is None:
+      return
+    if self.running:
+      self.logging.set_phase(self.running[-1].job_name)
+    else:
+      self.logging.set_phase(None)
+
+  def record(self, job_name, seconds):
+    """Add already measured job (e.g. wall time saved by overlapping)"""
+    self.start(job_name)
+    job = self.running.pop()
+    self.phase_changed()
+    job.stopped = True
+    job.recorded = True
+    job.total = seconds
+
+  def job(self, job_name):
+    for i in self.jobs:
+      if i.job_name == job_name:
+        return i
+    return None
+
+  def add_event(self, name, category, start, duration, args=None):
+    """Event of a child process, `start` is a `now()` value"""
+    self.events.append((name, category, start, duration, args))
 
   def result(self):
     if not perf_counter_available:
@@ -59,3 +113,131 @@ class Timer:
     print('-')
     self.total.stop()
     self.total.result()
+    print('-')
+    print('Resources used by child processes:')
+    for i in self.jobs + [self.total]:
+      if i.resources:
+        print(
+            '{}{}: {}'.format(
+                '  ' * i.depth, i.job_name, detail.rusage.describe(i.resources)
+            )
+        )
+
+  def offset(self, value):
+    """Seconds since the timer creation"""
+    return value - self.total.start
+
+  def started_at(self):
+    return datetime.datetime.fromtimestamp(self.wall_start).isoformat()
+
+  def save(self, path):
+    """Save stopped jobs and event totals to `path` as JSON
+    (read by the matrix mode)"""
+    if not perf_counter_available:
+      return
+    jobs = []
+    for i in self.jobs:
+      if not i.stopped:
+        continue
+      job = {'name': i.job_name, 'seconds': i.total, 'depth': i.depth}
+      if i.resources:
+        job['resources'] = i.resources
+      if i.parent:
+        job['parent'] = i.parent.job_name
+      if not i.recorded:
+        job['start'] = self.offset(i.start)
+        job['end'] = self.offset(i.end)
+      jobs.append(job)
+    # Events can nest or overlap: save the number and the time span
+    events = {}
+    for name, category, start, duration, args in self.events:
+      start = self.offset(start)
+      end = start + duration
+      summary = events.setdefault(
+          category, {'count': 0, 'start': start, 'end': end}
+      )
+      summary['count'] += 1
+      summary['start'] = min(summary['start'], start)
+      summary['end'] = max(summary['end'], end)
+    result = {
+        'started_at': self.started_at(),
+        'jobs': jobs,
+        'events': events,
+        'total': self.total.total if self.total.stopped else None,
+        'resources': self.total.resources
+    }
+    with open(path, 'w') as f:
+      json.dump(result, f, indent=2)
+
+  def save_trace(self, path, process_name):
+    """Save jobs and events to `path` in Chrome trace event format
+    (chrome://tracing, https://ui.perfetto.dev)"""
+    if not perf_counter_available:
+      return
+    pid = os.getpid()
+    def microseconds(value):
+      return int(round(value * 1000000))
+
+    trace = [{
+        'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0,
+        'args': {'name': process_name}
+    }]
+
+    for i in self.jobs:
+      if not i.stopped or i.recorded:
+        continue
+      trace.append({
+          'name': i.job_name, 'cat': 'polly', 'ph': 'X', 'pid': pid, 'tid': 0,
+          'ts': microseconds(self.offset(i.start)),
+          'dur': microseconds(i.total),
+          'args': i.resources
+      })
+
+    # Overlapping events of one category go to different threads,
+    # nested events (e.g. cmake function calls) stay on the same thread
+    lanes = {} # category -> stack of event ends for every lane
+    threads = {(None, 0): 0} # (category, lane) -> tid
+    for name, category, start, duration, args in sorted(
+        self.events, key=lambda x: (x[2], -x[3])
+    ):
+      end = start + duration
+      category_lanes = lanes.setdefault(category, [])
+      for lane, ends in enumerate(category_lanes):
+        while ends and ends[-1] <= start:
+          ends.pop()
+        if not ends or end <= ends[-1]:
+          break
+      else:
+        lane = len(category_lanes)
+        category_lanes.append([])
+        threads[(category, lane)] = len(threads)
+      category_lanes[lane].append(end)
+      tid = threads[(category, lane)]
+      event = {
+          'name': name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': tid,
+          'ts': microseconds(self.offset(start)),
+          'dur': microseconds(duration)
+      }
+      if args:
+        event['args'] = args
+      trace.append(event)
+
+    for (category, lane), tid in threads.items():
+      if category is None:
+        thread_name = 'polly'
+      else:
+        thread_name = '{} {}'.format(category, lane)
+      trace.append({
+          'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+          'args': {'name': thread_name}
+      })
+
+    with open(path, 'w') as f:
+      json.dump(
+          {
+              'traceEvents': trace,
+              'displayTimeUnit': 'ms',
+              'otherData': {'started_at': self.started_at()}
+          },
+          f
+      )
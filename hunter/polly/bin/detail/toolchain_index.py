@@ -0,0 +1,344 @@
+# Index of the toolchain files (<polly>/*.cmake) built by parsing them:
+# generator and description from `polly_init`, compiler/flags/os/library
+# from the included modules, C++ standard, architectures and SDK versions
+# from the `set` commands.
+#
+# Index is cached in the user cache directory (see `detail.user_cache`):
+# * same mtime of the polly directory: list of files is taken from the cache
+# * same mtime and size of the file: entry is taken from the cache
+# * otherwise the file is hashed and parsed only if the content changed
+#
+# Queries ("all ninja clang cxx17 toolchains"):
+#
+#   > polly.py --list-toolchains ninja clang cxx17
+#   > polly.py --list-toolchains 'generator=Unix Makefiles' arch=arm64
+#
+# Keyword terms can also be given as one argument ('ninja clang cxx17'),
+# Android ABIs match the architecture names (arch=arm64: arm64-v8a).
+
+import hashlib
+import os
+import re
+import sys
+
+import detail.user_cache
+
+version = 2
+
+polly_root = os.path.realpath(
+    os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..')
+)
+
+init_regex = re.compile(
+    r'polly_init\(\s*"((?:[^"\\]|\\.)*)"\s*(?:"([^"]*)")?', re.DOTALL
+)
+set_regex = re.compile(r'^\s*set\(\s*(\w+)\s+([^)]*)\)', re.MULTILINE)
+include_regex = re.compile(
+    r'^\s*include\(\s*"\$\{CMAKE_CURRENT_LIST_DIR\}/(\w+)/([^"]+)\.cmake"',
+    re.MULTILINE
+)
+variable_regex = re.compile(r'\$\{(\w+)\}')
+cxx_flag_regex = re.compile(r'(?:^|-)(?:c|gnu)xx(\d+)')
+cxx_description_regex = re.compile(r'c\+\+ ?(\d+)', re.IGNORECASE)
+
+# `set` variables with the architectures
+arch_variables = [
+    'CMAKE_ANDROID_ARCH_ABI',
+    'ANDROID_ABI',
+    'IPHONEOS_ARCHS',
+    'IPHONESIMULATOR_ARCHS',
+    'CMAKE_OSX_ARCHITECTURES'
+]
+
+# toolchain name part -> architecture (Visual Studio and the rest)
+name_archs = [
+    ('win64', 'amd64'),
+    ('x64', 'amd64'),
+    ('amd64', 'amd64'),
+    ('arm64', 'arm64'),
+    ('arm', 'arm'),
+    ('x86-64', 'x86_64'),
+    ('x86', 'x86'),
+    ('i686', 'x86'),
+    ('aarch64', 'aarch64')
+]
+
+# Android ABI -> architecture name of the other toolchains
+arch_aliases = {
+    'arm64-v8a': 'arm64',
+    'armeabi-v7a': 'armv7',
+    'armeabi': 'arm'
+}
+
+def set_value(arguments):
+  """Value of `set(VAR arguments)` without quotes and the CACHE part"""
+  result = []
+  for x in re.findall(r'"[^"]*"|[^\s"]+', arguments):
+    if x in ['CACHE', 'PARENT_SCOPE', 'FORCE']:
+      break
+    result.append(x.strip('"'))
+  return ' '.join(result)
+
+def name_arch(name):
+  parts = name.split('-')
+  for part, arch in name_archs:
+    if '-' in part:
+      if '-{}-'.format(part) in '-{}-'.format(name):
+        return arch
+    elif part in parts:
+      return arch
+  return ''
+
+def parse(name, content):
+  """Index entry of the toolchain file `name` (without .cmake)"""
+  content = re.sub(r'\)\s*#.*$', ')', content, flags=re.MULTILINE)
+  variables = {}
+  for variable, arguments in set_regex.findall(content):
+    variables.setdefault(variable, set_value(arguments))
+
+  entry = {
+      'name': name,
+      'description': variables.get('POLLY_TOOLCHAIN_NAME', ''),
+      'generator': '',
+      'compilers': [],
+      'flags': [],
+      'os': [],
+      'libraries': [],
+      'cxx': '',
+      'archs': [],
+      'vs_version': '',
+      'ios_version': variables.get('IOS_SDK_VERSION', ''),
+      'osx_version': variables.get('OSX_SDK_VERSION', ''),
+      'nocodesign': False
+  }
+
+  found = init_regex.search(content)
+  if found:
+    description = found.group(1).replace('\\\n', '')
+    description = variable_regex.sub(
+        lambda x: variables.get(x.group(1), x.group(0)), description
+    )
+    entry['description'] = ' '.join(description.split())
+    entry['generator'] = found.group(2) or ''
+
+  categories = {
+      'compiler': 'compilers',
+      'flags': 'flags',
+      'os': 'os',
+      'library': 'libraries'
+  }
+  for category, module in include_regex.findall(content):
+    if category in categories:
+      entry[categories[category]].append(module)
+
+  for x in ['POLLY_XCODE_COMPILER', 'CMAKE_ANDROID_NDK_TOOLCHAIN_VERSION']:
+    compiler = variables.get(x)
+    if compiler and compiler not in entry['compilers']:
+      entry['compilers'].append(compiler)
+
+  for flag in entry['flags'] + entry['libraries']:
+    found = cxx_flag_regex.search(flag)
+    if found:
+      entry['cxx'] = found.group(1)
+  if not entry['cxx']:
+    found = cxx_description_regex.search(entry['description'])
+    if found:
+      entry['cxx'] = found.group(1)
+
+  for x in arch_variables:
+    for arch in re.split(r'[\s;]+', variables.get(x, '')):
+      if not arch:
+        continue
+      if arch not in entry['archs']:
+        entry['archs'].append(arch)
+  if not entry['archs']:
+    arch = name_arch(name)
+    if arch:
+      entry['archs'].append(arch)
+
+  found = re.search(r'Visual Studio (\d+)', entry['generator'])
+  if not found:
+    found = re.search(r'(?:^|-)vs-(\d+)-\d{4}', name)
+  if found:
+    entry['vs_version'] = found.group(1)
+
+  entry['nocodesign'] = (
+      'ios_nocodesign' in entry['flags'] or 'nocodesign' in name.split('-')
+  )
+  return entry
+
+def keywords(entry):
+  """Words matched by the free-form query terms"""
+  result = set()
+  generator = entry['generator'].lower()
+  if generator == 'ninja':
+    result.add('ninja')
+  elif generator == 'xcode':
+    result.add('xcode')
+  elif generator.startswith('visual studio'):
+    result.update(['msvc', 'vs'])
+  elif generator.startswith('nmake'):
+    result.update(['nmake', 'make'])
+  elif generator.endswith('makefiles'):
+    result.add('make')
+  for x in entry['compilers']:
+    result.add(x.lower())
+    result.add(re.split(r'[-_\d]', x.lower())[0] or x.lower())
+  if entry['cxx']:
+    result.add('cxx{}'.format(entry['cxx']))
+  for x in entry['flags'] + entry['os'] + entry['archs']:
+    result.add(x.lower())
+  for x in entry['archs']:
+    if x.lower() in arch_aliases:
+      result.add(arch_aliases[x.lower()])
+  if entry['ios_version']:
+    result.add('ios')
+  if entry['osx_version']:
+    result.add('osx')
+  return result
+
+# query attribute names
+aliases = {
+    'arch': 'archs',
+    'compiler': 'compilers',
+    'flag': 'flags',
+    'library': 'libraries'
+}
+
+def matches(entry, term):
+  """Query `term`: 'key=value' or a keyword (see `keywords`)"""
+  key, sep, value = term.partition('=')
+  if not sep:
+    return term.lower() in keywords(entry)
+  key = aliases.get(key, key)
+  if key not in entry:
+    sys.exit(
+        'Unknown toolchain attribute: {} (expected one of: {})'.format(
+            key, ', '.join(sorted(entry))
+        )
+    )
+  actual = entry[key]
+  value = value.lower()
+  if isinstance(actual, bool):
+    return actual == (value in ['1', 'on', 'yes', 'true'])
+  if key == 'archs':
+    return any(
+        value in [x.lower(), arch_aliases.get(x.lower())] for x in actual
+    )
+  if isinstance(actual, list):
+    return any(x.lower() == value for x in actual)
+  if key == 'description':
+    return value in actual.lower()
+  return actual.lower() == value
+
+class Index:
+  def __init__(self, entries):
+    self.entries = entries
+
+  def __contains__(self, name):
+    return name in self.entries
+
+  def names(self):
+    return sorted(self.entries)
+
+  def get(self, name):
+    return self.entries.get(name)
+
+  def query(self, terms):
+    """Entries matching all the `terms` (strings, see `matches`), keyword
+    terms are split on whitespace"""
+    terms = [y for x in terms for y in ([x] if '=' in x else x.split())]
+    return [
+        self.entries[x] for x in self.names()
+        if all(matches(self.entries[x], t) for t in terms)
+    ]
+
+def cache_name(root):
+  digest = hashlib.sha1(root.encode('utf-8')).hexdigest()[:12]
+  return 'toolchain-index-{}.json'.format(digest)
+
+def build(root):
+  """Index of `root`, parse only files changed since the cached index"""
+  cached = detail.user_cache.load_json(cache_name(root))
+  if not cached or cached.get('version') != version or cached.get('root') != root:
+    cached = {'files': {}}
+  directory_mtime = os.stat(root).st_mtime_ns
+  if cached.get('directory_mtime') == directory_mtime:
+    names = list(cached['files'])
+  else:
+    names = [x[:-6] for x in os.listdir(root) if x.endswith('.cmake')]
+
+  changed = (cached.get('directory_mtime') != directory_mtime)
+  files = {}
+  for name in names:
+    path = os.path.join(root, name + '.cmake')
+    try:
+      stat = os.stat(path)
+    except OSError:
+      changed = True # removed after the directory was read
+      continue
+    old = cached['files'].get(name)
+    if old and old['mtime'] == stat.st_mtime_ns and old['size'] == stat.st_size:
+      files[name] = old
+      continue
+    changed = True
+    with open(path, 'rb') as f:
+      content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if old and old['sha256'] == digest:
+      entry = old['entry'] # touched only
+    else:
+      entry = parse(name, content.decode('utf-8', errors='replace'))
+    files[name] = {
+        'mtime': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'sha256': digest,
+        'entry': entry
+    }
+
+  if changed:
+    detail.user_cache.save_json(
+        cache_name(root),
+        {
+            'version': version,
+            'root': root,
+            'directory_mtime': directory_mtime,
+            'files': files
+        }
+    )
+  return Index({name: x['entry'] for name, x in files.items()})
+
+# root -> Index, loaded once per process
+loaded = {}
+
+def get(root=None):
+  root = os.path.realpath(root or polly_root)
+  if root not in loaded:
+    loaded[root] = build(root)
+  return loaded[root]
+
+def toolchain_path(name, root=None):
+  return os.path.join(root or polly_root, '{}.cmake'.format(name))
+
+def verify(name, root=None):
+  """Exit with suggestions if there is no toolchain file for `name`"""
+  path = toolchain_path(name, root)
+  if os.path.exists(path):
+    return path
+  import difflib # error path only
+  close = difflib.get_close_matches(name, get(root).names(), n=5)
+  message = 'Toolchain file not found: {}'.format(path)
+  if close:
+    message += '\nDid you mean: {}'.format(', '.join(close))
+  sys.exit(message)
+
+def print_query(terms, root=None):
+  """polly.py --list-toolchains"""
+  found = get(root).query(terms)
+  for entry in found:
+    print(
+        '{:<50} {:<28} {}'.format(
+            entry['name'], entry['generator'] or '-', entry['description']
+        )
+    )
+  print('{} toolchains'.format(len(found)))
@@ -7,9 +7,27 @@
 # All rights reserved.
 
 import os
-import platform
+import sys
 
 class Toolchain:
+  __slots__ = (
+      'name',
+      'generator',
+      'toolset',
+      'arch',
+      'vs_version',
+      'ios_version',
+      'osx_version',
+      'is_nmake',
+      'is_msvc',
+      'is_make',
+      'is_ninja',
+      'xp',
+      'is_xcode',
+      'multiconfig',
+      'nocodesign'
+  )
+
   def __init__(
       self,
       name,
@@ -54,532 +72,536 @@ class Toolchain:
     if self.xp:
       assert(self.vs_version)
 
-toolchain_table = [
-    Toolchain('default', ''),
-    Toolchain('cxx11', ''),
-    Toolchain('cxx17', ''),
-    Toolchain('android-ndk-r10e-api-8-armeabi-v7a', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-16-armeabi-v7a-neon', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-16-armeabi-v7a-neon-clang-35', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-16-armeabi-v7a-neon-clang-35-hid', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-16-armeabi-v7a-neon-clang-35-hid-sections', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-16-x86', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-16-x86-hid', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-16-x86-hid-sections', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-19-armeabi-v7a-neon', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-19-armeabi-v7a-neon-c11', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-19-armeabi-v7a-neon-hid-sections', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-19-armeabi-v7a-neon-hid-sections-lto', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-19-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-armeabi-v7a', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-armeabi-v7a-neon', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-armeabi-v7a-neon-hid-sections', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-armeabi-v7a-neon-clang-35', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-armeabi-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-armeabi', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-arm64-v8a', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-arm64-v8a-gcc-49', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-arm64-v8a-gcc-49-hid', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-arm64-v8a-gcc-49-hid-sections', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-arm64-v8a-clang-35', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-x86', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-x86-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-x86-64', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-x86-64-hid', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-x86-64-hid-sections', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-mips', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-mips64', 'Unix Makefiles'),
-    Toolchain('android-ndk-r10e-api-21-mips-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-8-armeabi-v7a', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-16-armeabi', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-16-armeabi-cxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-16-armeabi-v7a', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-16-armeabi-v7a-cxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-16-armeabi-v7a-neon', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-16-armeabi-v7a-neon-cxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-16-armeabi-v7a-neon-clang-35', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-16-armeabi-v7a-neon-clang-35-hid', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-16-x86', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-16-x86-hid', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-19-armeabi-v7a-neon', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-21-armeabi-v7a', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-21-armeabi-v7a-neon', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-21-armeabi-v7a-neon-clang-35', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-21-armeabi', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-21-arm64-v8a', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-21-arm64-v8a-gcc-49', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-21-arm64-v8a-gcc-49-hid', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-21-arm64-v8a-clang-35', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-21-x86', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-21-x86-64', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-21-x86-64-hid', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-21-mips', 'Unix Makefiles'),
-    Toolchain('android-ndk-r11c-api-21-mips64', 'Unix Makefiles'),
-    Toolchain('android-ndk-r12b-api-19-armeabi-v7a-neon', 'Unix Makefiles'),
-    Toolchain('android-ndk-r13b-api-19-armeabi-v7a-neon', 'Unix Makefiles'),
-    Toolchain('android-ndk-r14-api-16-armeabi-v7a-neon-clang-hid-sections-lto', 'Unix Makefiles'),
-    Toolchain('android-ndk-r14-api-19-armeabi-v7a-neon-c11', 'Unix Makefiles'),
-    Toolchain('android-ndk-r14-api-19-armeabi-v7a-neon-clang', 'Unix Makefiles'),
-    Toolchain('android-ndk-r14-api-19-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r14-api-21-arm64-v8a-neon-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r14-api-19-armeabi-v7a-neon-hid-sections-lto', 'Unix Makefiles'),
-    Toolchain('android-ndk-r14-api-21-arm64-v8a-clang-hid-sections-lto', 'Unix Makefiles'),
-    Toolchain('android-ndk-r14-api-21-x86-64', 'Unix Makefiles'),
-    Toolchain('android-ndk-r14b-api-21-armeabi-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r14b-api-21-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r14b-api-21-mips-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r14b-api-21-x86-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r15c-api-16-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r15c-api-16-armeabi-v7a-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r15c-api-16-armeabi-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r15c-api-16-mips-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r15c-api-16-x86-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r15c-api-21-arm64-v8a-neon-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r15c-api-21-arm64-v8a-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r15c-api-21-armeabi-v7a-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r15c-api-21-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r15c-api-21-armeabi-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r15c-api-21-mips-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r15c-api-21-x86-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r15c-api-21-x86-64-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r15c-api-24-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-16-armeabi-v7a-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-16-armeabi-v7a-thumb-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-16-x86-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-19-gcc-49-armeabi-v7a-neon-libcxx-hid-sections-lto', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-21-armeabi-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-21-armeabi-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-21-armeabi-v7a-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-21-armeabi-v7a-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-21-arm64-v8a-neon-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-21-arm64-v8a-neon-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-21-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-21-armeabi-v7a-neon-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-21-x86-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-21-x86-64-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-24-arm64-v8a-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-24-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-24-armeabi-v7a-neon-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-24-x86-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r16b-api-24-x86-64-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r17-api-24-arm64-v8a-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r17-api-24-arm64-v8a-clang-libcxx11', 'Unix Makefiles'),
-    Toolchain('android-ndk-r17-api-21-arm64-v8a-neon-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r17-api-16-armeabi-v7a-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r17-api-16-x86-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r17-api-21-x86-64-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r17-api-19-armeabi-v7a-neon-hid-sections', 'Unix Makefiles'),
-    Toolchain('android-ndk-r17-api-19-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r18-api-24-arm64-v8a-clang-libcxx14', 'Unix Makefiles'),
-    Toolchain('android-ndk-r18b-api-24-arm64-v8a-clang-libcxx11', 'Unix Makefiles'),
-    Toolchain('android-ndk-r18b-api-28-arm64-v8a-clang-libcxx11', 'Unix Makefiles'),
-    Toolchain('android-ndk-r18b-api-16-armeabi-v7a-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r18b-api-21-arm64-v8a-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r18b-api-21-armeabi-v7a-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r18b-api-21-x86-64-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('android-ndk-r18b-api-21-x86-clang-libcxx', 'Unix Makefiles'),
-    Toolchain('emscripten-cxx11', 'Unix Makefiles'),
-    Toolchain('emscripten-cxx14', 'Unix Makefiles'),
-    Toolchain('emscripten-cxx17', 'Unix Makefiles'),
-    Toolchain('raspberrypi1-cxx11-pic', 'Unix Makefiles'),
-    Toolchain('raspberrypi1-cxx11-pic-static-std', 'Unix Makefiles'),
-    Toolchain('raspberrypi1-cxx14-pic-static-std', 'Unix Makefiles'),
-    Toolchain('raspberrypi2-cxx11', 'Unix Makefiles'),
-    Toolchain('raspberrypi2-cxx11-pic', 'Unix Makefiles'),
-    Toolchain('raspberrypi3-clang-cxx11', 'Unix Makefiles'),
-    Toolchain('raspberrypi3-clang-cxx14', 'Unix Makefiles'),
-    Toolchain('raspberrypi3-clang-cxx14-pic', 'Unix Makefiles'),
-    Toolchain('raspberrypi3-gcc-pic-hid-sections', 'Unix Makefiles'),
-    Toolchain('raspberrypi3-cxx14', 'Unix Makefiles'),
-    Toolchain('raspberrypi3-cxx11', 'Unix Makefiles')
+def spec(name, generator, **kwargs):
+  """Arguments of `Toolchain`, object is created on first use"""
+  return (name, generator, kwargs)
+
+specs = [
+    spec('default', ''),
+    spec('cxx11', ''),
+    spec('cxx17', ''),
+    spec('android-ndk-r10e-api-8-armeabi-v7a', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-16-armeabi-v7a-neon', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-16-armeabi-v7a-neon-clang-35', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-16-armeabi-v7a-neon-clang-35-hid', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-16-armeabi-v7a-neon-clang-35-hid-sections', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-16-x86', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-16-x86-hid', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-16-x86-hid-sections', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-19-armeabi-v7a-neon', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-19-armeabi-v7a-neon-c11', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-19-armeabi-v7a-neon-hid-sections', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-19-armeabi-v7a-neon-hid-sections-lto', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-19-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-armeabi-v7a', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-armeabi-v7a-neon', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-armeabi-v7a-neon-hid-sections', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-armeabi-v7a-neon-clang-35', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-armeabi-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-armeabi', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-arm64-v8a', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-arm64-v8a-gcc-49', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-arm64-v8a-gcc-49-hid', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-arm64-v8a-gcc-49-hid-sections', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-arm64-v8a-clang-35', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-x86', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-x86-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-x86-64', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-x86-64-hid', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-x86-64-hid-sections', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-mips', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-mips64', 'Unix Makefiles'),
+    spec('android-ndk-r10e-api-21-mips-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-8-armeabi-v7a', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-16-armeabi', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-16-armeabi-cxx14', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-16-armeabi-v7a', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-16-armeabi-v7a-cxx14', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-16-armeabi-v7a-neon', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-16-armeabi-v7a-neon-cxx14', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-16-armeabi-v7a-neon-clang-35', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-16-armeabi-v7a-neon-clang-35-hid', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-16-x86', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-16-x86-hid', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-19-armeabi-v7a-neon', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-21-armeabi-v7a', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-21-armeabi-v7a-neon', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-21-armeabi-v7a-neon-clang-35', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-21-armeabi', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-21-arm64-v8a', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-21-arm64-v8a-gcc-49', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-21-arm64-v8a-gcc-49-hid', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-21-arm64-v8a-clang-35', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-21-x86', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-21-x86-64', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-21-x86-64-hid', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-21-mips', 'Unix Makefiles'),
+    spec('android-ndk-r11c-api-21-mips64', 'Unix Makefiles'),
+    spec('android-ndk-r12b-api-19-armeabi-v7a-neon', 'Unix Makefiles'),
+    spec('android-ndk-r13b-api-19-armeabi-v7a-neon', 'Unix Makefiles'),
+    spec('android-ndk-r14-api-16-armeabi-v7a-neon-clang-hid-sections-lto', 'Unix Makefiles'),
+    spec('android-ndk-r14-api-19-armeabi-v7a-neon-c11', 'Unix Makefiles'),
+    spec('android-ndk-r14-api-19-armeabi-v7a-neon-clang', 'Unix Makefiles'),
+    spec('android-ndk-r14-api-19-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r14-api-21-arm64-v8a-neon-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r14-api-19-armeabi-v7a-neon-hid-sections-lto', 'Unix Makefiles'),
+    spec('android-ndk-r14-api-21-arm64-v8a-clang-hid-sections-lto', 'Unix Makefiles'),
+    spec('android-ndk-r14-api-21-x86-64', 'Unix Makefiles'),
+    spec('android-ndk-r14b-api-21-armeabi-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r14b-api-21-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r14b-api-21-mips-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r14b-api-21-x86-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r15c-api-16-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r15c-api-16-armeabi-v7a-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r15c-api-16-armeabi-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r15c-api-16-mips-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r15c-api-16-x86-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r15c-api-21-arm64-v8a-neon-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r15c-api-21-arm64-v8a-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r15c-api-21-armeabi-v7a-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r15c-api-21-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r15c-api-21-armeabi-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r15c-api-21-mips-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r15c-api-21-x86-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r15c-api-21-x86-64-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r15c-api-24-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-16-armeabi-v7a-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-16-armeabi-v7a-thumb-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-16-x86-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-19-gcc-49-armeabi-v7a-neon-libcxx-hid-sections-lto', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-21-armeabi-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-21-armeabi-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-21-armeabi-v7a-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-21-armeabi-v7a-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-21-arm64-v8a-neon-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-21-arm64-v8a-neon-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-21-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-21-armeabi-v7a-neon-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-21-x86-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-21-x86-64-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-24-arm64-v8a-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-24-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-24-armeabi-v7a-neon-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-24-x86-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r16b-api-24-x86-64-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r17-api-24-arm64-v8a-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r17-api-24-arm64-v8a-clang-libcxx11', 'Unix Makefiles'),
+    spec('android-ndk-r17-api-21-arm64-v8a-neon-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r17-api-16-armeabi-v7a-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r17-api-16-x86-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r17-api-21-x86-64-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r17-api-19-armeabi-v7a-neon-hid-sections', 'Unix Makefiles'),
+    spec('android-ndk-r17-api-19-armeabi-v7a-neon-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r18-api-24-arm64-v8a-clang-libcxx14', 'Unix Makefiles'),
+    spec('android-ndk-r18b-api-24-arm64-v8a-clang-libcxx11', 'Unix Makefiles'),
+    spec('android-ndk-r18b-api-28-arm64-v8a-clang-libcxx11', 'Unix Makefiles'),
+    spec('android-ndk-r18b-api-16-armeabi-v7a-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r18b-api-21-arm64-v8a-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r18b-api-21-armeabi-v7a-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r18b-api-21-x86-64-clang-libcxx', 'Unix Makefiles'),
+    spec('android-ndk-r18b-api-21-x86-clang-libcxx', 'Unix Makefiles'),
+    spec('emscripten-cxx11', 'Unix Makefiles'),
+    spec('emscripten-cxx14', 'Unix Makefiles'),
+    spec('emscripten-cxx17', 'Unix Makefiles'),
+    spec('raspberrypi1-cxx11-pic', 'Unix Makefiles'),
+    spec('raspberrypi1-cxx11-pic-static-std', 'Unix Makefiles'),
+    spec('raspberrypi1-cxx14-pic-static-std', 'Unix Makefiles'),
+    spec('raspberrypi2-cxx11', 'Unix Makefiles'),
+    spec('raspberrypi2-cxx11-pic', 'Unix Makefiles'),
+    spec('raspberrypi3-clang-cxx11', 'Unix Makefiles'),
+    spec('raspberrypi3-clang-cxx14', 'Unix Makefiles'),
+    spec('raspberrypi3-clang-cxx14-pic', 'Unix Makefiles'),
+    spec('raspberrypi3-gcc-pic-hid-sections', 'Unix Makefiles'),
+    spec('raspberrypi3-cxx14', 'Unix Makefiles'),
+    spec('raspberrypi3-cxx11', 'Unix Makefiles')
 ]
 
 if os.name == 'nt':
-  toolchain_table += [
-      Toolchain('mingw', 'MinGW Makefiles'),
-      Toolchain('mingw-c11', 'MinGW Makefiles'),
-      Toolchain('mingw-cxx14', 'MinGW Makefiles'),
-      Toolchain('mingw-cxx17', 'MinGW Makefiles'),
-      Toolchain('msys', 'MSYS Makefiles'),
-      Toolchain('msys-cxx14', 'MSYS Makefiles'),
-      Toolchain('msys-cxx17', 'MSYS Makefiles'),
-      Toolchain(
+  specs += [
+      spec('mingw', 'MinGW Makefiles'),
+      spec('mingw-c11', 'MinGW Makefiles'),
+      spec('mingw-cxx14', 'MinGW Makefiles'),
+      spec('mingw-cxx17', 'MinGW Makefiles'),
+      spec('msys', 'MSYS Makefiles'),
+      spec('msys-cxx14', 'MSYS Makefiles'),
+      spec('msys-cxx17', 'MSYS Makefiles'),
+      spec(
           'nmake-vs-12-2013',
           'NMake Makefiles',
           arch='x86',
           vs_version='12'
       ),
-      Toolchain(
+      spec(
           'nmake-vs-12-2013-win64',
           'NMake Makefiles',
           arch='amd64',
           vs_version='12'
       ),
-      Toolchain(
+      spec(
           'nmake-vs-15-2017-win64',
           'NMake Makefiles',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'nmake-vs-15-2017-win64-cxx17',
           'NMake Makefiles',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'nmake-vs-15-2017-win64-cxx17-nonpermissive',
           'NMake Makefiles',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'nmake-vs-16-2019-win64',
           'NMake Makefiles',
           arch='amd64',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'nmake-vs-16-2019-win64-cxx17',
           'NMake Makefiles',
           arch='amd64',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'nmake-vs-16-2019-win64-cxx17-nonpermissive',
           'NMake Makefiles',
           arch='amd64',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'ninja-vs-12-2013-win64',
           'Ninja',
           arch='amd64',
           vs_version='12'
       ),
-      Toolchain(
+      spec(
           'ninja-vs-14-2015-win64',
           'Ninja',
           arch='amd64',
           vs_version='14'
       ),
-      Toolchain(
+      spec(
           'ninja-vs-15-2017-win64',
           'Ninja',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'ninja-vs-15-2017-win64-cxx17',
           'Ninja',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'ninja-vs-15-2017-win64-cxx17-nonpermissive',
           'Ninja',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'ninja-vs-16-2019-win64',
           'Ninja',
           arch='amd64',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'ninja-vs-16-2019-win64-cxx17',
           'Ninja',
           arch='amd64',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'ninja-vs-16-2019-win64-cxx17-nonpermissive',
           'Ninja',
           arch='amd64',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'vs-12-2013', 'Visual Studio 12 2013', arch='x86', vs_version='12'
       ),
-      Toolchain(
+      spec(
           'vs-12-2013-mt', 'Visual Studio 12 2013', arch='x86', vs_version='12'
       ),
-      Toolchain(
+      spec(
           'vs-10-2010', 'Visual Studio 10 2010', arch='x86', vs_version='10'
       ),
-      Toolchain(
+      spec(
           'vs-11-2012', 'Visual Studio 11 2012', arch='x86', vs_version='11'
       ),
-      Toolchain(
+      spec(
           'vs-14-2015', 'Visual Studio 14 2015', arch='x86', vs_version='14'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017', 'Visual Studio 15 2017', arch='x86', vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-mt', 'Visual Studio 15 2017', arch='x86', vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-cxx14-mt', 'Visual Studio 15 2017', arch='x86', vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-cxx17', 'Visual Studio 15 2017', arch='x86', vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-14-2015-sdk-8-1', 'Visual Studio 14 2015', arch='x86', vs_version='14'
       ),
-      Toolchain(
+      spec(
           'vs-9-2008', 'Visual Studio 9 2008', arch='x86', vs_version='9'
       ),
-      Toolchain(
+      spec(
           'vs-8-2005', 'Visual Studio 8 2005', arch='x86', vs_version='8'
       ),
-      Toolchain(
+      spec(
           'vs-12-2013-xp',
           'Visual Studio 12 2013',
           arch='x86',
           vs_version='12',
           xp=True
       ),
-      Toolchain(
+      spec(
           'vs-11-2012-win64',
           'Visual Studio 11 2012 Win64',
           arch='amd64',
           vs_version='11'
       ),
-      Toolchain(
+      spec(
           'vs-12-2013-win64',
           'Visual Studio 12 2013 Win64',
           arch='amd64',
           vs_version='12'
       ),
-      Toolchain(
+      spec(
           'vs-14-2015-win64',
           'Visual Studio 14 2015 Win64',
           arch='amd64',
           vs_version='14'
       ),
-      Toolchain(
+      spec(
           'vs-14-2015-win64-cxx17',
           'Visual Studio 14 2015 Win64',
           arch='amd64',
           vs_version='14'
       ),
-      Toolchain(
+      spec(
           'vs-14-2015-win64-sdk-8-1',
           'Visual Studio 14 2015 Win64',
           arch='amd64',
           vs_version='14'
       ),
-      Toolchain(
+      spec(
           'vs-14-2015-win64-sdk-8-1-cxx17',
           'Visual Studio 14 2015 Win64',
           arch='amd64',
           vs_version='14'
       ),
-      Toolchain(
+      spec(
           'vs-11-2012-arm',
           'Visual Studio 11 2012 ARM',
           vs_version='11'
       ),
-      Toolchain(
+      spec(
           'vs-12-2013-arm',
           'Visual Studio 12 2013 ARM',
           vs_version='12'
       ),
-      Toolchain(
+      spec(
           'vs-14-2015-arm',
           'Visual Studio 14 2015 ARM',
           vs_version='14'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-arm',
           'Visual Studio 15 2017',
           arch='arm',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-arm64',
           'Visual Studio 15 2017',
           arch='arm64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-16-2019-arm',
           'Visual Studio 16 2019',
           arch='arm',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'vs-16-2019-arm64',
           'Visual Studio 16 2019',
           arch='arm64',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-win64',
           'Visual Studio 15 2017 Win64',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-win64-mt',
           'Visual Studio 15 2017 Win64',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-win64-cxx14-mt',
           'Visual Studio 15 2017 Win64',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-win64-cxx14',
           'Visual Studio 15 2017 Win64',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-win64-cxx17',
           'Visual Studio 15 2017 Win64',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-win64-cxx17-nonpermissive',
           'Visual Studio 15 2017 Win64',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-win64-llvm',
           'Visual Studio 15 2017 Win64',
           toolset='llvm',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-win64-llvm-vs2014',
           'Visual Studio 15 2017 Win64',
           toolset='LLVM-vs2014',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-win64-store-10-zw',
           'Visual Studio 15 2017 Win64',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-store-10-zw',
           'Visual Studio 15 2017',
           arch='x86',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-win64-store-10-cxx17',
           'Visual Studio 15 2017 Win64',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-win64-z7',
           'Visual Studio 15 2017 Win64',
           arch='amd64',
           vs_version='15'
       ),
-      Toolchain(
+      spec(
           'vs-15-2017-win64-version-14-11',
           'Visual Studio 15 2017 Win64',
           arch='amd64',
           vs_version='15',
           toolset='version=14.11'
       ),
-      Toolchain(
+      spec(
           'vs-16-2019',
           'Visual Studio 16 2019',
           arch='x86',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'vs-16-2019-cxx14',
           'Visual Studio 16 2019',
           arch='x86',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'vs-16-2019-cxx17',
           'Visual Studio 16 2019',
           arch='x86',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'vs-16-2019-llvm-cxx17',
           'Visual Studio 16 2019',
           toolset='clangcl',
           arch='x86',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'vs-16-2019-win64',
           'Visual Studio 16 2019',
           arch='amd64',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'vs-16-2019-win64-cxx14',
           'Visual Studio 16 2019',
           arch='amd64',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'vs-16-2019-win64-cxx17',
           'Visual Studio 16 2019',
           arch='amd64',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'vs-16-2019-win64-cxx17-cuda-cxx14',
           'Visual Studio 16 2019',
           arch='amd64',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'vs-16-2019-win64-sdk-10-0-18362-0-cxx17',
           'Visual Studio 16 2019',
           arch='amd64',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'vs-16-2019-win64-llvm-cxx17',
           'Visual Studio 16 2019',
           toolset='clangcl',
           arch='amd64',
           vs_version='16'
       ),
-      Toolchain(
+      spec(
           'android-vc-ndk-r10e-api-19-arm-clang-3-6',
           'Visual Studio 14 2015 ARM',
           arch='',
           vs_version='14'
       ),
-      Toolchain(
+      spec(
           'android-vc-ndk-r10e-api-21-arm-clang-3-6',
           'Visual Studio 14 2015 ARM',
           arch='',
           vs_version='14'
       ),
-      Toolchain(
+      spec(
           'android-vc-ndk-r10e-api-19-x86-clang-3-6',
           'Visual Studio 14 2015',
           arch='',
           vs_version='14'
       ),
-      Toolchain(
+      spec(
           'android-vc-ndk-r10e-api-19-arm-gcc-4-9',
           'Visual Studio 14 2015 ARM',
           arch='',
@@ -587,505 +609,663 @@ if os.name == 'nt':
       ),
   ]
 
-if platform.system().startswith('CYGWIN'):
-  toolchain_table += [
-      Toolchain('cygwin', 'Unix Makefiles'),
+if sys.platform == 'cygwin':
+  specs += [
+      spec('cygwin', 'Unix Makefiles'),
   ]
 
-if platform.system() == 'Linux':
-  toolchain_table += [
-      Toolchain('sanitize-leak', 'Unix Makefiles'),
-      Toolchain('sanitize-leak-cxx17', 'Unix Makefiles'),
-      Toolchain('sanitize-leak-cxx17-pic', 'Unix Makefiles'),
-      Toolchain('sanitize-memory', 'Unix Makefiles'),
-      Toolchain('linux-mingw-w32', 'Unix Makefiles'),
-      Toolchain('linux-mingw-w32-cxx14', 'Unix Makefiles'),
-      Toolchain('linux-mingw-w64', 'Unix Makefiles'),
-      Toolchain('linux-mingw-w64-cxx14', 'Unix Makefiles'),
-      Toolchain('linux-mingw-w64-cxx98', 'Unix Makefiles'),
-      Toolchain('linux-mingw-w64-gnuxx11', 'Unix Makefiles'),
-      Toolchain('linux-gcc-armhf', 'Unix Makefiles'),
-      Toolchain('linux-gcc-armhf-neon', 'Unix Makefiles'),
-      Toolchain('linux-gcc-armhf-neon-vfpv4', 'Unix Makefiles'),
-      Toolchain('linux-gcc-jetson-tk1', 'Unix Makefiles'),
+if sys.platform.startswith('linux'):
+  specs += [
+      spec('sanitize-leak', 'Unix Makefiles'),
+      spec('sanitize-leak-cxx17', 'Unix Makefiles'),
+      spec('sanitize-leak-cxx17-pic', 'Unix Makefiles'),
+      spec('sanitize-memory', 'Unix Makefiles'),
+      spec('linux-mingw-w32', 'Unix Makefiles'),
+      spec('linux-mingw-w32-cxx14', 'Unix Makefiles'),
+      spec('linux-mingw-w64', 'Unix Makefiles'),
+      spec('linux-mingw-w64-cxx14', 'Unix Makefiles'),
+      spec('linux-mingw-w64-cxx98', 'Unix Makefiles'),
+      spec('linux-mingw-w64-gnuxx11', 'Unix Makefiles'),
+      spec('linux-gcc-armhf', 'Unix Makefiles'),
+      spec('linux-gcc-armhf-neon', 'Unix Makefiles'),
+      spec('linux-gcc-armhf-neon-vfpv4', 'Unix Makefiles'),
+      spec('linux-gcc-jetson-tk1', 'Unix Makefiles'),
   ]
 
-if platform.system() == 'Darwin':
-  toolchain_table += [
-      Toolchain('ios', 'Xcode'),
-      Toolchain('ios-arm64', 'Xcode'),
-      Toolchain('ios-arm64-cxx17', 'Xcode'),
-      Toolchain('ios-cxx17', 'Xcode'),
-      Toolchain('ios-bitcode', 'Xcode'),
-      Toolchain('ios-14-4-dep-10-0-arm64', 'Xcode', ios_version='14.4'),
-      Toolchain('ios-14-4-dep-10-0-armv7', 'Xcode', ios_version='14.4'),
-      Toolchain('ios-14-4-dep-10-0-armv7s', 'Xcode', ios_version='14.4'),
-      Toolchain('ios-14-4-dep-10-0-device-cxx14', 'Xcode', ios_version='14.4'),
-      Toolchain('ios-14-4-dep-10-0-device-bitcode-cxx14', 'Xcode', ios_version='14.4'),
-      Toolchain('ios-14-3-dep-10-0-arm64', 'Xcode', ios_version='14.3'),
-      Toolchain('ios-14-3-dep-10-0-armv7', 'Xcode', ios_version='14.3'),
-      Toolchain('ios-14-3-dep-10-0-armv7s', 'Xcode', ios_version='14.3'),
-      Toolchain('ios-14-3-dep-10-0-device-cxx14', 'Xcode', ios_version='14.3'),
-      Toolchain('ios-14-3-dep-10-0-device-bitcode-cxx14', 'Xcode', ios_version='14.3'),
-      Toolchain('ios-14-2-dep-10-0-arm64', 'Xcode', ios_version='14.2'),
-      Toolchain('ios-14-2-dep-10-0-armv7', 'Xcode', ios_version='14.2'),
-      Toolchain('ios-14-2-dep-10-0-armv7s', 'Xcode', ios_version='14.2'),
-      Toolchain('ios-14-2-dep-10-0-device-cxx14', 'Xcode', ios_version='14.2'),
-      Toolchain('ios-14-2-dep-10-0-device-bitcode-cxx14', 'Xcode', ios_version='14.2'),
-      Toolchain('ios-14-0-dep-9-3-arm64', 'Xcode', ios_version='14.0'),
-      Toolchain('ios-14-0-dep-9-3-armv7', 'Xcode', ios_version='14.0'),
-      Toolchain('ios-14-0-dep-9-3-armv7s', 'Xcode', ios_version='14.0'),
-      Toolchain('ios-14-0-dep-9-3-device-cxx14', 'Xcode', ios_version='14.0'),
-      Toolchain('ios-14-0-dep-9-3-device-bitcode-cxx14', 'Xcode', ios_version='14.0'),
-      Toolchain('ios-13-6-dep-9-3-arm64', 'Xcode', ios_version='13.6'),
-      Toolchain('ios-13-6-dep-9-3-armv7', 'Xcode', ios_version='13.6'),
-      Toolchain('ios-13-6-dep-9-3-armv7s', 'Xcode', ios_version='13.6'),
-      Toolchain('ios-13-6-dep-9-3-device-cxx14', 'Xcode', ios_version='13.6'),
-      Toolchain('ios-13-6-dep-9-3-device-bitcode-cxx14', 'Xcode', ios_version='13.6'),
-      Toolchain('ios-13-5-dep-9-3-arm64', 'Xcode', ios_version='13.5'),
-      Toolchain('ios-13-5-dep-9-3-armv7', 'Xcode', ios_version='13.5'),
-      Toolchain('ios-13-5-dep-9-3-armv7s', 'Xcode', ios_version='13.5'),
-      Toolchain('ios-13-5-dep-9-3-device-cxx14', 'Xcode', ios_version='13.5'),
-      Toolchain('ios-13-5-dep-9-3-device-bitcode-cxx14', 'Xcode', ios_version='13.5'),
-      Toolchain('ios-13-4-dep-10-0-device-bitcode-cxx17', 'Xcode', ios_version='13.4'),
-      Toolchain('ios-13-4-dep-10-0', 'Xcode', ios_version='13.4'),
-      Toolchain('ios-13-4-dep-9-0-arm64-bitcode-cxx17', 'Xcode', ios_version='13.4'),
-      Toolchain('ios-13-4-dep-9-0-arm64-cxx17', 'Xcode', ios_version='13.4'),
-      Toolchain('ios-13-4-dep-9-0-device-bitcode-cxx17', 'Xcode', ios_version='13.4'),
-      Toolchain('ios-13-4-dep-9-3-arm64', 'Xcode', ios_version='13.4'),
-      Toolchain('ios-13-4-dep-9-3-armv7', 'Xcode', ios_version='13.4'),
-      Toolchain('ios-13-4-dep-9-3-armv7s', 'Xcode', ios_version='13.4'),
-      Toolchain('ios-13-4-dep-9-3-device-cxx14', 'Xcode', ios_version='13.4'),
-      Toolchain('ios-13-4-dep-9-3-device-bitcode-cxx14', 'Xcode', ios_version='13.4'),
-      Toolchain('ios-13-3-dep-9-3-arm64', 'Xcode', ios_version='13.3'),
-      Toolchain('ios-13-3-dep-9-3-armv7', 'Xcode', ios_version='13.3'),
-      Toolchain('ios-13-3-dep-9-3-armv7s', 'Xcode', ios_version='13.3'),
-      Toolchain('ios-13-3-dep-9-3-device-cxx14', 'Xcode', ios_version='13.3'),
-      Toolchain('ios-13-3-dep-9-3-device-bitcode-cxx14', 'Xcode', ios_version='13.3'),
-      Toolchain('ios-13-2-dep-10-0-arm64-bitcode-cxx17', 'Xcode', ios_version='13.2'),
-      Toolchain('ios-13-2-dep-9-3-arm64-bitcode', 'Xcode', ios_version='13.2'),
-      Toolchain('ios-13-2-dep-9-3-arm64', 'Xcode', ios_version='13.2'),
-      Toolchain('ios-13-2-dep-9-3-armv7', 'Xcode', ios_version='13.2'),
-      Toolchain('ios-13-2-dep-9-3-armv7s', 'Xcode', ios_version='13.2'),
-      Toolchain('ios-13-2-dep-9-3-device-cxx14', 'Xcode', ios_version='13.2'),
-      Toolchain('ios-13-2-dep-9-3-device-bitcode-cxx14', 'Xcode', ios_version='13.2'),
-      Toolchain('ios-13-1-dep-9-0-arm64-bitcode-cxx17', 'Xcode', ios_version='13.1'),
-      Toolchain('ios-13-1-dep-9-0-arm64-cxx17', 'Xcode', ios_version='13.1'),
-      Toolchain('ios-13-1-dep-9-0-device-bitcode-cxx17', 'Xcode', ios_version='13.1'),
-      Toolchain('ios-13-0-dep-9-3-arm64', 'Xcode', ios_version='13.0'),
-      Toolchain('ios-13-0-dep-9-3-arm64-bitcode', 'Xcode', ios_version='13.0'),
-      Toolchain('ios-13-0-dep-11-0-arm64-bitcode-cxx17', 'Xcode', ios_version='13.0'),
-      Toolchain('ios-13-0-dep-10-0-arm64-bitcode-cxx17', 'Xcode', ios_version='13.0'),
-      Toolchain('ios-12-3-dep-9-3-arm64', 'Xcode', ios_version='12.3'),
-      Toolchain('ios-12-2-dep-9-3-arm64', 'Xcode', ios_version='12.2'),
-      Toolchain('ios-12-1-dep-9-0-device-bitcode-cxx14', 'Xcode', ios_version='12.1'),
-      Toolchain('ios-12-1-dep-9-0-device-bitcode-cxx17', 'Xcode', ios_version='12.1'),
-      Toolchain('ios-12-0-dep-11-0-arm64', 'Xcode', ios_version='12.0'),
-      Toolchain('ios-12-1-dep-11-0-arm64', 'Xcode', ios_version='12.1'),
-      Toolchain('ios-12-1-dep-12-0-arm64-cxx17', 'Xcode', ios_version='12.1'),
-      Toolchain('ios-12-1-dep-9-3-arm64-bitcode', 'Xcode', ios_version='12.1'),
-      Toolchain('ios-12-1-dep-9-3-arm64', 'Xcode', ios_version='12.1'),
-      Toolchain('ios-12-1-dep-9-3-armv7', 'Xcode', ios_version='12.1'),
-      Toolchain('ios-12-1-dep-9-3', 'Xcode', ios_version='12.1'),
-      Toolchain('ios-12-1-dep-9-3-x86-64-arm64', 'Xcode', ios_version='12.1'),
-      Toolchain('ios-11-4-dep-9-3-arm64', 'Xcode', ios_version='11.4'),
-      Toolchain('ios-11-4-dep-9-3-armv7', 'Xcode', ios_version='11.4'),
-      Toolchain('ios-11-4-dep-9-3-arm64-armv7', 'Xcode', ios_version='11.4'),
-      Toolchain('ios-11-4-dep-9-3', 'Xcode', ios_version='11.4'),
-      Toolchain('ios-11-4-dep-9-4-arm64', 'Xcode', ios_version='11.4'),
-      Toolchain('ios-11-4-dep-9-3-arm64-hid-sections-lto-cxx11', 'Xcode', ios_version='11.4'),
-      Toolchain('ios-11-4-dep-8-0-arm64-armv7-hid-sections-lto-cxx11', 'Xcode', ios_version='11.4'),
-      Toolchain('ios-11-4-dep-8-0-arm64-hid-sections-lto-cxx11', 'Xcode', ios_version='11.4'),
-      Toolchain('ios-11-3-dep-9-0-arm64', 'Xcode', ios_version='11.3'),
-      Toolchain('ios-11-4-dep-9-0-device-bitcode-cxx11', 'Xcode', ios_version='11.4'),
-      Toolchain('ios-12-0-dep-9-0-device-bitcode-cxx11', 'Xcode', ios_version='12.0'),
-      Toolchain('ios-11-4-dep-9-0-device-bitcode-nocxx', 'Xcode', ios_version='11.4'),
-      Toolchain('ios-11-3-dep-9-0-device-bitcode', 'Xcode', ios_version='11.3'),
-      Toolchain('ios-11-3-dep-9-0-device-bitcode-nocxx', 'Xcode', ios_version='11.3'),
-      Toolchain('ios-11-3-dep-9-0-device-bitcode-cxx11', 'Xcode', ios_version='11.3'),
-      Toolchain('ios-11-3-dep-9-0-device-bitcode-cxx17', 'Xcode', ios_version='11.3'),
-      Toolchain('ios-11-2-dep-9-0-device-bitcode-cxx11', 'Xcode', ios_version='11.2'),
-      Toolchain('ios-11-2-dep-9-0-device-bitcode-nocxx', 'Xcode', ios_version='11.2'),
-      Toolchain('ios-11-2-dep-9-3-arm64-armv7', 'Xcode', ios_version='11.2'),
-      Toolchain('ios-11-3-dep-9-3-arm64-armv7', 'Xcode', ios_version='11.3'),
-      Toolchain('ios-11-1-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='11.1'),
-      Toolchain('ios-11-1-dep-9-0-device-bitcode-cxx11', 'Xcode', ios_version='11.1'),
-      Toolchain('ios-11-0-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='11.0'),
-      Toolchain('ios-11-0-dep-9-0-device-bitcode-cxx11', 'Xcode', ios_version='11.0'),
-      Toolchain('ios-11-0-dep-9-0-x86-64-arm64-bitcode-cxx11', 'Xcode', ios_version='11.0'),
-      Toolchain('ios-11-0', 'Xcode', ios_version='11.0'),
-      Toolchain('ios-10-3', 'Xcode', ios_version='10.3'),
-      Toolchain('ios-10-3-dep-8-0-bitcode', 'Xcode', ios_version='10.3'),
-      Toolchain('ios-10-3-dep-9-0-bitcode', 'Xcode', ios_version='10.3'),
-      Toolchain('ios-10-3-dep-9-3-i386-armv7', 'Xcode', ios_version='10.3'),
-      Toolchain('ios-10-3-dep-9-3-x86-64-arm64', 'Xcode', ios_version='10.3'),
-      Toolchain('ios-10-3-lto', 'Xcode', ios_version='10.3'),
-      Toolchain('ios-10-3-armv7', 'Xcode', ios_version='10.3'),
-      Toolchain('ios-10-3-arm64', 'Xcode', ios_version='10.3'),
-      Toolchain('ios-10-2', 'Xcode', ios_version='10.2'),
-      Toolchain('ios-10-2-dep-9-3-armv7', 'Xcode', ios_version='10.2'),
-      Toolchain('ios-10-2-dep-9-3-arm64', 'Xcode', ios_version='10.2'),
-      Toolchain('ios-10-1', 'Xcode', ios_version='10.1'),
-      Toolchain('ios-10-1-arm64', 'Xcode', ios_version='10.1'),
-      Toolchain('ios-10-1-arm64-dep-8-0-hid-sections', 'Xcode', ios_version='10.1'),
-      Toolchain('ios-10-1-armv7', 'Xcode', ios_version='10.1'),
-      Toolchain('ios-10-1-dep-8-0-hid-sections', 'Xcode', ios_version='10.1'),
-      Toolchain('ios-10-1-dep-8-0-libcxx-hid-sections', 'Xcode', ios_version='10.1'),
-      Toolchain('ios-10-1-dep-8-0-libcxx-hid-sections-lto', 'Xcode', ios_version='10.1'),
-      Toolchain('ios-10-1-wo-armv7s', 'Xcode', ios_version='10.1'),
-      Toolchain('ios-10-0', 'Xcode', ios_version='10.0'),
-      Toolchain('ios-10-0-arm64', 'Xcode', ios_version='10.0'),
-      Toolchain('ios-10-0-arm64-dep-8-0-hid-sections', 'Xcode', ios_version='10.0'),
-      Toolchain('ios-10-0-armv7', 'Xcode', ios_version='10.0'),
-      Toolchain('ios-10-0-dep-8-0-hid-sections', 'Xcode', ios_version='10.0'),
-      Toolchain('ios-10-0-wo-armv7s', 'Xcode', ios_version='10.0'),
-      Toolchain('ios-9-3', 'Xcode', ios_version='9.3'),
-      Toolchain('ios-9-3-arm64', 'Xcode', ios_version='9.3'),
-      Toolchain('ios-9-3-armv7', 'Xcode', ios_version='9.3'),
-      Toolchain('ios-9-3-wo-armv7s', 'Xcode', ios_version='9.3'),
-      Toolchain('ios-9-2', 'Xcode', ios_version='9.2'),
-      Toolchain('ios-9-2-arm64', 'Xcode', ios_version='9.2'),
-      Toolchain('ios-9-2-armv7', 'Xcode', ios_version='9.2'),
-      Toolchain('ios-9-2-hid', 'Xcode', ios_version='9.2'),
-      Toolchain('ios-9-2-hid-sections', 'Xcode', ios_version='9.2'),
-      Toolchain('ios-9-1-armv7', 'Xcode', ios_version='9.1'),
-      Toolchain('ios-9-1-arm64', 'Xcode', ios_version='9.1'),
-      Toolchain('ios-9-1-dep-7-0-armv7', 'Xcode', ios_version='9.1'),
-      Toolchain('ios-9-1-hid', 'Xcode', ios_version='9.1'),
-      Toolchain('ios-9-1-dep-8-0-hid', 'Xcode', ios_version='9.1'),
-      Toolchain('ios-9-1', 'Xcode', ios_version='9.1'),
-      Toolchain('ios-9-0', 'Xcode', ios_version='9.0'),
-      Toolchain('ios-9-0-armv7', 'Xcode', ios_version='9.0'),
-      Toolchain('ios-9-0-i386-armv7', 'Xcode', ios_version='9.0'),
-      Toolchain('ios-9-0-wo-armv7s', 'Xcode', ios_version='9.0'),
-      Toolchain('ios-9-0-dep-7-0-armv7', 'Xcode', ios_version='9.0'),
-      Toolchain('ios-8-4', 'Xcode', ios_version='8.4'),
-      Toolchain('ios-8-4-arm64', 'Xcode', ios_version='8.4'),
-      Toolchain('ios-8-4-armv7', 'Xcode', ios_version='8.4'),
-      Toolchain('ios-8-4-armv7s', 'Xcode', ios_version='8.4'),
-      Toolchain('ios-8-4-hid', 'Xcode', ios_version='8.4'),
-      Toolchain('ios-8-2', 'Xcode', ios_version='8.2'),
-      Toolchain('ios-8-2-i386-arm64', 'Xcode', ios_version='8.2'),
-      Toolchain('ios-8-2-arm64', 'Xcode', ios_version='8.2'),
-      Toolchain('ios-8-2-arm64-hid', 'Xcode', ios_version='8.2'),
-      Toolchain('ios-8-2-cxx98', 'Xcode', ios_version='8.2'),
-      Toolchain('ios-8-1', 'Xcode', ios_version='8.1'),
-      Toolchain('ios-8-0', 'Xcode', ios_version='8.0'),
-      Toolchain('ios-7-1', 'Xcode', ios_version='7.1'),
-      Toolchain('ios-7-0', 'Xcode', ios_version='7.0'),
-      Toolchain('ios-dep-8-0-arm64-cxx11', 'Xcode'),
-      Toolchain('ios-dep-8-0-arm64-armv7-hid-sections-cxx11', 'Xcode'),
-      Toolchain('ios-dep-8-0-arm64-armv7-hid-sections-lto-cxx11', 'Xcode'),
-      Toolchain('ios-dep-10-0-bitcode-cxx17', 'Xcode'),
-      Toolchain('ios-dep-11-0-bitcode-cxx17', 'Xcode'),
-      Toolchain('ios-dep-12-0-bitcode-cxx17', 'Xcode'),
-      Toolchain('ios-nocodesign', 'Xcode', nocodesign=True),
-      Toolchain('ios-nocodesign-cxx17', 'Xcode', nocodesign=True),
-      Toolchain('ios-nocodesign-arm64', 'Xcode', nocodesign=True),
-      Toolchain('ios-nocodesign-arm64-cxx17', 'Xcode', nocodesign=True),
-      Toolchain('ios-nocodesign-armv7', 'Xcode', ios_version='8.1', nocodesign=True),
-      Toolchain('ios-nocodesign-hid-sections', 'Xcode', ios_version='8.1', nocodesign=True),
-      Toolchain('ios-nocodesign-wo-armv7s', 'Xcode', ios_version='8.1', nocodesign=True),
-      Toolchain('ios-nocodesign-8-4', 'Xcode', ios_version='8.4', nocodesign=True),
-      Toolchain('ios-nocodesign-8-1', 'Xcode', ios_version='8.1', nocodesign=True),
-      Toolchain('ios-nocodesign-9-1', 'Xcode', ios_version='9.1', nocodesign=True),
-      Toolchain('ios-nocodesign-9-1-arm64', 'Xcode', ios_version='9.1', nocodesign=True),
-      Toolchain('ios-nocodesign-9-1-armv7', 'Xcode', ios_version='9.1', nocodesign=True),
-      Toolchain('ios-nocodesign-9-2', 'Xcode', ios_version='9.2', nocodesign=True),
-      Toolchain('ios-nocodesign-9-2-arm64', 'Xcode', ios_version='9.2', nocodesign=True),
-      Toolchain('ios-nocodesign-9-2-armv7', 'Xcode', ios_version='9.2', nocodesign=True),
-      Toolchain('ios-nocodesign-9-3', 'Xcode', ios_version='9.3', nocodesign=True),
-      Toolchain('ios-nocodesign-9-3-device', 'Xcode', ios_version='9.3', nocodesign=True),
-      Toolchain('ios-nocodesign-9-3-device-hid-sections', 'Xcode', ios_version='9.3', nocodesign=True),
-      Toolchain('ios-nocodesign-9-3-arm64', 'Xcode', ios_version='9.3', nocodesign=True),
-      Toolchain('ios-nocodesign-9-3-armv7', 'Xcode', ios_version='9.3', nocodesign=True),
-      Toolchain('ios-nocodesign-9-3-wo-armv7s', 'Xcode', ios_version='9.3', nocodesign=True),
-      Toolchain('ios-nocodesign-10-0', 'Xcode', ios_version='10.0', nocodesign=True),
-      Toolchain('ios-nocodesign-10-0-arm64', 'Xcode', ios_version='10.0', nocodesign=True),
-      Toolchain('ios-nocodesign-10-0-armv7', 'Xcode', ios_version='10.0', nocodesign=True),
-      Toolchain('ios-nocodesign-10-0-wo-armv7s', 'Xcode', ios_version='10.0', nocodesign=True),
-      Toolchain('ios-nocodesign-10-1', 'Xcode', ios_version='10.1', nocodesign=True),
-      Toolchain('ios-nocodesign-10-1-arm64', 'Xcode', ios_version='10.1', nocodesign=True),
-      Toolchain('ios-nocodesign-10-1-armv7', 'Xcode', ios_version='10.1', nocodesign=True),
-      Toolchain('ios-nocodesign-10-1-wo-armv7s', 'Xcode', ios_version='10.1', nocodesign=True),
-      Toolchain('ios-nocodesign-10-1-arm64-dep-9-0-device-libcxx-hid-sections-lto', 'Xcode', ios_version='10.1', nocodesign=True),
-      Toolchain('ios-nocodesign-10-1-arm64-dep-9-0-device-libcxx-hid-sections', 'Xcode', ios_version='10.1', nocodesign=True),
-      Toolchain('ios-nocodesign-10-1-dep-8-0-libcxx-hid-sections-lto', 'Xcode', ios_version='10.1', nocodesign=True),
-      Toolchain('ios-nocodesign-10-1-dep-8-0-device-libcxx-hid-sections-lto', 'Xcode', ios_version='10.1', nocodesign=True),
-      Toolchain('ios-nocodesign-10-1-dep-9-0-device-libcxx-hid-sections-lto', 'Xcode', ios_version='10.1', nocodesign=True),
-      Toolchain('ios-nocodesign-10-2', 'Xcode', ios_version='10.2', nocodesign=True),
-      Toolchain('ios-nocodesign-10-3', 'Xcode', ios_version='10.3', nocodesign=True),
-      Toolchain('ios-nocodesign-10-3-cxx14', 'Xcode', ios_version='10.3', nocodesign=True),
-      Toolchain('ios-nocodesign-10-3-arm64-dep-9-0-device-libcxx-hid-sections', 'Xcode', ios_version='10.3', nocodesign=True),
-      Toolchain('ios-nocodesign-10-3-dep-9-0-bitcode', 'Xcode', ios_version='10.3', nocodesign=True),
-      Toolchain('ios-nocodesign-10-3-wo-armv7s', 'Xcode', ios_version='10.3', nocodesign=True),
-      Toolchain('ios-nocodesign-10-3-arm64', 'Xcode', ios_version='10.3', nocodesign=True),
-      Toolchain('ios-nocodesign-10-3-armv7', 'Xcode', ios_version='10.3', nocodesign=True),
-      Toolchain('ios-nocodesign-11-0', 'Xcode', ios_version='11.0', nocodesign=True),
-      Toolchain('ios-nocodesign-11-0-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='11.0', nocodesign=True),
-      Toolchain('ios-nocodesign-11-0-arm64-dep-9-0-device-libcxx-hid-sections', 'Xcode', ios_version='11.0', nocodesign=True),
-      Toolchain('ios-nocodesign-11-1', 'Xcode', ios_version='11.1', nocodesign=True),
-      Toolchain('ios-nocodesign-11-1-dep-9-0-wo-armv7s-bitcode-cxx11', 'Xcode', ios_version='11.1', nocodesign=True),
-      Toolchain('ios-nocodesign-11-1-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='11.1', nocodesign=True),
-      Toolchain('ios-nocodesign-11-2-dep-8-0-wo-armv7s-bitcode-cxx11', 'Xcode', ios_version='11.2', nocodesign=True),
-      Toolchain('ios-nocodesign-11-2-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='11.2', nocodesign=True),
-      Toolchain('ios-nocodesign-11-2-dep-9-3', 'Xcode', ios_version='11.2', nocodesign=True),
-      Toolchain('ios-nocodesign-11-2-dep-9-3-armv7', 'Xcode', ios_version='11.2', nocodesign=True),
-      Toolchain('ios-nocodesign-11-2-dep-9-3-arm64', 'Xcode', ios_version='11.2', nocodesign=True),
-      Toolchain('ios-nocodesign-11-2-dep-9-3-arm64-armv7', 'Xcode', ios_version='11.2', nocodesign=True),
-      Toolchain('ios-nocodesign-11-2-dep-9-3-i386-armv7', 'Xcode', ios_version='11.2', nocodesign=True),
-      Toolchain('ios-nocodesign-11-2', 'Xcode', ios_version='11.2', nocodesign=True),
-      Toolchain('ios-nocodesign-11-3-dep-9-3', 'Xcode', ios_version='11.3', nocodesign=True),
-      Toolchain('ios-nocodesign-11-3-dep-9-3-armv7', 'Xcode', ios_version='11.3', nocodesign=True),
-      Toolchain('ios-nocodesign-11-3-dep-9-3-arm64', 'Xcode', ios_version='11.3', nocodesign=True),
-      Toolchain('ios-nocodesign-11-3-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='11.3', nocodesign=True),
-      Toolchain('ios-nocodesign-11-4-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='11.4', nocodesign=True),
-      Toolchain('ios-nocodesign-12-0-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='12.0', nocodesign=True),
-      Toolchain('ios-nocodesign-12-0-dep-10-0-bitcode-cxx11', 'Xcode', ios_version='12.0', nocodesign=True),
-      Toolchain('ios-nocodesign-12-1-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='12.1', nocodesign=True),
-      Toolchain('ios-nocodesign-11-4-dep-9-3', 'Xcode', ios_version='11.4', nocodesign=True),
-      Toolchain('ios-nocodesign-11-4-dep-9-3-arm64', 'Xcode', ios_version='11.4', nocodesign=True),
-      Toolchain('ios-nocodesign-11-4-dep-9-3-armv7', 'Xcode', ios_version='11.4', nocodesign=True),
-      Toolchain('ios-nocodesign-12-1-dep-9-3-armv7', 'Xcode', ios_version='12.1', nocodesign=True),
-      Toolchain('ios-nocodesign-12-1', 'Xcode', ios_version='12.1', nocodesign=True),
-      Toolchain('ios-nocodesign-13-0-dep-9-3-arm64', 'Xcode', ios_version='13.0', nocodesign=True),
-      Toolchain('ios-nocodesign-13-1-dep-9-0-arm64-cxx14', 'Xcode', ios_version='13.1', nocodesign=True),
-      Toolchain('ios-nocodesign-13-1-dep-9-0-arm64-cxx17', 'Xcode', ios_version='13.1', nocodesign=True),
-      Toolchain('ios-nocodesign-13-1-dep-9-0-armv7-cxx14', 'Xcode', ios_version='13.1', nocodesign=True),
-      Toolchain('ios-nocodesign-13-1-dep-9-0-armv7-cxx17', 'Xcode', ios_version='13.1', nocodesign=True),
-      Toolchain('ios-nocodesign-13-2-dep-9-3-arm64', 'Xcode', ios_version='13.2', nocodesign=True),
-      Toolchain('ios-nocodesign-13-2-dep-9-3-armv7', 'Xcode', ios_version='13.2', nocodesign=True),
-      Toolchain('ios-nocodesign-13-2-dep-9-3-armv7s', 'Xcode', ios_version='13.2', nocodesign=True),
-      Toolchain('ios-nocodesign-13-2-dep-9-3', 'Xcode', ios_version='13.2', nocodesign=True),
-      Toolchain('ios-nocodesign-13-2-dep-9-3-device-cxx11', 'Xcode', ios_version='13.2', nocodesign=True),
-      Toolchain('ios-nocodesign-13-2-dep-9-3-device', 'Xcode', ios_version='13.2', nocodesign=True),
-      Toolchain('ios-nocodesign-13-5-dep-9-3-arm64', 'Xcode', ios_version='13.5', nocodesign=True),
-      Toolchain('ios-nocodesign-13-5-dep-9-3-armv7', 'Xcode', ios_version='13.5', nocodesign=True),
-      Toolchain('ios-nocodesign-13-5-dep-9-3-armv7s', 'Xcode', ios_version='13.5', nocodesign=True),
-      Toolchain('ios-nocodesign-13-5-dep-9-3', 'Xcode', ios_version='13.5', nocodesign=True),
-      Toolchain('ios-nocodesign-13-5-dep-9-3-device-cxx11', 'Xcode', ios_version='13.5', nocodesign=True),
-      Toolchain('ios-nocodesign-13-5-dep-9-3-device', 'Xcode', ios_version='13.5', nocodesign=True),
-      Toolchain('ios-nocodesign-13-6-dep-9-3-arm64', 'Xcode', ios_version='13.6', nocodesign=True),
-      Toolchain('ios-nocodesign-13-6-dep-9-3-armv7', 'Xcode', ios_version='13.6', nocodesign=True),
-      Toolchain('ios-nocodesign-13-6-dep-9-3-armv7s', 'Xcode', ios_version='13.6', nocodesign=True),
-      Toolchain('ios-nocodesign-13-6-dep-9-3', 'Xcode', ios_version='13.6', nocodesign=True),
-      Toolchain('ios-nocodesign-13-6-dep-9-3-device-cxx11', 'Xcode', ios_version='13.6', nocodesign=True),
-      Toolchain('ios-nocodesign-13-6-dep-9-3-device', 'Xcode', ios_version='13.6', nocodesign=True),
-      Toolchain('ios-nocodesign-14-0-dep-9-3-arm64', 'Xcode', ios_version='14.0', nocodesign=True),
-      Toolchain('ios-nocodesign-14-0-dep-9-3-armv7', 'Xcode', ios_version='14.0', nocodesign=True),
-      Toolchain('ios-nocodesign-14-0-dep-9-3-armv7s', 'Xcode', ios_version='14.0', nocodesign=True),
-      Toolchain('ios-nocodesign-14-0-dep-9-3', 'Xcode', ios_version='14.0', nocodesign=True),
-      Toolchain('ios-nocodesign-14-0-dep-9-3-device-cxx11', 'Xcode', ios_version='14.0', nocodesign=True),
-      Toolchain('ios-nocodesign-14-0-dep-9-3-device', 'Xcode', ios_version='14.0', nocodesign=True),
-      Toolchain('ios-nocodesign-14-2-dep-10-0-arm64', 'Xcode', ios_version='14.2', nocodesign=True),
-      Toolchain('ios-nocodesign-14-2-dep-10-0-armv7', 'Xcode', ios_version='14.2', nocodesign=True),
-      Toolchain('ios-nocodesign-14-2-dep-10-0-armv7s', 'Xcode', ios_version='14.2', nocodesign=True),
-      Toolchain('ios-nocodesign-14-2-dep-10-0', 'Xcode', ios_version='14.2', nocodesign=True),
-      Toolchain('ios-nocodesign-14-2-dep-10-0-device-cxx11', 'Xcode', ios_version='14.2', nocodesign=True),
-      Toolchain('ios-nocodesign-14-2-dep-10-0-device', 'Xcode', ios_version='14.2', nocodesign=True),
-      Toolchain('ios-nocodesign-14-3-dep-10-0-arm64', 'Xcode', ios_version='14.3', nocodesign=True),
-      Toolchain('ios-nocodesign-14-3-dep-10-0-armv7', 'Xcode', ios_version='14.3', nocodesign=True),
-      Toolchain('ios-nocodesign-14-3-dep-10-0-armv7s', 'Xcode', ios_version='14.3', nocodesign=True),
-      Toolchain('ios-nocodesign-14-3-dep-10-0', 'Xcode', ios_version='14.3', nocodesign=True),
-      Toolchain('ios-nocodesign-14-3-dep-10-0-device-cxx11', 'Xcode', ios_version='14.3', nocodesign=True),
-      Toolchain('ios-nocodesign-14-3-dep-10-0-device', 'Xcode', ios_version='14.3', nocodesign=True),
-      Toolchain('ios-nocodesign-14-4-dep-10-0-arm64', 'Xcode', ios_version='14.4', nocodesign=True),
-      Toolchain('ios-nocodesign-14-4-dep-10-0-armv7', 'Xcode', ios_version='14.4', nocodesign=True),
-      Toolchain('ios-nocodesign-14-4-dep-10-0-armv7s', 'Xcode', ios_version='14.4', nocodesign=True),
-      Toolchain('ios-nocodesign-14-4-dep-10-0', 'Xcode', ios_version='14.4', nocodesign=True),
-      Toolchain('ios-nocodesign-14-4-dep-10-0-device-cxx11', 'Xcode', ios_version='14.4', nocodesign=True),
-      Toolchain('ios-nocodesign-14-4-dep-10-0-device', 'Xcode', ios_version='14.4', nocodesign=True),
-      Toolchain('ios-nocodesign-15-5-arm64-cxx17', 'Xcode', ios_version='15.5', nocodesign=True),
-      Toolchain('ios-nocodesign-dep-9-0-cxx14', 'Xcode', nocodesign=True),
-      Toolchain('xcode', 'Xcode'),
-      Toolchain('xcode-cxx98', 'Xcode'),
-      Toolchain('xcode-cxx17', 'Xcode'),
-      Toolchain('xcode-nocxx', 'Xcode'),
-      Toolchain('xcode-gcc', 'Xcode'),
-      Toolchain('xcode-hid-sections', 'Xcode'),
-      Toolchain('xcode-sections', 'Xcode'),
-      Toolchain('osx', 'Xcode'),
-      Toolchain('osx-cxx17', 'Xcode'),
-      Toolchain('osx-make', 'Unix Makefiles'),
-      Toolchain('osx-make-cxx17', 'Unix Makefiles'),
-      Toolchain('osx-arch-universal2', 'Xcode'),
-      Toolchain('osx-arch-universal2-cxx17', 'Xcode'),
-      Toolchain('osx-10-7', 'Xcode', osx_version='10.7'),
-      Toolchain('osx-10-8', 'Xcode', osx_version='10.8'),
-      Toolchain('osx-10-9', 'Xcode', osx_version='10.9'),
-      Toolchain('osx-10-10', 'Xcode', osx_version='10.10'),
-      Toolchain('osx-10-11', 'Xcode', osx_version='10.11'),
-      Toolchain('osx-10-11-hid-sections', 'Xcode', osx_version='10.11'),
-      Toolchain('osx-10-11-hid-sections-lto', 'Xcode', osx_version='10.11'),
-      Toolchain('osx-10-11-lto', 'Xcode', osx_version='10.11'),
-      Toolchain('osx-10-12', 'Xcode', osx_version='10.12'),
-      Toolchain('osx-10-12-hid-sections', 'Xcode', osx_version='10.12'),
-      Toolchain('osx-10-12-lto', 'Xcode', osx_version='10.12'),
-      Toolchain('osx-10-12-cxx98', 'Xcode', osx_version='10.12'),
-      Toolchain('osx-10-12-cxx14', 'Xcode', osx_version='10.12'),
-      Toolchain('osx-10-12-cxx17', 'Xcode', osx_version='10.12'),
-      Toolchain('osx-10-10-dep-10-7', 'Xcode', osx_version='10.10'),
-      Toolchain('osx-10-12-dep-10-10', 'Xcode', osx_version='10.12'),
-      Toolchain('osx-10-12-dep-10-10-lto', 'Xcode', osx_version='10.12'),
-      Toolchain('osx-10-10-dep-10-9-make', 'Unix Makefiles'),
-      Toolchain('osx-10-11-make', 'Unix Makefiles'),
-      Toolchain('osx-10-12-make', 'Unix Makefiles'),
-      Toolchain('osx-10-12-ninja', 'Ninja'),
-      Toolchain('osx-10-11-sanitize-address', 'Xcode', osx_version='10.11'),
-      Toolchain('osx-10-12-sanitize-address', 'Xcode', osx_version='10.12'),
-      Toolchain('osx-10-12-sanitize-address-hid-sections', 'Xcode', osx_version='10.12'),
-      Toolchain('osx-10-13', 'Xcode', osx_version='10.13'),
-      Toolchain('osx-10-13-dep-10-10', 'Xcode', osx_version='10.13'),
-      Toolchain('osx-10-13-dep-10-10-cxx14', 'Xcode', osx_version='10.13'),
-      Toolchain('osx-10-13-dep-10-10-cxx17', 'Xcode', osx_version='10.13'),
-      Toolchain('osx-10-13-dep-10-12', 'Xcode', osx_version='10.13'),
-      Toolchain('osx-10-13-dep-10-12-cxx14', 'Xcode', osx_version='10.13'),
-      Toolchain('osx-10-13-dep-10-12-cxx17', 'Xcode', osx_version='10.13'),
-      Toolchain('osx-10-13-make-cxx14', 'Unix Makefiles'),
-      Toolchain('osx-10-13-cxx14', 'Xcode', osx_version='10.13'),
-      Toolchain('osx-10-13-cxx17', 'Xcode', osx_version='10.13'),
-      Toolchain('osx-10-13-i386-cxx14', 'Xcode', osx_version='10.13'),
-      Toolchain('osx-10-14', 'Xcode', osx_version='10.14'),
-      Toolchain('osx-10-14-dep-10-10', 'Xcode', osx_version='10.14'),
-      Toolchain('osx-10-14-dep-10-10-cxx14', 'Xcode', osx_version='10.14'),
-      Toolchain('osx-10-14-dep-10-10-cxx17', 'Xcode', osx_version='10.14'),
-      Toolchain('osx-10-14-dep-10-12', 'Xcode', osx_version='10.14'),
-      Toolchain('osx-10-14-dep-10-12-cxx14', 'Xcode', osx_version='10.14'),
-      Toolchain('osx-10-14-dep-10-12-cxx17', 'Xcode', osx_version='10.14'),
-      Toolchain('osx-10-14-cxx14', 'Xcode', osx_version='10.14'),
-      Toolchain('osx-10-14-cxx17', 'Xcode', osx_version='10.14'),
-      Toolchain('osx-10-15', 'Xcode', osx_version='10.15'),
-      Toolchain('osx-10-15-cxx17', 'Xcode', osx_version='10.15'),
-      Toolchain('osx-10-15-dep-10-10', 'Xcode', osx_version='10.15'),
-      Toolchain('osx-10-15-dep-10-10-cxx14', 'Xcode', osx_version='10.15'),
-      Toolchain('osx-10-15-dep-10-10-cxx17', 'Xcode', osx_version='10.15'),
-      Toolchain('osx-10-15-dep-10-12-cxx17', 'Xcode', osx_version='10.15'),
-      Toolchain('osx-10-15-make-cxx14', 'Unix Makefiles'),
-      Toolchain('osx-11-0', 'Xcode', osx_version='11.0'),
-      Toolchain('osx-11-0-arch-universal2', 'Xcode', osx_version='11.0'),
-      Toolchain('osx-11-0-cxx17', 'Xcode', osx_version='11.0'),
-      Toolchain('osx-11-0-dep-10-10-cxx17', 'Xcode', osx_version='11.0'),
-      Toolchain('osx-11-1', 'Xcode', osx_version='11.1'),
-      Toolchain('osx-11-1-cxx17', 'Xcode', osx_version='11.1'),
-      Toolchain('osx-11-1-arch-universal2-cxx17', 'Xcode', osx_version='11.1'),
-      Toolchain('osx-11-1-dep-10-10-cxx17', 'Xcode', osx_version='11.1'),
-      Toolchain('osx-11-1-dep-10-14-cxx17', 'Xcode', osx_version='11.1'),
-      Toolchain('osx-12-3-arch-universal2-cxx17', 'Xcode', osx_version='11.1'),
-      Toolchain('linux-gcc-x64', 'Unix Makefiles'),
-      Toolchain('linux-mingw-w32', 'Unix Makefiles'),
-      Toolchain('linux-mingw-w32-cxx14', 'Unix Makefiles'),
-      Toolchain('linux-mingw-w64', 'Unix Makefiles'),
-      Toolchain('linux-mingw-w64-cxx14', 'Unix Makefiles'),
-      Toolchain('linux-mingw-w64-cxx98', 'Unix Makefiles'),
-      Toolchain('linux-mingw-w64-gnuxx11', 'Unix Makefiles'),
+if sys.platform == 'darwin':
+  specs += [
+      spec('ios', 'Xcode'),
+      spec('ios-arm64', 'Xcode'),
+      spec('ios-arm64-cxx17', 'Xcode'),
+      spec('ios-cxx17', 'Xcode'),
+      spec('ios-bitcode', 'Xcode'),
+      spec('ios-14-4-dep-10-0-arm64', 'Xcode', ios_version='14.4'),
+      spec('ios-14-4-dep-10-0-armv7', 'Xcode', ios_version='14.4'),
+      spec('ios-14-4-dep-10-0-armv7s', 'Xcode', ios_version='14.4'),
+      spec('ios-14-4-dep-10-0-device-cxx14', 'Xcode', ios_version='14.4'),
+      spec('ios-14-4-dep-10-0-device-bitcode-cxx14', 'Xcode', ios_version='14.4'),
+      spec('ios-14-3-dep-10-0-arm64', 'Xcode', ios_version='14.3'),
+      spec('ios-14-3-dep-10-0-armv7', 'Xcode', ios_version='14.3'),
+      spec('ios-14-3-dep-10-0-armv7s', 'Xcode', ios_version='14.3'),
+      spec('ios-14-3-dep-10-0-device-cxx14', 'Xcode', ios_version='14.3'),
+      spec('ios-14-3-dep-10-0-device-bitcode-cxx14', 'Xcode', ios_version='14.3'),
+      spec('ios-14-2-dep-10-0-arm64', 'Xcode', ios_version='14.2'),
+      spec('ios-14-2-dep-10-0-armv7', 'Xcode', ios_version='14.2'),
+      spec('ios-14-2-dep-10-0-armv7s', 'Xcode', ios_version='14.2'),
+      spec('ios-14-2-dep-10-0-device-cxx14', 'Xcode', ios_version='14.2'),
+      spec('ios-14-2-dep-10-0-device-bitcode-cxx14', 'Xcode', ios_version='14.2'),
+      spec('ios-14-0-dep-9-3-arm64', 'Xcode', ios_version='14.0'),
+      spec('ios-14-0-dep-9-3-armv7', 'Xcode', ios_version='14.0'),
+      spec('ios-14-0-dep-9-3-armv7s', 'Xcode', ios_version='14.0'),
+      spec('ios-14-0-dep-9-3-device-cxx14', 'Xcode', ios_version='14.0'),
+      spec('ios-14-0-dep-9-3-device-bitcode-cxx14', 'Xcode', ios_version='14.0'),
+      spec('ios-13-6-dep-9-3-arm64', 'Xcode', ios_version='13.6'),
+      spec('ios-13-6-dep-9-3-armv7', 'Xcode', ios_version='13.6'),
+      spec('ios-13-6-dep-9-3-armv7s', 'Xcode', ios_version='13.6'),
+      spec('ios-13-6-dep-9-3-device-cxx14', 'Xcode', ios_version='13.6'),
+      spec('ios-13-6-dep-9-3-device-bitcode-cxx14', 'Xcode', ios_version='13.6'),
+      spec('ios-13-5-dep-9-3-arm64', 'Xcode', ios_version='13.5'),
+      spec('ios-13-5-dep-9-3-armv7', 'Xcode', ios_version='13.5'),
+      spec('ios-13-5-dep-9-3-armv7s', 'Xcode', ios_version='13.5'),
+      spec('ios-13-5-dep-9-3-device-cxx14', 'Xcode', ios_version='13.5'),
+      spec('ios-13-5-dep-9-3-device-bitcode-cxx14', 'Xcode', ios_version='13.5'),
+      spec('ios-13-4-dep-10-0-device-bitcode-cxx17', 'Xcode', ios_version='13.4'),
+      spec('ios-13-4-dep-10-0', 'Xcode', ios_version='13.4'),
+      spec('ios-13-4-dep-9-0-arm64-bitcode-cxx17', 'Xcode', ios_version='13.4'),
+      spec('ios-13-4-dep-9-0-arm64-cxx17', 'Xcode', ios_version='13.4'),
+      spec('ios-13-4-dep-9-0-device-bitcode-cxx17', 'Xcode', ios_version='13.4'),
+      spec('ios-13-4-dep-9-3-arm64', 'Xcode', ios_version='13.4'),
+      spec('ios-13-4-dep-9-3-armv7', 'Xcode', ios_version='13.4'),
+      spec('ios-13-4-dep-9-3-armv7s', 'Xcode', ios_version='13.4'),
+      spec('ios-13-4-dep-9-3-device-cxx14', 'Xcode', ios_version='13.4'),
+      spec('ios-13-4-dep-9-3-device-bitcode-cxx14', 'Xcode', ios_version='13.4'),
+      spec('ios-13-3-dep-9-3-arm64', 'Xcode', ios_version='13.3'),
+      spec('ios-13-3-dep-9-3-armv7', 'Xcode', ios_version='13.3'),
+      spec('ios-13-3-dep-9-3-armv7s', 'Xcode', ios_version='13.3'),
+      spec('ios-13-3-dep-9-3-device-cxx14', 'Xcode', ios_version='13.3'),
+      spec('ios-13-3-dep-9-3-device-bitcode-cxx14', 'Xcode', ios_version='13.3'),
+      spec('ios-13-2-dep-10-0-arm64-bitcode-cxx17', 'Xcode', ios_version='13.2'),
+      spec('ios-13-2-dep-9-3-arm64-bitcode', 'Xcode', ios_version='13.2'),
+      spec('ios-13-2-dep-9-3-arm64', 'Xcode', ios_version='13.2'),
+      spec('ios-13-2-dep-9-3-armv7', 'Xcode', ios_version='13.2'),
+      spec('ios-13-2-dep-9-3-armv7s', 'Xcode', ios_version='13.2'),
+      spec('ios-13-2-dep-9-3-device-cxx14', 'Xcode', ios_version='13.2'),
+      spec('ios-13-2-dep-9-3-device-bitcode-cxx14', 'Xcode', ios_version='13.2'),
+      spec('ios-13-1-dep-9-0-arm64-bitcode-cxx17', 'Xcode', ios_version='13.1'),
+      spec('ios-13-1-dep-9-0-arm64-cxx17', 'Xcode', ios_version='13.1'),
+      spec('ios-13-1-dep-9-0-device-bitcode-cxx17', 'Xcode', ios_version='13.1'),
+      spec('ios-13-0-dep-9-3-arm64', 'Xcode', ios_version='13.0'),
+      spec('ios-13-0-dep-9-3-arm64-bitcode', 'Xcode', ios_version='13.0'),
+      spec('ios-13-0-dep-11-0-arm64-bitcode-cxx17', 'Xcode', ios_version='13.0'),
+      spec('ios-13-0-dep-10-0-arm64-bitcode-cxx17', 'Xcode', ios_version='13.0'),
+      spec('ios-12-3-dep-9-3-arm64', 'Xcode', ios_version='12.3'),
+      spec('ios-12-2-dep-9-3-arm64', 'Xcode', ios_version='12.2'),
+      spec('ios-12-1-dep-9-0-device-bitcode-cxx14', 'Xcode', ios_version='12.1'),
+      spec('ios-12-1-dep-9-0-device-bitcode-cxx17', 'Xcode', ios_version='12.1'),
+      spec('ios-12-0-dep-11-0-arm64', 'Xcode', ios_version='12.0'),
+      spec('ios-12-1-dep-11-0-arm64', 'Xcode', ios_version='12.1'),
+      spec('ios-12-1-dep-12-0-arm64-cxx17', 'Xcode', ios_version='12.1'),
+      spec('ios-12-1-dep-9-3-arm64-bitcode', 'Xcode', ios_version='12.1'),
+      spec('ios-12-1-dep-9-3-arm64', 'Xcode', ios_version='12.1'),
+      spec('ios-12-1-dep-9-3-armv7', 'Xcode', ios_version='12.1'),
+      spec('ios-12-1-dep-9-3', 'Xcode', ios_version='12.1'),
+      spec('ios-12-1-dep-9-3-x86-64-arm64', 'Xcode', ios_version='12.1'),
+      spec('ios-11-4-dep-9-3-arm64', 'Xcode', ios_version='11.4'),
+      spec('ios-11-4-dep-9-3-armv7', 'Xcode', ios_version='11.4'),
+      spec('ios-11-4-dep-9-3-arm64-armv7', 'Xcode', ios_version='11.4'),
+      spec('ios-11-4-dep-9-3', 'Xcode', ios_version='11.4'),
+      spec('ios-11-4-dep-9-4-arm64', 'Xcode', ios_version='11.4'),
+      spec('ios-11-4-dep-9-3-arm64-hid-sections-lto-cxx11', 'Xcode', ios_version='11.4'),
+      spec('ios-11-4-dep-8-0-arm64-armv7-hid-sections-lto-cxx11', 'Xcode', ios_version='11.4'),
+      spec('ios-11-4-dep-8-0-arm64-hid-sections-lto-cxx11', 'Xcode', ios_version='11.4'),
+      spec('ios-11-3-dep-9-0-arm64', 'Xcode', ios_version='11.3'),
+      spec('ios-11-4-dep-9-0-device-bitcode-cxx11', 'Xcode', ios_version='11.4'),
+      spec('ios-12-0-dep-9-0-device-bitcode-cxx11', 'Xcode', ios_version='12.0'),
+      spec('ios-11-4-dep-9-0-device-bitcode-nocxx', 'Xcode', ios_version='11.4'),
+      spec('ios-11-3-dep-9-0-device-bitcode', 'Xcode', ios_version='11.3'),
+      spec('ios-11-3-dep-9-0-device-bitcode-nocxx', 'Xcode', ios_version='11.3'),
+      spec('ios-11-3-dep-9-0-device-bitcode-cxx11', 'Xcode', ios_version='11.3'),
+      spec('ios-11-3-dep-9-0-device-bitcode-cxx17', 'Xcode', ios_version='11.3'),
+      spec('ios-11-2-dep-9-0-device-bitcode-cxx11', 'Xcode', ios_version='11.2'),
+      spec('ios-11-2-dep-9-0-device-bitcode-nocxx', 'Xcode', ios_version='11.2'),
+      spec('ios-11-2-dep-9-3-arm64-armv7', 'Xcode', ios_version='11.2'),
+      spec('ios-11-3-dep-9-3-arm64-armv7', 'Xcode', ios_version='11.3'),
+      spec('ios-11-1-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='11.1'),
+      spec('ios-11-1-dep-9-0-device-bitcode-cxx11', 'Xcode', ios_version='11.1'),
+      spec('ios-11-0-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='11.0'),
+      spec('ios-11-0-dep-9-0-device-bitcode-cxx11', 'Xcode', ios_version='11.0'),
+      spec('ios-11-0-dep-9-0-x86-64-arm64-bitcode-cxx11', 'Xcode', ios_version='11.0'),
+      spec('ios-11-0', 'Xcode', ios_version='11.0'),
+      spec('ios-10-3', 'Xcode', ios_version='10.3'),
+      spec('ios-10-3-dep-8-0-bitcode', 'Xcode', ios_version='10.3'),
+      spec('ios-10-3-dep-9-0-bitcode', 'Xcode', ios_version='10.3'),
+      spec('ios-10-3-dep-9-3-i386-armv7', 'Xcode', ios_version='10.3'),
+      spec('ios-10-3-dep-9-3-x86-64-arm64', 'Xcode', ios_version='10.3'),
+      spec('ios-10-3-lto', 'Xcode', ios_version='10.3'),
+      spec('ios-10-3-armv7', 'Xcode', ios_version='10.3'),
+      spec('ios-10-3-arm64', 'Xcode', ios_version='10.3'),
+      spec('ios-10-2', 'Xcode', ios_version='10.2'),
+      spec('ios-10-2-dep-9-3-armv7', 'Xcode', ios_version='10.2'),
+      spec('ios-10-2-dep-9-3-arm64', 'Xcode', ios_version='10.2'),
+      spec('ios-10-1', 'Xcode', ios_version='10.1'),
+      spec('ios-10-1-arm64', 'Xcode', ios_version='10.1'),
+      spec('ios-10-1-arm64-dep-8-0-hid-sections', 'Xcode', ios_version='10.1'),
+      spec('ios-10-1-armv7', 'Xcode', ios_version='10.1'),
+      spec('ios-10-1-dep-8-0-hid-sections', 'Xcode', ios_version='10.1'),
+      spec('ios-10-1-dep-8-0-libcxx-hid-sections', 'Xcode', ios_version='10.1'),
+      spec('ios-10-1-dep-8-0-libcxx-hid-sections-lto', 'Xcode', ios_version='10.1'),
+      spec('ios-10-1-wo-armv7s', 'Xcode', ios_version='10.1'),
+      spec('ios-10-0', 'Xcode', ios_version='10.0'),
+      spec('ios-10-0-arm64', 'Xcode', ios_version='10.0'),
+      spec('ios-10-0-arm64-dep-8-0-hid-sections', 'Xcode', ios_version='10.0'),
+      spec('ios-10-0-armv7', 'Xcode', ios_version='10.0'),
+      spec('ios-10-0-dep-8-0-hid-sections', 'Xcode', ios_version='10.0'),
+      spec('ios-10-0-wo-armv7s', 'Xcode', ios_version='10.0'),
+      spec('ios-9-3', 'Xcode', ios_version='9.3'),
+      spec('ios-9-3-arm64', 'Xcode', ios_version='9.3'),
+      spec('ios-9-3-armv7', 'Xcode', ios_version='9.3'),
+      spec('ios-9-3-wo-armv7s', 'Xcode', ios_version='9.3'),
+      spec('ios-9-2', 'Xcode', ios_version='9.2'),
+      spec('ios-9-2-arm64', 'Xcode', ios_version='9.2'),
+      spec('ios-9-2-armv7', 'Xcode', ios_version='9.2'),
+      spec('ios-9-2-hid', 'Xcode', ios_version='9.2'),
+      spec('ios-9-2-hid-sections', 'Xcode', ios_version='9.2'),
+      spec('ios-9-1-armv7', 'Xcode', ios_version='9.1'),
+      spec('ios-9-1-arm64', 'Xcode', ios_version='9.1'),
+      spec('ios-9-1-dep-7-0-armv7', 'Xcode', ios_version='9.1'),
+      spec('ios-9-1-hid', 'Xcode', ios_version='9.1'),
+      spec('ios-9-1-dep-8-0-hid', 'Xcode', ios_version='9.1'),
+      spec('ios-9-1', 'Xcode', ios_version='9.1'),
+      spec('ios-9-0', 'Xcode', ios_version='9.0'),
+      spec('ios-9-0-armv7', 'Xcode', ios_version='9.0'),
+      spec('ios-9-0-i386-armv7', 'Xcode', ios_version='9.0'),
+      spec('ios-9-0-wo-armv7s', 'Xcode', ios_version='9.0'),
+      spec('ios-9-0-dep-7-0-armv7', 'Xcode', ios_version='9.0'),
+      spec('ios-8-4', 'Xcode', ios_version='8.4'),
+      spec('ios-8-4-arm64', 'Xcode', ios_version='8.4'),
+      spec('ios-8-4-armv7', 'Xcode', ios_version='8.4'),
+      spec('ios-8-4-armv7s', 'Xcode', ios_version='8.4'),
+      spec('ios-8-4-hid', 'Xcode', ios_version='8.4'),
+      spec('ios-8-2', 'Xcode', ios_version='8.2'),
+      spec('ios-8-2-i386-arm64', 'Xcode', ios_version='8.2'),
+      spec('ios-8-2-arm64', 'Xcode', ios_version='8.2'),
+      spec('ios-8-2-arm64-hid', 'Xcode', ios_version='8.2'),
+      spec('ios-8-2-cxx98', 'Xcode', ios_version='8.2'),
+      spec('ios-8-1', 'Xcode', ios_version='8.1'),
+      spec('ios-8-0', 'Xcode', ios_version='8.0'),
+      spec('ios-7-1', 'Xcode', ios_version='7.1'),
+      spec('ios-7-0', 'Xcode', ios_version='7.0'),
+      spec('ios-dep-8-0-arm64-cxx11', 'Xcode'),
+      spec('ios-dep-8-0-arm64-armv7-hid-sections-cxx11', 'Xcode'),
+      spec('ios-dep-8-0-arm64-armv7-hid-sections-lto-cxx11', 'Xcode'),
+      spec('ios-dep-10-0-bitcode-cxx17', 'Xcode'),
+      spec('ios-dep-11-0-bitcode-cxx17', 'Xcode'),
+      spec('ios-dep-12-0-bitcode-cxx17', 'Xcode'),
+      spec('ios-nocodesign', 'Xcode', nocodesign=True),
+      spec('ios-nocodesign-cxx17', 'Xcode', nocodesign=True),
+      spec('ios-nocodesign-arm64', 'Xcode', nocodesign=True),
+      spec('ios-nocodesign-arm64-cxx17', 'Xcode', nocodesign=True),
+      spec('ios-nocodesign-armv7', 'Xcode', ios_version='8.1', nocodesign=True),
+      spec('ios-nocodesign-hid-sections', 'Xcode', ios_version='8.1', nocodesign=True),
+      spec('ios-nocodesign-wo-armv7s', 'Xcode', ios_version='8.1', nocodesign=True),
+      spec('ios-nocodesign-8-4', 'Xcode', ios_version='8.4', nocodesign=True),
+      spec('ios-nocodesign-8-1', 'Xcode', ios_version='8.1', nocodesign=True),
+      spec('ios-nocodesign-9-1', 'Xcode', ios_version='9.1', nocodesign=True),
+      spec('ios-nocodesign-9-1-arm64', 'Xcode', ios_version='9.1', nocodesign=True),
+      spec('ios-nocodesign-9-1-armv7', 'Xcode', ios_version='9.1', nocodesign=True),
+      spec('ios-nocodesign-9-2', 'Xcode', ios_version='9.2', nocodesign=True),
+      spec('ios-nocodesign-9-2-arm64', 'Xcode', ios_version='9.2', nocodesign=True),
+      spec('ios-nocodesign-9-2-armv7', 'Xcode', ios_version='9.2', nocodesign=True),
+      spec('ios-nocodesign-9-3', 'Xcode', ios_version='9.3', nocodesign=True),
+      spec('ios-nocodesign-9-3-device', 'Xcode', ios_version='9.3', nocodesign=True),
+      spec('ios-nocodesign-9-3-device-hid-sections', 'Xcode', ios_version='9.3', nocodesign=True),
+      spec('ios-nocodesign-9-3-arm64', 'Xcode', ios_version='9.3', nocodesign=True),
+      spec('ios-nocodesign-9-3-armv7', 'Xcode', ios_version='9.3', nocodesign=True),
+      spec('ios-nocodesign-9-3-wo-armv7s', 'Xcode', ios_version='9.3', nocodesign=True),
+      spec('ios-nocodesign-10-0', 'Xcode', ios_version='10.0', nocodesign=True),
+      spec('ios-nocodesign-10-0-arm64', 'Xcode', ios_version='10.0', nocodesign=True),
+      spec('ios-nocodesign-10-0-armv7', 'Xcode', ios_version='10.0', nocodesign=True),
+      spec('ios-nocodesign-10-0-wo-armv7s', 'Xcode', ios_version='10.0', nocodesign=True),
+      spec('ios-nocodesign-10-1', 'Xcode', ios_version='10.1', nocodesign=True),
+      spec('ios-nocodesign-10-1-arm64', 'Xcode', ios_version='10.1', nocodesign=True),
+      spec('ios-nocodesign-10-1-armv7', 'Xcode', ios_version='10.1', nocodesign=True),
+      spec('ios-nocodesign-10-1-wo-armv7s', 'Xcode', ios_version='10.1', nocodesign=True),
+      spec('ios-nocodesign-10-1-arm64-dep-9-0-device-libcxx-hid-sections-lto', 'Xcode', ios_version='10.1', nocodesign=True),
+      spec('ios-nocodesign-10-1-arm64-dep-9-0-device-libcxx-hid-sections', 'Xcode', ios_version='10.1', nocodesign=True),
+      spec('ios-nocodesign-10-1-dep-8-0-libcxx-hid-sections-lto', 'Xcode', ios_version='10.1', nocodesign=True),
+      spec('ios-nocodesign-10-1-dep-8-0-device-libcxx-hid-sections-lto', 'Xcode', ios_version='10.1', nocodesign=True),
+      spec('ios-nocodesign-10-1-dep-9-0-device-libcxx-hid-sections-lto', 'Xcode', ios_version='10.1', nocodesign=True),
+      spec('ios-nocodesign-10-2', 'Xcode', ios_version='10.2', nocodesign=True),
+      spec('ios-nocodesign-10-3', 'Xcode', ios_version='10.3', nocodesign=True),
+      spec('ios-nocodesign-10-3-cxx14', 'Xcode', ios_version='10.3', nocodesign=True),
+      spec('ios-nocodesign-10-3-arm64-dep-9-0-device-libcxx-hid-sections', 'Xcode', ios_version='10.3', nocodesign=True),
+      spec('ios-nocodesign-10-3-dep-9-0-bitcode', 'Xcode', ios_version='10.3', nocodesign=True),
+      spec('ios-nocodesign-10-3-wo-armv7s', 'Xcode', ios_version='10.3', nocodesign=True),
+      spec('ios-nocodesign-10-3-arm64', 'Xcode', ios_version='10.3', nocodesign=True),
+      spec('ios-nocodesign-10-3-armv7', 'Xcode', ios_version='10.3', nocodesign=True),
+      spec('ios-nocodesign-11-0', 'Xcode', ios_version='11.0', nocodesign=True),
+      spec('ios-nocodesign-11-0-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='11.0', nocodesign=True),
+      spec('ios-nocodesign-11-0-arm64-dep-9-0-device-libcxx-hid-sections', 'Xcode', ios_version='11.0', nocodesign=True),
+      spec('ios-nocodesign-11-1', 'Xcode', ios_version='11.1', nocodesign=True),
+      spec('ios-nocodesign-11-1-dep-9-0-wo-armv7s-bitcode-cxx11', 'Xcode', ios_version='11.1', nocodesign=True),
+      spec('ios-nocodesign-11-1-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='11.1', nocodesign=True),
+      spec('ios-nocodesign-11-2-dep-8-0-wo-armv7s-bitcode-cxx11', 'Xcode', ios_version='11.2', nocodesign=True),
+      spec('ios-nocodesign-11-2-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='11.2', nocodesign=True),
+      spec('ios-nocodesign-11-2-dep-9-3', 'Xcode', ios_version='11.2', nocodesign=True),
+      spec('ios-nocodesign-11-2-dep-9-3-armv7', 'Xcode', ios_version='11.2', nocodesign=True),
+      spec('ios-nocodesign-11-2-dep-9-3-arm64', 'Xcode', ios_version='11.2', nocodesign=True),
+      spec('ios-nocodesign-11-2-dep-9-3-arm64-armv7', 'Xcode', ios_version='11.2', nocodesign=True),
+      spec('ios-nocodesign-11-2-dep-9-3-i386-armv7', 'Xcode', ios_version='11.2', nocodesign=True),
+      spec('ios-nocodesign-11-2', 'Xcode', ios_version='11.2', nocodesign=True),
+      spec('ios-nocodesign-11-3-dep-9-3', 'Xcode', ios_version='11.3', nocodesign=True),
+      spec('ios-nocodesign-11-3-dep-9-3-armv7', 'Xcode', ios_version='11.3', nocodesign=True),
+      spec('ios-nocodesign-11-3-dep-9-3-arm64', 'Xcode', ios_version='11.3', nocodesign=True),
+      spec('ios-nocodesign-11-3-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='11.3', nocodesign=True),
+      spec('ios-nocodesign-11-4-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='11.4', nocodesign=True),
+      spec('ios-nocodesign-12-0-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='12.0', nocodesign=True),
+      spec('ios-nocodesign-12-0-dep-10-0-bitcode-cxx11', 'Xcode', ios_version='12.0', nocodesign=True),
+      spec('ios-nocodesign-12-1-dep-9-0-bitcode-cxx11', 'Xcode', ios_version='12.1', nocodesign=True),
+      spec('ios-nocodesign-11-4-dep-9-3', 'Xcode', ios_version='11.4', nocodesign=True),
+      spec('ios-nocodesign-11-4-dep-9-3-arm64', 'Xcode', ios_version='11.4', nocodesign=True),
+      spec('ios-nocodesign-11-4-dep-9-3-armv7', 'Xcode', ios_version='11.4', nocodesign=True),
+      spec('ios-nocodesign-12-1-dep-9-3-armv7', 'Xcode', ios_version='12.1', nocodesign=True),
+      spec('ios-nocodesign-12-1', 'Xcode', ios_version='12.1', nocodesign=True),
+      spec('ios-nocodesign-13-0-dep-9-3-arm64', 'Xcode', ios_version='13.0', nocodesign=True),
+      spec('ios-nocodesign-13-1-dep-9-0-arm64-cxx14', 'Xcode', ios_version='13.1', nocodesign=True),
+      spec('ios-nocodesign-13-1-dep-9-0-arm64-cxx17', 'Xcode', ios_version='13.1', nocodesign=True),
+      spec('ios-nocodesign-13-1-dep-9-0-armv7-cxx14', 'Xcode', ios_version='13.1', nocodesign=True),
+      spec('ios-nocodesign-13-1-dep-9-0-armv7-cxx17', 'Xcode', ios_version='13.1', nocodesign=True),
+      spec('ios-nocodesign-13-2-dep-9-3-arm64', 'Xcode', ios_version='13.2', nocodesign=True),
+      spec('ios-nocodesign-13-2-dep-9-3-armv7', 'Xcode', ios_version='13.2', nocodesign=True),
+      spec('ios-nocodesign-13-2-dep-9-3-armv7s', 'Xcode', ios_version='13.2', nocodesign=True),
+      spec('ios-nocodesign-13-2-dep-9-3', 'Xcode', ios_version='13.2', nocodesign=True),
+      spec('ios-nocodesign-13-2-dep-9-3-device-cxx11', 'Xcode', ios_version='13.2', nocodesign=True),
+      spec('ios-nocodesign-13-2-dep-9-3-device', 'Xcode', ios_version='13.2', nocodesign=True),
+      spec('ios-nocodesign-13-5-dep-9-3-arm64', 'Xcode', ios_version='13.5', nocodesign=True),
+      spec('ios-nocodesign-13-5-dep-9-3-armv7', 'Xcode', ios_version='13.5', nocodesign=True),
+      spec('ios-nocodesign-13-5-dep-9-3-armv7s', 'Xcode', ios_version='13.5', nocodesign=True),
+      spec('ios-nocodesign-13-5-dep-9-3', 'Xcode', ios_version='13.5', nocodesign=True),
+      spec('ios-nocodesign-13-5-dep-9-3-device-cxx11', 'Xcode', ios_version='13.5', nocodesign=True),
+      spec('ios-nocodesign-13-5-dep-9-3-device', 'Xcode', ios_version='13.5', nocodesign=True),
+      spec('ios-nocodesign-13-6-dep-9-3-arm64', 'Xcode', ios_version='13.6', nocodesign=True),
+      spec('ios-nocodesign-13-6-dep-9-3-armv7', 'Xcode', ios_version='13.6', nocodesign=True),
+      spec('ios-nocodesign-13-6-dep-9-3-armv7s', 'Xcode', ios_version='13.6', nocodesign=True),
+      spec('ios-nocodesign-13-6-dep-9-3', 'Xcode', ios_version='13.6', nocodesign=True),
+      spec('ios-nocodesign-13-6-dep-9-3-device-cxx11', 'Xcode', ios_version='13.6', nocodesign=True),
+      spec('ios-nocodesign-13-6-dep-9-3-device', 'Xcode', ios_version='13.6', nocodesign=True),
+      spec('ios-nocodesign-14-0-dep-9-3-arm64', 'Xcode', ios_version='14.0', nocodesign=True),
+      spec('ios-nocodesign-14-0-dep-9-3-armv7', 'Xcode', ios_version='14.0', nocodesign=True),
+      spec('ios-nocodesign-14-0-dep-9-3-armv7s', 'Xcode', ios_version='14.0', nocodesign=True),
+      spec('ios-nocodesign-14-0-dep-9-3', 'Xcode', ios_version='14.0', nocodesign=True),
+      spec('ios-nocodesign-14-0-dep-9-3-device-cxx11', 'Xcode', ios_version='14.0', nocodesign=True),
+      spec('ios-nocodesign-14-0-dep-9-3-device', 'Xcode', ios_version='14.0', nocodesign=True),
+      spec('ios-nocodesign-14-2-dep-10-0-arm64', 'Xcode', ios_version='14.2', nocodesign=True),
+      spec('ios-nocodesign-14-2-dep-10-0-armv7', 'Xcode', ios_version='14.2', nocodesign=True),
+      spec('ios-nocodesign-14-2-dep-10-0-armv7s', 'Xcode', ios_version='14.2', nocodesign=True),
+      spec('ios-nocodesign-14-2-dep-10-0', 'Xcode', ios_version='14.2', nocodesign=True),
+      spec('ios-nocodesign-14-2-dep-10-0-device-cxx11', 'Xcode', ios_version='14.2', nocodesign=True),
+      spec('ios-nocodesign-14-2-dep-10-0-device', 'Xcode', ios_version='14.2', nocodesign=True),
+      spec('ios-nocodesign-14-3-dep-10-0-arm64', 'Xcode', ios_version='14.3', nocodesign=True),
+      spec('ios-nocodesign-14-3-dep-10-0-armv7', 'Xcode', ios_version='14.3', nocodesign=True),
+      spec('ios-nocodesign-14-3-dep-10-0-armv7s', 'Xcode', ios_version='14.3', nocodesign=True),
+      spec('ios-nocodesign-14-3-dep-10-0', 'Xcode', ios_version='14.3', nocodesign=True),
+      spec('ios-nocodesign-14-3-dep-10-0-device-cxx11', 'Xcode', ios_version='14.3', nocodesign=True),
+      spec('ios-nocodesign-14-3-dep-10-0-device', 'Xcode', ios_version='14.3', nocodesign=True),
+      spec('ios-nocodesign-14-4-dep-10-0-arm64', 'Xcode', ios_version='14.4', nocodesign=True),
+      spec('ios-nocodesign-14-4-dep-10-0-armv7', 'Xcode', ios_version='14.4', nocodesign=True),
+      spec('ios-nocodesign-14-4-dep-10-0-armv7s', 'Xcode', ios_version='14.4', nocodesign=True),
+      spec('ios-nocodesign-14-4-dep-10-0', 'Xcode', ios_version='14.4', nocodesign=True),
+      spec('ios-nocodesign-14-4-dep-10-0-device-cxx11', 'Xcode', ios_version='14.4', nocodesign=True),
+      spec('ios-nocodesign-14-4-dep-10-0-device', 'Xcode', ios_version='14.4', nocodesign=True),
+      spec('ios-nocodesign-15-5-arm64-cxx17', 'Xcode', ios_version='15.5', nocodesign=True),
+      spec('ios-nocodesign-dep-9-0-cxx14', 'Xcode', nocodesign=True),
+      spec('xcode', 'Xcode'),
+      spec('xcode-cxx98', 'Xcode'),
+      spec('xcode-cxx17', 'Xcode'),
+      spec('xcode-nocxx', 'Xcode'),
+      spec('xcode-gcc', 'Xcode'),
+      spec('xcode-hid-sections', 'Xcode'),
+      spec('xcode-sections', 'Xcode'),
+      spec('osx', 'Xcode'),
+      spec('osx-cxx17', 'Xcode'),
+      spec('osx-make', 'Unix Makefiles'),
+      spec('osx-make-cxx17', 'Unix Makefiles'),
+      spec('osx-arch-universal2', 'Xcode'),
+      spec('osx-arch-universal2-cxx17', 'Xcode'),
+      spec('osx-10-7', 'Xcode', osx_version='10.7'),
+      spec('osx-10-8', 'Xcode', osx_version='10.8'),
+      spec('osx-10-9', 'Xcode', osx_version='10.9'),
+      spec('osx-10-10', 'Xcode', osx_version='10.10'),
+      spec('osx-10-11', 'Xcode', osx_version='10.11'),
+      spec('osx-10-11-hid-sections', 'Xcode', osx_version='10.11'),
+      spec('osx-10-11-hid-sections-lto', 'Xcode', osx_version='10.11'),
+      spec('osx-10-11-lto', 'Xcode', osx_version='10.11'),
+      spec('osx-10-12', 'Xcode', osx_version='10.12'),
+      spec('osx-10-12-hid-sections', 'Xcode', osx_version='10.12'),
+      spec('osx-10-12-lto', 'Xcode', osx_version='10.12'),
+      spec('osx-10-12-cxx98', 'Xcode', osx_version='10.12'),
+      spec('osx-10-12-cxx14', 'Xcode', osx_version='10.12'),
+      spec('osx-10-12-cxx17', 'Xcode', osx_version='10.12'),
+      spec('osx-10-10-dep-10-7', 'Xcode', osx_version='10.10'),
+      spec('osx-10-12-dep-10-10', 'Xcode', osx_version='10.12'),
+      spec('osx-10-12-dep-10-10-lto', 'Xcode', osx_version='10.12'),
+      spec('osx-10-10-dep-10-9-make', 'Unix Makefiles'),
+      spec('osx-10-11-make', 'Unix Makefiles'),
+      spec('osx-10-12-make', 'Unix Makefiles'),
+      spec('osx-10-12-ninja', 'Ninja'),
+      spec('osx-10-11-sanitize-address', 'Xcode', osx_version='10.11'),
+      spec('osx-10-12-sanitize-address', 'Xcode', osx_version='10.12'),
+      spec('osx-10-12-sanitize-address-hid-sections', 'Xcode', osx_version='10.12'),
+      spec('osx-10-13', 'Xcode', osx_version='10.13'),
+      spec('osx-10-13-dep-10-10', 'Xcode', osx_version='10.13'),
+      spec('osx-10-13-dep-10-10-cxx14', 'Xcode', osx_version='10.13'),
+      spec('osx-10-13-dep-10-10-cxx17', 'Xcode', osx_version='10.13'),
+      spec('osx-10-13-dep-10-12', 'Xcode', osx_version='10.13'),
+      spec('osx-10-13-dep-10-12-cxx14', 'Xcode', osx_version='10.13'),
+      spec('osx-10-13-dep-10-12-cxx17', 'Xcode', osx_version='10.13'),
+      spec('osx-10-13-make-cxx14', 'Unix Makefiles'),
+      spec('osx-10-13-cxx14', 'Xcode', osx_version='10.13'),
+      spec('osx-10-13-cxx17', 'Xcode', osx_version='10.13'),
+      spec('osx-10-13-i386-cxx14', 'Xcode', osx_version='10.13'),
+      spec('osx-10-14', 'Xcode', osx_version='10.14'),
+      spec('osx-10-14-dep-10-10', 'Xcode', osx_version='10.14'),
+      spec('osx-10-14-dep-10-10-cxx14', 'Xcode', osx_version='10.14'),
+      spec('osx-10-14-dep-10-10-cxx17', 'Xcode', osx_version='10.14'),
+      spec('osx-10-14-dep-10-12', 'Xcode', osx_version='10.14'),
+      spec('osx-10-14-dep-10-12-cxx14', 'Xcode', osx_version='10.14'),
+      spec('osx-10-14-dep-10-12-cxx17', 'Xcode', osx_version='10.14'),
+      spec('osx-10-14-cxx14', 'Xcode', osx_version='10.14'),
+      spec('osx-10-14-cxx17', 'Xcode', osx_version='10.14'),
+      spec('osx-10-15', 'Xcode', osx_version='10.15'),
+      spec('osx-10-15-cxx17', 'Xcode', osx_version='10.15'),
+      spec('osx-10-15-dep-10-10', 'Xcode', osx_version='10.15'),
+      spec('osx-10-15-dep-10-10-cxx14', 'Xcode', osx_version='10.15'),
+      spec('osx-10-15-dep-10-10-cxx17', 'Xcode', osx_version='10.15'),
+      spec('osx-10-15-dep-10-12-cxx17', 'Xcode', osx_version='10.15'),
+      spec('osx-10-15-make-cxx14', 'Unix Makefiles'),
+      spec('osx-11-0', 'Xcode', osx_version='11.0'),
+      spec('osx-11-0-arch-universal2', 'Xcode', osx_version='11.0'),
+      spec('osx-11-0-cxx17', 'Xcode', osx_version='11.0'),
+      spec('osx-11-0-dep-10-10-cxx17', 'Xcode', osx_version='11.0'),
+      spec('osx-11-1', 'Xcode', osx_version='11.1'),
+      spec('osx-11-1-cxx17', 'Xcode', osx_version='11.1'),
+      spec('osx-11-1-arch-universal2-cxx17', 'Xcode', osx_version='11.1'),
+      spec('osx-11-1-dep-10-10-cxx17', 'Xcode', osx_version='11.1'),
+      spec('osx-11-1-dep-10-14-cxx17', 'Xcode', osx_version='11.1'),
+      spec('osx-12-3-arch-universal2-cxx17', 'Xcode', osx_version='11.1'),
+      spec('linux-gcc-x64', 'Unix Makefiles'),
+      spec('linux-mingw-w32', 'Unix Makefiles'),
+      spec('linux-mingw-w32-cxx14', 'Unix Makefiles'),
+      spec('linux-mingw-w64', 'Unix Makefiles'),
+      spec('linux-mingw-w64-cxx14', 'Unix Makefiles'),
+      spec('linux-mingw-w64-cxx98', 'Unix Makefiles'),
+      spec('linux-mingw-w64-gnuxx11', 'Unix Makefiles'),
   ]
 
 if os.name == 'posix':
-  toolchain_table += [
-      Toolchain('analyze', 'Unix Makefiles'),
-      Toolchain('analyze-cxx17', 'Unix Makefiles'),
-      Toolchain('clang-5', 'Unix Makefiles'),
-      Toolchain('clang-5-cxx14', 'Unix Makefiles'),
-      Toolchain('clang-5-cxx17', 'Unix Makefiles'),
-      Toolchain('clang-cxx20', 'Unix Makefiles'),
-      Toolchain('clang-cxx17', 'Unix Makefiles'),
-      Toolchain('clang-cxx17-pic', 'Unix Makefiles'),
-      Toolchain('clang-cxx14', 'Unix Makefiles'),
-      Toolchain('clang-cxx14-pic', 'Unix Makefiles'),
-      Toolchain('clang-cxx11', 'Unix Makefiles'),
-      Toolchain('clang-libcxx', 'Unix Makefiles'),
-      Toolchain('clang-libcxx-fpic', 'Unix Makefiles'),
-      Toolchain('clang-libcxx14', 'Unix Makefiles'),
-      Toolchain('clang-libcxx14-fpic', 'Unix Makefiles'),
-      Toolchain('clang-libcxx17', 'Unix Makefiles'),
-      Toolchain('clang-libcxx17-fpic', 'Unix Makefiles'),
-      Toolchain('clang-libcxx98', 'Unix Makefiles'),
-      Toolchain('clang-libcxx17-static', 'Unix Makefiles'),
-      Toolchain('clang-lto', 'Unix Makefiles'),
-      Toolchain('clang-libstdcxx', 'Unix Makefiles'),
-      Toolchain('clang-omp', 'Unix Makefiles'),
-      Toolchain('clang-fpic', 'Unix Makefiles'),
-      Toolchain('clang-fpic-hid-sections', 'Unix Makefiles'),
-      Toolchain('clang-fpic-static-std', 'Unix Makefiles'),
-      Toolchain('clang-fpic-static-std-cxx14', 'Unix Makefiles'),
-      Toolchain('clang-tidy', 'Unix Makefiles'),
-      Toolchain('clang-tidy-libcxx', 'Unix Makefiles'),
-      Toolchain('custom-libcxx', 'Unix Makefiles'),
-      Toolchain('gcc', 'Unix Makefiles'),
-      Toolchain('gcc-ninja', 'Ninja'),
-      Toolchain('gcc-static', 'Unix Makefiles'),
-      Toolchain('gcc-static-std', 'Unix Makefiles'),
-      Toolchain('gcc-musl', 'Unix Makefiles'),
-      Toolchain('gcc-32bit', 'Unix Makefiles'),
-      Toolchain('gcc-32bit-pic', 'Unix Makefiles'),
-      Toolchain('gcc-hid', 'Unix Makefiles'),
-      Toolchain('gcc-hid-fpic', 'Unix Makefiles'),
-      Toolchain('gcc-gold', 'Unix Makefiles'),
-      Toolchain('gcc-pic', 'Unix Makefiles'),
-      Toolchain('gcc-pic-cxx17', 'Unix Makefiles'),
-      Toolchain('gcc-c11', 'Unix Makefiles'),
-      Toolchain('gcc-cxx14-c11', 'Unix Makefiles'),
-      Toolchain('gcc-cxx17-c11', 'Unix Makefiles'),
-      Toolchain('gcc-4-8', 'Unix Makefiles'),
-      Toolchain('gcc-4-8-c11', 'Unix Makefiles'),
-      Toolchain('gcc-4-8-pic', 'Unix Makefiles'),
-      Toolchain('gcc-4-8-pic-hid-sections', 'Unix Makefiles'),
-      Toolchain('gcc-4-8-pic-hid-sections-cxx11-c11', 'Unix Makefiles'),
-      Toolchain('gcc-pic-hid-sections', 'Unix Makefiles'),
-      Toolchain('gcc-pic-hid-sections-lto', 'Unix Makefiles'),
-      Toolchain('gcc-5-pic-hid-sections-lto', 'Unix Makefiles'),
-      Toolchain('gcc-5-pic-hid-sections', 'Unix Makefiles'),
-      Toolchain('gcc-5', 'Unix Makefiles'),
-      Toolchain('gcc-5-cxx14-c11', 'Unix Makefiles'),
-      Toolchain('gcc-6-32bit-cxx14', 'Unix Makefiles'),
-      Toolchain('gcc-7', 'Unix Makefiles'),
-      Toolchain('gcc-7-cxx11-pic', 'Unix Makefiles'),
-      Toolchain('gcc-7-cxx14', 'Unix Makefiles'),
-      Toolchain('gcc-7-cxx14-pic', 'Unix Makefiles'),
-      Toolchain('gcc-7-cxx17', 'Unix Makefiles'),
-      Toolchain('gcc-7-cxx17-gnu', 'Unix Makefiles'),
-      Toolchain('gcc-7-cxx17-pic', 'Unix Makefiles'),
-      Toolchain('gcc-7-cxx17-concepts', 'Unix Makefiles'),
-      Toolchain('gcc-7-pic-hid-sections-lto', 'Unix Makefiles'),
-      Toolchain('gcc-8-cxx14', 'Unix Makefiles'),
-      Toolchain('gcc-8-cxx14-fpic', 'Unix Makefiles'),
-      Toolchain('gcc-8-cxx17', 'Unix Makefiles'),
-      Toolchain('gcc-8-cxx17-fpic', 'Unix Makefiles'),
-      Toolchain('gcc-8-cxx17-gnu-fpic', 'Unix Makefiles'),
-      Toolchain('gcc-8-cxx17-concepts', 'Unix Makefiles'),
-      Toolchain('gcc-9-cxx17', 'Unix Makefiles'),
-      Toolchain('gcc-9-cxx17-fpic', 'Unix Makefiles'),
-      Toolchain('gcc-9-cxx17-gnu-fpic', 'Unix Makefiles'),
-      Toolchain('gcc-10-cxx17', 'Unix Makefiles'),
-      Toolchain('gcc-10-cxx17-fpic', 'Unix Makefiles'),
-      Toolchain('gcc-10-cxx17-gnu-fpic', 'Unix Makefiles'),
-      Toolchain('gcc-cxx98', 'Unix Makefiles'),
-      Toolchain('gcc-lto', 'Unix Makefiles'),
-      Toolchain('libcxx', 'Unix Makefiles'),
-      Toolchain('libcxx14', 'Unix Makefiles'),
-      Toolchain('libcxx-no-sdk', 'Unix Makefiles'),
-      Toolchain('libcxx-hid', 'Unix Makefiles'),
-      Toolchain('libcxx-hid-fpic', 'Unix Makefiles'),
-      Toolchain('libcxx-fpic-hid-sections', 'Unix Makefiles'),
-      Toolchain('libcxx-hid-sections', 'Unix Makefiles'),
-      Toolchain('sanitize-address', 'Unix Makefiles'),
-      Toolchain('sanitize-address-cxx17', 'Unix Makefiles'),
-      Toolchain('sanitize-address-cxx17-pic', 'Unix Makefiles'),
-      Toolchain('sanitize-thread', 'Unix Makefiles'),
-      Toolchain('sanitize-thread-cxx17', 'Unix Makefiles'),
-      Toolchain('sanitize-thread-cxx17-pic', 'Unix Makefiles'),
-      Toolchain('arm-openwrt-linux-muslgnueabi', 'Unix Makefiles'),
-      Toolchain('arm-openwrt-linux-muslgnueabi-cxx14', 'Unix Makefiles'),
-      Toolchain('openbsd-egcc-cxx11-static-std', 'Unix Makefiles'),
-      Toolchain('ninja-gcc-7-cxx17-concepts', 'Ninja'),
-      Toolchain('ninja-gcc-8-cxx17-concepts', 'Ninja'),
-      Toolchain('ninja-clang-cxx17-fpic', 'Ninja'),
-      Toolchain('ninja-gcc-cxx17-fpic', 'Ninja'),
-      Toolchain('ninja-vs-win64-cxx17', 'Ninja'),
+  specs += [
+      spec('analyze', 'Unix Makefiles'),
+      spec('analyze-cxx17', 'Unix Makefiles'),
+      spec('clang-5', 'Unix Makefiles'),
+      spec('clang-5-cxx14', 'Unix Makefiles'),
+      spec('clang-5-cxx17', 'Unix Makefiles'),
+      spec('clang-cxx20', 'Unix Makefiles'),
+      spec('clang-cxx17', 'Unix Makefiles'),
+      spec('clang-cxx17-pic', 'Unix Makefiles'),
+      spec('clang-cxx14', 'Unix Makefiles'),
+      spec('clang-cxx14-pic', 'Unix Makefiles'),
+      spec('clang-cxx11', 'Unix Makefiles'),
+      spec('clang-libcxx', 'Unix Makefiles'),
+      spec('clang-libcxx-fpic', 'Unix Makefiles'),
+      spec('clang-libcxx14', 'Unix Makefiles'),
+      spec('clang-libcxx14-fpic', 'Unix Makefiles'),
+      spec('clang-libcxx17', 'Unix Makefiles'),
+      spec('clang-libcxx17-fpic', 'Unix Makefiles'),
+      spec('clang-libcxx98', 'Unix Makefiles'),
+      spec('clang-libcxx17-static', 'Unix Makefiles'),
+      spec('clang-lto', 'Unix Makefiles'),
+      spec('clang-libstdcxx', 'Unix Makefiles'),
+      spec('clang-omp', 'Unix Makefiles'),
+      spec('clang-fpic', 'Unix Makefiles'),
+      spec('clang-fpic-hid-sections', 'Unix Makefiles'),
+      spec('clang-fpic-static-std', 'Unix Makefiles'),
+      spec('clang-fpic-static-std-cxx14', 'Unix Makefiles'),
+      spec('clang-tidy', 'Unix Makefiles'),
+      spec('clang-tidy-libcxx', 'Unix Makefiles'),
+      spec('custom-libcxx', 'Unix Makefiles'),
+      spec('gcc', 'Unix Makefiles'),
+      spec('gcc-ninja', 'Ninja'),
+      spec('gcc-static', 'Unix Makefiles'),
+      spec('gcc-static-std', 'Unix Makefiles'),
+      spec('gcc-musl', 'Unix Makefiles'),
+      spec('gcc-32bit', 'Unix Makefiles'),
+      spec('gcc-32bit-pic', 'Unix Makefiles'),
+      spec('gcc-hid', 'Unix Makefiles'),
+      spec('gcc-hid-fpic', 'Unix Makefiles'),
+      spec('gcc-gold', 'Unix Makefiles'),
+      spec('gcc-pic', 'Unix Makefiles'),
+      spec('gcc-pic-cxx17', 'Unix Makefiles'),
+      spec('gcc-c11', 'Unix Makefiles'),
+      spec('gcc-cxx14-c11', 'Unix Makefiles'),
+      spec('gcc-cxx17-c11', 'Unix Makefiles'),
+      spec('gcc-4-8', 'Unix Makefiles'),
+      spec('gcc-4-8-c11', 'Unix Makefiles'),
+      spec('gcc-4-8-pic', 'Unix Makefiles'),
+      spec('gcc-4-8-pic-hid-sections', 'Unix Makefiles'),
+      spec('gcc-4-8-pic-hid-sections-cxx11-c11', 'Unix Makefiles'),
+      spec('gcc-pic-hid-sections', 'Unix Makefiles'),
+      spec('gcc-pic-hid-sections-lto', 'Unix Makefiles'),
+      spec('gcc-5-pic-hid-sections-lto', 'Unix Makefiles'),
+      spec('gcc-5-pic-hid-sections', 'Unix Makefiles'),
+      spec('gcc-5', 'Unix Makefiles'),
+      spec('gcc-5-cxx14-c11', 'Unix Makefiles'),
+      spec('gcc-6-32bit-cxx14', 'Unix Makefiles'),
+      spec('gcc-7', 'Unix Makefiles'),
+      spec('gcc-7-cxx11-pic', 'Unix Makefiles'),
+      spec('gcc-7-cxx14', 'Unix Makefiles'),
+      spec('gcc-7-cxx14-pic', 'Unix Makefiles'),
+      spec('gcc-7-cxx17', 'Unix Makefiles'),
+      spec('gcc-7-cxx17-gnu', 'Unix Makefiles'),
+      spec('gcc-7-cxx17-pic', 'Unix Makefiles'),
+      spec('gcc-7-cxx17-concepts', 'Unix Makefiles'),
+      spec('gcc-7-pic-hid-sections-lto', 'Unix Makefiles'),
+      spec('gcc-8-cxx14', 'Unix Makefiles'),
+      spec('gcc-8-cxx14-fpic', 'Unix Makefiles'),
+      spec('gcc-8-cxx17', 'Unix Makefiles'),
+      spec('gcc-8-cxx17-fpic', 'Unix Makefiles'),
+      spec('gcc-8-cxx17-gnu-fpic', 'Unix Makefiles'),
+      spec('gcc-8-cxx17-concepts', 'Unix Makefiles'),
+      spec('gcc-9-cxx17', 'Unix Makefiles'),
+      spec('gcc-9-cxx17-fpic', 'Unix Makefiles'),
+      spec('gcc-9-cxx17-gnu-fpic', 'Unix Makefiles'),
+      spec('gcc-10-cxx17', 'Unix Makefiles'),
+      spec('gcc-10-cxx17-fpic', 'Unix Makefiles'),
+      spec('gcc-10-cxx17-gnu-fpic', 'Unix Makefiles'),
+      spec('gcc-cxx98', 'Unix Makefiles'),
+      spec('gcc-lto', 'Unix Makefiles'),
+      spec('libcxx', 'Unix Makefiles'),
+      spec('libcxx14', 'Unix Makefiles'),
+      spec('libcxx-no-sdk', 'Unix Makefiles'),
+      spec('libcxx-hid', 'Unix Makefiles'),
+      spec('libcxx-hid-fpic', 'Unix Makefiles'),
+      spec('libcxx-fpic-hid-sections', 'Unix Makefiles'),
+      spec('libcxx-hid-sections', 'Unix Makefiles'),
+      spec('sanitize-address', 'Unix Makefiles'),
+      spec('sanitize-address-cxx17', 'Unix Makefiles'),
+      spec('sanitize-address-cxx17-pic', 'Unix Makefiles'),
+      spec('sanitize-thread', 'Unix Makefiles'),
+      spec('sanitize-thread-cxx17', 'Unix Makefiles'),
+      spec('sanitize-thread-cxx17-pic', 'Unix Makefiles'),
+      spec('arm-openwrt-linux-muslgnueabi', 'Unix Makefiles'),
+      spec('arm-openwrt-linux-muslgnueabi-cxx14', 'Unix Makefiles'),
+      spec('openbsd-egcc-cxx11-static-std', 'Unix Makefiles'),
+      spec('ninja-gcc-7-cxx17-concepts', 'Ninja'),
+      spec('ninja-gcc-8-cxx17-concepts', 'Ninja'),
+      spec('ninja-clang-cxx17-fpic', 'Ninja'),
+      spec('ninja-gcc-cxx17-fpic', 'Ninja'),
+      spec('ninja-vs-win64-cxx17', 'Ninja'),
   ]
 
+def available(generator):
+  """Toolchain with `generator` can be used on this platform"""
+  if generator == 'Xcode':
+    return sys.platform == 'darwin'
+  if generator.startswith(('Visual Studio', 'NMake', 'MinGW', 'MSYS')):
+    return os.name == 'nt'
+  return True
+
+def discovered_spec(entry):
+  """Spec of the toolchain missing in `specs` from the index entry (see
+  `detail.toolchain_index`), None if it's not for this platform"""
+  generator = entry['generator']
+  if not available(generator):
+    return None
+  if 'cl' in entry['compilers'] and os.name != 'nt':
+    return None
+  apple = ['osx', 'osx-default-sdk', 'iphone', 'iphone-default-sdk']
+  if any(x in apple for x in entry['os']) and sys.platform != 'darwin':
+    return None
+  if 'cygwin' in entry['os'] and sys.platform != 'cygwin':
+    return None
+  kwargs = {}
+  vs_ninja = (generator == 'Ninja' and 'cl' in entry['compilers'])
+  if generator.startswith(('Visual Studio', 'NMake')) or vs_ninja:
+    if not entry['vs_version']:
+      return None
+    kwargs['vs_version'] = entry['vs_version']
+  if generator.startswith('NMake') or vs_ninja:
+    kwargs['arch'] = 'x86'
+    for x in entry['archs']:
+      if x in ['amd64', 'x86', 'arm', 'arm64']:
+        kwargs['arch'] = x
+  if generator == 'Xcode':
+    kwargs['ios_version'] = entry['ios_version']
+    kwargs['osx_version'] = entry['osx_version']
+    kwargs['nocodesign'] = entry['nocodesign']
+  return spec(entry['name'], generator, **kwargs)
+
+class Registry:
+  """Toolchains indexed by name, `Toolchain` objects (and `verify`) are
+  created only for the toolchains used. Toolchain files missing in `specs`
+  are found in the index of the polly directory (loaded on first miss)."""
+  def __init__(self, specs, discover=True):
+    self.specs = {}
+    self.order = []
+    for x in specs:
+      if x[0] in self.specs:
+        continue # first one wins (as in the old linear lookup)
+      self.specs[x[0]] = x
+      self.order.append(x[0])
+    self.entries = {}
+    self.discover = discover
+    self.discovered = None
+
+  def index(self):
+    import detail.toolchain_index # reads the cache, not needed for `specs`
+    return detail.toolchain_index.get()
+
+  def discovered_specs(self):
+    """Specs of the toolchain files not in `specs` (name -> spec)"""
+    if self.discovered is None:
+      self.discovered = {}
+      if self.discover:
+        index = self.index()
+        for name in index.names():
+          if name not in self.specs:
+            found = discovered_spec(index.get(name))
+            if found:
+              self.discovered[name] = found
+    return self.discovered
+
+  def find_spec(self, name):
+    found = self.specs.get(name)
+    if found is None:
+      found = self.discovered_specs().get(name)
+    return found
+
+  def __contains__(self, name):
+    return self.find_spec(name) is not None
+
+  def __len__(self):
+    return len(self.order)
+
+  def __iter__(self):
+    for name in self.order:
+      yield self.get(name)
+
+  def names(self):
+    """Names from `specs` (`match` includes the discovered ones)"""
+    return list(self.order)
+
+  def get(self, name):
+    """`Toolchain` or None if not found"""
+    entry = self.entries.get(name)
+    if entry is None:
+      found = self.find_spec(name)
+      if found is None:
+        return None
+      name, generator, kwargs = found
+      entry = Toolchain(name, generator, **kwargs)
+      self.entries[name] = entry
+    return entry
+
+  def match(self, pattern):
+    """Names matching glob `pattern` (discovered toolchains included)"""
+    import fnmatch # not needed for the lookup by name (imports re)
+    names = self.order + sorted(self.discovered_specs())
+    return [x for x in names if fnmatch.fnmatchcase(x, pattern)]
+
+  def find(self, **attributes):
+    """Toolchains with given attribute values, e.g. find(is_ninja=True)"""
+    return [
+        x for x in self
+        if all(getattr(x, k) == v for k, v in attributes.items())
+    ]
+
+registry = Registry(specs)
+
 def get_by_name(name):
-  for x in toolchain_table:
-    if name == x.name:
-      return x
-  sys.exit('Internal error: toolchain not found in toolchain table')
+  entry = registry.get(name)
+  if entry is None:
+    import detail.toolchain_index
+    found = detail.toolchain_index.get().get(name)
+    if found:
+      sys.exit(
+          "Toolchain '{}' ({}) is not available on this platform".format(
+              name, found['generator']
+          )
+      )
+    detail.toolchain_index.verify(name) # exits with the close names
+    sys.exit('Internal error: toolchain not found in toolchain table')
+  return entry
+
+class LazyList(list):
+  """List filled from `source` on first use (the `Toolchain` objects are
+  not created unless someone reads `toolchain_table`)"""
+  def __init__(self, source):
+    list.__init__(self)
+    self.source = source
+    self.loaded = False
+
+  def load(self):
+    if not self.loaded:
+      self.loaded = True
+      list.extend(self, self.source)
+    return self
+
+def lazy_method(name):
+  method = getattr(list, name)
+  def wrapper(self, *args):
+    return method(self.load(), *args)
+  wrapper.__name__ = name
+  return wrapper
+
+for x in [
+    '__iter__', '__len__', '__getitem__', '__contains__', '__reversed__',
+    '__eq__', '__ne__', '__add__', '__mul__', '__repr__', 'index', 'count',
+    'copy'
+]:
+  setattr(LazyList, x, lazy_method(x))
+
+# All `Toolchain` objects, for the old users of the list
+toolchain_table = LazyList(registry)
@@ -0,0 +1,132 @@
+# Import events of the child processes into the polly timer (saved by
+# `Timer.save_trace`):
+# * Ninja: edges from .ninja_log appended by the build
+# * CMake: `--profiling-format=google-trace` output of the configure step
+# * CTest: test durations from Testing/Temporary/LastTest*.log
+#
+# Child clocks are not shared with polly: events are aligned to the start of
+# the polly job that ran the child.
+
+import glob
+import json
+import os
+import re
+
+ctest_testing_regex = re.compile(r'^\d+/\d+ Testing: (.*)$')
+ctest_time_regex = re.compile(r'^Test time =\s*([0-9.]+) sec')
+ctest_result_regex = re.compile(r'^Test (Passed|Failed)\.?')
+
+def cmake_profile_args(profile_path):
+  return [
+      '--profiling-format=google-trace',
+      '--profiling-output={}'.format(profile_path)
+  ]
+
+def ninja_log_size(build_dir):
+  log_path = os.path.join(build_dir, '.ninja_log')
+  if not os.path.exists(log_path):
+    return 0
+  return os.path.getsize(log_path)
+
+def add_ninja_events(timer, build_dir, offset, start):
+  """Edges of the ninja run started at `start` (.ninja_log after `offset`)"""
+  log_path = os.path.join(build_dir, '.ninja_log')
+  if not os.path.exists(log_path) or os.path.getsize(log_path) < offset:
+    return # no log or log recompacted
+  with open(log_path, 'rb') as f:
+    f.seek(offset)
+    data = f.read().decode('utf-8', errors='replace')
+  edges = {} # one edge can have several outputs
+  for line in data.splitlines():
+    fields = line.split('\t')
+    if line.startswith('#') or len(fields) < 4:
+      continue
+    edges.setdefault((int(fields[0]), int(fields[1])), []).append(fields[3])
+  for (start_ms, end_ms), outputs in edges.items():
+    args = None
+    if len(outputs) > 1:
+      args = {'outputs': outputs}
+    timer.add_event(
+        outputs[0], 'ninja', start + start_ms / 1000, (end_ms - start_ms) / 1000, args
+    )
+
+def add_cmake_events(timer, profile_path, start):
+  """Function calls from the CMake google-trace profile"""
+  if not os.path.exists(profile_path):
+    return
+  try:
+    with open(profile_path, 'r') as f:
+      events = json.load(f)
+  except ValueError:
+    return # configure failed or interrupted
+  begins = [x['ts'] for x in events if x.get('ph') in ['B', 'X']]
+  if not begins:
+    return
+  origin = min(begins)
+  def seconds(ts):
+    return start + (ts - origin) / 1000000
+
+  stack = []
+  for event in events:
+    phase = event.get('ph')
+    if phase == 'B':
+      stack.append(event)
+    elif phase == 'E' and stack:
+      begin = stack.pop()
+      timer.add_event(
+          begin['name'],
+          'cmake',
+          seconds(begin['ts']),
+          (event['ts'] - begin['ts']) / 1000000,
+          begin.get('args')
+      )
+    elif phase == 'X':
+      timer.add_event(
+          event['name'],
+          'cmake',
+          seconds(event['ts']),
+          event['dur'] / 1000000,
+          event.get('args')
+      )
+
+def add_ctest_events(timer, build_dir, start):
+  """Tests of the last ctest run laid out one after another from `start`"""
+  logs = glob.glob(
+      os.path.join(build_dir, 'Testing', 'Temporary', 'LastTest*.log')
+  )
+  if not logs:
+    return
+  with open(max(logs, key=os.path.getmtime), 'r', errors='replace') as f:
+    lines = f.read().splitlines()
+  name = None
+  duration = None
+  position = start
+  for line in lines:
+    m = ctest_testing_regex.match(line)
+    if m:
+      name = m.group(1)
+      duration = None
+      continue
+    m = ctest_time_regex.match(line)
+    if m:
+      duration = float(m.group(1))
+      continue
+    m = ctest_result_regex.match(line)
+    if m and name is not None and duration is not None:
+      timer.add_event(name, 'ctest', position, duration, {'result': m.group(1)})
+      position += duration
+      name = None
+
+def add_pipeline_events(timer, pipeline, build_dir):
+  """Tests started by the pipelined build-and-test"""
+  for names, exit_code, start, duration in pipeline.calls:
+    if len(names) == 1:
+      timer.add_event(
+          names[0],
+          'ctest',
+          start,
+          duration,
+          {'result': 'Passed' if exit_code == 0 else 'Failed'}
+      )
+    else:
+      add_ctest_events(timer, build_dir, start)
@@ -0,0 +1,48 @@
+# Per-user cache directory shared by all the projects built with polly:
+# * $POLLY_CACHE_DIR
+# * Linux: $XDG_CACHE_HOME/polly or ~/.cache/polly
+# * macOS: ~/Library/Caches/polly
+# * Windows: %LOCALAPPDATA%\polly\cache
+
+import json
+import os
+import sys
+import tempfile
+
+def directory():
+  result = os.getenv('POLLY_CACHE_DIR')
+  if result:
+    return result
+  if os.name == 'nt':
+    base = os.getenv('LOCALAPPDATA') or os.path.expanduser('~')
+    return os.path.join(base, 'polly', 'cache')
+  if sys.platform == 'darwin':
+    return os.path.expanduser(os.path.join('~', 'Library', 'Caches', 'polly'))
+  base = os.getenv('XDG_CACHE_HOME') or os.path.expanduser(
+      os.path.join('~', '.cache')
+  )
+  return os.path.join(base, 'polly')
+
+def path(*names):
+  return os.path.join(directory(), *names)
+
+def load_json(name):
+  """Content of JSON file `name` from the cache, None if missing/broken"""
+  try:
+    with open(path(name), 'r') as f:
+      return json.load(f)
+  except (OSError, IOError, ValueError):
+    return None
+
+def save_json(name, content):
+  """Write JSON file `name` atomically, the cache is optional (no errors)"""
+  try:
+    cache_dir = directory()
+    if not os.path.exists(cache_dir):
+      os.makedirs(cache_dir)
+    fd, temp = tempfile.mkstemp(dir=cache_dir, prefix='.{}.'.format(name))
+    with os.fdopen(fd, 'w') as f:
+      json.dump(content, f, indent=2, sort_keys=True)
+    os.replace(temp, path(name))
+  except (OSError, IOError):
+    pass
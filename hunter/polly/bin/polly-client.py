@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+
+# Thin client for `polly.py --daemon`: send the command line to the daemon,
+# stream the output back and exit with the status of the build. Falls back to
+# running polly.py directly if the daemon is not running.
+#
+# Socket: POLLY_DAEMON_SOCKET environment variable or the daemon's default.
+
+import os
+import sys
+
+import detail.daemon
+
+exit_code = detail.daemon.client(sys.argv[1:])
+if exit_code is None:
+  polly_py = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'polly.py')
+  os.execv(sys.executable, [sys.executable, polly_py] + sys.argv[1:])
+sys.exit(exit_code)
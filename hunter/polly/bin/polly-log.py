@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+
+# Read polly logs (plain log.txt, log.txt.gz written with --compress-log or
+# rotated logs) without decompressing the whole file where possible:
+#
+#   > polly-log.py tail -n 50 --toolchain gcc
+#   > polly-log.py grep 'undefined reference' _logs/polly/gcc/log.txt.gz
+#   > polly-log.py cat --range 1048576:2097152 --toolchain gcc
+#   > polly-log.py errors --toolchain gcc
+#   > polly-log.py segments --toolchain gcc
+#   > polly-log.py cat --segment -1 --toolchain gcc
+#   > polly-log.py grep --phase Test 'Passed' --toolchain gcc
+#
+# `tail`, `cat`/`grep` of a range, segment or phase and `errors` read only
+# the blocks they need (offsets from log.index.json).
+
+import argparse
+import collections
+import gzip
+import json
+import os
+import re
+import sys
+
+import detail.log_rotation
+import detail.seekable_log
+
+def find_log(args):
+  if args.log:
+    return args.log
+  logs_dir = os.path.join(args.output or os.getcwd(), '_logs', 'polly')
+  toolchain = args.toolchain
+  if not toolchain:
+    if not os.path.isdir(logs_dir):
+      sys.exit('Directory not found: {}'.format(logs_dir))
+    toolchains = sorted(
+        x for x in os.listdir(logs_dir)
+        if os.path.isdir(os.path.join(logs_dir, x))
+    )
+    if len(toolchains) != 1:
+      sys.exit(
+          'Use --toolchain to select one of: {}'.format(', '.join(toolchains))
+      )
+    toolchain = toolchains[0]
+  for name in ['log.txt', 'log.txt.gz']:
+    path = os.path.join(logs_dir, toolchain, name)
+    if os.path.exists(path):
+      return path
+  sys.exit('No log found in {}'.format(os.path.join(logs_dir, toolchain)))
+
+def parse_range(value):
+  start, sep, end = value.partition(':')
+  try:
+    return int(start or 0), int(end) if end else None
+  except ValueError:
+    raise argparse.ArgumentTypeError('Expected START:END: {}'.format(value))
+
+def chunks(f, start=0, end=None, size=1 << 20):
+  """Data from `start` to `end` (blocks of the seekable log as they are)"""
+  if isinstance(f, detail.seekable_log.Reader):
+    for x in f.iter_blocks(start, end):
+      yield x
+    return
+  f.seek(start)
+  position = start
+  while end is None or position < end:
+    data = f.read(size if end is None else min(size, end - position))
+    if not data:
+      return
+    position += len(data)
+    yield data
+
+def lines(f, start=0, end=None):
+  """(offset, line without EOL)"""
+  offset = start
+  partial = b''
+  for data in chunks(f, start, end):
+    data = partial + data
+    parts = data.split(b'\n')
+    partial = parts.pop()
+    for x in parts:
+      yield offset, x
+      offset += len(x) + 1
+  if partial:
+    yield offset, partial
+
+def output(line):
+  sys.stdout.buffer.write(line + b'\n')
+
+def cat(f, args):
+  start, end = args.selected
+  for data in chunks(f, start, end):
+    sys.stdout.buffer.write(data)
+  return 0
+
+def tail(f, args):
+  if isinstance(f, gzip.GzipFile):
+    # not seekable backwards in reasonable time
+    for offset, line in collections.deque(lines(f), maxlen=args.lines):
+      output(line)
+    return 0
+  end = f.seek(0, os.SEEK_END)
+  start = end
+  data = b''
+  # read backwards until enough lines
+  while start > 0 and data.count(b'\n') <= args.lines:
+    size = min(start, 1 << 16)
+    start -= size
+    f.seek(start)
+    data = f.read(size) + data
+  result = data.split(b'\n')
+  if result and not result[-1]:
+    result.pop()
+  for line in result[-args.lines:]:
+    output(line)
+  return 0
+
+def grep(f, args):
+  flags = re.IGNORECASE if args.ignore_case else 0
+  try:
+    regex = re.compile(args.pattern.encode('utf-8'), flags)
+  except re.error as exc:
+    sys.exit('Invalid regex {}: {}'.format(args.pattern, exc))
+  start, end = args.selected
+  found = 0
+  for offset, line in lines(f, start, end):
+    if regex.search(line):
+      found += 1
+      if args.byte_offset:
+        sys.stdout.buffer.write('{}:'.format(offset).encode('utf-8'))
+      output(line)
+      if args.max_count and found >= args.max_count:
+        break
+  return 0 if found else 1
+
+def load_index(log_path):
+  index_path = detail.log_rotation.index_path(log_path)
+  if not os.path.exists(index_path):
+    sys.exit('Index not found: {}'.format(index_path))
+  with open(index_path, 'r') as index_file:
+    return json.load(index_file)
+
+def select_range(args, log_path):
+  """--range, --segment or --phase as (start, end)"""
+  if args.segment is not None:
+    segments = load_index(log_path).get('segments', [])
+    try:
+      segment = segments[args.segment]
+    except IndexError:
+      sys.exit('No segment {} ({} segments)'.format(args.segment, len(segments)))
+    return segment['start'], segment['end']
+  if args.phase is not None:
+    phases = [
+        x for x in load_index(log_path).get('phases', [])
+        if x['name'] == args.phase
+    ]
+    if not phases:
+      sys.exit('No phase {}'.format(args.phase))
+    return phases[0]['start'], phases[-1]['end']
+  return args.range or (0, None)
+
+def segments(f, args, log_path):
+  print(
+      '{:>3} {:<24} {:>10} {:>10} {:>5} {:>9}  {}'.format(
+          '#', 'phase', 'start', 'end', 'exit', 'seconds', 'command'
+      )
+  )
+  for i, x in enumerate(load_index(log_path).get('segments', [])):
+    print(
+        '{:>3} {:<24} {:>10} {:>10} {:>5} {:>9.2f}  {}{}'.format(
+            i,
+            x['phase'][:24],
+            x['start'],
+            x['end'],
+            x['exit_code'],
+            x['duration'],
+            ' '.join(x['cmd']),
+            ' (interleaved)' if x.get('interleaved') else ''
+        )
+    )
+  return 0
+
+def errors(f, args, log_path):
+  index = load_index(log_path)
+  kind = 'warning' if args.warnings else 'error'
+  offsets = index.get('{}_offsets'.format(kind), [])
+  print(
+      '{} {} lines ({} indexed)'.format(
+          index.get('counts', {}).get(kind, 0), kind, len(offsets)
+      )
+  )
+  for offset in offsets[:args.lines]:
+    f.seek(offset)
+    line = f.readline() if hasattr(f, 'readline') else b''
+    output('{}:'.format(offset).encode('utf-8') + line.rstrip(b'\n'))
+  return 0
+
+def main():
+  parser = argparse.ArgumentParser(description='Read polly logs')
+  parser.add_argument(
+      'command', choices=['cat', 'tail', 'grep', 'errors', 'segments']
+  )
+  parser.add_argument('pattern', nargs='?', help='grep: regular expression')
+  parser.add_argument(
+      'log', nargs='?', help='Log file (default: log of --toolchain)'
+  )
+  parser.add_argument(
+      '--output', help="Directory polly.py was run in (polly.py --output)"
+  )
+  parser.add_argument('--toolchain', help="Log of this toolchain")
+  parser.add_argument(
+      '-n',
+      '--lines',
+      type=int,
+      default=10,
+      help='tail/errors: number of lines (default: %(default)s)'
+  )
+  parser.add_argument(
+      '--range',
+      type=parse_range,
+      help='cat/grep: bytes START:END of the uncompressed log'
+  )
+  parser.add_argument(
+      '--segment',
+      type=int,
+      help='cat/grep: output of N-th command (see segments, -1: last)'
+  )
+  parser.add_argument('--phase', help='cat/grep: phase (e.g. Build, Test)')
+  parser.add_argument(
+      '-i', '--ignore-case', action='store_true', help='grep: ignore case'
+  )
+  parser.add_argument(
+      '-b',
+      '--byte-offset',
+      action='store_true',
+      help='grep: print offset of the line in the uncompressed log'
+  )
+  parser.add_argument(
+      '-m', '--max-count', type=int, help='grep: stop after N lines'
+  )
+  parser.add_argument(
+      '--warnings', action='store_true', help='errors: show warnings'
+  )
+  if hasattr(parser, 'parse_intermixed_args'):
+    args = parser.parse_intermixed_args() # options between positionals
+  else:
+    args = parser.parse_args()
+
+  if args.command == 'grep':
+    if args.pattern is None:
+      parser.error('grep: pattern expected')
+  elif args.pattern is not None:
+    if args.log is not None:
+      parser.error('unexpected argument: {}'.format(args.log))
+    args.log = args.pattern # no pattern: first positional is the log
+
+  log_path = find_log(args)
+  if not os.path.exists(log_path):
+    sys.exit('Log not found: {}'.format(log_path))
+
+  if args.command in ['cat', 'grep']:
+    args.selected = select_range(args, log_path)
+
+  f = detail.seekable_log.open_log(log_path)
+  try:
+    if args.command == 'segments':
+      result = segments(f, args, log_path)
+    elif args.command == 'cat':
+      result = cat(f, args)
+    elif args.command == 'tail':
+      result = tail(f, args)
+    elif args.command == 'grep':
+      result = grep(f, args)
+    else:
+      result = errors(f, args, log_path)
+    sys.stdout.flush()
+  except BrokenPipeError:
+    result = 0 # polly-log.py ... | head
+  finally:
+    f.close()
+  sys.exit(result)
+
+if __name__ == '__main__':
+  main()
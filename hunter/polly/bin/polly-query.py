@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+# Answer questions about a build directory from the query index written by
+# polly.py (_builds/<tag>/_3rdParty/polly/query-index.json), CMake is not run:
+#
+#   > polly-query.py targets --toolchain gcc
+#   > polly-query.py target foo --toolchain gcc
+#   > polly-query.py sources foo
+#   > polly-query.py owner lib/foo.cpp
+#   > polly-query.py tests --target foo
+#   > polly-query.py affected lib/foo.cpp include/foo.hpp --ctest-regex
+#   > polly-query.py cache 'CMAKE_*_COMPILER'
+#
+# `affected` lists the targets compiling the files, the targets depending on
+# them and the tests running these targets (`--ctest-regex`: regex for
+# `ctest -R`). If the index is older than the latest CMake file API reply it
+# is rebuilt from the reply (only ctest is run).
+
+import argparse
+import fnmatch
+import json
+import os
+import re
+import sys
+
+import detail.file_api
+import detail.query_index
+
+def find_build_dir(args):
+  if args.build_dir:
+    return args.build_dir
+  builds_dir = os.path.join(args.output or os.getcwd(), '_builds')
+  if args.toolchain:
+    tags = [args.toolchain]
+    if args.config:
+      tags.insert(0, '{}-{}'.format(args.toolchain, args.config))
+    for tag in tags:
+      if os.path.isdir(os.path.join(builds_dir, tag)):
+        return os.path.join(builds_dir, tag)
+    sys.exit('Build directory not found: {}'.format(os.path.join(builds_dir, tags[0])))
+  if not os.path.isdir(builds_dir):
+    sys.exit('Directory not found: {}'.format(builds_dir))
+  tags = sorted(
+      x for x in os.listdir(builds_dir)
+      if os.path.exists(detail.query_index.path(os.path.join(builds_dir, x)))
+  )
+  if len(tags) != 1:
+    sys.exit(
+        'Use --toolchain to select one of: {}'.format(', '.join(tags) or '-')
+    )
+  return os.path.join(builds_dir, tags[0])
+
+def load(build_dir, config):
+  index = detail.query_index.load(build_dir)
+  if index and not index.matches(build_dir, config or index.content['config']):
+    index = None
+  if index is None:
+    if detail.file_api.reply_index(build_dir) is None:
+      sys.exit(
+          'No query index in {} (run polly.py to configure it)'.format(build_dir)
+      )
+    ctest_bin = reply_cache(build_dir).get('CMAKE_CTEST_COMMAND', 'ctest')
+    sys.stderr.write('Query index is out of date, rebuilding\n')
+    index = detail.query_index.build(build_dir, config, ctest_bin)
+    if index is None:
+      sys.exit('No CMake file API reply in {}'.format(build_dir))
+  return index
+
+def reply_cache(build_dir):
+  """Cache entries of the reply: name -> value"""
+  replies = detail.file_api.responses(build_dir) or {}
+  return {
+      x['name']: x['value'] for x in replies.get('cache', {}).get('entries', [])
+  }
+
+def source_path(index, path):
+  """Absolute path of the file given relative to cwd or source directory"""
+  if os.path.isabs(path):
+    return os.path.normpath(path)
+  if os.path.exists(path):
+    return os.path.abspath(path)
+  return os.path.normpath(os.path.join(index.content['source_dir'], path))
+
+def get_target(index, name):
+  if name not in index.targets:
+    sys.exit('Target not found: {}'.format(name))
+  return index.targets[name]
+
+def targets(index, args):
+  rows = []
+  for name in sorted(index.targets):
+    if args.names and not any(fnmatch.fnmatchcase(name, x) for x in args.names):
+      continue
+    x = index.targets[name]
+    rows.append({'name': name, 'type': x['type'], 'sources': len(x['sources'])})
+  if args.json:
+    return rows
+  for x in rows:
+    print('{:<40} {:<16} {:>5} sources'.format(x['name'], x['type'], x['sources']))
+
+def target(index, args):
+  result = []
+  for name in args.names:
+    x = dict(get_target(index, name))
+    x['name'] = name
+    x['dependents'] = sorted(index.dependents([name]) - set([name]))
+    x['tests'] = index.tests_of([name])
+    result.append(x)
+  if args.json:
+    return result
+  for x in result:
+    print('{} ({})'.format(x['name'], x['type']))
+    print('  directory: {}'.format(x['directory']))
+    for key in ['artifacts', 'dependencies', 'dependents', 'tests']:
+      print('  {}: {}'.format(key, ', '.join(x[key]) or '-'))
+    print('  sources: {}'.format(len(x['sources'])))
+
+def sources(index, args):
+  result = []
+  for name in args.names:
+    result += get_target(index, name)['sources']
+  if args.json:
+    return result
+  for x in result:
+    print(x)
+
+def owner(index, args):
+  result = {}
+  for path in args.names:
+    result[path] = index.owners(source_path(index, path))
+  if args.json:
+    return result
+  for path, names in result.items():
+    print('{}: {}'.format(path, ' '.join(names) or '-'))
+  return 0 if all(result.values()) else 1
+
+def tests(index, args):
+  if index.tests is None:
+    sys.exit('Tests are not indexed (ctest --show-only=json-v1 failed)')
+  names = sorted(index.tests)
+  if args.target:
+    get_target(index, args.target)
+    names = index.tests_of([args.target])
+  result = [dict(index.tests[x], name=x) for x in names]
+  if args.json:
+    return result
+  for x in result:
+    print('{:<40} {}'.format(x['name'], x['target'] or '-'))
+
+def affected(index, args):
+  files = [source_path(index, x) for x in args.names]
+  owners = set()
+  for x in files:
+    owners.update(index.owners(x))
+  names = sorted(index.dependents(owners))
+  result = {
+      'targets': names,
+      'tests': index.tests_of(names),
+      # CMakeLists.txt, *.cmake: the whole project may change
+      'reconfigure': sorted(x for x in files if x in index.inputs),
+      'unknown': sorted(
+          x for x in files if not index.owners(x) and x not in index.inputs
+      )
+  }
+  if args.json:
+    return result
+  if args.ctest_regex:
+    print(
+        '^({})$'.format('|'.join(re.escape(x) for x in result['tests']))
+        if result['tests'] else ''
+    )
+    return
+  for key in ['targets', 'tests', 'reconfigure', 'unknown']:
+    print('{}: {}'.format(key, ' '.join(result[key]) or '-'))
+
+def cache(index, args):
+  result = {}
+  for name in sorted(index.cache):
+    if args.names and not any(fnmatch.fnmatchcase(name, x) for x in args.names):
+      continue
+    result[name] = index.cache[name]
+  if args.json:
+    return result
+  for name, (kind, value) in result.items():
+    print('{}:{}={}'.format(name, kind, value))
+  return 0 if result else 1
+
+commands = {
+    'targets': targets,
+    'target': target,
+    'sources': sources,
+    'owner': owner,
+    'tests': tests,
+    'affected': affected,
+    'cache': cache
+}
+
+def main():
+  parser = argparse.ArgumentParser(
+      description='Query targets, sources and tests of a polly build directory'
+  )
+  parser.add_argument('command', choices=sorted(commands))
+  parser.add_argument(
+      'names',
+      nargs='*',
+      help='Targets (target, sources), files (owner, affected) or patterns'
+      ' (targets, cache)'
+  )
+  parser.add_argument(
+      '--output', help="Directory polly.py was run in (polly.py --output)"
+  )
+  parser.add_argument('--toolchain', help="Build directory of this toolchain")
+  parser.add_argument('--config', help="polly.py --config")
+  parser.add_argument('--build-dir', help="Build directory")
+  parser.add_argument('--target', help='tests: tests running this target')
+  parser.add_argument(
+      '--ctest-regex',
+      action='store_true',
+      help='affected: print the tests as regex for ctest -R'
+  )
+  parser.add_argument('--json', action='store_true', help='Print JSON')
+  args = parser.parse_args()
+
+  if args.command in ['target', 'sources', 'owner', 'affected'] and not args.names:
+    parser.error('{}: at least one name expected'.format(args.command))
+
+  index = load(find_build_dir(args), args.config)
+  result = commands[args.command](index, args)
+  if args.json:
+    print(json.dumps(result, indent=2, sort_keys=True))
+    result = 0
+  try:
+    sys.stdout.flush()
+  except BrokenPipeError:
+    pass
+  sys.exit(result or 0)
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+
+# Show the timing history recorded by polly.py (_logs/polly/history.sqlite):
+#
+#   > polly-stats.py percentiles
+#   > polly-stats.py trend --toolchain gcc --phase Build --by month
+#   > polly-stats.py regressions --base 1a2b3c --head 4d5e6f
+#
+# `regressions` compares the phase times of two revisions (consecutive
+# revisions by default) with the Mann-Whitney U test and exits with status 1
+# if a statistically significant slowdown is found. Only successful runs are
+# used unless --status is given.
+
+import argparse
+import datetime
+import os
+import sys
+
+import detail.history
+import detail.stats
+
+def bucket_name(row, by):
+  if by == 'revision':
+    revision = (row['revision'] or 'unknown')[:10]
+    return revision + ('-dirty' if row['dirty'] else '')
+  started_at = datetime.datetime.strptime(row['started_at'][:10], '%Y-%m-%d')
+  if by == 'day':
+    return started_at.strftime('%Y-%m-%d')
+  if by == 'week':
+    year, week, day = started_at.isocalendar()
+    return '{}-W{:02d}'.format(year, week)
+  return started_at.strftime('%Y-%m')
+
+def load(connection, args):
+  query = (
+      'SELECT runs.id, runs.started_at, runs.toolchain, runs.config,'
+      ' runs.host, runs.revision, runs.dirty, runs.seconds,'
+      ' phases.name, phases.depth, phases.seconds'
+      ' FROM runs LEFT JOIN phases ON phases.run_id = runs.id'
+  )
+  conditions = []
+  parameters = []
+  if args.status != 'all':
+    conditions.append('runs.status = ?')
+    parameters.append(args.status)
+  if args.toolchain:
+    conditions.append('runs.toolchain = ?')
+    parameters.append(args.toolchain)
+  if args.config:
+    conditions.append('runs.config = ?')
+    parameters.append(args.config)
+  if args.this_host:
+    conditions.append('runs.host = ?')
+    parameters.append(
+        detail.history.host_fingerprint(detail.history.host_info())
+    )
+  if conditions:
+    query += ' WHERE ' + ' AND '.join(conditions)
+  query += ' ORDER BY runs.started_at, runs.id'
+
+  rows = []
+  totals = set()
+  for x in connection.execute(query, parameters):
+    run = {
+        'id': x[0], 'started_at': x[1], 'toolchain': x[2], 'config': x[3],
+        'host': x[4], 'revision': x[5], 'dirty': x[6]
+    }
+    if x[0] not in totals and x[7] is not None:
+      totals.add(x[0])
+      rows.append(dict(run, phase='Total', seconds=x[7]))
+    if x[8] is not None:
+      rows.append(dict(run, phase='  ' * x[9] + x[8], seconds=x[10]))
+  if args.phase:
+    rows = [x for x in rows if x['phase'].strip() == args.phase]
+  return rows
+
+def groups(rows, by):
+  """(toolchain, config, phase) -> ordered list of (bucket, [seconds])"""
+  result = {}
+  for row in rows:
+    key = (row['toolchain'], row['config'] or '-', row['phase'])
+    buckets = result.setdefault(key, [])
+    name = bucket_name(row, by)
+    for bucket, values in buckets:
+      if bucket == name:
+        values.append(row['seconds'])
+        break
+    else:
+      buckets.append((name, [row['seconds']]))
+  return result
+
+def pretty(seconds):
+  return '{:.2f}'.format(seconds)
+
+def print_group_header(key):
+  print('-')
+  print('{} ({}): {}'.format(key[0], key[1], key[2].strip()))
+
+def percentiles(rows, args):
+  print(
+      '{:<40} {:>5} {:>9} {:>9} {:>9} {:>9} {:>9}'.format(
+          'toolchain (config): phase', 'runs', 'min', 'p50', 'p90', 'p99', 'max'
+      )
+  )
+  for key, buckets in sorted(groups(rows, args.by).items()):
+    values = [v for bucket, x in buckets for v in x]
+    print(
+        '{:<40} {:>5} {:>9} {:>9} {:>9} {:>9} {:>9}'.format(
+            '{} ({}): {}'.format(*key),
+            len(values),
+            pretty(min(values)),
+            pretty(detail.stats.percentile(values, 50)),
+            pretty(detail.stats.percentile(values, 90)),
+            pretty(detail.stats.percentile(values, 99)),
+            pretty(max(values))
+        )
+    )
+  return 0
+
+def trend(rows, args):
+  for key, buckets in sorted(groups(rows, args.by).items()):
+    print_group_header(key)
+    print(
+        '  {:<20} {:>5} {:>9} {:>9} {:>9}'.format(
+            args.by, 'runs', 'median', 'p90', 'change'
+        )
+    )
+    previous = None
+    for bucket, values in buckets:
+      median = detail.stats.median(values)
+      change = ''
+      if previous:
+        change = '{:+.1f}%'.format((median - previous) / previous * 100)
+      print(
+          '  {:<20} {:>5} {:>9} {:>9} {:>9}'.format(
+              bucket,
+              len(values),
+              pretty(median),
+              pretty(detail.stats.percentile(values, 90)),
+              change
+          )
+      )
+      if median > 0:
+        previous = median
+  return 0
+
+def find_bucket(buckets, prefix):
+  matches = [x for x in buckets if x[0].startswith(prefix)]
+  if len(matches) > 1:
+    sys.exit('Ambiguous {}: {}'.format(prefix, ', '.join(x[0] for x in matches)))
+  return matches[0] if matches else None
+
+def regressions(rows, args):
+  slowdowns = 0
+  print(
+      '{:<40} {:>21} {:>9} {:>9} {:>8} {:>8}'.format(
+          'toolchain (config): phase', args.by, 'base', 'head', 'change', 'p-value'
+      )
+  )
+  for key, buckets in sorted(groups(rows, args.by).items()):
+    if args.base or args.head:
+      base = find_bucket(buckets, args.base) if args.base else buckets[0]
+      head = find_bucket(buckets, args.head) if args.head else buckets[-1]
+      pairs = [(base, head)] if base and head else []
+    else:
+      pairs = list(zip(buckets, buckets[1:]))
+    for (base_name, base), (head_name, head) in pairs:
+      if len(base) < args.min_runs or len(head) < args.min_runs:
+        continue
+      u, p = detail.stats.mann_whitney(head, base)
+      base_median = detail.stats.median(base)
+      head_median = detail.stats.median(head)
+      if base_median <= 0:
+        continue
+      change = (head_median - base_median) / base_median * 100
+      if p >= args.alpha or abs(change) < args.threshold:
+        continue
+      if change > 0:
+        slowdowns += 1
+      print(
+          '{:<40} {:>21} {:>9} {:>9} {:>8} {:>8.4f}'.format(
+              '{} ({}): {}'.format(key[0], key[1], key[2].strip()),
+              '{}..{}'.format(base_name[:10], head_name[:10]),
+              pretty(base_median),
+              pretty(head_median),
+              '{:+.1f}%'.format(change),
+              p
+          )
+      )
+  print('-')
+  print('Significant slowdowns: {}'.format(slowdowns))
+  return 1 if slowdowns else 0
+
+def main():
+  parser = argparse.ArgumentParser(description='polly timing history')
+  parser.add_argument(
+      'command',
+      choices=['percentiles', 'trend', 'regressions'],
+      nargs='?',
+      default='trend'
+  )
+  parser.add_argument(
+      '--db',
+      help="History database (default: <output>/_logs/polly/history.sqlite)"
+  )
+  parser.add_argument(
+      '--output', help="Directory polly.py was run in (polly.py --output)"
+  )
+  parser.add_argument('--toolchain', help="Only runs of this toolchain")
+  parser.add_argument('--config', help="Only runs of this config")
+  parser.add_argument('--phase', help="Only this phase (e.g. Build, Total)")
+  parser.add_argument(
+      '--status',
+      choices=['success', 'failed', 'all'],
+      default='success',
+      help="Only runs with this result (default: %(default)s)"
+  )
+  parser.add_argument(
+      '--this-host',
+      action='store_true',
+      help="Only runs on this host (same CPU, cores, memory, OS)"
+  )
+  parser.add_argument(
+      '--by',
+      choices=['revision', 'day', 'week', 'month'],
+      default='revision',
+      help="Group runs by git revision or date (default: %(default)s)"
+  )
+  parser.add_argument('--base', help="regressions: base revision/date")
+  parser.add_argument('--head', help="regressions: head revision/date")
+  parser.add_argument(
+      '--alpha',
+      type=float,
+      default=0.05,
+      help="regressions: significance level (default: %(default)s)"
+  )
+  parser.add_argument(
+      '--threshold',
+      type=float,
+      default=2.0,
+      help="regressions: ignore median changes below this percent"
+          " (default: %(default)s)"
+  )
+  parser.add_argument(
+      '--min-runs',
+      type=int,
+      default=3,
+      help="regressions: minimum runs in both groups (default: %(default)s)"
+  )
+  args = parser.parse_args()
+
+  if detail.history.sqlite3 is None:
+    sys.exit('Python is built without sqlite3 module')
+
+  db = args.db
+  if not db:
+    db = detail.history.database_path(args.output or os.getcwd())
+  if not os.path.exists(db):
+    sys.exit('History database not found: {}'.format(db))
+
+  connection = detail.history.connect(db)
+  try:
+    rows = load(connection, args)
+  finally:
+    connection.close()
+  if not rows:
+    sys.exit('No runs found')
+
+  commands = {
+      'percentiles': percentiles,
+      'trend': trend,
+      'regressions': regressions
+  }
+  sys.exit(commands[args.command](rows, args))
+
+if __name__ == '__main__':
+  main()
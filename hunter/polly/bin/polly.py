@@ -5,187 +5,17 @@
 
 import argparse
 import os
-import platform
-import shutil
 import sys
 
-import detail.call
 import detail.cpack_generator
-import detail.create_archive
-import detail.create_framework
-import detail.generate_command
-import detail.get_nmake_environment
-import detail.ios_dev_root
-import detail.logging
-import detail.open_project
-import detail.osx_dev_root
-import detail.pack_command
-import detail.rmtree
-import detail.target
-import detail.test_command
-import detail.timer
-import detail.toolchain_name
-import detail.toolchain_table
-import detail.verify_mingw_path
-import detail.verify_msys_path
-
-toolchain_table = detail.toolchain_table.toolchain_table
+
+# NOTE: modules for the build are imported by `main` after the arguments are
+# parsed, so --help, --list-toolchains and argument errors are fast (see
+# benchmarks/startup.py and benchmarks/import_time.py)
 
 assert(sys.version_info.major == 3)
 assert(sys.version_info.minor >= 2) # Current cygwin version is 3.2.3
 
-print(
-    'Python version: {}.{}'.format(
-        sys.version_info.major, sys.version_info.minor
-     )
-)
-
-description="""
-Script for building. Available toolchains:\n
-"""
-
-for x in toolchain_table:
-  description += '  ' + x.name + '\n'
-
-parser = argparse.ArgumentParser(
-    formatter_class=argparse.RawDescriptionHelpFormatter,
-    description=description
-)
-
-parser.add_argument(
-    '--toolchain',
-    choices=[x.name for x in toolchain_table],
-    help="CMake generator/toolchain",
-)
-
-parser.add_argument(
-    '--config',
-    help="CMake build type (Release, Debug, ...)",
-)
-
-parser.add_argument(
-  '--keep-going',
-  action='store_true',
-  help="Continue  as  much as  possible after an error. see make -k"
-)
-
-parser.add_argument(
-    '--config-all',
-    help="CMake build type for project and hunter packages: --config <type> --fwd HUNTER_CONFIGURATION_TYPES=<type>",
-)
-
-parser.add_argument(
-    '--home',
-    help="Project home directory (directory with CMakeLists.txt)"
-)
-
-parser.add_argument(
-    '--output',
-    help="Project build directory (i.e., cmake -B)"
-)
-
-parser.add_argument(
-    '--cache',
-    help="CMake -C <initial-cache> = Pre-load a script to populate the cache."
-)
-
-parser.add_argument('--test', action='store_true', help="Run ctest after build")
-parser.add_argument('--test-xml', help="Save ctest output to xml")
-
-parser.add_argument(
-    '--pack',
-    choices=detail.cpack_generator.available_generators,
-    nargs='?',
-    const=detail.cpack_generator.default(),
-    help="Run cpack after build"
-)
-parser.add_argument(
-    '--archive',
-    help="Create an archive of locally installed files"
-)
-parser.add_argument(
-    '--nobuild', action='store_true', help="Do not build (only generate)"
-)
-parser.add_argument(
-    '--open', action='store_true', help="Open generated project (for IDE)"
-)
-
-verbosity_group=parser.add_mutually_exclusive_group()
-verbosity_group.add_argument(
-    '--verbosity-level', dest='verbosity', help="Verbosity level",
-    choices=['silent', 'normal', 'full'], default='normal'
-)
-verbosity_group.add_argument('--verbose', action='store_true', help="Full verbose output")
-
-parser.add_argument(
-    '--install', action='store_true', help="Run install (local directory)"
-)
-parser.add_argument(
-    '--ios-multiarch',
-    action='store_true',
-    help="Build multi-architecture binary (effectively add CMAKE_XCODE_ATTRIBUTE_ONLY_ACTIVE_ARCH=NO)"
-)
-parser.add_argument(
-    '--ios-combined',
-    action='store_true',
-    help="Combine iOS simulator and device libraries on install (effectively add CMAKE_IOS_INSTALL_COMBINED=YES)"
-)
-parser.add_argument(
-    '--framework', action='store_true', help="Create framework"
-)
-parser.add_argument(
-    '--framework-device',
-    action='store_true',
-    help="Create framework for device (exclude simulator architectures)"
-)
-parser.add_argument(
-    '--framework-lib',
-    default='*',
-    help="Regular expression for the source library used for --framework"
-)
-parser.add_argument(
-    '--strip', action='store_true', help="Run strip/install cmake targets"
-)
-parser.add_argument(
-    '--identity',
-    help="Specify code signing identity for --framework"
-)
-parser.add_argument(
-    '--plist',
-    help="User specified Info.plist file for --framework"
-)
-parser.add_argument(
-    '--clear',
-    action='store_true',
-    help="Remove build and install dirs before build"
-)
-parser.add_argument(
-    '--reconfig',
-    action='store_true',
-    help="Run configure even if CMakeCache.txt exists. Used to add new args."
-)
-parser.add_argument(
-    '--fwd',
-    nargs='*',
-    help="Arguments to cmake without '-D', like:\nBOOST_ROOT=/some/path"
-)
-parser.add_argument(
-    '--iossim',
-    action='store_true',
-    help="Build for ios simulator"
-)
-
-parser.add_argument(
-    '--jobs',
-    type=int,
-    help="Number of concurrent build operations"
-)
-
-parser.add_argument(
-    '--target',
-    help="Target to build for the 'cmake --build' command"
-)
-
 def PositiveInt(string):
   value = int(string)
   if value > 0:
@@ -193,364 +23,1154 @@ def PositiveInt(string):
   m = 'Should be greater that zero: {}'.format(string)
   raise argparse.ArgumentTypeError(m)
 
-parser.add_argument(
-    '--discard',
-    type=PositiveInt,
-    help='Option to reduce output. Discard every N lines of execution messages'
-        ' (note that full log is still available in log.txt)'
-)
-
-parser.add_argument(
-    '--tail',
-    type=PositiveInt,
-    help='Print last N lines if build failed'
-)
-
-parser.add_argument(
-    '--output_filter',
-    help="Output filter"
-)
-
-parser.add_argument(
-    '--timeout',
-    type=PositiveInt,
-    help='Timeout for CTest'
-)
-
-parser.add_argument(
-    '--cmake',
-    help="CMake binary (cmake or cmake3)"
-)
-
-parser.add_argument(
-    '--cpack',
-    help="CPack binary (cpack or cpack3)"
-)
-
-parser.add_argument(
-    '--ctest',
-    help="CTest binary (ctest or ctest3)"
-)
-
-parser.add_argument(
-    '--dry-run',
+def Jobs(string):
+  if string == 'auto':
+    return string
+  return int(string)
+
+def jobserver_fifo(mode, ninja):
+  """Ninja joins only the fifo jobservers"""
+  if mode == 'auto':
+    return ninja
+  return mode == 'fifo'
+
+def preload():
+  """Load the modules of the build stages and the toolchain index (daemon:
+  once before the runs are forked)"""
+  import importlib
+  for x in build_modules:
+    importlib.import_module('detail.{}'.format(x))
+  import detail.toolchain_index
+  import detail.toolchain_table
+  detail.toolchain_index.get()
+  detail.toolchain_table.registry.discovered_specs()
+
+# Imported by `main` after the arguments are checked
+build_modules = [
+    'auto_jobs',
+    'build_snapshot',
+    'build_tag',
+    'call',
+    'check_cache',
+    'create_archive',
+    'create_framework',
+    'file_api',
+    'fingerprint',
+    'gc',
+    'generate_command',
+    'get_nmake_environment',
+    'history',
+    'ios_dev_root',
+    'jobserver',
+    'log_rotation',
+    'logging',
+    'matrix',
+    'mtime',
+    'open_project',
+    'osx_dev_root',
+    'output_filter',
+    'pack_command',
+    'pipelined_test',
+    'query_index',
+    'rmtree',
+    'target',
+    'test_command',
+    'timer',
+    'toolchain_name',
+    'trace',
+    'verify_mingw_path',
+    'verify_msys_path'
+]
+
+def create_parser():
+  description="""
+Script for building. Available toolchains (with generator and description):
+
+  polly.py --list-toolchains
+  polly.py --list-toolchains ninja clang cxx17
+
+Remove least recently used build trees (see 'polly.py gc --help'):
+
+  polly.py gc --max-size 50G --max-age 14
+"""
+
+  parser = argparse.ArgumentParser(
+      formatter_class=argparse.RawDescriptionHelpFormatter,
+      description=description
+  )
+
+  parser.add_argument(
+      '--toolchain',
+      help="CMake generator/toolchain. Comma-separated list and/or glob"
+          " patterns (e.g. 'gcc,ninja-*') build several toolchains concurrently"
+          " sharing the --jobs budget",
+  )
+
+  parser.add_argument(
+      '--list-toolchains',
+      nargs='*',
+      metavar='TERM',
+      help="List toolchain files matching all the terms: keywords (e.g."
+          " 'ninja clang cxx17') or ATTRIBUTE=VALUE (e.g. 'arch=arm64',"
+          " 'generator=Unix Makefiles') and exit"
+  )
+
+  parser.add_argument(
+      '--config',
+      help="CMake build type (Release, Debug, ...)",
+  )
+
+  parser.add_argument(
+    '--keep-going',
     action='store_true',
-    help="Print the corresponding CMake command and quit"
-)
-
-args = parser.parse_args()
-
-polly_toolchain = detail.toolchain_name.get(args.toolchain)
-toolchain_entry = detail.toolchain_table.get_by_name(polly_toolchain)
-cpack_generator = args.pack
-
-polly_root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
-polly_root = os.path.realpath(polly_root)
-
-if args.config and args.config_all:
-  sys.exit('Must specify --config or --config-all but not both')
-
-if args.config_all:
-  args.config = args.config_all
-
-"""Build directory tag"""
-if args.config and not toolchain_entry.multiconfig:
-  build_tag = "{}-{}".format(polly_toolchain, args.config)
-else:
-  build_tag = polly_toolchain
-
-"""Tune environment"""
-if toolchain_entry.name.startswith('mingw'):
-  mingw_path = os.getenv("MINGW_PATH")
-  detail.verify_mingw_path.verify(mingw_path)
-  os.environ['PATH'] = "{};{}".format(mingw_path, os.getenv('PATH'))
-
-if toolchain_entry.name.startswith('msys'):
-  msys_path = os.getenv("MSYS_PATH")
-  detail.verify_msys_path.verify(msys_path)
-  os.environ['PATH'] = "{};{}".format(msys_path, os.getenv('PATH'))
-
-vs_ninja = toolchain_entry.is_ninja and toolchain_entry.vs_version
-if toolchain_entry.is_nmake or vs_ninja:
-  os.environ = detail.get_nmake_environment.get(
-      toolchain_entry.arch, toolchain_entry.vs_version
-  )
-
-if toolchain_entry.ios_version:
-  ios_dev_root = detail.ios_dev_root.get(toolchain_entry.ios_version)
-  if ios_dev_root:
-    print("Set environment DEVELOPER_DIR to {}".format(ios_dev_root))
-    os.environ['DEVELOPER_DIR'] = ios_dev_root
-
-if toolchain_entry.nocodesign:
-  xcconfig = os.path.join(polly_root, 'scripts', 'NoCodeSign.xcconfig')
-  print("Set environment XCODE_XCCONFIG_FILE to {}".format(xcconfig))
-  os.environ['XCODE_XCCONFIG_FILE'] = xcconfig
-
-if toolchain_entry.osx_version:
-  osx_dev_root = detail.osx_dev_root.get(toolchain_entry.osx_version)
-  if osx_dev_root:
-    print("Set environment DEVELOPER_DIR to {}".format(osx_dev_root))
-    os.environ['DEVELOPER_DIR'] = osx_dev_root
-
-toolchain_path = os.path.join(polly_root, "{}.cmake".format(polly_toolchain))
-if not os.path.exists(toolchain_path):
-  sys.exit("Toolchain file not found: {}".format(toolchain_path))
-toolchain_option = "-DCMAKE_TOOLCHAIN_FILE={}".format(toolchain_path)
-
-if args.output:
-  if not os.path.isdir(args.output):
-    sys.exit("Specified build directory does not exist: {}".format(args.output))
-  if not os.access(args.output, os.W_OK):
-    sys.exit("Specified build directory is not writeable: {}".format(args.output))
-  cdir = args.output
-else:
-  cdir = os.getcwd()
-
-build_dir = os.path.join(cdir, '_builds', build_tag)
-print("Build dir: {}".format(build_dir))
-build_dir_option = "-B{}".format(build_dir)
-
-install_dir = os.path.join(cdir, '_install', polly_toolchain)
-local_install = args.install or args.strip or args.framework or args.framework_device or args.archive
-
-if args.install and args.strip:
-  sys.exit('Both --install and --strip specified')
-
-if args.strip:
-  install_target_name = 'install/strip'
-elif local_install:
-  install_target_name = 'install'
-else:
-  install_target_name = '' # not used
-
-target = detail.target.Target()
-
-target.add(condition=local_install, name=install_target_name)
-target.add(condition=args.target, name=args.target)
-
-# After 'target.add'
-if args.strip and not toolchain_entry.is_make:
-  sys.exit('CMake install/strip targets are only supported for the Unix Makefile generator')
-
-if local_install:
-  install_dir_option = "-DCMAKE_INSTALL_PREFIX={}".format(install_dir)
-
-if (args.framework or args.framework_device) and platform.system() != 'Darwin':
-  sys.exit('Framework creation only for Mac OS X')
-framework_dir = os.path.join(cdir, '_framework', polly_toolchain)
-archives_dir = os.path.join(cdir, '_archives')
-
-if args.clear:
-  detail.rmtree.rmtree(build_dir)
-  detail.rmtree.rmtree(install_dir)
-  detail.rmtree.rmtree(framework_dir)
-
-# --verbose flag triggers full verbosity level
-if args.verbose:
-    args.verbosity='full'
-
-polly_temp_dir = os.path.join(build_dir, '_3rdParty', 'polly')
-if not os.path.exists(polly_temp_dir):
-  os.makedirs(polly_temp_dir)
-logging = detail.logging.Logging(
-    cdir, args.verbosity, args.discard, args.tail, polly_toolchain
-)
-
-if args.cmake:
-  cmake_bin = args.cmake
-else:
-  cmake_bin = 'cmake'
-
-if os.path.isabs(cmake_bin):
-  if not os.path.exists(cmake_bin):
-    sys.exit("CMake binary not found: {}".format(cmake_bin))
-else:
-  if os.name == 'nt':
-    # Windows
-    detail.call.call(['where', cmake_bin], logging)
-  else:
-    detail.call.call(['which', cmake_bin], logging)
-detail.call.call([cmake_bin, '--version'], logging)
+    help="Continue  as  much as  possible after an error. see make -k"
+  )
 
-home = '.'
-if args.home:
-  home = args.home
+  parser.add_argument(
+      '--config-all',
+      help="CMake build type for project and hunter packages: --config <type> --fwd HUNTER_CONFIGURATION_TYPES=<type>",
+  )
 
-generate_command = [
-    cmake_bin,
-    '-H{}'.format(home),
-    build_dir_option
-]
+  parser.add_argument(
+      '--home',
+      help="Project home directory (directory with CMakeLists.txt)"
+  )
 
-if args.cache:
-  if not os.path.isfile(args.cache):
-    sys.exit("Specified cache file does not exist: {}".format(args.cache))
-  if not os.access(args.cache, os.R_OK):
-    sys.exit("Specified cache file is not readable: {}".format(args.cache))
-  generate_command.append("-C{}".format(args.cache))
+  parser.add_argument(
+      '--output',
+      help="Project build directory (i.e., cmake -B)"
+  )
 
-if (args.config and not toolchain_entry.multiconfig) or args.config_all:
-  generate_command.append("-DCMAKE_BUILD_TYPE={}".format(args.config))
+  parser.add_argument(
+      '--cache',
+      help="CMake -C <initial-cache> = Pre-load a script to populate the cache."
+  )
 
-if toolchain_entry.generator:
-  generate_command.append('-G{}'.format(toolchain_entry.generator))
+  parser.add_argument(
+      '--check-cache',
+      choices=['on', 'off', 'refresh'],
+      default='on',
+      help="Results of the configure checks (try_compile, find_*) saved"
+          " per project/toolchain in the user cache and used as the initial"
+          " cache of a new build directory; 'refresh' saves new results"
+          " without using the old ones (default: %(default)s)"
+  )
 
-if toolchain_entry.toolset:
-  generate_command.append('-T{}'.format(toolchain_entry.toolset))
+  parser.add_argument(
+      '--snapshot-build-dir',
+      action='store_true',
+      help="After a successful run save the build directory (CMake cache,"
+          " generated files, _3rdParty, Hunter packages) to the snapshot store,"
+          " keyed by toolchain, arguments and CMake files of the project"
+  )
+  parser.add_argument(
+      '--snapshot-objects',
+      action='store_true',
+      help="With --snapshot-build-dir: save object files, libraries and"
+          " target artifacts too"
+  )
+  parser.add_argument(
+      '--restore-build-dir',
+      action='store_true',
+      help="Start a new build directory from the matching snapshot (paths"
+          " are fixed for another project location)"
+  )
+  parser.add_argument(
+      '--snapshot-store',
+      help="Directory of the build directory snapshots (default:"
+          " 'build-snapshots' in the user cache directory)"
+  )
 
-if toolchain_entry.xp:
-  toolset = 'v{}0_xp'.format(toolchain_entry.vs_version)
-  generate_command.append('-T{}'.format(toolset))
+  parser.add_argument('--test', action='store_true', help="Run ctest after build")
+  parser.add_argument('--test-xml', help="Save ctest output to xml")
+  parser.add_argument(
+      '--test-pipelined',
+      action='store_true',
+      help="With --test: start every test as soon as its target is built"
+          " while the rest of the project is still building (Makefile and"
+          " Ninja generators)"
+  )
 
-if toolchain_option:
-  generate_command.append(toolchain_option)
+  parser.add_argument(
+      '--pack',
+      choices=detail.cpack_generator.available_generators,
+      nargs='?',
+      const=detail.cpack_generator.default(),
+      help="Run cpack after build"
+  )
+  parser.add_argument(
+      '--concurrent-pack',
+      action='store_true',
+      help="With --test and --pack: run cpack while the tests are running"
+          " (Python 3.5+)"
+  )
+  parser.add_argument(
+      '--archive',
+      help="Create an archive of locally installed files"
+  )
+  parser.add_argument(
+      '--nobuild', action='store_true', help="Do not build (only generate)"
+  )
+  parser.add_argument(
+      '--open', action='store_true', help="Open generated project (for IDE)"
+  )
 
-if args.verbosity == 'full':
-    generate_command.append('-DCMAKE_VERBOSE_MAKEFILE=ON')
-    generate_command.append('-DPOLLY_STATUS_DEBUG=ON')
-    generate_command.append('-DHUNTER_STATUS_DEBUG=ON')
+  verbosity_group=parser.add_mutually_exclusive_group()
+  verbosity_group.add_argument(
+      '--verbosity-level', dest='verbosity', help="Verbosity level",
+      choices=['silent', 'normal', 'full'], default='normal'
+  )
+  verbosity_group.add_argument('--verbose', action='store_true', help="Full verbose output")
 
-if args.ios_multiarch:
-    generate_command.append('-DCMAKE_XCODE_ATTRIBUTE_ONLY_ACTIVE_ARCH=NO')
+  parser.add_argument(
+      '--install', action='store_true', help="Run install (local directory)"
+  )
+  parser.add_argument(
+      '--ios-multiarch',
+      action='store_true',
+      help="Build multi-architecture binary (effectively add CMAKE_XCODE_ATTRIBUTE_ONLY_ACTIVE_ARCH=NO)"
+  )
+  parser.add_argument(
+      '--ios-combined',
+      action='store_true',
+      help="Combine iOS simulator and device libraries on install (effectively add CMAKE_IOS_INSTALL_COMBINED=YES)"
+  )
+  parser.add_argument(
+      '--framework', action='store_true', help="Create framework"
+  )
+  parser.add_argument(
+      '--framework-device',
+      action='store_true',
+      help="Create framework for device (exclude simulator architectures)"
+  )
+  parser.add_argument(
+      '--framework-lib',
+      default='*',
+      help="Regular expression for the source library used for --framework"
+  )
+  parser.add_argument(
+      '--strip', action='store_true', help="Run strip/install cmake targets"
+  )
+  parser.add_argument(
+      '--identity',
+      help="Specify code signing identity for --framework"
+  )
+  parser.add_argument(
+      '--plist',
+      help="User specified Info.plist file for --framework"
+  )
+  parser.add_argument(
+      '--clear',
+      action='store_true',
+      help="Remove build and install dirs before build"
+  )
+  parser.add_argument(
+      '--clear-async',
+      action='store_true',
+      help="Like --clear but move the directories to <output>/_trash and"
+          " remove them in a detached low priority process"
+  )
+  parser.add_argument(
+      '--reconfig',
+      action='store_true',
+      help="Run configure even if arguments, toolchain files, cache script"
+          " and environment are not changed"
+  )
+  parser.add_argument(
+      '--fwd',
+      nargs='*',
+      help="Arguments to cmake without '-D', like:\nBOOST_ROOT=/some/path"
+  )
+  parser.add_argument(
+      '--iossim',
+      action='store_true',
+      help="Build for ios simulator"
+  )
 
-if args.ios_combined:
-    generate_command.append('-DCMAKE_IOS_INSTALL_COMBINED=YES')
+  parser.add_argument(
+      '--jobs',
+      type=Jobs,
+      help="Number of concurrent build operations. 'auto': derive from CPU"
+          " affinity, cgroup CPU quota and available memory (see --job-memory),"
+          " lower Makefile build parallelism under memory pressure"
+  )
 
-if local_install:
-  generate_command.append(install_dir_option)
+  parser.add_argument(
+      '--jobs-max',
+      type=PositiveInt,
+      help="With --jobs auto: use at most this number of jobs (set by the"
+          " matrix mode to the share of every toolchain)"
+  )
 
-if cpack_generator:
-  generate_command.append('-DCPACK_GENERATOR={}'.format(cpack_generator))
+  parser.add_argument(
+      '--job-memory',
+      type=PositiveInt,
+      default=1536,
+      help="Memory estimate of one build job in MiB for --jobs auto"
+          " (default: %(default)s)"
+  )
 
-if args.fwd != None:
-  for x in args.fwd:
-    generate_command.append("-D{}".format(x))
+  parser.add_argument(
+      '--jobserver',
+      choices=['auto', 'pipe', 'fifo'],
+      nargs='?',
+      const='auto',
+      help="Share --jobs slots between all started commands (and concurrent"
+          " polly runs) using POSIX jobserver. Join the jobserver from MAKEFLAGS"
+          " if present. 'pipe' is understood by GNU Make only, 'fifo' by"
+          " GNU Make 4.4+ and Ninja 1.13+ (Ninja keeps -j with a pipe"
+          " jobserver). 'auto' (default): 'fifo' for Ninja, 'pipe' otherwise"
+  )
 
-if args.config_all:
-  generate_command.append("-DHUNTER_CONFIGURATION_TYPES={}".format(args.config_all))
+  parser.add_argument(
+      '--target',
+      help="Target to build for the 'cmake --build' command"
+  )
 
-timer = detail.timer.Timer()
+  parser.add_argument(
+      '--discard',
+      type=PositiveInt,
+      help='Option to reduce output. Discard every N lines of execution messages'
+          ' (note that full log is still available in log.txt)'
+  )
 
-timer.start('Generate')
-detail.generate_command.run(
-    generate_command, build_dir, polly_temp_dir, args.reconfig, logging, args.output_filter, args.dry_run
-)
-timer.stop()
+  parser.add_argument(
+      '--tail',
+      type=PositiveInt,
+      help='Print last N lines if build failed'
+  )
 
-build_command = [
-    cmake_bin,
-    '--build',
-    build_dir
-]
+  parser.add_argument(
+      '--errors',
+      type=int,
+      default=5,
+      help='Print first N errors with context if build failed'
+          ' (default: %(default)s, 0 to disable)'
+  )
 
-if args.config:
-  build_command.append('--config')
-  build_command.append(args.config)
+  parser.add_argument(
+      '--log-keep',
+      type=int,
+      default=100,
+      help='Keep at most N rotated logs per toolchain (default: %(default)s)'
+  )
 
-build_command += target.args()
+  parser.add_argument(
+      '--log-max-age',
+      type=PositiveInt,
+      help='Remove rotated logs older than N days'
+  )
 
-# NOTE: This must be the last `build_command` modification!
-build_command.append('--')
+  parser.add_argument(
+      '--log-max-size',
+      type=PositiveInt,
+      help='Remove oldest rotated logs if all of them take more than N MiB'
+  )
 
-if args.iossim:
-  build_command.append('-sdk')
-  build_command.append('iphonesimulator')
+  parser.add_argument(
+      '--log-compression',
+      choices=['gzip', 'zstd', 'none'],
+      default='gzip',
+      help='Compress rotated logs in background (default: %(default)s,'
+          ' zstd needs Python module zstandard, gzip used if not installed)'
+  )
 
-if args.jobs:
-  if toolchain_entry.is_xcode:
-    build_command.append('-jobs')
-    build_command.append('{}'.format(args.jobs))
-  elif toolchain_entry.is_make and not toolchain_entry.is_nmake:
-    build_command.append('-j')
-    build_command.append('{}'.format(args.jobs))
-  elif toolchain_entry.is_msvc and (int(toolchain_entry.vs_version) >= 12):
-    build_command.append('/maxcpucount:{}'.format(args.jobs))
+  parser.add_argument(
+      '--compress-log',
+      action='store_true',
+      help='Write log compressed while building (log.txt.gz, blocks can be'
+          ' read without decompressing the whole file, see polly-log.py)'
+  )
 
-if args.keep_going:
-  if toolchain_entry.is_make:
-    build_command.append('-k') ## keep going
+  parser.add_argument(
+      '--log-split-phases',
+      action='store_true',
+      help='Write every phase (Generate, Build, Test, ...) also to its own'
+          ' file (directory log.phases next to the log)'
+  )
 
-if not args.nobuild:
-  timer.start('Build')
+  parser.add_argument(
+      '--no-history',
+      action='store_true',
+      help="Don't record the run in the timing history"
+          " (_logs/polly/history.sqlite, see polly-stats.py)"
+  )
 
-  if toolchain_entry.is_xcode:
-    # Workaround for https://gitlab.kitware.com/cmake/cmake/issues/17851
-    zero_check_command = [
-        cmake_bin,
-        '--build',
-        build_dir,
-        '--target',
-        'ZERO_CHECK'
-    ]
-    detail.call.call(zero_check_command, logging, sleep=1)
+  parser.add_argument(
+      '--output_filter',
+      help="Output filter command (external process, stdout only; see --filter)"
+  )
 
-  detail.call.call(build_command, logging, sleep=1, output_filter=args.output_filter)
-  timer.stop()
+  parser.add_argument(
+      '--filter',
+      action='append',
+      help="In-process filter of stdout and stderr of all the commands (can be"
+          " repeated): 'progress' (drop make/ninja progress lines),"
+          " 'collapse-warnings' (print repeated warnings once),"
+          " 'drop:<regex>', 'keep:<regex>',"
+          " 'python:<module or file.py>:<callable>' (line -> line or None)"
+  )
 
-  if args.archive:
-    timer.start('Archive creation')
-    detail.create_archive.run(
-        install_dir,
-        archives_dir,
-        args.archive,
-        toolchain_entry.name,
-        args.config
+  parser.add_argument(
+      '--timeout',
+      type=PositiveInt,
+      help='Timeout for CTest'
+  )
+
+  parser.add_argument(
+      '--cmake',
+      help="CMake binary (cmake or cmake3)"
+  )
+
+  parser.add_argument(
+      '--cpack',
+      help="CPack binary (cpack or cpack3)"
+  )
+
+  parser.add_argument(
+      '--ctest',
+      help="CTest binary (ctest or ctest3)"
+  )
+
+  parser.add_argument(
+      '--trace-cmake',
+      action='store_true',
+      help="Profile the CMake configure step (CMake 3.18+) and add the"
+          " function calls to the trace (_3rdParty/polly/trace.json)"
+  )
+
+  parser.add_argument(
+      '--dry-run',
+      action='store_true',
+      help="Print the corresponding CMake command and quit"
+  )
+
+  parser.add_argument(
+      '--daemon',
+      action='store_true',
+      help="Run as a persistent server with warm state; requests are sent"
+          " by polly-client.py with the same options (POSIX only)"
+  )
+
+  parser.add_argument(
+      '--socket',
+      help="Unix domain socket for --daemon (default: $POLLY_DAEMON_SOCKET,"
+          " polly-daemon.sock in $XDG_RUNTIME_DIR or /tmp)"
+  )
+
+  return parser
+
+def main(argv=None, parser=None):
+  print(
+      'Python version: {}.{}'.format(
+          sys.version_info.major, sys.version_info.minor
+       )
+  )
+
+  if argv is None:
+    argv = sys.argv[1:]
+
+  if argv[:1] == ['gc']:
+    import detail.gc
+    detail.gc.main(argv[1:], os.getcwd())
+    return
+
+  if parser is None:
+    parser = create_parser()
+
+  args = parser.parse_args(argv)
+
+  if args.list_toolchains is not None:
+    import detail.toolchain_index
+    detail.toolchain_index.print_query(args.list_toolchains)
+    return
+
+  if args.daemon:
+    import detail.daemon
+    preload()
+    detail.daemon.serve(args.socket, lambda x: main(x, parser))
+    return
+
+  if args.config and args.config_all:
+    sys.exit('Must specify --config or --config-all but not both')
+
+  if args.install and args.strip:
+    sys.exit('Both --install and --strip specified')
+
+  if args.concurrent_pack and sys.version_info < (3, 5):
+    sys.exit('--concurrent-pack requires Python 3.5+')
+
+  if args.cache:
+    if not os.path.isfile(args.cache):
+      sys.exit("Specified cache file does not exist: {}".format(args.cache))
+    if not os.access(args.cache, os.R_OK):
+      sys.exit("Specified cache file is not readable: {}".format(args.cache))
+
+  import detail.matrix
+  import detail.toolchain_index
+  import detail.toolchain_name
+  import detail.toolchain_table
+
+  if not detail.matrix.is_matrix(args.toolchain):
+    # before the environment is tuned and the jobs are counted
+    polly_toolchain = detail.toolchain_name.get(args.toolchain)
+    detail.toolchain_table.get_by_name(polly_toolchain) # exits with reason
+    detail.toolchain_index.verify(polly_toolchain)
+
+  import detail.auto_jobs
+  import detail.build_tag
+  import detail.call
+  import detail.jobserver
+  import detail.output_filter
+  import detail.target
+  import detail.trace
+
+  auto_jobs = (args.jobs == 'auto')
+  job_memory = args.job_memory * detail.auto_jobs.mebibyte
+  if auto_jobs:
+    args.jobs, auto_jobs_reason = detail.auto_jobs.get(job_memory)
+    if args.jobs_max and args.jobs > args.jobs_max:
+      args.jobs = args.jobs_max
+      auto_jobs_reason = '{} (--jobs-max); {}'.format(
+          args.jobs, auto_jobs_reason
+      )
+    print('Jobs (auto): {}'.format(auto_jobs_reason))
+
+  if detail.matrix.is_matrix(args.toolchain):
+    toolchains = detail.matrix.expand(
+        args.toolchain, detail.toolchain_table.registry
     )
-    timer.stop()
+    for x in toolchains:
+      detail.toolchain_index.verify(x)
+    if args.open:
+      sys.exit('--open is not supported for several toolchains')
+    if args.output:
+      cdir = os.path.abspath(args.output)
+    else:
+      cdir = os.getcwd()
+    polly_py = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'polly.py')
+    if args.jobserver and not detail.jobserver.join(os.environ):
+      detail.jobserver.activate(
+          detail.jobserver.create(
+              args.jobs or os.cpu_count() or 1,
+              use_fifo=jobserver_fifo(
+                  args.jobserver,
+                  all(
+                      detail.toolchain_table.get_by_name(x).is_ninja
+                      for x in toolchains
+                  )
+              )
+          ),
+          os.environ
+      )
+    sys.exit(
+        detail.matrix.run(
+            toolchains,
+            polly_py,
+            argv,
+            cdir,
+            args.config_all or args.config,
+            args.jobs,
+            job_memory if auto_jobs else None
+        )
+    )
+
+  detail.output_filter.setup(args.filter)
+
+  polly_toolchain = detail.toolchain_name.get(args.toolchain)
+  toolchain_entry = detail.toolchain_table.get_by_name(polly_toolchain)
+  cpack_generator = args.pack
+
+  polly_root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+  polly_root = os.path.realpath(polly_root)
+
+  if args.config_all:
+    args.config = args.config_all
+
+  build_tag = detail.build_tag.get(polly_toolchain, toolchain_entry, args.config)
+
+  toolchain_path = os.path.join(polly_root, "{}.cmake".format(polly_toolchain))
+  toolchain_option = "-DCMAKE_TOOLCHAIN_FILE={}".format(toolchain_path)
+
+  if args.output:
+    if not os.path.isdir(args.output):
+      sys.exit("Specified build directory does not exist: {}".format(args.output))
+    if not os.access(args.output, os.W_OK):
+      sys.exit("Specified build directory is not writeable: {}".format(args.output))
+    # absolute: results are saved after 'os.chdir(build_dir)'
+    cdir = os.path.abspath(args.output)
+  else:
+    cdir = os.getcwd()
+
+  build_dir = os.path.join(cdir, '_builds', build_tag)
+  print("Build dir: {}".format(build_dir))
+  build_dir_option = "-B{}".format(build_dir)
+
+  install_dir = os.path.join(cdir, '_install', polly_toolchain)
+  local_install = args.install or args.strip or args.framework or args.framework_device or args.archive
+
+  if args.strip:
+    install_target_name = 'install/strip'
+  elif local_install:
+    install_target_name = 'install'
+  else:
+    install_target_name = '' # not used
+
+  target = detail.target.Target()
+
+  target.add(condition=local_install, name=install_target_name)
+  target.add(condition=args.target, name=args.target)
+
+  # After 'target.add'
+  if args.strip and not toolchain_entry.is_make:
+    sys.exit('CMake install/strip targets are only supported for the Unix Makefile generator')
+
+  if local_install:
+    install_dir_option = "-DCMAKE_INSTALL_PREFIX={}".format(install_dir)
+
+  if (args.framework or args.framework_device) and sys.platform != 'darwin':
+    sys.exit('Framework creation only for Mac OS X')
+  framework_dir = os.path.join(cdir, '_framework', polly_toolchain)
+  archives_dir = os.path.join(cdir, '_archives')
+
+  # --verbose flag triggers full verbosity level
+  if args.verbose:
+      args.verbosity='full'
+
+  polly_temp_dir = os.path.join(build_dir, '_3rdParty', 'polly')
 
-  if args.framework or args.framework_device:
-    timer.start('Framework creation')
-    detail.create_framework.run(
-        install_dir,
-        framework_dir,
-        toolchain_entry.ios_version,
+  if args.cmake:
+    cmake_bin = args.cmake
+  else:
+    cmake_bin = 'cmake'
+
+  home = '.'
+  if args.home:
+    home = args.home
+  project_home = os.path.abspath(home)
+
+  generate_command = [
+      cmake_bin,
+      '-H{}'.format(home),
+      build_dir_option
+  ]
+
+  if args.cache:
+    generate_command.append("-C{}".format(args.cache))
+
+  if (args.config and not toolchain_entry.multiconfig) or args.config_all:
+    generate_command.append("-DCMAKE_BUILD_TYPE={}".format(args.config))
+
+  if toolchain_entry.generator:
+    generate_command.append('-G{}'.format(toolchain_entry.generator))
+
+  if toolchain_entry.toolset:
+    generate_command.append('-T{}'.format(toolchain_entry.toolset))
+
+  if toolchain_entry.xp:
+    toolset = 'v{}0_xp'.format(toolchain_entry.vs_version)
+    generate_command.append('-T{}'.format(toolset))
+
+  if toolchain_option:
+    generate_command.append(toolchain_option)
+
+  if args.verbosity == 'full':
+      generate_command.append('-DCMAKE_VERBOSE_MAKEFILE=ON')
+      generate_command.append('-DPOLLY_STATUS_DEBUG=ON')
+      generate_command.append('-DHUNTER_STATUS_DEBUG=ON')
+
+  if args.ios_multiarch:
+      generate_command.append('-DCMAKE_XCODE_ATTRIBUTE_ONLY_ACTIVE_ARCH=NO')
+
+  if args.ios_combined:
+      generate_command.append('-DCMAKE_IOS_INSTALL_COMBINED=YES')
+
+  if local_install:
+    generate_command.append(install_dir_option)
+
+  if cpack_generator:
+    generate_command.append('-DCPACK_GENERATOR={}'.format(cpack_generator))
+
+  if args.fwd != None:
+    for x in args.fwd:
+      generate_command.append("-D{}".format(x))
+
+  if args.config_all:
+    generate_command.append("-DHUNTER_CONFIGURATION_TYPES={}".format(args.config_all))
+
+  cmake_profile_path = os.path.join(polly_temp_dir, 'cmake-profile.json')
+  if args.trace_cmake:
+    generate_command += detail.trace.cmake_profile_args(cmake_profile_path)
+
+  if args.dry_run:
+    # Nothing is run or written: no log, no cmake checks, build and install
+    # directories untouched
+    detail.call.print_command(generate_command)
+    return
+
+  import detail.build_snapshot
+  import detail.check_cache
+  import detail.create_archive
+  import detail.create_framework
+  import detail.daemon
+  import detail.file_api
+  import detail.fingerprint
+  import detail.gc
+  import detail.generate_command
+  import detail.get_nmake_environment
+  import detail.history
+  import detail.ios_dev_root
+  import detail.log_rotation
+  import detail.logging
+  import detail.mtime
+  import detail.open_project
+  import detail.osx_dev_root
+  import detail.pack_command
+  import detail.pipelined_test
+  import detail.query_index
+  import detail.rmtree
+  import detail.test_command
+  import detail.timer
+  import detail.verify_mingw_path
+  import detail.verify_msys_path
+
+  # filesystem timestamps are probed here, not in the source tree
+  detail.mtime.probe_dirs = [polly_temp_dir]
+
+  """Tune environment"""
+  if toolchain_entry.name.startswith('mingw'):
+    mingw_path = os.getenv("MINGW_PATH")
+    detail.verify_mingw_path.verify(mingw_path)
+    os.environ['PATH'] = "{};{}".format(mingw_path, os.getenv('PATH'))
+
+  if toolchain_entry.name.startswith('msys'):
+    msys_path = os.getenv("MSYS_PATH")
+    detail.verify_msys_path.verify(msys_path)
+    os.environ['PATH'] = "{};{}".format(msys_path, os.getenv('PATH'))
+
+  vs_ninja = toolchain_entry.is_ninja and toolchain_entry.vs_version
+  if toolchain_entry.is_nmake or vs_ninja:
+    os.environ = detail.get_nmake_environment.get(
+        toolchain_entry.arch, toolchain_entry.vs_version
+    )
+
+  if toolchain_entry.ios_version:
+    ios_dev_root = detail.ios_dev_root.get(toolchain_entry.ios_version)
+    if ios_dev_root:
+      print("Set environment DEVELOPER_DIR to {}".format(ios_dev_root))
+      os.environ['DEVELOPER_DIR'] = ios_dev_root
+
+  if toolchain_entry.nocodesign:
+    xcconfig = os.path.join(polly_root, 'scripts', 'NoCodeSign.xcconfig')
+    print("Set environment XCODE_XCCONFIG_FILE to {}".format(xcconfig))
+    os.environ['XCODE_XCCONFIG_FILE'] = xcconfig
+
+  if toolchain_entry.osx_version:
+    osx_dev_root = detail.osx_dev_root.get(toolchain_entry.osx_version)
+    if osx_dev_root:
+      print("Set environment DEVELOPER_DIR to {}".format(osx_dev_root))
+      os.environ['DEVELOPER_DIR'] = osx_dev_root
+
+  trash_dir = detail.rmtree.trash_dir(cdir)
+  if args.clear_async:
+    detail.rmtree.move_to_trash(build_dir, trash_dir)
+    detail.rmtree.move_to_trash(install_dir, trash_dir)
+    detail.rmtree.move_to_trash(framework_dir, trash_dir)
+  elif args.clear:
+    detail.rmtree.rmtree(build_dir)
+    detail.rmtree.rmtree(install_dir)
+    detail.rmtree.rmtree(framework_dir)
+
+  # Also collects the trash left by previous (crashed) runs
+  detail.rmtree.start_reaper(trash_dir)
+
+  if not os.path.exists(polly_temp_dir):
+    os.makedirs(polly_temp_dir)
+  detail.gc.touch(polly_temp_dir, polly_toolchain, args.config)
+  logging = detail.logging.Logging(
+      cdir,
+      args.verbosity,
+      args.discard,
+      args.tail,
+      polly_toolchain,
+      args.errors,
+      detail.log_rotation.Retention(
+          keep=args.log_keep,
+          max_age=args.log_max_age,
+          max_size=args.log_max_size * 1024 * 1024 if args.log_max_size else None,
+          compression=args.log_compression
+      ),
+      args.compress_log,
+      args.log_split_phases
+  )
+
+  if auto_jobs:
+    logging.write('Jobs (auto): {}\n'.format(auto_jobs_reason))
+
+  if args.jobserver:
+    if not (toolchain_entry.is_make or toolchain_entry.is_ninja):
+      sys.exit('Jobserver is only supported for Makefile and Ninja generators')
+    detail.jobserver.setup(
+        'fifo' if jobserver_fifo(args.jobserver, toolchain_entry.is_ninja) else 'pipe',
+        args.jobs,
+        os.environ,
+        logging
+    )
+
+  # Makefile build parallelism can be lowered only through the jobserver
+  jobs_throttle = None
+  make_unix = toolchain_entry.is_make and not toolchain_entry.is_nmake
+  if auto_jobs and make_unix and os.name == 'posix':
+    if not detail.jobserver.active:
+      detail.jobserver.setup('pipe', args.jobs, os.environ, logging)
+    if detail.jobserver.active.owner:
+      jobs_throttle = detail.auto_jobs.Throttle(
+          detail.jobserver.active, job_memory, logging
+      )
+    else:
+      logging.write('Jobs throttle: pool owned by parent process, disabled\n')
+
+  warm_cmake_check = detail.daemon.warm_cmake_check(cmake_bin)
+  if warm_cmake_check is not None:
+    logging.write(warm_cmake_check)
+  else:
+    if os.path.isabs(cmake_bin):
+      if not os.path.exists(cmake_bin):
+        sys.exit("CMake binary not found: {}".format(cmake_bin))
+    else:
+      if os.name == 'nt':
+        # Windows
+        detail.call.call(['where', cmake_bin], logging)
+      else:
+        detail.call.call(['which', cmake_bin], logging)
+    detail.call.call([cmake_bin, '--version'], logging)
+
+  if os.path.exists(cmake_profile_path):
+    os.unlink(cmake_profile_path)
+
+  test_pipelined = args.test_pipelined and args.test and not args.test_xml
+  if args.test_pipelined and args.test_xml:
+    print('NOTE: --test-pipelined ignored for --test-xml (dashboard mode)')
+  elif args.test_pipelined and not args.test:
+    print('NOTE: --test-pipelined ignored without --test')
+  if args.concurrent_pack and not (args.pack and (args.test or args.test_xml)):
+    print('NOTE: --concurrent-pack ignored without --test and --pack')
+
+  timer = detail.timer.Timer(logging)
+
+  history = None
+  if not args.no_history:
+    history = detail.history.Recorder(
+        cdir, timer, polly_toolchain, args.config, args.jobs, project_home
+    )
+    detail.call.failure_hooks.append(lambda: history.record('failed'))
+
+  build_snapshot = None
+  if args.snapshot_build_dir or args.restore_build_dir:
+    build_snapshot = detail.build_snapshot.BuildSnapshot(
+        args.snapshot_store or detail.build_snapshot.default_store(),
+        build_tag,
+        build_dir,
+        project_home,
+        cdir,
         polly_root,
-        args.framework_device,
-        logging,
-        args.plist,
-        args.identity,
-        args.framework_lib
+        [x for x in generate_command if x != build_dir_option],
+        toolchain_path,
+        args.cache,
+        os.environ
+    )
+    # saved by the configure step, see `detail.generate_command`
+    fingerprint_path = os.path.join(polly_temp_dir, 'fingerprint')
+    fingerprint = detail.fingerprint.get(
+        generate_command, toolchain_path, args.cache, os.environ
+    )
+
+  if args.restore_build_dir:
+    timer.start('Restore build directory')
+    restored, restore_message = build_snapshot.restore(
+        fingerprint_path, fingerprint
     )
     timer.stop()
+    restore_message = 'Restore build directory: {}'.format(
+        restore_message if restored else 'skipped ({})'.format(restore_message)
+    )
+    print(restore_message)
+    logging.write('{}\n'.format(restore_message))
+
+  # Targets, sources and tests for the query index and the pipelined test.
+  # Existing build directory is reconfigured once to get the new replies.
+  reconfig = args.reconfig
+  if detail.file_api.write_query(build_dir):
+    if os.path.exists(os.path.join(build_dir, 'CMakeCache.txt')):
+      print('CMake file API query changed, reconfigure')
+      logging.write('CMake file API query changed, reconfigure\n')
+      reconfig = True
+  elif test_pipelined and not detail.file_api.has_reply(build_dir):
+    reconfig = True
+
+  if args.ctest:
+    ctest_bin = args.ctest
+  else:
+    ctest_bin = 'ctest'
 
-if not args.nobuild:
-  os.chdir(build_dir)
-  if args.test or args.test_xml:
-    timer.start('Test')
+  check_cache = None
+  if args.check_cache != 'off':
+    check_cache = detail.check_cache.CheckCache(
+        build_tag,
+        project_home,
+        cmake_bin,
+        toolchain_path,
+        [x for x in generate_command if x != build_dir_option],
+        os.environ,
+        refresh=(args.check_cache == 'refresh')
+    )
 
-    if args.ctest:
-      ctest_bin = args.ctest
-    else:
-      ctest_bin = 'ctest'
+  timer.start('Generate')
+  detail.generate_command.run(
+      generate_command,
+      build_dir,
+      polly_temp_dir,
+      reconfig,
+      logging,
+      args.output_filter,
+      toolchain_path=toolchain_path,
+      cache_path=args.cache,
+      mtime_barrier=[home, build_dir],
+      check_cache=check_cache
+  )
+  query_index, rebuilt = detail.query_index.update(
+      build_dir, args.config, ctest_bin
+  )
+  if query_index and rebuilt:
+    query_index_message = 'Query index: {} targets, {} tests'.format(
+        len(query_index.targets), len(query_index.tests or {})
+    )
+    print(query_index_message)
+    logging.write('{}\n'.format(query_index_message))
+  timer.stop()
+  detail.trace.add_cmake_events(
+      timer, cmake_profile_path, timer.job('Generate').start
+  )
 
+  build_command = [
+      cmake_bin,
+      '--build',
+      build_dir
+  ]
+
+  if args.config:
+    build_command.append('--config')
+    build_command.append(args.config)
+
+  build_command += target.args()
+
+  # NOTE: This must be the last `build_command` modification!
+  build_command.append('--')
+
+  if args.iossim:
+    build_command.append('-sdk')
+    build_command.append('iphonesimulator')
+
+  if args.jobs:
+    if toolchain_entry.is_xcode:
+      build_command.append('-jobs')
+      build_command.append('{}'.format(args.jobs))
+    elif detail.jobserver.active and not (
+        toolchain_entry.is_ninja and not detail.jobserver.active.fifo_path
+    ):
+      pass # make/ninja take the job slots from MAKEFLAGS
+    elif toolchain_entry.is_make and not toolchain_entry.is_nmake:
+      build_command.append('-j')
+      build_command.append('{}'.format(args.jobs))
+    elif toolchain_entry.is_ninja:
+      build_command.append('-j')
+      build_command.append('{}'.format(args.jobs))
+    elif toolchain_entry.is_msvc and (int(toolchain_entry.vs_version) >= 12):
+      build_command.append('/maxcpucount:{}'.format(args.jobs))
+
+  if args.keep_going:
+    if toolchain_entry.is_make:
+      build_command.append('-k') ## keep going
+
+  if (args.test or args.test_xml) and not args.nobuild:
     if os.path.isabs(ctest_bin):
       if not os.path.exists(ctest_bin):
         sys.exit("Ctest binary not found: {}".format(ctest_bin))
 
-    detail.test_command.run(build_dir, args.config, logging, args.test_xml, args.verbosity == 'full', args.timeout, ctest_bin)
-    timer.stop()
-  if args.pack:
-    timer.start('Pack')
+  pipeline = None
+  if test_pipelined and not args.nobuild:
+    pipeline = detail.pipelined_test.create(
+        build_dir,
+        args.config,
+        ctest_bin,
+        toolchain_entry,
+        detail.test_command.command(
+            args.config, None, args.verbosity == 'full', args.timeout, ctest_bin
+        ),
+        logging
+    )
 
-    if args.cpack:
-      cpack_bin = args.cpack
-    else:
-      cpack_bin = 'cpack'
+  if jobs_throttle and not args.nobuild:
+    jobs_throttle.start()
 
-    if os.path.isabs(cpack_bin):
-      if not os.path.exists(cpack_bin):
-        sys.exit("CPack binary not found: {}".format(cpack_bin))
+  ninja_log_size = detail.trace.ninja_log_size(build_dir)
 
-    detail.pack_command.run(args.config, logging, cpack_generator, cpack_bin, cmake_bin)
+  if pipeline:
+    timer.start('Build + Test (pipelined)')
+    pipeline.run(
+        build_command, args.output_filter, mtime_barrier=[home, build_dir]
+    )
     timer.stop()
-
-if args.open:
-  detail.open_project.open(toolchain_entry, build_dir, logging)
-
-print('-')
-print('Log saved: {}'.format(logging.log_path))
-print('-')
-timer.result()
-print('-')
-print('SUCCESS')
+    timer.record('Pipelining saved', pipeline.saved())
+    detail.trace.add_pipeline_events(timer, pipeline, build_dir)
+    if toolchain_entry.is_ninja:
+      detail.trace.add_ninja_events(
+          timer, build_dir, ninja_log_size, pipeline.build_start
+      )
+  elif not args.nobuild:
+    timer.start('Build')
+
+    if toolchain_entry.is_xcode:
+      # Workaround for https://gitlab.kitware.com/cmake/cmake/issues/17851
+      # (Xcode needs the whole second between ZERO_CHECK and build)
+      zero_check_command = [
+          cmake_bin,
+          '--build',
+          build_dir,
+          '--target',
+          'ZERO_CHECK'
+      ]
+      timer.start('ZERO_CHECK')
+      detail.call.call(zero_check_command, logging, sleep=1)
+      timer.stop()
+
+    build_start = detail.timer.now()
+    detail.call.call(
+        build_command,
+        logging,
+        output_filter=args.output_filter,
+        mtime_barrier=[home, build_dir]
+    )
+    timer.stop()
+    if toolchain_entry.is_ninja:
+      detail.trace.add_ninja_events(timer, build_dir, ninja_log_size, build_start)
+
+  if jobs_throttle and not args.nobuild:
+    jobs_throttle.stop()
+
+  if not args.nobuild:
+    if args.archive:
+      timer.start('Archive creation')
+      detail.create_archive.run(
+          install_dir,
+          archives_dir,
+          args.archive,
+          toolchain_entry.name,
+          args.config
+      )
+      timer.stop()
+
+    if args.framework or args.framework_device:
+      timer.start('Framework creation')
+      detail.create_framework.run(
+          install_dir,
+          framework_dir,
+          toolchain_entry.ios_version,
+          polly_root,
+          args.framework_device,
+          logging,
+          args.plist,
+          args.identity,
+          args.framework_lib
+      )
+      timer.stop()
+
+  if not args.nobuild:
+    os.chdir(build_dir)
+    if args.pack:
+      if args.cpack:
+        cpack_bin = args.cpack
+      else:
+        cpack_bin = 'cpack'
+
+      if os.path.isabs(cpack_bin):
+        if not os.path.exists(cpack_bin):
+          sys.exit("CPack binary not found: {}".format(cpack_bin))
+
+    run_tests = (args.test or args.test_xml) and not pipeline
+    if args.concurrent_pack and run_tests and args.pack:
+      import detail.async_call # Python 3.5+
+      timer.start('Test + Pack (concurrent)')
+      test_start = detail.timer.now()
+      results = detail.async_call.run_all(
+          [
+              detail.async_call.Command(
+                  detail.test_command.command(
+                      args.config,
+                      args.test_xml,
+                      args.verbosity == 'full',
+                      args.timeout,
+                      ctest_bin
+                  ),
+                  prefix='test'
+              ),
+              detail.async_call.Command(
+                  detail.pack_command.command(
+                      args.config, cpack_generator, cpack_bin, cmake_bin
+                  ),
+                  prefix='pack'
+              )
+          ],
+          logging,
+          cancel_on_failure=True
+      )
+      for name, result in zip(['Test', 'Pack'], results):
+        if result.duration is not None:
+          timer.record(name, result.duration)
+      timer.stop()
+      detail.async_call.exit_on_failure(results, logging)
+      detail.trace.add_ctest_events(timer, build_dir, test_start)
+    else:
+      if run_tests:
+        timer.start('Test')
+        detail.test_command.run(build_dir, args.config, logging, args.test_xml, args.verbosity == 'full', args.timeout, ctest_bin)
+        timer.stop()
+        detail.trace.add_ctest_events(timer, build_dir, timer.job('Test').start)
+      if args.pack:
+        timer.start('Pack')
+        detail.pack_command.run(args.config, logging, cpack_generator, cpack_bin, cmake_bin)
+        timer.stop()
+
+  if args.snapshot_build_dir:
+    timer.start('Snapshot build directory')
+    snapshot_message = 'Snapshot build directory: {}'.format(
+        build_snapshot.save(
+            fingerprint_path, fingerprint, args.snapshot_objects
+        )
+    )
+    timer.stop()
+    print(snapshot_message)
+    logging.write('{}\n'.format(snapshot_message))
+
+  if args.open:
+    detail.open_project.open(toolchain_entry, build_dir, logging)
+
+  logging.close()
+  print('-')
+  print('Log saved: {}'.format(logging.log_path))
+  print('-')
+  timer.result()
+  detail.gc.touch(polly_temp_dir, polly_toolchain, args.config)
+  timer.save(os.path.join(polly_temp_dir, 'timing.json'))
+  trace_path = os.path.join(polly_temp_dir, 'trace.json')
+  timer.save_trace(trace_path, 'polly {}'.format(build_tag))
+  history_path = history.record() if history else None
+  print('-')
+  print('Trace saved: {}'.format(trace_path))
+  if history_path:
+    print('Timing history: {} (see polly-stats.py)'.format(history_path))
+  print('-')
+  print('SUCCESS')
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,11 @@
+# Unit tests of the polly.py helpers (bin/detail):
+#
+#   > python3 -m unittest discover -s tests -t .
+#   > python3 -m pytest tests
+
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'bin')
+)
@@ -0,0 +1,127 @@
+# detail.auto_jobs: cgroup v1/v2 parsing on a fake /proc and cgroup tree
+
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+
+import detail.auto_jobs
+
+gibibyte = detail.auto_jobs.gibibyte
+
+class TestCgroup(unittest.TestCase):
+  def setUp(self):
+    self.temp_dir = tempfile.mkdtemp()
+    self.proc = {}
+    read_file = detail.auto_jobs.read_file
+    patcher = unittest.mock.patch.object(
+        detail.auto_jobs,
+        'read_file',
+        lambda path: self.proc[path] if path in self.proc else read_file(path)
+    )
+    patcher.start()
+    self.addCleanup(patcher.stop)
+
+  def tearDown(self):
+    shutil.rmtree(self.temp_dir)
+
+  def write(self, path, content):
+    path = os.path.join(self.temp_dir, path)
+    if not os.path.isdir(os.path.dirname(path)):
+      os.makedirs(os.path.dirname(path))
+    with open(path, 'w') as f:
+      f.write(content)
+
+  def mount(self, lines):
+    self.proc['/proc/self/mountinfo'] = '\n'.join(
+        x.format(self.temp_dir) for x in lines
+    )
+
+  def test_v2(self):
+    self.mount([
+        '22 1 8:1 / / rw,relatime - ext4 /dev/sda1 rw',
+        '36 25 0:30 / {}/v2 rw,nosuid - cgroup2 cgroup2 rw'
+    ])
+    self.proc['/proc/self/cgroup'] = '0::/user.slice/build'
+    self.write('v2/user.slice/build/cpu.max', '150000 100000\n')
+    self.write('v2/user.slice/cpu.max', 'max 100000\n')
+    self.write('v2/user.slice/build/memory.max', str(4 * gibibyte))
+    self.write('v2/user.slice/build/memory.current', str(3 * gibibyte))
+    self.write(
+        'v2/user.slice/build/memory.stat',
+        'anon 1\ninactive_file {}\n'.format(gibibyte)
+    )
+    self.write('v2/user.slice/memory.max', 'max')
+    self.write('v2/user.slice/memory.current', str(8 * gibibyte))
+
+    version, dirs = detail.auto_jobs.cgroup_dirs('cpu')
+    root = os.path.join(self.temp_dir, 'v2')
+    self.assertEqual(version, 2)
+    self.assertEqual(
+        dirs,
+        [
+            os.path.join(root, 'user.slice', 'build'),
+            os.path.join(root, 'user.slice'),
+            root
+        ]
+    )
+    self.assertEqual(detail.auto_jobs.cpu_quota(), 1.5)
+    self.assertEqual(
+        detail.auto_jobs.cgroup_memory_available(version, dirs), 2 * gibibyte
+    )
+
+    self.proc['/proc/meminfo'] = 'MemTotal: 1 kB\nMemAvailable: 1048576 kB'
+    self.assertEqual(
+        detail.auto_jobs.memory_available(version, dirs),
+        (gibibyte, 'MemAvailable 1.0 GiB, cgroup v2 2.0 GiB')
+    )
+
+    self.write(
+        'v2/user.slice/build/memory.pressure',
+        'some avg10=12.50 avg60=3.00 avg300=1.00 total=1\n'
+        'full avg10=1.00 avg60=0.00 avg300=0.00 total=1\n'
+    )
+    self.assertEqual(detail.auto_jobs.memory_pressure(version, dirs), 12.5)
+
+  def test_v1(self):
+    self.mount([
+        '30 25 0:26 /docker/abc {}/cpu rw - cgroup cgroup rw,cpu,cpuacct',
+        '31 25 0:27 /docker/abc {}/memory rw - cgroup cgroup rw,memory'
+    ])
+    self.proc['/proc/self/cgroup'] = (
+        '5:memory:/docker/abc\n4:cpu,cpuacct:/docker/abc'
+    )
+    self.write('cpu/cpu.cfs_quota_us', '200000')
+    self.write('cpu/cpu.cfs_period_us', '100000')
+    self.write('memory/memory.limit_in_bytes', str(2 ** 63 - 4096))
+    self.write('memory/memory.usage_in_bytes', str(gibibyte))
+
+    version, dirs = detail.auto_jobs.cgroup_dirs('cpu')
+    self.assertEqual(version, 1)
+    self.assertEqual(dirs, [os.path.join(self.temp_dir, 'cpu')])
+    self.assertEqual(detail.auto_jobs.cpu_quota(), 2.0)
+
+    version, dirs = detail.auto_jobs.cgroup_dirs('memory')
+    self.assertEqual(dirs, [os.path.join(self.temp_dir, 'memory')])
+    self.assertIsNone(detail.auto_jobs.cgroup_memory_available(version, dirs))
+
+  def test_hybrid(self):
+    self.mount([
+        '30 25 0:26 / {}/cpu rw - cgroup cgroup rw,cpu,cpuacct',
+        '36 25 0:30 / {}/unified rw - cgroup2 cgroup2 rw'
+    ])
+    self.proc['/proc/self/cgroup'] = '4:cpu,cpuacct:/\n0::/'
+    self.write('cpu/cpu.cfs_quota_us', '-1')
+    self.write('cpu/cpu.cfs_period_us', '100000')
+    version, dirs = detail.auto_jobs.cgroup_dirs('cpu')
+    self.assertEqual(version, 1)
+    self.assertIsNone(detail.auto_jobs.cpu_quota())
+
+  def test_no_cgroup(self):
+    self.proc['/proc/self/cgroup'] = None
+    self.assertEqual(detail.auto_jobs.cgroup_dirs('cpu'), (None, []))
+    self.assertIsNone(detail.auto_jobs.cpu_quota())
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,92 @@
+# detail.fingerprint: change detection of the configure inputs
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import detail.fingerprint
+
+class TestFingerprint(unittest.TestCase):
+  def setUp(self):
+    self.root = tempfile.mkdtemp()
+    self.write(
+        'custom.cmake',
+        'include("${CMAKE_CURRENT_LIST_DIR}/utilities/polly_init.cmake")\n'
+        'include(polly_common)\n'
+        'include("${CMAKE_CURRENT_LIST_DIR}/flags/custom.cmake")\n'
+        'include("${SOME_DIR}/unresolved.cmake")\n'
+    )
+    self.write('utilities/polly_init.cmake', '# init\n')
+    self.write('utilities/polly_common.cmake', '# common\n')
+    self.write(
+        'flags/custom.cmake',
+        'set(CMAKE_CXX_FLAGS "$ENV{CUSTOM_FLAGS}")\n'
+        'include("${CMAKE_CURRENT_LIST_DIR}/../utilities/polly_init.cmake")\n'
+    )
+    self.write('cache.cmake', 'set(FOO "1" CACHE STRING "")\n')
+    self.toolchain = os.path.join(self.root, 'custom.cmake')
+    self.cache = os.path.join(self.root, 'cache.cmake')
+    self.command = ['cmake', '-H.', '-B_builds', '-DCMAKE_BUILD_TYPE=Release']
+    self.environ = {'PATH': '/usr/bin', 'CUSTOM_FLAGS': '-O2', 'TERM': 'xterm'}
+
+  def tearDown(self):
+    shutil.rmtree(self.root)
+
+  def write(self, path, content):
+    path = os.path.join(self.root, path)
+    if not os.path.isdir(os.path.dirname(path)):
+      os.makedirs(os.path.dirname(path))
+    with open(path, 'w') as f:
+      f.write(content)
+
+  def get(self):
+    return detail.fingerprint.get(
+        self.command, self.toolchain, self.cache, self.environ
+    )
+
+  def test_toolchain_files(self):
+    files, variables = detail.fingerprint.toolchain_files(
+        self.toolchain, self.environ
+    )
+    self.assertEqual(
+        sorted(os.path.relpath(x, self.root) for x in files),
+        [
+            'custom.cmake',
+            os.path.join('flags', 'custom.cmake'),
+            os.path.join('utilities', 'polly_common.cmake'),
+            os.path.join('utilities', 'polly_init.cmake')
+        ]
+    )
+    self.assertEqual(variables, set(['CUSTOM_FLAGS']))
+
+  def test_unchanged(self):
+    self.assertEqual(self.get(), self.get())
+    self.environ['TERM'] = 'dumb' # not used by the toolchain
+    fingerprint = self.get()
+    self.write('unused.cmake', '# not included\n')
+    self.assertEqual(self.get(), fingerprint)
+
+  def test_included_file(self):
+    fingerprint = self.get()
+    self.write('utilities/polly_common.cmake', '# common, changed\n')
+    self.assertNotEqual(self.get(), fingerprint)
+
+  def test_environment(self):
+    fingerprint = self.get()
+    self.environ['CUSTOM_FLAGS'] = '-O3'
+    changed = self.get()
+    self.assertNotEqual(changed, fingerprint)
+    self.environ['CXX'] = 'clang++' # common variable
+    self.assertNotEqual(self.get(), changed)
+
+  def test_arguments_and_cache(self):
+    fingerprint = self.get()
+    self.command[-1] = '-DCMAKE_BUILD_TYPE=Debug'
+    changed = self.get()
+    self.assertNotEqual(changed, fingerprint)
+    self.write('cache.cmake', 'set(FOO "2" CACHE STRING "")\n')
+    self.assertNotEqual(self.get(), changed)
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,92 @@
+# detail.gc: size parsing and eviction order (`select`)
+
+import argparse
+import unittest
+
+import detail.gc
+
+day = 24 * 3600
+now = 1000 * day
+
+def create_items():
+  Item = detail.gc.Item
+  items = [
+      Item('gcc-Release', 'build', now - 10 * day, [], 'gcc'),
+      Item('gcc-Debug', 'build', now - day, [], 'gcc'),
+      Item('gcc', 'toolchain', now - day, [], 'gcc'),
+      Item('clang', 'build', now - 5 * day, [], 'clang'),
+      Item('clang', 'toolchain', now - 5 * day, [], 'clang'),
+      Item('old', 'toolchain', now - 30 * day, [], 'old'),
+      Item('archive.tar.gz', 'archive', now - 20 * day, []),
+      Item('gcc-Coverage', 'build', now - 10, [], 'gcc')
+  ]
+  for item, size in zip(items, [30, 20, 5, 40, 5, 5, 10, 50]):
+    item.size = size
+  return items
+
+def evicted(items):
+  return [(x.name, x.kind, x.reason) for x in items if x.reason]
+
+class TestParseSize(unittest.TestCase):
+  def test_units(self):
+    self.assertEqual(detail.gc.parse_size('512'), 512)
+    self.assertEqual(detail.gc.parse_size('500M'), 500 * 1024 ** 2)
+    self.assertEqual(detail.gc.parse_size('1.5g'), int(1.5 * 1024 ** 3))
+    self.assertEqual(detail.gc.parse_size('20GiB'), 20 * 1024 ** 3)
+    self.assertEqual(detail.gc.parse_size(' 2T '), 2 * 1024 ** 4)
+
+  def test_invalid(self):
+    for x in ['', 'G', '10X', '-1G', '1,5G']:
+      with self.assertRaises(argparse.ArgumentTypeError):
+        detail.gc.parse_size(x)
+
+  def test_format(self):
+    self.assertEqual(detail.gc.format_size(100), '100B')
+    self.assertEqual(detail.gc.format_size(1536), '1.5K')
+    self.assertEqual(detail.gc.format_size(3 * 1024 ** 4), '3.0T')
+
+class TestSelect(unittest.TestCase):
+  def test_max_size(self):
+    items = create_items()
+    total = detail.gc.select(items, 100, None, 3600, now)
+    self.assertEqual(total, 75)
+    self.assertEqual(
+        evicted(items),
+        [
+            ('gcc-Release', 'build', 'size'),
+            ('clang', 'build', 'size'),
+            ('clang', 'toolchain', 'last tag of toolchain'),
+            ('old', 'toolchain', 'size'),
+            ('archive.tar.gz', 'archive', 'size')
+        ]
+    )
+
+  def test_max_age(self):
+    items = create_items()
+    total = detail.gc.select(items, None, 7 * day, 3600, now)
+    self.assertEqual(total, 120)
+    self.assertEqual(
+        evicted(items),
+        [
+            ('gcc-Release', 'build', 'age'),
+            ('old', 'toolchain', 'age'),
+            ('archive.tar.gz', 'archive', 'age')
+        ]
+    )
+
+  def test_keep_recent(self):
+    items = create_items()
+    total = detail.gc.select(items, 0, None, 3600, now)
+    # toolchain tree stays with the recently used tag
+    self.assertEqual(total, 55)
+    self.assertEqual(
+        [x.name for x in items if not x.reason], ['gcc', 'gcc-Coverage']
+    )
+
+  def test_nothing_to_do(self):
+    items = create_items()
+    self.assertEqual(detail.gc.select(items, None, None, 3600, now), 165)
+    self.assertEqual(evicted(items), [])
+
+if __name__ == '__main__':
+  unittest.main()
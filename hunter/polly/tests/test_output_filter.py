@@ -0,0 +1,125 @@
+# detail.output_filter
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import detail.output_filter
+
+def run(specs, lines):
+  detail.output_filter.setup(specs)
+  chain = detail.output_filter.create_chain()
+  return chain.filter(lines) + chain.finish()
+
+class TestFilters(unittest.TestCase):
+  def tearDown(self):
+    detail.output_filter.setup(None)
+
+  def test_no_filters(self):
+    detail.output_filter.setup([])
+    self.assertIsNone(detail.output_filter.create_chain())
+
+  def test_progress(self):
+    lines = [
+        '[ 50%] Building CXX object foo.o\n',
+        '[3/10] Linking CXX executable app\n',
+        'make[2]: Entering directory \'/tmp\'\n',
+        'Scanning dependencies of target foo\n',
+        'foo.cpp:1:2: warning: unused variable\n'
+    ]
+    self.assertEqual(run(['progress'], lines), lines[-1:])
+
+  def test_drop_keep(self):
+    lines = ['a: one\n', 'b: two\n', 'a: three\n']
+    self.assertEqual(run(['drop:^a:'], lines), ['b: two\n'])
+    self.assertEqual(run(['keep:^a:'], lines), ['a: one\n', 'a: three\n'])
+    with self.assertRaises(SystemExit):
+      detail.output_filter.setup(['drop:('])
+    with self.assertRaises(SystemExit):
+      detail.output_filter.setup(['unknown'])
+
+  def test_collapse_warnings(self):
+    warning = 'foo.h:1:2: warning: unused parameter [-Wunused]\n'
+    lines = [
+        warning,
+        '    int x;\n',
+        '        ^\n',
+        'other line\n',
+        warning,
+        '    int x;\n',
+        '        ^\n',
+        'foo.h(3): warning C4996: deprecated\n',
+        'last line\n'
+    ]
+    self.assertEqual(
+        run(['collapse-warnings'], lines),
+        lines[:4] + lines[7:] + ['polly: 1 repeated warnings collapsed\n']
+    )
+
+  def test_state_per_stream(self):
+    detail.output_filter.setup(['collapse-warnings'])
+    warning = ['foo.h:1:2: warning: unused\n']
+    for i in range(2):
+      chain = detail.output_filter.create_chain()
+      self.assertEqual(chain.filter(warning), warning)
+
+  def test_chain_finish(self):
+    # lines added by `collapse-warnings` go through `drop`
+    lines = ['x: warning: a\n', 'x: warning: a\n']
+    self.assertEqual(
+        run(['collapse-warnings', 'drop:^x'], lines),
+        ['polly: 1 repeated warnings collapsed\n']
+    )
+    self.assertEqual(
+        run(['collapse-warnings', 'drop:^polly'], lines), lines[:1]
+    )
+
+class TestPythonFilter(unittest.TestCase):
+  def setUp(self):
+    self.temp_dir = tempfile.mkdtemp()
+    self.path = os.path.join(self.temp_dir, 'filters.py')
+    with open(self.path, 'w') as f:
+      f.write(
+          'def upper(line):\n'
+          '  if line.startswith("skip"):\n'
+          '    return None\n'
+          '  return line.rstrip("\\n").upper()\n'
+          '\n'
+          'class Count:\n'
+          '  def __init__(self):\n'
+          '    self.count = 0\n'
+          '  def __call__(self, line):\n'
+          '    self.count += 1\n'
+          '    return line\n'
+          '  def finish(self):\n'
+          '    return ["{} lines".format(self.count)]\n'
+      )
+
+  def tearDown(self):
+    detail.output_filter.setup(None)
+    shutil.rmtree(self.temp_dir)
+
+  def test_function(self):
+    self.assertEqual(
+        run(['python:{}:upper'.format(self.path)], ['a\n', 'skip\n', 'b\n']),
+        ['A\n', 'B\n']
+    )
+
+  def test_class(self):
+    self.assertEqual(
+        run(['python:{}:Count'.format(self.path)], ['a\n', 'b\n']),
+        ['a\n', 'b\n', '2 lines\n']
+    )
+
+  def test_errors(self):
+    for spec in [
+        'python:{}:missing'.format(self.path),
+        'python:{}:upper'.format(os.path.join(self.temp_dir, 'no.py')),
+        'python:upper'
+    ]:
+      with self.assertRaises(SystemExit):
+        detail.output_filter.setup([spec])
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,91 @@
+# detail.seekable_log
+
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+import detail.seekable_log
+
+class TestSeekableLog(unittest.TestCase):
+  def setUp(self):
+    self.temp_dir = tempfile.mkdtemp()
+    self.path = os.path.join(self.temp_dir, 'log.txt.gz')
+    self.data = b''.join(
+        'line {}\n'.format(i).encode('utf-8') for i in range(2000)
+    )
+    writer = detail.seekable_log.Writer(self.path, size=4096)
+    for i in range(0, len(self.data), 1000):
+      writer.write(self.data[i:i + 1000])
+    writer.close()
+
+  def tearDown(self):
+    shutil.rmtree(self.temp_dir)
+
+  def test_gzip_compatible(self):
+    with gzip.open(self.path, 'rb') as f:
+      self.assertEqual(f.read(), self.data)
+
+  def test_round_trip(self):
+    self.assertTrue(detail.seekable_log.is_seekable_log(self.path))
+    with detail.seekable_log.open_log(self.path) as f:
+      self.assertIsInstance(f, detail.seekable_log.Reader)
+      self.assertEqual(f.read(), self.data)
+      offset = self.data.index(b'line 1234\n')
+      f.seek(offset)
+      self.assertEqual(f.read(10), b'line 1234\n')
+      self.assertEqual(f.tell(), offset + 10)
+      f.seek(-5, os.SEEK_END)
+      self.assertEqual(f.read(), self.data[-5:])
+
+  def test_block_index(self):
+    with open(self.path, 'rb') as f:
+      blocks = detail.seekable_log.read_blocks(f)
+    self.assertGreater(len(blocks), 1)
+    self.assertEqual(sum(x.size for x in blocks), len(self.data))
+    offset = 0
+    file_offset = 0
+    for block in blocks:
+      self.assertEqual(block.offset, offset)
+      self.assertEqual(block.file_offset, file_offset)
+      offset += block.size
+      file_offset += block.file_size
+    self.assertEqual(file_offset, os.path.getsize(self.path))
+
+    with detail.seekable_log.Reader(self.path) as f:
+      for i, block in enumerate(blocks):
+        self.assertEqual(f.block_index(block.offset), i)
+        self.assertEqual(f.block_index(block.offset + block.size - 1), i)
+      self.assertIsNone(f.block_index(len(self.data)))
+      chunks = list(f.iter_blocks(100, 9000))
+      self.assertEqual(b''.join(chunks), self.data[100:9000])
+
+  def test_truncated(self):
+    with open(self.path, 'rb') as f:
+      blocks = detail.seekable_log.read_blocks(f)
+    with open(self.path, 'r+b') as f:
+      f.truncate(blocks[-1].file_offset + 10)
+    with detail.seekable_log.Reader(self.path) as f:
+      self.assertEqual(len(f.blocks), len(blocks) - 1)
+      self.assertEqual(f.read(), self.data[:blocks[-1].offset])
+
+  def test_other_logs(self):
+    path = os.path.join(self.temp_dir, 'rotated.txt.gz')
+    with gzip.open(path, 'wb') as f:
+      f.write(self.data)
+    self.assertFalse(detail.seekable_log.is_seekable_log(path))
+    with open(path, 'rb') as f:
+      self.assertIsNone(detail.seekable_log.read_blocks(f))
+    with detail.seekable_log.open_log(path) as f:
+      f.seek(5)
+      self.assertEqual(f.read(), self.data[5:])
+
+    path = os.path.join(self.temp_dir, 'log.txt')
+    with open(path, 'wb') as f:
+      f.write(self.data)
+    with detail.seekable_log.open_log(path) as f:
+      self.assertEqual(f.read(), self.data)
+
+if __name__ == '__main__':
+  unittest.main()
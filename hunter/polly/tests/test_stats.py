@@ -0,0 +1,48 @@
+# detail.stats
+
+import unittest
+
+import detail.stats
+
+class TestPercentile(unittest.TestCase):
+  def test_interpolation(self):
+    values = [4, 1, 3, 2]
+    self.assertEqual(detail.stats.percentile(values, 0), 1)
+    self.assertEqual(detail.stats.percentile(values, 100), 4)
+    self.assertEqual(detail.stats.median(values), 2.5)
+    self.assertAlmostEqual(detail.stats.percentile(values, 90), 3.7)
+
+  def test_empty(self):
+    self.assertIsNone(detail.stats.median([]))
+
+class TestMannWhitney(unittest.TestCase):
+  def test_ranks_ties(self):
+    ranks, ties = detail.stats.ranks([10, 20, 10, 30])
+    self.assertEqual(ranks, [1.5, 3, 1.5, 4])
+    self.assertEqual(sorted(ties), [1, 1, 2])
+
+  def test_separated(self):
+    a = [1.0, 1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7]
+    b = [2.0, 2.1, 2.2, 2.3, 2.4, 2.5, 2.6, 2.7]
+    u, p = detail.stats.mann_whitney(a, b)
+    self.assertEqual(u, 0)
+    self.assertLess(p, 0.01)
+    u, p = detail.stats.mann_whitney(b, a)
+    self.assertEqual(u, len(a) * len(b))
+    self.assertLess(p, 0.01)
+
+  def test_same_distribution(self):
+    a = [1, 3, 5, 7, 9]
+    b = [2, 4, 6, 8, 10]
+    u, p = detail.stats.mann_whitney(a, b)
+    self.assertGreater(p, 0.5)
+    self.assertLessEqual(p, 1.0)
+
+  def test_all_equal(self):
+    self.assertEqual(detail.stats.mann_whitney([5, 5], [5, 5, 5]), (3, 1.0))
+
+  def test_empty(self):
+    self.assertEqual(detail.stats.mann_whitney([], [1]), (None, None))
+
+if __name__ == '__main__':
+  unittest.main()
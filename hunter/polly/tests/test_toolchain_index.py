@@ -0,0 +1,157 @@
+# detail.toolchain_index
+
+import unittest
+
+import detail.toolchain_index
+
+android = '''
+include("${CMAKE_CURRENT_LIST_DIR}/utilities/polly_init.cmake")
+set(ANDROID_NDK_VERSION "r18b")
+set(CMAKE_SYSTEM_VERSION "21")
+set(CMAKE_ANDROID_ARCH_ABI "arm64-v8a")
+set(CMAKE_ANDROID_NDK_TOOLCHAIN_VERSION "clang")
+set(CMAKE_ANDROID_STL_TYPE "c++_static") # LLVM libc++ static
+polly_init(
+    "Android NDK ${ANDROID_NDK_VERSION} / \\
+API ${CMAKE_SYSTEM_VERSION} / ${CMAKE_ANDROID_ARCH_ABI} / \\
+Clang / c++11 support / libc++ static"
+    "Unix Makefiles"
+)
+include("${CMAKE_CURRENT_LIST_DIR}/flags/cxx11.cmake") # before toolchain!
+include("${CMAKE_CURRENT_LIST_DIR}/os/android.cmake")
+'''
+
+ninja = '''
+polly_init(
+    "clang / c++17 support / Position-Independent Code"
+    "Ninja"
+)
+include("${CMAKE_CURRENT_LIST_DIR}/compiler/clang.cmake")
+include("${CMAKE_CURRENT_LIST_DIR}/flags/cxx17.cmake")
+include("${CMAKE_CURRENT_LIST_DIR}/flags/fpic.cmake")
+'''
+
+vs = '''
+polly_init(
+    "Visual Studio 16 2019 Win64 / C++17"
+    "Visual Studio 16 2019"
+)
+include("${CMAKE_CURRENT_LIST_DIR}/flags/vs-cxx17.cmake")
+'''
+
+ios = '''
+set(IOS_SDK_VERSION 12.1)
+set(IPHONEOS_ARCHS arm64;armv7)
+set(IPHONESIMULATOR_ARCHS "x86_64")
+polly_init("iOS ${IOS_SDK_VERSION} Universal" "Xcode")
+include("${CMAKE_CURRENT_LIST_DIR}/flags/ios_nocodesign.cmake")
+'''
+
+def create_index():
+  return detail.toolchain_index.Index({
+      'android-arm64-v8a': detail.toolchain_index.parse(
+          'android-arm64-v8a', android
+      ),
+      'ninja-clang-cxx17-fpic': detail.toolchain_index.parse(
+          'ninja-clang-cxx17-fpic', ninja
+      ),
+      'vs-16-2019-win64-cxx17': detail.toolchain_index.parse(
+          'vs-16-2019-win64-cxx17', vs
+      ),
+      'ios-nocodesign-12-1': detail.toolchain_index.parse(
+          'ios-nocodesign-12-1', ios
+      )
+  })
+
+def names(entries):
+  return [x['name'] for x in entries]
+
+class TestParse(unittest.TestCase):
+  def test_android(self):
+    entry = detail.toolchain_index.parse('android-arm64-v8a', android)
+    self.assertEqual(
+        entry['description'],
+        'Android NDK r18b / API 21 / arm64-v8a / Clang / c++11 support /'
+        ' libc++ static'
+    )
+    self.assertEqual(entry['generator'], 'Unix Makefiles')
+    self.assertEqual(entry['compilers'], ['clang'])
+    self.assertEqual(entry['flags'], ['cxx11'])
+    self.assertEqual(entry['os'], ['android'])
+    self.assertEqual(entry['cxx'], '11')
+    self.assertEqual(entry['archs'], ['arm64-v8a'])
+
+  def test_ninja(self):
+    entry = detail.toolchain_index.parse('ninja-clang-cxx17-fpic', ninja)
+    self.assertEqual(entry['generator'], 'Ninja')
+    self.assertEqual(entry['compilers'], ['clang'])
+    self.assertEqual(entry['flags'], ['cxx17', 'fpic'])
+    self.assertEqual(entry['cxx'], '17')
+    self.assertEqual(entry['archs'], [])
+
+  def test_visual_studio(self):
+    entry = detail.toolchain_index.parse('vs-16-2019-win64-cxx17', vs)
+    self.assertEqual(entry['vs_version'], '16')
+    self.assertEqual(entry['cxx'], '17')
+    self.assertEqual(entry['archs'], ['amd64'])
+
+  def test_ios(self):
+    entry = detail.toolchain_index.parse('ios-nocodesign-12-1', ios)
+    self.assertEqual(entry['description'], 'iOS 12.1 Universal')
+    self.assertEqual(entry['ios_version'], '12.1')
+    self.assertEqual(entry['archs'], ['arm64', 'armv7', 'x86_64'])
+    self.assertTrue(entry['nocodesign'])
+
+class TestQuery(unittest.TestCase):
+  def setUp(self):
+    self.index = create_index()
+
+  def test_keywords(self):
+    self.assertEqual(
+        names(self.index.query(['ninja', 'clang', 'cxx17'])),
+        ['ninja-clang-cxx17-fpic']
+    )
+    self.assertEqual(
+        names(self.index.query(['ninja clang cxx17'])),
+        ['ninja-clang-cxx17-fpic']
+    )
+    self.assertEqual(
+        names(self.index.query(['clang'])),
+        ['android-arm64-v8a', 'ninja-clang-cxx17-fpic']
+    )
+    self.assertEqual(names(self.index.query(['msvc'])), ['vs-16-2019-win64-cxx17'])
+    self.assertEqual(names(self.index.query(['ninja', 'msvc'])), [])
+
+  def test_attributes(self):
+    self.assertEqual(
+        names(self.index.query(['generator=Unix Makefiles'])),
+        ['android-arm64-v8a']
+    )
+    self.assertEqual(
+        names(self.index.query(['description=universal', 'nocodesign=yes'])),
+        ['ios-nocodesign-12-1']
+    )
+    self.assertEqual(
+        names(self.index.query(['vs_version=16', 'arch=amd64'])),
+        ['vs-16-2019-win64-cxx17']
+    )
+
+  def test_arch_aliases(self):
+    self.assertEqual(
+        names(self.index.query(['arch=arm64'])),
+        ['android-arm64-v8a', 'ios-nocodesign-12-1']
+    )
+    self.assertEqual(
+        names(self.index.query(['arch=arm64-v8a'])), ['android-arm64-v8a']
+    )
+    self.assertEqual(
+        names(self.index.query(['arm64'])),
+        ['android-arm64-v8a', 'ios-nocodesign-12-1']
+    )
+
+  def test_unknown_attribute(self):
+    with self.assertRaises(SystemExit):
+      self.index.query(['color=red'])
+
+if __name__ == '__main__':
+  unittest.main()